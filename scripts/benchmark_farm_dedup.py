@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark farm clustering: exhaustive pairwise comparison vs blocking.
+
+Runs ``cluster_farms`` both ways on the regions with the most farms and checks
+that the clusters are identical. Farms are grouped the same way as in
+``scripts/deduplicate_farms.py`` (one representative per normalized name).
+
+    uv run python scripts/benchmark_farm_dedup.py --top 5
+    uv run python scripts/benchmark_farm_dedup.py --country CO --top 3
+    uv run python scripts/benchmark_farm_dedup.py --synthetic 2000 4000
+
+Use KISSATEN_DATABASE_PATH to point at a different database.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kissaten.dedup import candidate_pairs, cluster_farms
+
+console = Console()
+
+_WORDS = [
+    "las", "flores", "el", "paraiso", "la", "esperanza", "san", "jose", "buena", "vista", "mirador", "palma",
+    "alto", "bajo", "monte", "rio", "cerro", "loma", "santa", "maria", "cruz", "piedra", "blanca", "verde",
+]
+_GIVEN = ["Edinson", "Luz", "Jairo", "Elkin", "Rodrigo", "Pedro", "Ana", "Maria", "Jose", "Carlos", "Diego"]
+_SURNAMES = ["Argote", "Rojas", "Arcila", "Guzman", "Sanchez", "Lasso", "Hernandez", "Gomez", "Vargas", "Moreno"]
+
+
+def synthetic_region(size: int, seed: int = 42) -> list[dict]:
+    """Farms drawn from a small vocabulary, with typos and variants of the same farm."""
+    rng = random.Random(seed)
+    base = [" ".join(rng.sample(_WORDS, rng.randint(1, 3))) for _ in range(size // 3)]
+    farms = []
+    for _ in range(size):
+        name = rng.choice(base)
+        if rng.random() < 0.15:
+            pos = rng.randrange(len(name))
+            name = name[:pos] + rng.choice("aeiou") + name[pos + 1 :]
+        producer = ""
+        if rng.random() < 0.7:
+            producer = f"{rng.choice(_GIVEN)} {rng.choice(_SURNAMES)} {rng.choice(_SURNAMES)}"
+        farms.append({"farm_name": f"Finca {name.title()}", "producer_name": producer, "bean_count": rng.randint(1, 9)})
+    return farms
+
+
+def largest_regions(country: str | None, top: int) -> list[tuple[str, list[dict]]]:
+    """Representative farms for the ``top`` regions with the most distinct farms."""
+    from kissaten.dedup import storage
+
+    regions = []
+    for country_code, region_name, region_key in storage.get_all_regions(country):
+        region_slug = region_key.split(":", 1)[1]
+        farms = storage.get_farms_for_region(country_code, region_slug)
+        representatives = []
+        for entries in farms.values():
+            rep = entries[0].copy()
+            rep["bean_count"] = sum(e["bean_count"] for e in entries)
+            representatives.append(rep)
+        regions.append((f"{country_code} / {region_name}", representatives))
+    regions.sort(key=lambda region: len(region[1]), reverse=True)
+    return regions[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--country", help="Only consider regions in this country (e.g. CO)")
+    parser.add_argument("--top", type=int, default=5, help="Number of largest regions to benchmark")
+    parser.add_argument("--synthetic", type=int, nargs="+", help="Benchmark synthetic regions of these sizes")
+    parser.add_argument("--name-threshold", type=float, default=0.90, help="Name similarity threshold")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        regions = [(f"synthetic ({size:,})", synthetic_region(size)) for size in args.synthetic]
+    else:
+        regions = largest_regions(args.country, args.top)
+
+    table = Table(title="cluster_farms: exhaustive vs blocking")
+    table.add_column("Region")
+    table.add_column("Farms", justify="right")
+    table.add_column("All pairs", justify="right")
+    table.add_column("Candidates", justify="right")
+    table.add_column("Exhaustive (s)", justify="right")
+    table.add_column("Blocking (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Identical")
+
+    all_identical = True
+    for label, farms in regions:
+        start = time.perf_counter()
+        exhaustive = cluster_farms(farms, name_threshold=args.name_threshold, use_blocking=False)
+        exhaustive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        blocked = cluster_farms(farms, name_threshold=args.name_threshold)
+        blocked_s = time.perf_counter() - start
+
+        identical = blocked == exhaustive
+        all_identical &= identical
+        n = len(farms)
+        table.add_row(
+            label,
+            f"{n:,}",
+            f"{n * (n - 1) // 2:,}",
+            f"{len(candidate_pairs(farms, name_threshold=args.name_threshold)):,}",
+            f"{exhaustive_s:.2f}",
+            f"{blocked_s:.2f}",
+            f"{exhaustive_s / blocked_s:.0f}x" if blocked_s else "-",
+            "[green]yes[/green]" if identical else "[red]NO[/red]",
+        )
+
+    console.print(table)
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Benchmark origin typeahead: per-keystroke ILIKE aggregates vs the suggestion index.
+
+Compares the legacy ``/v1/search/origins`` implementation (three
+``strip_accents(...) ILIKE '%q%'`` + ``GROUP BY`` queries over
+``country_codes`` and ``origins``) with ``OriginSuggestionIndex`` lookups over
+the refresh-time ``origin_suggestions`` table, for every prefix of a set of
+typed queries.
+
+Run against a copy of the production database, or against a synthetic
+catalogue to see how latency scales with the number of origins:
+
+    uv run python scripts/benchmark_origin_search.py --database data/kissaten.duckdb
+    uv run python scripts/benchmark_origin_search.py --synthetic 20000
+
+The legacy queries call the Python ``normalize_region_name`` UDF on every
+matching row, so they take seconds per keystroke at that size.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+import unicodedata
+
+import duckdb
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from kissaten.api.origin_suggestions import OriginSuggestionIndex, build_origin_suggestions
+
+console = Console()
+
+TYPED = ["colombia", "huila", "finca el paraíso", "yirgacheffe", "santa", "et", "guji"]
+
+_ELEVATION_MIDPOINT = "(NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2"
+_REGION_SLUG = "normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region'))"
+
+LEGACY_QUERIES = [
+    f"""
+    SELECT 'country', cc.name, cc.alpha_2, COUNT(DISTINCT cb.id) AS bean_count,
+        COUNT(DISTINCT o.farm_normalized), AVG({_ELEVATION_MIDPOINT})
+    FROM country_codes cc
+    LEFT JOIN origins o ON cc.alpha_2 = o.country
+    LEFT JOIN coffee_beans cb ON o.bean_id = cb.id
+    WHERE (strip_accents(cc.name) ILIKE strip_accents($q) OR cc.alpha_2 ILIKE $q)
+    GROUP BY cc.name, cc.alpha_2
+    ORDER BY bean_count DESC LIMIT $limit
+    """,
+    f"""
+    SELECT 'region', COALESCE(ANY_VALUE(o.state_canonical), arg_max(o.region, length(o.region))), o.country,
+        {_REGION_SLUG}, COUNT(DISTINCT o.bean_id) AS bean_count, COUNT(DISTINCT o.farm_normalized),
+        AVG({_ELEVATION_MIDPOINT})
+    FROM origins o JOIN country_codes cc ON o.country = cc.alpha_2
+    WHERE (o.region_unaccented ILIKE strip_accents($q) OR o.state_canonical_unaccented ILIKE strip_accents($q))
+    GROUP BY o.country, {_REGION_SLUG}
+    ORDER BY bean_count DESC LIMIT $limit
+    """,
+    f"""
+    SELECT 'farm', COALESCE(ANY_VALUE(o.farm_canonical), arg_max(o.farm, length(o.farm))), o.country,
+        {_REGION_SLUG}, MODE(o.producer) FILTER (WHERE o.producer IS NOT NULL AND o.producer != ''),
+        COUNT(DISTINCT o.bean_id) AS bean_count, AVG({_ELEVATION_MIDPOINT})
+    FROM origins o JOIN country_codes cc ON o.country = cc.alpha_2
+    WHERE (o.farm_unaccented ILIKE strip_accents($q) OR o.producer_unaccented ILIKE strip_accents($q))
+    GROUP BY o.country, {_REGION_SLUG}, COALESCE(o.farm_canonical, o.farm_normalized)
+    ORDER BY bean_count DESC LIMIT $limit
+    """,
+]
+
+_ORIGIN_COLUMNS = [
+    "bean_id", "country", "region", "state_canonical", "farm", "farm_canonical", "farm_normalized", "producer",
+    "elevation_min", "elevation_max",
+]
+
+_SYLLABLES = [
+    "hu", "ila", "gu", "ji", "san", "ta", "ma", "ría", "ca", "fé", "yir", "ga", "che", "el", "pa", "ra", "íso",
+]
+
+
+def _slug(text: str | None) -> str:
+    if not text:
+        return ""
+    ascii_only = unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+    return re.sub(r"[\s-]+", "-", re.sub(r"[^a-zA-Z0-9\s-]", "", ascii_only.lower()).strip())
+
+
+def register_slug_functions(con: duckdb.DuckDBPyConnection) -> None:
+    """The slug UDFs the queries use (same rules as ``kissaten.api.db``)."""
+    for name in ("normalize_region_name", "normalize_farm_name"):
+        con.create_function(name, _slug, [str], str)
+
+
+def synthetic_database(origins: int) -> duckdb.DuckDBPyConnection:
+    """An in-memory catalogue with the columns the origin search reads."""
+    rng = random.Random(0)
+    con = duckdb.connect(":memory:")
+    countries = [("Colombia", "CO"), ("Ethiopia", "ET"), ("Kenya", "KE"), ("Brazil", "BR"), ("Panama", "PA")]
+    countries += [(f"Country {i}", f"{chr(65 + i // 26)}{chr(65 + i % 26)}") for i in range(10, 200)]
+    con.execute("CREATE TABLE country_codes (name VARCHAR, alpha_2 VARCHAR)")
+    con.executemany("INSERT INTO country_codes VALUES (?, ?)", countries)
+
+    def word() -> str:
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    regions = [word() for _ in range(max(origins // 200, 10))]
+    farms = [f"Finca {word()} {word()}" for _ in range(max(origins // 10, 10))]
+    columns: dict[str, list] = {name: [] for name in _ORIGIN_COLUMNS}
+    for bean_id in range(origins):
+        farm = rng.choice(farms) if rng.random() < 0.7 else None
+        elevation = rng.randint(1000, 2200)
+        row = (
+            bean_id, rng.choice(countries[:40])[1], rng.choice(regions), None, farm, None, _slug(farm) or None,
+            word() if rng.random() < 0.5 else None, elevation, elevation + 200,
+        )
+        for name, value in zip(_ORIGIN_COLUMNS, row):
+            columns[name].append(value)
+    # Missing strings travel as "" in fixed-width numpy arrays
+    origin_rows = {  # noqa: F841
+        name: np.array(values) if name in ("bean_id", "elevation_min", "elevation_max")
+        else np.array(["" if value is None else value for value in values])
+        for name, values in columns.items()
+    }
+    con.execute(f"""
+        CREATE TABLE origins AS SELECT
+            bean_id::INTEGER AS bean_id, {", ".join(f"NULLIF({c}, '') AS {c}" for c in _ORIGIN_COLUMNS[1:8])},
+            elevation_min::INTEGER AS elevation_min, elevation_max::INTEGER AS elevation_max
+        FROM origin_rows
+    """)
+    con.execute("""
+        ALTER TABLE origins ADD COLUMN region_unaccented VARCHAR;
+        ALTER TABLE origins ADD COLUMN state_canonical_unaccented VARCHAR;
+        ALTER TABLE origins ADD COLUMN farm_unaccented VARCHAR;
+        ALTER TABLE origins ADD COLUMN producer_unaccented VARCHAR;
+        UPDATE origins SET region_unaccented = strip_accents(region), farm_unaccented = strip_accents(farm),
+            producer_unaccented = strip_accents(producer);
+        CREATE TABLE coffee_beans AS SELECT DISTINCT bean_id AS id FROM origins;
+    """)
+    return con
+
+
+def median_ms(fn, repeats: int) -> float:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--database", help="DuckDB file built by `kissaten refresh` (opened read-only)")
+    source.add_argument("--synthetic", type=int, help="Number of synthetic origin rows")
+    parser.add_argument("--limit", type=int, default=20, help="Suggestions per request")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query (median is reported)")
+    args = parser.parse_args()
+
+    if args.database:
+        con = duckdb.connect(args.database, read_only=True)
+        register_slug_functions(con)
+    else:
+        start = time.perf_counter()
+        con = synthetic_database(args.synthetic)
+        register_slug_functions(con)
+        build_origin_suggestions(con)
+        console.print(f"Built synthetic catalogue and suggestions in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    index = OriginSuggestionIndex.from_connection(con)
+    console.print(f"Loaded {len(index)} suggestions in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    def legacy(query: str) -> None:
+        for sql in LEGACY_QUERIES:
+            con.execute(sql, {"q": f"%{query}%", "limit": args.limit}).fetchall()
+
+    table = Table(title="Origin typeahead latency per keystroke (median ms)")
+    table.add_column("Typed")
+    table.add_column("Keystrokes", justify="right")
+    table.add_column("ILIKE median", justify="right")
+    table.add_column("ILIKE max", justify="right")
+    table.add_column("Index median", justify="right")
+    table.add_column("Index max", justify="right")
+    for typed in TYPED:
+        prefixes = [typed[:i] for i in range(1, len(typed) + 1)]
+        legacy_ms = [median_ms(lambda q=q: legacy(q), args.repeats) for q in prefixes]
+        index_ms = [median_ms(lambda q=q: index.search(q, args.limit), args.repeats) for q in prefixes]
+        table.add_row(
+            typed,
+            str(len(prefixes)),
+            f"{statistics.median(legacy_ms):.2f}",
+            f"{max(legacy_ms):.2f}",
+            f"{statistics.median(index_ms):.3f}",
+            f"{max(index_ms):.3f}",
+        )
+
+    console.print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
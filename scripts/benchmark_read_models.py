@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Benchmark API response building: validated models vs read models.
+
+Builds a page of search results from synthetic database rows both ways:
+
+- validated: ``APISearchResult(**row)`` with ``APIBean(**origin)`` origins,
+  returned through a FastAPI route with ``response_model`` (which dumps,
+  re-validates and serializes the payload again)
+- read model: ``APISearchResult.read_model`` / ``APIBean.read_model`` dicts
+  serialized once with ``json_response``
+
+and reports the per-page time in-process and through a FastAPI route.
+
+    uv run python scripts/benchmark_read_models.py
+    uv run python scripts/benchmark_read_models.py --rows 100 --repeats 200
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from kissaten.schemas import APIResponse, PaginationInfo
+from kissaten.schemas.api_models import APIBean, APISearchResult
+
+console = Console()
+
+_NOTES = ["Jasmine", "Bergamot", "Peach", "Dark Chocolate", "Caramel", "Red Apple", "Black Tea", "Honey"]
+
+
+def synthetic_rows(count: int) -> list[tuple[dict, list[dict]]]:
+    """(bean row, origin rows) pairs shaped like the /v1/search query results."""
+    rows = []
+    scraped_at = datetime(2026, 9, 1, 12, 0)
+    for i in range(count):
+        bean = {
+            "id": i,
+            "name": f"Ethiopia Guji Natural Lot {i}",
+            "roaster": f"Roaster {i % 17}",
+            "url": f"https://roaster{i % 17}.example.com/products/ethiopia-guji-{i}",
+            "is_single_origin": True,
+            "roast_level": "Light",
+            "roast_profile": "Filter",
+            "weight": 250,
+            "price": 18.5 + i % 7,
+            "currency": "GBP",
+            "is_decaf": False,
+            "cupping_score": 87.5,
+            "is_tasting_kit": False,
+            "requires_review": False,
+            "tasting_notes": [
+                {"note": note, "primary_category": "fruity"} for note in _NOTES[i % 4 : i % 4 + 3]
+            ],
+            "description": "A bright, floral coffee from smallholders around Shakiso. " * 4,
+            "in_stock": True,
+            "scraped_at": scraped_at - timedelta(hours=i),
+            "date_added": scraped_at - timedelta(days=i),
+            "scraper_version": "2.0",
+            "image_url": f"/images/roaster{i % 17}/{i}.jpg",
+            "clean_url_slug": f"ethiopia-guji-{i}",
+            "bean_url_path": f"/roaster_{i % 17}/ethiopia_guji_{i}",
+            "price_paid_for_green_coffee": None,
+            "currency_of_price_paid_for_green_coffee": None,
+            "roaster_country_code": "GB",
+            "roaster_location": "United Kingdom",
+            "score": 3.5,
+            "price_converted": False,
+            "price_large_weight": 1000,
+            "price_large_price": 58.0,
+            "price_large_price_per_kg_usd": 73.4,
+        }
+        origins = [
+            {
+                "country": "ET",
+                "region": "Guji",
+                "producer": "Shakiso Smallholders",
+                "farm": None,
+                "elevation_min": 1900,
+                "elevation_max": 2200,
+                "process": "Natural",
+                "variety": "Heirloom",
+                "variety_canonical": ["Ethiopian Landrace"],
+                "harvest_date": datetime(2025, 12, 1),
+                "latitude": 0.0,
+                "longitude": 0.0,
+                "country_full_name": "Ethiopia",
+            }
+        ]
+        rows.append((bean, origins))
+    return rows
+
+
+def validated_page(rows) -> APIResponse:
+    results = [APISearchResult(**bean, origins=[APIBean(**o) for o in origins]) for bean, origins in rows]
+    return APIResponse.success_response(data=results, pagination=_pagination(len(rows)))
+
+
+def read_model_page(rows) -> APIResponse:
+    results = [
+        APISearchResult.read_model(**bean, origins=[APIBean.read_model(**o) for o in origins])
+        for bean, origins in rows
+    ]
+    return APIResponse.success_response(data=results, pagination=_pagination(len(rows)))
+
+
+def _pagination(count: int) -> PaginationInfo:
+    return PaginationInfo(page=1, per_page=count, total_items=count, total_pages=1, has_next=False, has_previous=False)
+
+
+def median_ms(fn, repeats: int) -> float:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Results per page")
+    parser.add_argument("--repeats", type=int, default=100, help="Timed runs (median is reported)")
+    args = parser.parse_args()
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from kissaten.api.main import json_response
+
+    rows = synthetic_rows(args.rows)
+
+    app = FastAPI()
+
+    @app.get("/validated", response_model=APIResponse[list[APISearchResult]])
+    async def validated_route():
+        return validated_page(rows)
+
+    @app.get("/read-model", response_model=APIResponse[list[APISearchResult]])
+    async def read_model_route():
+        return json_response(read_model_page(rows))
+
+    client = TestClient(app)
+    assert client.get("/validated").json() == client.get("/read-model").json(), "responses differ"
+
+    table = Table(title=f"Building a {args.rows}-row search page (median ms)")
+    table.add_column("Stage")
+    table.add_column("Validated", justify="right")
+    table.add_column("Read model", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    stages = [
+        ("Construct models", lambda: validated_page(rows), lambda: read_model_page(rows)),
+        (
+            "Construct + serialize",
+            lambda: validated_page(rows).model_dump_json(),
+            lambda: json_response(read_model_page(rows)),
+        ),
+        ("FastAPI route", lambda: client.get("/validated"), lambda: client.get("/read-model")),
+    ]
+    for label, validated, read_model in stages:
+        validated_ms = median_ms(validated, args.repeats)
+        read_model_ms = median_ms(read_model, args.repeats)
+        table.add_row(label, f"{validated_ms:.2f}", f"{read_model_ms:.2f}", f"{validated_ms / read_model_ms:.1f}x")
+
+    console.print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark bean recommendations: search-engine SQL scoring vs the neighbour index.
+
+Requests ``/v1/beans/{roaster}/{bean}/recommendations`` for a sample of beans
+through the API, once with the refresh-time recommendation index and once with
+it disabled (the per-request SQL scoring fallback), and reports latency and the
+overlap between the two top-k lists.
+
+The database must have been built by ``kissaten refresh`` (which builds the
+recommendation tables). Use KISSATEN_DATABASE_PATH to point at it:
+
+    KISSATEN_DATABASE_PATH=data/kissaten.duckdb uv run python scripts/benchmark_recommendations.py
+    uv run python scripts/benchmark_recommendations.py --beans 100 --limit 12
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+console = Console()
+
+SCENARIOS = {
+    "default weights": {},
+    "custom weights": {"weight_variety": 2.0, "weight_process": 1.0},
+    "decaf filter": {"is_decaf": "false"},
+}
+
+
+def time_requests(client, paths: list[str], params: dict) -> tuple[list[float], list[list[str]]]:
+    timings, results = [], []
+    for path in paths:
+        start = time.perf_counter()
+        response = client.get(f"/v1/beans{path}/recommendations", params=params)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        results.append([rec["clean_url_slug"] for rec in response.json()["data"]])
+    return timings, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--beans", type=int, default=50, help="Number of target beans to sample")
+    parser.add_argument("--limit", type=int, default=6, help="Recommendations per request")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    import kissaten.api.main as api_main
+    from kissaten.api.db import conn
+
+    try:
+        conn.execute("SELECT 1 FROM recommendation_neighbours LIMIT 1")
+    except Exception:
+        console.print("[red]Recommendation index not found; run `kissaten refresh` first.[/red]")
+        return 1
+
+    paths = [
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT cb.bean_url_path FROM coffee_beans cb
+            JOIN recommendation_beans rb ON rb.bean_id = cb.id
+            WHERE rb.is_candidate AND cb.bean_url_path IS NOT NULL
+            ORDER BY hash(cb.id)
+            LIMIT ?
+            """,
+            [args.beans],
+        ).fetchall()
+    ]
+    console.print(f"Benchmarking {len(paths)} beans, {args.limit} recommendations each\n")
+
+    table = Table(title="Recommendation latency per request (ms)")
+    table.add_column("Scenario")
+    table.add_column("SQL median", justify="right")
+    table.add_column("SQL p95", justify="right")
+    table.add_column("Index median", justify="right")
+    table.add_column("Index p95", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Top-k overlap", justify="right")
+
+    with TestClient(api_main.app) as client:
+        # Warm the in-memory index and DuckDB caches
+        time_requests(client, paths[:3], {"limit": args.limit, "weight_variety": 1.0})
+
+        for scenario, extra in SCENARIOS.items():
+            params = {"limit": args.limit, **extra}
+            index_ms, index_results = time_requests(client, paths, params)
+
+            precomputed, recommender = api_main.precomputed_neighbours, api_main.get_recommender
+            api_main.precomputed_neighbours = lambda *_: None
+            api_main.get_recommender = lambda _conn: None
+            try:
+                sql_ms, sql_results = time_requests(client, paths, params)
+            finally:
+                api_main.precomputed_neighbours, api_main.get_recommender = precomputed, recommender
+
+            overlaps = [
+                len(set(a) & set(b)) / max(len(set(a) | set(b)), 1) for a, b in zip(sql_results, index_results)
+            ]
+            sql_median, index_median = statistics.median(sql_ms), statistics.median(index_ms)
+            table.add_row(
+                scenario,
+                f"{sql_median:.1f}",
+                f"{statistics.quantiles(sql_ms, n=20)[-1]:.1f}" if len(sql_ms) > 1 else "-",
+                f"{index_median:.1f}",
+                f"{statistics.quantiles(index_ms, n=20)[-1]:.1f}" if len(index_ms) > 1 else "-",
+                f"{sql_median / index_median:.1f}x" if index_median else "-",
+                f"{statistics.mean(overlaps):.0%}",
+            )
+
+    console.print(table)
+    console.print(
+        "[dim]Latency includes fetching bean details and origins, which both paths share. Overlap is the "
+        "Jaccard index of the returned beans; the index scores cosine similarity of feature vectors, "
+        "the SQL path counts matching filters, so rankings are similar but not identical.[/dim]"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
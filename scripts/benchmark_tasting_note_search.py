@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Benchmark strict-mode tasting note search: per-row ILIKE vs the note index.
+
+Compares the legacy ``array_to_string(cb.tasting_notes, ' ') ILIKE ?`` filter
+with the bean-ID set queries compiled by ``kissaten.api.tasting_note_search``
+over a set of realistic ``tasting_notes_query`` expressions.
+
+Run against a copy of the production database, or against a synthetic
+catalogue to see how latency scales with catalogue and vocabulary size:
+
+    uv run python scripts/benchmark_tasting_note_search.py --database data/kissaten.duckdb
+    uv run python scripts/benchmark_tasting_note_search.py --synthetic 200000 --vocabulary 20000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+import duckdb
+from rich.console import Console
+from rich.table import Table
+
+from kissaten.api.tasting_note_search import build_tasting_note_filter, build_tasting_note_index, tokenize_query
+
+console = Console()
+
+QUERIES = [
+    "chocolate",
+    "fruit*",
+    '"dark chocolate"',
+    "chocolate&berry",
+    "berry|cherry|plum",
+    "citrus&!bitter",
+    "(peach|apricot)&(jasmine|floral)",
+    "choc*&(caramel|toffee)&!ferment*",
+    "stone fruit|tropical",
+    "bl?ckberry",
+]
+
+_SYNTHETIC_WORDS = [
+    "chocolate", "dark chocolate", "milk chocolate", "cocoa", "caramel", "toffee", "honey", "brown sugar",
+    "berry", "blueberry", "blackberry", "raspberry", "strawberry", "cherry", "plum", "grape", "peach",
+    "apricot", "nectarine", "stone fruit", "citrus", "lemon", "lime", "orange", "grapefruit", "bergamot",
+    "jasmine", "floral", "rose", "hibiscus", "black tea", "tropical", "mango", "pineapple", "papaya",
+    "almond", "hazelnut", "walnut", "vanilla", "cinnamon", "clove", "molasses", "bitter", "fermented",
+]
+
+
+def legacy_filter(query: str) -> tuple[str, list[str]]:
+    """The pre-index strict filter: one joined-string ILIKE per term."""
+    tokens = tokenize_query(query)
+    field = "array_to_string(cb.tasting_notes, ' ')"
+    pos = 0
+
+    def parse_or():
+        nonlocal pos
+        cond, params = parse_and()
+        while pos < len(tokens) and tokens[pos] == "|":
+            pos += 1
+            right, right_params = parse_and()
+            cond, params = f"({cond} OR {right})", params + right_params
+        return cond, params
+
+    def parse_and():
+        nonlocal pos
+        cond, params = parse_not()
+        while pos < len(tokens) and tokens[pos] == "&":
+            pos += 1
+            right, right_params = parse_not()
+            cond, params = f"({cond} AND {right})", params + right_params
+        return cond, params
+
+    def parse_not():
+        nonlocal pos
+        if tokens[pos] == "!":
+            pos += 1
+            cond, params = parse_primary()
+            return f"NOT {cond}", params
+        return parse_primary()
+
+    def parse_primary():
+        nonlocal pos
+        if tokens[pos] == "(":
+            pos += 1
+            cond, params = parse_or()
+            pos += 1
+            return cond, params
+        parts = []
+        while pos < len(tokens) and tokens[pos] not in "|&()":
+            parts.append(tokens[pos])
+            pos += 1
+        term = " ".join(parts)
+        if term.startswith("EXACT:"):
+            return (
+                "EXISTS (SELECT 1 FROM unnest(cb.tasting_notes) AS t(note) WHERE lower(note) = lower(?))",
+                [term[6:]],
+            )
+        pattern = term.replace("*", "%").replace("?", "_")
+        if "*" not in term and "?" not in term:
+            pattern = f"%{pattern}%"
+        return f"{field} ILIKE ?", [pattern]
+
+    return parse_or()
+
+
+def create_synthetic_catalogue(conn, beans: int, vocabulary: int, seed: int = 42) -> None:
+    """Create a coffee_beans table with 2-6 random notes per bean.
+
+    Note ranks are drawn log-uniformly, so a few notes are very common and
+    most are rare, as in the real catalogue.
+    """
+    rng = random.Random(seed)
+    vocab = list(_SYNTHETIC_WORDS)
+    while len(vocab) < vocabulary:
+        vocab.append(f"{rng.choice(_SYNTHETIC_WORDS)} {rng.choice(_SYNTHETIC_WORDS)} {len(vocab)}")
+    conn.execute("SELECT setseed(?)", [seed / 100])
+    conn.execute(
+        """
+        CREATE OR REPLACE TABLE coffee_beans AS
+        SELECT b.id, list(vocab[CAST(floor(pow(len(vocab), random())) AS INTEGER)] ORDER BY r.k) AS tasting_notes
+        FROM (SELECT CAST(?::VARCHAR[] AS VARCHAR[]) AS vocab) v,
+             range(1, ? + 1) b(id),
+             LATERAL range(2 + CAST(floor(random() * 5) AS INTEGER)) r(k)
+        GROUP BY b.id
+        """,
+        [vocab, beans],
+    )
+
+
+def time_query(conn, condition: str, params: list[str], repeats: int) -> tuple[float, int]:
+    sql = f"SELECT COUNT(*) FROM coffee_beans cb WHERE {condition}"
+    conn.execute(sql, params).fetchone()  # warm-up
+    timings = []
+    count = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        count = conn.execute(sql, params).fetchone()[0]
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", type=Path, help="DuckDB database with a coffee_beans table")
+    parser.add_argument("--synthetic", type=int, help="Generate a synthetic catalogue with this many beans")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct notes in the synthetic catalogue")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed runs per query (median is reported)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        conn = duckdb.connect()
+        console.print(f"[blue]Generating {args.synthetic:,} beans over {args.vocabulary:,} notes...[/blue]")
+        create_synthetic_catalogue(conn, args.synthetic, args.vocabulary)
+    elif args.database:
+        if not args.database.exists():
+            console.print(f"[red]Error: Database file not found at {args.database}[/red]")
+            return 1
+        # Work on an in-memory copy so the index build never touches the source DB
+        conn = duckdb.connect()
+        conn.execute(f"ATTACH '{args.database}' AS src (READ_ONLY)")
+        conn.execute("CREATE TABLE coffee_beans AS SELECT id, tasting_notes FROM src.coffee_beans")
+    else:
+        parser.error("pass --database or --synthetic")
+
+    start = time.perf_counter()
+    build_tasting_note_index(conn)
+    build_ms = (time.perf_counter() - start) * 1000
+    beans, notes = conn.execute(
+        "SELECT (SELECT COUNT(*) FROM coffee_beans), (SELECT COUNT(*) FROM tasting_note_postings)"
+    ).fetchone()
+    console.print(f"Index built in {build_ms:.0f} ms ({beans:,} beans, {notes:,} distinct notes)\n")
+
+    table = Table(title="Strict tasting_notes_query latency (median ms)")
+    table.add_column("Query")
+    table.add_column("ILIKE", justify="right")
+    table.add_column("Index", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Matches (ILIKE / index)", justify="right")
+
+    for query in QUERIES:
+        legacy_ms, legacy_count = time_query(conn, *legacy_filter(query), args.repeats)
+        index_ms, index_count = time_query(conn, *build_tasting_note_filter(query), args.repeats)
+        table.add_row(
+            query,
+            f"{legacy_ms:.2f}",
+            f"{index_ms:.2f}",
+            f"{legacy_ms / index_ms:.1f}x" if index_ms else "-",
+            f"{legacy_count:,} / {index_count:,}",
+        )
+
+    console.print(table)
+    console.print(
+        "[dim]Match counts can differ: the index matches terms per note (so 'fruit*' matches any note "
+        "starting with 'fruit'), the legacy filter matched the space-joined note string.[/dim]"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,329 @@
+"""
+Concurrent, checkpointed batch runner for the LLM categorizers.
+
+The categorizers (tasting notes, varietals, processing methods) split their
+inputs into batches and send each batch to a PydanticAI agent. ``BatchRunner``
+runs those batches with bounded concurrency and retries rate-limited or
+transient failures with exponential backoff. When any batch is rate-limited,
+every worker pauses for the same cooldown instead of each one hammering the
+API on its own schedule.
+
+Each completed batch is written to its own checkpoint file:
+
+    <checkpoint_dir>/<task>/<run key>/batch-00012.json
+
+The run key is a hash of the task name, batch size and input items, so an
+interrupted ``kissaten categorize all`` that is re-run over the same inputs
+picks up the finished batches and only calls the model for the rest.
+Checkpoints are removed once the caller has saved the final output
+(``BatchRunner.clear``). Batches that still fail after all retries are not
+checkpointed; they go through the caller's fallback and are retried next run.
+
+``BatchRunner.estimate`` gives a dry-run view of the work: batches left,
+approximate tokens and cost, and the wall time expected at the configured
+concurrency.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import shutil
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).parent.parent.parent.parent / "data" / "checkpoints" / "categorize"
+
+# Rough characters-per-token ratio used for dry-run token estimates
+CHARS_PER_TOKEN = 4
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether ``error`` looks like a provider rate-limit / overload response."""
+    status_code = getattr(error, "status_code", None)
+    if status_code in (429, 503):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in ("429", "rate limit", "resource_exhausted", "quota", "overloaded"))
+
+
+@dataclass
+class BatchEstimate:
+    """Dry-run estimate for a batch run."""
+
+    task: str
+    items: int
+    batches: int
+    checkpointed_batches: int
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    wall_time_seconds: float
+
+    @property
+    def remaining_batches(self) -> int:
+        return self.batches - self.checkpointed_batches
+
+
+@dataclass
+class BatchRunStats:
+    """Outcome of a batch run."""
+
+    batches: int = 0
+    resumed: int = 0
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class BatchRunner(Generic[ItemT, ResultT]):
+    """Run LLM batches concurrently with retries and per-batch checkpoints."""
+
+    def __init__(
+        self,
+        task: str,
+        checkpoint_dir: Path | None = DEFAULT_CHECKPOINT_DIR,
+        concurrency: int = 4,
+        max_retries: int = 4,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        result_model: type[BaseModel] | None = None,
+    ):
+        """
+        Args:
+            task: Name of the task; used for the checkpoint directory and logging.
+            checkpoint_dir: Root directory for checkpoints, or None to disable them.
+            concurrency: Maximum number of batches in flight at once.
+            max_retries: Retries per batch after the first attempt.
+            base_delay: Initial backoff delay in seconds (doubles on each retry).
+            max_delay: Upper bound for a single backoff delay.
+            result_model: Pydantic model for results, used to (de)serialize
+                          checkpoints. Plain JSON values are stored as-is if None.
+        """
+        self.task = task
+        self.checkpoint_dir = checkpoint_dir
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.result_model = result_model
+        self.stats = BatchRunStats()
+        self._resume_at = 0.0
+
+    # -- Checkpoints -------------------------------------------------------
+
+    def run_key(self, items: Sequence[ItemT], batch_size: int, context: str = "") -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self.task}:{batch_size}:{context}".encode())
+        for item in items:
+            digest.update(b"\x00")
+            digest.update(json.dumps(item, sort_keys=True, default=str).encode())
+        return digest.hexdigest()[:16]
+
+    def _run_dir(self, items: Sequence[ItemT], batch_size: int, context: str = "") -> Path | None:
+        if self.checkpoint_dir is None:
+            return None
+        return self.checkpoint_dir / self.task / self.run_key(items, batch_size, context)
+
+    @staticmethod
+    def _batch_path(run_dir: Path, index: int) -> Path:
+        return run_dir / f"batch-{index:05d}.json"
+
+    def _serialize(self, result: ResultT) -> Any:
+        if isinstance(result, BaseModel):
+            return result.model_dump(mode="json")
+        return result
+
+    def _deserialize(self, value: Any) -> ResultT:
+        if self.result_model is not None:
+            return self.result_model.model_validate(value)
+        return value
+
+    def _load_checkpoint(self, run_dir: Path | None, index: int, batch: list[ItemT]) -> list[ResultT] | None:
+        if run_dir is None:
+            return None
+        path = self._batch_path(run_dir, index)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("items") != json.loads(json.dumps(batch, default=str)):
+                return None
+            return [self._deserialize(value) for value in data["results"]]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def _save_checkpoint(self, run_dir: Path | None, index: int, batch: list[ItemT], results: list[ResultT]) -> None:
+        if run_dir is None:
+            return
+        run_dir.mkdir(parents=True, exist_ok=True)
+        path = self._batch_path(run_dir, index)
+        tmp_path = path.with_suffix(".json.tmp")
+        payload = {"items": batch, "results": [self._serialize(r) for r in results]}
+        tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def clear(self, items: Sequence[ItemT], batch_size: int, context: str = "") -> None:
+        """Delete the checkpoints of a finished run."""
+        run_dir = self._run_dir(items, batch_size, context)
+        if run_dir is not None and run_dir.exists():
+            shutil.rmtree(run_dir)
+
+    # -- Running -----------------------------------------------------------
+
+    @staticmethod
+    def batches(items: Sequence[ItemT], batch_size: int) -> list[list[ItemT]]:
+        return [list(items[i : i + batch_size]) for i in range(0, len(items), batch_size)]
+
+    async def _wait_for_cooldown(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _call_with_retries(
+        self, worker: Callable[[list[ItemT]], Awaitable[list[ResultT]]], batch: list[ItemT], index: int
+    ) -> list[ResultT]:
+        attempt = 0
+        while True:
+            await self._wait_for_cooldown()
+            try:
+                return await worker(batch)
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * (2**attempt)) * (1 + random.random() * 0.25)
+                attempt += 1
+                self.stats.retries += 1
+                if is_rate_limited(e):
+                    # Pause every worker, not just this one
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                    logger.warning(
+                        f"[{self.task}] batch {index + 1} rate-limited; all workers pausing {delay:.1f}s "
+                        f"(retry {attempt}/{self.max_retries})"
+                    )
+                else:
+                    logger.warning(
+                        f"[{self.task}] batch {index + 1} failed: {e}; retrying in {delay:.1f}s "
+                        f"(retry {attempt}/{self.max_retries})"
+                    )
+                    await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        items: Sequence[ItemT],
+        batch_size: int,
+        worker: Callable[[list[ItemT]], Awaitable[list[ResultT]]],
+        on_error: Callable[[list[ItemT], Exception], list[ResultT]] | None = None,
+        on_batch_done: Callable[[int, list[ResultT]], None] | None = None,
+        context: str = "",
+    ) -> list[ResultT]:
+        """Run ``worker`` over ``items`` in batches and return the results in input order.
+
+        Args:
+            items: Inputs to process.
+            batch_size: Items per model call.
+            worker: Coroutine processing one batch. It should raise on failure
+                    so the runner can retry.
+            on_error: Fallback results for a batch that failed every retry. If
+                      None, the batch contributes no results.
+            on_batch_done: Called with (batch index, results) as each batch
+                           finishes, e.g. to advance a progress bar.
+            context: Extra input that changes the worker's output for the same
+                     items (e.g. the parent category); part of the run key.
+        """
+        started = time.perf_counter()
+        batches = self.batches(items, batch_size)
+        run_dir = self._run_dir(items, batch_size, context)
+        results: list[list[ResultT] | None] = [None] * len(batches)
+        self.stats = BatchRunStats(batches=len(batches))
+
+        pending = []
+        for index, batch in enumerate(batches):
+            cached = self._load_checkpoint(run_dir, index, batch)
+            if cached is not None:
+                results[index] = cached
+                self.stats.resumed += 1
+                if on_batch_done:
+                    on_batch_done(index, cached)
+            else:
+                pending.append(index)
+
+        if self.stats.resumed:
+            logger.info(f"[{self.task}] resuming: {self.stats.resumed}/{len(batches)} batches already checkpointed")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def process(index: int) -> None:
+            batch = batches[index]
+            async with semaphore:
+                try:
+                    batch_results = await self._call_with_retries(worker, batch, index)
+                    self._save_checkpoint(run_dir, index, batch, batch_results)
+                    self.stats.completed += 1
+                except Exception as e:
+                    logger.error(f"[{self.task}] batch {index + 1}/{len(batches)} failed after retries: {e}")
+                    batch_results = on_error(batch, e) if on_error else []
+                    self.stats.failed += 1
+            results[index] = batch_results
+            if on_batch_done:
+                on_batch_done(index, batch_results)
+
+        await asyncio.gather(*(process(index) for index in pending))
+
+        self.stats.elapsed_seconds = time.perf_counter() - started
+        return [result for batch_results in results for result in (batch_results or [])]
+
+    # -- Dry run -----------------------------------------------------------
+
+    def estimate(
+        self,
+        items: Sequence[ItemT],
+        batch_size: int,
+        prompt_overhead_chars: int = 0,
+        output_tokens_per_item: int = 40,
+        seconds_per_batch: float = 8.0,
+        input_cost_per_million: float = 0.30,
+        output_cost_per_million: float = 2.50,
+        context: str = "",
+    ) -> BatchEstimate:
+        """Estimate tokens, cost and wall time without calling the model.
+
+        Token counts use a ~4 characters/token heuristic. ``prompt_overhead_chars``
+        is the per-call system prompt and instructions (e.g. the taste lexicon).
+        The default prices are per million tokens in USD; pass the current rates
+        of the configured model for a meaningful cost figure.
+        """
+        batches = self.batches(items, batch_size)
+        run_dir = self._run_dir(items, batch_size, context)
+        remaining = [
+            batch for index, batch in enumerate(batches) if self._load_checkpoint(run_dir, index, batch) is None
+        ]
+        checkpointed = len(batches) - len(remaining)
+        item_chars = sum(len(str(item)) + 4 for batch in remaining for item in batch)
+        input_tokens = (item_chars + prompt_overhead_chars * len(remaining)) // CHARS_PER_TOKEN
+        output_tokens = output_tokens_per_item * sum(len(batch) for batch in remaining)
+        cost = input_tokens / 1e6 * input_cost_per_million + output_tokens / 1e6 * output_cost_per_million
+        waves = -(-len(remaining) // self.concurrency)
+        return BatchEstimate(
+            task=self.task,
+            items=len(items),
+            batches=len(batches),
+            checkpointed_batches=checkpointed,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=cost,
+            wall_time_seconds=waves * seconds_per_batch,
+        )
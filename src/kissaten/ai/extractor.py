@@ -2,6 +2,8 @@
 
 import asyncio
 import datetime
+import hashlib
+import json
 import logging
 import os
 
@@ -23,6 +25,10 @@ logfire.instrument_pydantic_ai()
 
 logger = logging.getLogger(__name__)
 
+# Bump when extraction behaviour changes in a way the prompt text and output
+# schema do not show, so cached extractions are not reused
+EXTRACTION_PROMPT_VERSION = 1
+
 
 class CoffeeDataExtractor:
     """AI-powered coffee data extractor using Gemini 2.5 Flash."""
@@ -62,14 +68,34 @@ class CoffeeDataExtractor:
             model_settings=GeminiModelSettings(gemini_thinking_config={"thinking_budget": 0}),
         )
 
+    def cache_fingerprint(self, use_optimized_mode: bool = False) -> str:
+        """Identify the prompts, schema and models an extraction depends on.
+
+        Part of the extraction cache key: changing any of them makes earlier
+        cached results miss.
+        """
+        models = "gemini-2.5-flash" if use_optimized_mode else "gemini-2.5-flash-lite,gemini-2.5-flash"
+        digest = hashlib.sha256()
+        for part in (
+            str(EXTRACTION_PROMPT_VERSION),
+            models,
+            self._get_system_prompt(),
+            self._get_translation_prompt(),
+            json.dumps(CoffeeBean.model_json_schema(), sort_keys=True),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
     def _get_system_prompt(self, optional_mode: bool = False) -> str:
         """Get the system prompt for coffee data extraction."""
         prompt = """
 You are an expert coffee data extraction specialist. Your task is to extract structured
 information about coffee beans from specialty coffee roaster product pages.
 
-You may be provided with HTML content and/or a screenshot of the page. Use all available
-information to extract the most accurate data possible. When a screenshot is provided,
+You may be provided with the page content (HTML, or HTML condensed to Markdown-like text)
+and/or a screenshot of the page. Use all available information to extract the most
+accurate data possible. When a screenshot is provided,
 use it to identify visual elements, prices, and product details that may not be clearly
 structured in the HTML. Pay special attention to:
 - Product images and visual layout
@@ -84,7 +110,8 @@ REQUIRED FIELDS:
   Remove the roaster name if present, and details not specific to the coffee itself (e.g., "250g", "Filter Roast", "NEW").
 - roaster: The coffee roaster name (e.g., "Cartwheel Coffee", "Coborn Coffee")
 - url: The product URL provided in the context
-- image_url: The main product image URL (look for high-quality product images, usually in <img> tags)
+- image_url: The main product image URL (look for high-quality product images, usually in <img> tags,
+  ![alt](url) lines or the og:image line)
 
 ORIGIN AND PROCESSING:
 - origins: List of Bean objects representing each origin in the coffee. For single origin coffees,
@@ -400,7 +427,7 @@ Translate all text fields to English while preserving the exact structure and al
         """Extract coffee data from HTML content using AI with retry logic and screenshot fallback.
 
         Args:
-            html_content: Raw HTML content of the coffee product page
+            html_content: HTML, or condensed page text, of the coffee product page
             product_url: URL of the product page
             screenshot_bytes: Optional screenshot bytes for visual analysis
             use_optimized_mode: If True, use only gemini-2.5-flash with screenshots (for complex pages)
@@ -417,7 +444,7 @@ Translate all text fields to English while preserving the exact structure and al
 Product URL: {product_url}
 Product Currency: {default_currency}
 
-HTML Content:
+Page Content:
 {html_content}
 """
 
@@ -488,7 +515,7 @@ HTML Content:
                     input_data = [
                         (
                             "Extract coffee bean information from this product page. "
-                            "Use both the screenshot and HTML content below:\n\n" + base_context
+                            "Use both the screenshot and page content below:\n\n" + base_context
                         ),
                         BinaryContent(data=screenshot_bytes, media_type=media_type),
                     ]
@@ -17,6 +17,8 @@ from rich.console import Console
 from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.table import Table
 
+from kissaten.ai.batch_runner import DEFAULT_CHECKPOINT_DIR, BatchEstimate, BatchRunner
+
 app = typer.Typer()
 
 logging.basicConfig(level=logging.INFO)
@@ -89,9 +91,17 @@ class ConflictResolution(BaseModel):
 
 
 class ProcessCategorizer:
-    def __init__(self, database_path: Path, mappings_file: Path | None = None):
+    def __init__(
+        self,
+        database_path: Path,
+        mappings_file: Path | None = None,
+        concurrency: int = 4,
+        checkpoint_dir: Path | None = DEFAULT_CHECKPOINT_DIR,
+    ):
         self.database_path = database_path
         self.mappings_file = mappings_file or Path(__file__).parent.parent / "database/processing_methods_mappings.json"
+        self.concurrency = concurrency
+        self.checkpoint_dir = checkpoint_dir
         self.agent = self._create_agent()
         self.merge_agent = self._create_merge_agent()
         self.conflict_agent = self._create_conflict_resolution_agent()
@@ -137,6 +147,8 @@ class ProcessCategorizer:
         - Remove redundant words but keep important qualifiers
         - Preserve distinctions between fundamentally different processes
         """
+        # Sent with every batch; used for dry-run token estimates
+        self.system_prompt_chars = len(system_prompt)
         return Agent(
             "gemini-3.5-flash",
             output_type=ProcessingMethodBatch,
@@ -479,6 +491,42 @@ class ProcessCategorizer:
         existing_common_names = set(m.common_name for m in existing_mappings.values())
 
         total_batches = (len(methods) + batch_size - 1) // batch_size
+        runner = self._runner()
+
+        async def categorize_batch(batch: list[str]) -> list[ProcessingMethodMapping]:
+            # Batches run concurrently, so each one sees the common names
+            # known when it starts (existing mappings plus finished batches).
+            prompt = f"""
+            Categorize these {len(batch)} coffee processing methods.
+            Map each to a standardized common name.
+
+            Methods to categorize:
+            {chr(10).join([f'{i+1}. "{name}"' for i, name in enumerate(batch)])}
+
+            Existing common names to consider (use these when appropriate):
+            {', '.join(sorted(existing_common_names)) if existing_common_names else 'None yet'}
+
+            Remember: Only merge methods that are truly the same process.
+            Keep different processes separate even if similar.
+            """
+
+            result = await self.agent.run(prompt)
+
+            # Validate mappings
+            validated_mappings = []
+            for mapping in result.output.mappings:
+                # Ensure original name is from our batch
+                if mapping.original_name in batch:
+                    validated_mappings.append(mapping)
+                    existing_common_names.add(mapping.common_name)
+                else:
+                    logger.warning(f"Skipping hallucinated mapping: {mapping.original_name}")
+            return validated_mappings
+
+        def fallback(batch: list[str], e: Exception) -> list[ProcessingMethodMapping]:
+            logger.error(f"Error processing batch: {e}")
+            # Fallback: map to original names
+            return [ProcessingMethodMapping(original_name=name, common_name=name, confidence=0.5) for name in batch]
 
         with Progress(
             TextColumn("[progress.description]{task.description}"),
@@ -490,56 +538,34 @@ class ProcessCategorizer:
         ) as progress:
             task = progress.add_task("Categorizing processing methods", total=total_batches)
 
-            for batch_idx in range(total_batches):
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, len(methods))
-                batch = methods[start_idx:end_idx]
-
-                prompt = f"""
-                Categorize these {len(batch)} coffee processing methods.
-                Map each to a standardized common name.
-
-                Methods to categorize:
-                {chr(10).join([f'{i+1}. "{name}"' for i, name in enumerate(batch)])}
-
-                Existing common names to consider (use these when appropriate):
-                {', '.join(sorted(existing_common_names)) if existing_common_names else 'None yet'}
-
-                Remember: Only merge methods that are truly the same process.
-                Keep different processes separate even if similar.
-                """
-
-                try:
-                    result = await self.agent.run(prompt)
-                    batch_mappings = result.output.mappings
-
-                    # Validate mappings
-                    validated_mappings = []
-                    for mapping in batch_mappings:
-                        # Ensure original name is from our batch
-                        if mapping.original_name in batch:
-                            validated_mappings.append(mapping)
-                            existing_common_names.add(mapping.common_name)
-                        else:
-                            logger.warning(f"Skipping hallucinated mapping: {mapping.original_name}")
-
-                    all_mappings.extend(validated_mappings)
-
-                except Exception as e:
-                    logger.error(f"Error processing batch {batch_idx + 1}: {e}")
-                    # Fallback: map to original names
-                    for name in batch:
-                        all_mappings.append(ProcessingMethodMapping(
-                            original_name=name,
-                            common_name=name,
-                            confidence=0.5
-                        ))
-
+            def batch_done(_index: int, batch_mappings: list[ProcessingMethodMapping]) -> None:
+                # Also covers batches resumed from checkpoints
+                existing_common_names.update(m.common_name for m in batch_mappings)
                 progress.update(task, advance=1)
-                await asyncio.sleep(0.5)  # Rate limiting
+
+            all_mappings.extend(
+                await runner.run(methods, batch_size, categorize_batch, on_error=fallback, on_batch_done=batch_done)
+            )
+
+        if runner.stats.resumed:
+            console.print(f"[cyan]Resumed {runner.stats.resumed}/{total_batches} batches from checkpoints[/cyan]")
 
         return all_mappings
 
+    def _runner(self) -> BatchRunner:
+        return BatchRunner(
+            "processing_methods",
+            checkpoint_dir=self.checkpoint_dir,
+            concurrency=self.concurrency,
+            result_model=ProcessingMethodMapping,
+        )
+
+    def estimate_categorization(self) -> BatchEstimate:
+        """Dry-run estimate for ``categorize_all_methods`` (no model calls)."""
+        existing_mappings = self.load_mappings()
+        methods_to_process = [m for m in self.get_unique_process_names() if m not in existing_mappings]
+        return self._runner().estimate(methods_to_process, 50, prompt_overhead_chars=self.system_prompt_chars)
+
     def print_statistics(self, mappings: list[ProcessingMethodMapping]) -> None:
         """Print statistics about the mappings."""
         common_counts = {}
@@ -615,8 +641,9 @@ class ProcessCategorizer:
                 for common, originals in list(unresolved.items())[:5]:
                     console.print(f"  '{common}': {originals[:3]}...")
 
-        # Save mappings
+        # Save mappings, then drop the batch checkpoints they were built from
         self.save_mappings(all_mappings)
+        self._runner().clear(methods_to_process, 50)
 
         # Print statistics
         self.print_statistics(all_mappings)
@@ -24,6 +24,8 @@ import logfire
 from pydantic import BaseModel, Field, model_validator
 from pydantic_ai import Agent
 
+from kissaten.ai.batch_runner import DEFAULT_CHECKPOINT_DIR, BatchEstimate, BatchRunner
+
 # Load environment variables from .env file
 dotenv.load_dotenv()
 
@@ -101,10 +103,19 @@ class NonFlavourCheckBatch(BaseModel):
 class TastingNoteCategorizer:
     """Categorizes tasting notes and suggests lexicon updates using Gemini."""
 
-    def __init__(self, database_path: Path, taste_lexicon_path: Path, categorized_csv_path: Path):
+    def __init__(
+        self,
+        database_path: Path,
+        taste_lexicon_path: Path,
+        categorized_csv_path: Path,
+        concurrency: int = 4,
+        checkpoint_dir: Path | None = DEFAULT_CHECKPOINT_DIR,
+    ):
         self.database_path = database_path
         self.taste_lexicon_path = taste_lexicon_path
         self.categorized_csv_path = categorized_csv_path
+        self.concurrency = concurrency
+        self.checkpoint_dir = checkpoint_dir
         self.taste_lexicon_data = self._load_lexicon_data()
         self.taste_lexicon_str = json.dumps(self.taste_lexicon_data, indent=2)
         self.categorization_agent = self._create_categorization_agent()
@@ -197,38 +208,56 @@ class TastingNoteCategorizer:
             "Be consistent and precise in your categorizations. Focus on the dominant flavor characteristic."
         )
 
-    async def categorize_batch(self, tasting_notes: list[str]) -> list[TastingNoteCategory]:
-        """Categorize a batch of tasting notes."""
+    def _runner(self, task: str, result_model: type[BaseModel] | None = None) -> BatchRunner:
+        return BatchRunner(
+            task,
+            checkpoint_dir=self.checkpoint_dir,
+            concurrency=self.concurrency,
+            result_model=result_model,
+        )
+
+    @staticmethod
+    def _fallback_categories(tasting_notes: list[str]) -> list[TastingNoteCategory]:
+        return [
+            TastingNoteCategory(
+                tasting_note=note,
+                primary_category="Other",
+                secondary_category=None,
+                tertiary_category=None,
+                confidence=0.1,
+            )
+            for note in tasting_notes
+        ]
+
+    async def _categorize_batch_or_raise(self, tasting_notes: list[str]) -> list[TastingNoteCategory]:
         notes_text = "\n".join(tasting_notes)
         prompt = f"Categorize these {len(tasting_notes)} coffee tasting notes:\n\n{notes_text}\n\nReturn a categorization for each tasting note in order."
+        result = await self.categorization_agent.run(prompt)
+        return result.output.categorizations
+
+    async def categorize_batch(self, tasting_notes: list[str]) -> list[TastingNoteCategory]:
+        """Categorize a batch of tasting notes."""
         try:
-            result = await self.categorization_agent.run(prompt)
-            return result.output.categorizations
+            return await self._categorize_batch_or_raise(tasting_notes)
         except Exception as e:
             logger.error(f"Error categorizing batch (likely a validation error): {e}")
-            return [
-                TastingNoteCategory(
-                    tasting_note=note,
-                    primary_category="Other",
-                    secondary_category=None,
-                    tertiary_category=None,
-                    confidence=0.1,
-                )
-                for note in tasting_notes
-            ]
+            return self._fallback_categories(tasting_notes)
 
-    async def get_canonical_names_batch(self, tasting_notes: list[str], secondary_category: str) -> list[str | None]:
-        """Get canonical names for a batch of tasting notes, providing context of the parent category."""
+    async def _canonical_names_or_raise(self, tasting_notes: list[str], secondary_category: str) -> list[str | None]:
         notes_text = "\n".join(tasting_notes)
         prompt = f"""The parent secondary category is: '{secondary_category}'.
 
 Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
 
 {notes_text}"""
+        result = await self.naming_agent.run(prompt)
+        name_map = {item.original_note: item.canonical_name for item in result.output.names}
+        return [name_map.get(note) for note in tasting_notes]
+
+    async def get_canonical_names_batch(self, tasting_notes: list[str], secondary_category: str) -> list[str | None]:
+        """Get canonical names for a batch of tasting notes, providing context of the parent category."""
         try:
-            result = await self.naming_agent.run(prompt)
-            name_map = {item.original_note: item.canonical_name for item in result.output.names}
-            return [name_map.get(note) for note in tasting_notes]
+            return await self._canonical_names_or_raise(tasting_notes, secondary_category)
         except Exception as e:
             logger.error(f"Error getting canonical names: {e}")
             return [None for _ in tasting_notes]
@@ -261,15 +290,17 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
             grouped_notes[(primary, secondary)].append(note)
 
         new_additions = collections.defaultdict(list)
+        runner = self._runner("lexicon_canonical_names")
 
         for (primary, secondary), notes in grouped_notes.items():
             logger.info(f"Analyzing {len(notes)} notes for {primary} -> {secondary}...")
-            canonical_names = []
-            for i in range(0, len(notes), batch_size):
-                batch = notes[i : i + batch_size]
-                names = await self.get_canonical_names_batch(batch, secondary_category=secondary)
-                canonical_names.extend(names)
-                await asyncio.sleep(1)
+            canonical_names = await runner.run(
+                notes,
+                batch_size,
+                lambda batch, secondary=secondary: self._canonical_names_or_raise(batch, secondary),
+                on_error=lambda batch, _e: [None for _ in batch],
+                context=f"{primary}/{secondary}",
+            )
 
             valid_names = [name.strip().title() for name in canonical_names if name and name.strip()]
             if not valid_names:
@@ -306,6 +337,8 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
                     break
 
         self._save_lexicon(output_lexicon_path)
+        for (primary, secondary), notes in grouped_notes.items():
+            runner.clear(notes, batch_size, context=f"{primary}/{secondary}")
 
     def _save_lexicon(self, output_path: Path | None):
         if output_path is None:
@@ -390,21 +423,24 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
         logger.info(f"Removed {len(stale_notes)} stale notes. {len(all_categorizations)} notes remain.")
         return len(stale_notes)
 
-    async def check_non_flavours_batch(self, tasting_notes: list[str]) -> list[NonFlavourCheck]:
-        """Check a batch of 'Other' notes to determine if they are genuine flavours."""
+    async def _check_non_flavours_or_raise(self, tasting_notes: list[str]) -> list[NonFlavourCheck]:
         notes_text = "\n".join(tasting_notes)
         prompt = (
             f"Check these {len(tasting_notes)} tasting notes and classify each as a genuine flavour "
             f"or a non-flavour:\n\n{notes_text}"
         )
+        result = await self.non_flavour_check_agent.run(prompt)
+        check_map = {c.tasting_note: c for c in result.output.checks}
+        # Default to is_flavour=True for any notes the model missed
+        return [
+            check_map.get(note, NonFlavourCheck(tasting_note=note, is_flavour=True, reason=None))
+            for note in tasting_notes
+        ]
+
+    async def check_non_flavours_batch(self, tasting_notes: list[str]) -> list[NonFlavourCheck]:
+        """Check a batch of 'Other' notes to determine if they are genuine flavours."""
         try:
-            result = await self.non_flavour_check_agent.run(prompt)
-            check_map = {c.tasting_note: c for c in result.output.checks}
-            # Default to is_flavour=True for any notes the model missed
-            return [
-                check_map.get(note, NonFlavourCheck(tasting_note=note, is_flavour=True, reason=None))
-                for note in tasting_notes
-            ]
+            return await self._check_non_flavours_or_raise(tasting_notes)
         except Exception as e:
             logger.error(f"Error checking non-flavours: {e}")
             return [NonFlavourCheck(tasting_note=note, is_flavour=True, reason=None) for note in tasting_notes]
@@ -434,16 +470,21 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
         flavour_notes: list[str] = []
         non_flavour_notes: list[str] = []
 
-        for i in range(0, len(other_notes), batch_size):
-            batch = other_notes[i : i + batch_size]
-            checks = await self.check_non_flavours_batch(batch)
-            for check in checks:
-                if check.is_flavour:
-                    flavour_notes.append(check.tasting_note)
-                else:
-                    non_flavour_notes.append(check.tasting_note)
-                    logger.info(f"  Non-flavour detected: '{check.tasting_note}' — {check.reason}")
-            await asyncio.sleep(1)
+        check_runner = self._runner("non_flavour_checks", NonFlavourCheck)
+        checks = await check_runner.run(
+            other_notes,
+            batch_size,
+            self._check_non_flavours_or_raise,
+            on_error=lambda batch, _e: [
+                NonFlavourCheck(tasting_note=note, is_flavour=True, reason=None) for note in batch
+            ],
+        )
+        for check in checks:
+            if check.is_flavour:
+                flavour_notes.append(check.tasting_note)
+            else:
+                non_flavour_notes.append(check.tasting_note)
+                logger.info(f"  Non-flavour detected: '{check.tasting_note}' — {check.reason}")
 
         logger.info(
             f"  {len(flavour_notes)} genuine flavours to re-categorize, "
@@ -460,24 +501,27 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
                 confidence=0.0,
             )
 
-        # Step 3: Re-categorize genuine flavours through the main categorization agent
+        # Step 3: Re-categorize genuine flavours through the main categorization agent.
+        # Batches that fail every retry keep their existing 'Other' categorization.
+        recategorize_runner = self._runner("recategorize_other", TastingNoteCategory)
         if flavour_notes:
             logger.info(f"Re-categorizing {len(flavour_notes)} genuine flavour notes...")
-            for i in range(0, len(flavour_notes), batch_size):
-                batch = flavour_notes[i : i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(flavour_notes) + batch_size - 1) // batch_size
-                logger.info(f"Re-categorizing batch {batch_num}/{total_batches} ({len(batch)} notes)")
-                try:
-                    batch_results = await self.categorize_batch(batch)
-                    for cat in batch_results:
-                        existing_categorizations[cat.tasting_note] = cat
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    logger.error(f"Error re-categorizing batch {batch_num}: {e}")
+            total_batches = (len(flavour_notes) + batch_size - 1) // batch_size
+            batch_results = await recategorize_runner.run(
+                flavour_notes,
+                batch_size,
+                self._categorize_batch_or_raise,
+                on_batch_done=lambda index, _results: logger.info(
+                    f"Re-categorized batch {index + 1}/{total_batches}"
+                ),
+            )
+            for cat in batch_results:
+                existing_categorizations[cat.tasting_note] = cat
 
         all_categorizations = sorted(list(existing_categorizations.values()), key=lambda x: x.tasting_note)
         self._save_to_csv(all_categorizations)
+        check_runner.clear(other_notes, batch_size)
+        recategorize_runner.clear(flavour_notes, batch_size)
         logger.info(
             f"'Other' cleanup complete: {len(non_flavour_notes)} marked as non-flavour, "
             f"{len(flavour_notes)} re-categorized."
@@ -494,29 +538,41 @@ Extract the canonical flavor name for each of these {len(tasting_notes)} notes:
 
         self.categorized_csv_path.parent.mkdir(parents=True, exist_ok=True)
 
+        runner = self._runner("tasting_notes", TastingNoteCategory)
         if notes_to_process:
-            for i in range(0, len(notes_to_process), batch_size):
-                batch = notes_to_process[i : i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(notes_to_process) + batch_size - 1) // batch_size
-                logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} notes)")
-                try:
-                    batch_results = await self.categorize_batch(batch)
-                    # Check if each tasting note is present in the database first
-                    batch_results = [cat for cat in batch_results if cat.tasting_note in notes_to_process]
-                    # Update the main dictionary with new/updated results
-                    for cat in batch_results:
-                        existing_categorizations[cat.tasting_note] = cat
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    logger.error(f"Error processing batch {batch_num}: {e}")
+            total_batches = (len(notes_to_process) + batch_size - 1) // batch_size
+            batch_results = await runner.run(
+                notes_to_process,
+                batch_size,
+                self._categorize_batch_or_raise,
+                on_error=lambda batch, _e: self._fallback_categories(batch),
+                on_batch_done=lambda index, _results: logger.info(f"Processed batch {index + 1}/{total_batches}"),
+            )
+            # Only keep categorizations for notes we asked about (drop hallucinated ones)
+            wanted = set(notes_to_process)
+            for cat in batch_results:
+                if cat.tasting_note in wanted:
+                    existing_categorizations[cat.tasting_note] = cat
+            stats = runner.stats
+            logger.info(
+                f"Categorized {stats.batches} batches in {stats.elapsed_seconds:.1f}s "
+                f"({stats.resumed} resumed from checkpoints, {stats.failed} failed, {stats.retries} retries)"
+            )
         else:
             logger.info("No new or updatable notes to process.")
 
         all_categorizations = sorted(list(existing_categorizations.values()), key=lambda x: x.tasting_note)
         self._save_to_csv(all_categorizations)
+        runner.clear(notes_to_process, batch_size)
         logger.info(f"Saved {len(all_categorizations)} total categorizations to {self.categorized_csv_path}")
 
+    def estimate_categorization(self, batch_size: int = 50, update_tertiary: bool = False) -> BatchEstimate:
+        """Dry-run estimate for ``categorize_all_notes`` (no model calls)."""
+        notes_to_process = self.get_notes_to_process(update_tertiary)
+        return self._runner("tasting_notes", TastingNoteCategory).estimate(
+            notes_to_process, batch_size, prompt_overhead_chars=len(self._build_system_prompt())
+        )
+
     def _save_to_csv(self, categorizations: list[TastingNoteCategory]):
         """Save categorizations to CSV file."""
         with open(self.categorized_csv_path, "w", newline="", encoding="utf-8") as csvfile:
@@ -22,6 +22,8 @@ from rich.console import Console
 from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.table import Table
 
+from kissaten.ai.batch_runner import DEFAULT_CHECKPOINT_DIR, BatchEstimate, BatchRunner
+
 # Typer CLI
 app = typer.Typer()
 
@@ -114,9 +116,17 @@ class ConflictResolution(BaseModel):
 
 
 class VarietalCategorizer:
-    def __init__(self, database_path: Path, mappings_file: Path | None = None):
+    def __init__(
+        self,
+        database_path: Path,
+        mappings_file: Path | None = None,
+        concurrency: int = 4,
+        checkpoint_dir: Path | None = DEFAULT_CHECKPOINT_DIR,
+    ):
         self.database_path = database_path
         self.mappings_file = mappings_file or Path(__file__).parent.parent / "database/varietal_mappings.json"
+        self.concurrency = concurrency
+        self.checkpoint_dir = checkpoint_dir
         self.varietals_reference = self._load_varietals_reference()
         self.agent = self._create_agent()
         self.merge_agent = self._create_merge_agent()
@@ -191,6 +201,8 @@ RULES:
 
 Return structured mappings."""
 
+        # Sent with every batch; used for dry-run token estimates
+        self.system_prompt_chars = len(system_prompt)
         return Agent(
             "gemini-3.5-flash",
             system_prompt=system_prompt,
@@ -570,24 +582,13 @@ Provide a clear reason based on coffee botany."""
 
         all_mappings = list(existing_mappings.values())
         total_batches = (len(new_varietals) + batch_size - 1) // batch_size
+        runner = self._runner()
 
-        with Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            TimeElapsedColumn(),
-            TimeRemainingColumn(),
-        ) as progress:
-            task = progress.add_task("[cyan]Categorizing varietals...", total=total_batches)
-
-            for i in range(0, len(new_varietals), batch_size):
-                batch = new_varietals[i : i + batch_size]
-                batch_index = i // batch_size
+        async def categorize_batch(batch: list[str]) -> list[VarietalMapping]:
+            # Create context for the agent - use simple list without numbers
+            varietal_list = "\n".join([f"- {v}" for v in batch])
 
-                # Create context for the agent - use simple list without numbers
-                varietal_list = "\n".join([f"- {v}" for v in batch])
-
-                prompt = f"""Analyze and categorize these {len(batch)} coffee varietal names (batch {batch_index + 1}/{total_batches}):
+            prompt = f"""Analyze and categorize these {len(batch)} coffee varietal names:
 
 {varietal_list}
 
@@ -602,45 +603,69 @@ IMPORTANT: The separator field must ONLY contain punctuation (like " & ", " + ",
 
 Return structured mappings."""
 
-                try:
-                    result = await self.agent.run(prompt)
-                    batch_mappings = result.output.mappings
+            result = await self.agent.run(prompt)
+            batch_mappings = result.output.mappings
 
-                    # validation: Ensure we got the same number of mappings back
-                    # (Helpful debug if the LLM hallucinated extra items)
-                    if len(batch_mappings) != len(batch):
-                        console.print(
-                            f"[yellow]Warning: Batch {batch_index} size mismatch. Input: {len(batch)}, Output: {len(batch_mappings)}[/yellow]"
-                        )
+            # validation: Ensure we got the same number of mappings back
+            # (Helpful debug if the LLM hallucinated extra items)
+            if len(batch_mappings) != len(batch):
+                console.print(
+                    f"[yellow]Warning: Batch size mismatch. Input: {len(batch)}, Output: {len(batch_mappings)}[/yellow]"
+                )
 
-                    all_mappings.extend(batch_mappings)
+            # Log some examples from this batch
+            for mapping in batch_mappings[:3]:  # Show first 3
+                compound_marker = " (compound)" if mapping.is_compound else ""
+                console.print(f"  '{mapping.original_name}' → {mapping.canonical_names}{compound_marker}")
 
-                    # Log some examples from this batch
-                    for mapping in batch_mappings[:3]:  # Show first 3
-                        compound_marker = " (compound)" if mapping.is_compound else ""
-                        console.print(f"  '{mapping.original_name}' → {mapping.canonical_names}{compound_marker}")
+            return batch_mappings
 
-                except Exception as e:
-                    console.print(f"[bold red]Error processing batch {batch_index + 1}: {e}[/bold red]")
+        def fallback(batch: list[str], e: Exception) -> list[VarietalMapping]:
+            console.print(f"[bold red]Error processing batch: {e}[/bold red]")
 
-                    # If using pydantic-ai/logfire, the detailed validation error might be in e.cause or e.errors()
-                    if hasattr(e, "errors"):
-                        console.print(f"[red]Validation errors: {e.__cause__}[/red]")
+            # If using pydantic-ai/logfire, the detailed validation error might be in e.cause or e.errors()
+            if hasattr(e, "errors"):
+                console.print(f"[red]Validation errors: {e.__cause__}[/red]")
 
-                    console.print(f"[red]Failed Items in this batch: {batch}[/red]")
+            console.print(f"[red]Failed Items in this batch: {batch}[/red]")
 
-                    # Create fallback mappings for this batch so processing continues
-                    for varietal in batch:
-                        all_mappings.append(
-                            VarietalMapping(
-                                original_name=varietal, canonical_names=[varietal], confidence=0.5, is_compound=False
-                            )
-                        )
+            # Create fallback mappings for this batch so processing continues
+            return [
+                VarietalMapping(original_name=varietal, canonical_names=[varietal], confidence=0.5, is_compound=False)
+                for varietal in batch
+            ]
 
-                progress.update(task, advance=1)
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+        ) as progress:
+            task = progress.add_task("[cyan]Categorizing varietals...", total=total_batches)
+            all_mappings.extend(
+                await runner.run(
+                    new_varietals,
+                    batch_size,
+                    categorize_batch,
+                    on_error=fallback,
+                    on_batch_done=lambda _index, _results: progress.update(task, advance=1),
+                )
+            )
+
+        if runner.stats.resumed:
+            console.print(f"[cyan]Resumed {runner.stats.resumed}/{total_batches} batches from checkpoints[/cyan]")
 
         return all_mappings
 
+    def _runner(self) -> BatchRunner:
+        return BatchRunner(
+            "varietals",
+            checkpoint_dir=self.checkpoint_dir,
+            concurrency=self.concurrency,
+            result_model=VarietalMapping,
+        )
+
     def print_statistics(self, mappings: list[VarietalMapping]) -> None:
         """Print statistics about the mappings."""
         total = len(mappings)
@@ -680,6 +705,16 @@ Return structured mappings."""
                     f"  '{mapping.original_name}' → {mapping.canonical_names} (separator: '{mapping.separator}')"
                 )
 
+    def estimate_categorization(self, min_confidence_threshold: float = 0.6) -> BatchEstimate:
+        """Dry-run estimate for ``categorize_all_varietals`` (no model calls)."""
+        existing_mappings = self.load_existing_mappings()
+        new_varietals = [
+            v
+            for v in self.get_unique_varietal_names()
+            if v not in existing_mappings or existing_mappings[v].confidence < min_confidence_threshold
+        ]
+        return self._runner().estimate(new_varietals, 20, prompt_overhead_chars=self.system_prompt_chars)
+
     async def categorize_all_varietals(self, min_confidence_threshold: float = 0.6) -> Path:
         """Main method to categorize all varietals."""
         console.print("[bold cyan]Starting Varietal Categorization[/bold cyan]\n")
@@ -715,8 +750,9 @@ Return structured mappings."""
             existing_mappings=valid_mappings,
         )
 
-        # Save mappings
+        # Save mappings, then drop the batch checkpoints they were built from
         self.save_mappings(mappings)
+        self._runner().clear([v for v in varietals if v not in valid_mappings], 20)
 
         # Detect and resolve conflicts
         conflicts = self.detect_conflicts(mappings)
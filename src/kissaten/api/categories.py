@@ -0,0 +1,185 @@
+"""
+Processing-method and varietal category matchers.
+
+The category rules are ordered keyword lists: the first rule with a keyword
+that occurs anywhere in the (lower-cased) input wins. Rather than running a
+chain of ``any(keyword in s ...)`` checks per rule, each rule table is compiled
+once into a single regex of zero-width lookaheads, one named group per rule in
+priority order. A ``finditer`` pass visits every start position exactly once
+and, at each position, the alternation picks the highest-priority rule that
+matches there; the minimum rule index over all positions is therefore exactly
+the rule the sequential chain would have picked.
+
+The same functions are registered as DuckDB UDFs so ``kissaten refresh`` can
+persist ``origins.process_category`` / ``origins.varietal_category`` and the
+API can group in SQL instead of categorising rows in Python.
+"""
+
+import re
+from functools import lru_cache
+
+# (category, literal keywords, extra regex patterns) in priority order.
+# Categories may appear more than once (e.g. generic fermentation keywords
+# only count as "advanced_technical" after the base processes have missed).
+PROCESS_CATEGORY_RULES: list[tuple[str, list[str], list[str]]] = [
+    # 1. Additive / Infused / Co-Fermented (Check early for transparency)
+    (
+        "infused_cofermented",
+        [
+            "co-ferment",
+            "infused",
+            "infusion",
+            "cinnamon",
+            "ginger",
+            "passion fruit",
+            "passionfruit",
+            "strawberry",
+            "peach",
+            "mango",
+            "pineapple",
+            "coconut",
+            "grapefruit",
+            "raspberry",
+            "lychee",
+            "watermelon",
+            "lavender",
+            "jasmine",
+            "rose",
+            "kumquat",
+            "osmanthus",
+            "acai",
+        ],
+        [],
+    ),
+    # 2. Barrel Aged
+    ("barrel_aged", ["barrel"], []),
+    # 3. Decaf processes (Check before others as it's a primary attribute)
+    ("decaf", ["decaf", "ethyl acetate", "swiss water", "sugarcane"], []),
+    # 4. Anaerobic & Carbonic Maceration
+    ("anaerobic_carbonic", ["anaerobic", "anaerobes", "anaerobico", "carbonic", "maceration", "anoxic"], []),
+    # 5. Advanced Technical (Thermal Shock, Koji, Lactic, Yeast, Nitrogen)
+    (
+        "advanced_technical",
+        ["thermal shock", "koji", "lactic", "yeast", "culturing", "bacteria", "nitrogen", "nitro"],
+        [],
+    ),
+    # 6. Honey processes
+    ("honey", ["honey"], []),
+    # 7. Washed processes
+    ("washed", ["washed", "lavado", "washing"], []),
+    # 8. Natural processes
+    ("natural", ["natural", "dry", "sun-dried", "sun dried", "winey"], []),
+    # 9. Wet Hulled (Giling Basah)
+    ("wet_hulled", ["giling basah", "wet hulled", "wet-hulled"], []),
+    # 10. Fermentation (generic standalone fermentation, after base processes)
+    ("advanced_technical", ["ferment", "inocul", "bioreactor", "mosto"], []),
+    # 11. Experimental/Generic special processes
+    ("experimental", ["experimental"], []),
+]
+
+VARIETAL_CATEGORY_RULES: list[tuple[str, list[str], list[str]]] = [
+    # Typica family
+    ("typica", ["typica", "kona", "jamaica blue mountain", "mocha", "kent"], []),
+    # Heirloom varieties
+    (
+        "heirloom",
+        [
+            "heirloom",
+            "landrace",
+            "native",
+            "wild",
+            "forest",
+            "pink bourbon",
+            "bourbon ají",
+            "wush wush",
+            "chiroso",
+        ],
+        [],
+    ),
+    # Bourbon family
+    (
+        "bourbon",
+        ["bourbon", "santos", "mundo novo", "caturra", "catuai", "pacas", "villa sarchi", "tekisic"],
+        [],
+    ),
+    # Geisha/Gesha varieties
+    ("geisha", ["geisha", "gesha"], []),
+    # SL varieties (SL28, SL34, etc.)
+    ("sl_varieties", ["sl ", "sl28", "sl34", "scott labs"], [r"sl\d+"]),
+    # Hybrid varieties
+    (
+        "hybrid",
+        [
+            "hybrid",
+            "f1",
+            "ruiru",
+            "batian",
+            "castillo",
+            "colombia",
+            "tabi",
+            "catimor",
+            "sarchimor",
+            "sidra",
+            "marsellesa",
+            "parainema",
+            "centroamericano",
+            "obata",
+            "icatu",
+            "starmaya",
+            "ihcafe",
+        ],
+        [],
+    ),
+    # Pacamara and large bean varieties
+    ("large_bean", ["pacamara", "maragogype", "maragogipe", "elephant bean"], []),
+    # Other Arabica varieties
+    ("arabica_other", ["red catuai", "yellow catuai"], []),
+]
+
+
+class CategoryMatcher:
+    """Single-pass, priority-ordered keyword matcher for a category rule table."""
+
+    def __init__(self, rules: list[tuple[str, list[str], list[str]]], default: str = "other"):
+        self.default = default
+        self._categories = [category for category, _, _ in rules]
+        groups = []
+        for index, (_, keywords, patterns) in enumerate(rules):
+            # Longest keywords first so the group itself never needs to
+            # backtrack between overlapping alternatives.
+            alternatives = [re.escape(k) for k in sorted(keywords, key=len, reverse=True)] + patterns
+            groups.append(f"(?P<r{index}>{'|'.join(alternatives)})")
+        self._pattern = re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+    def rule_index(self, value: str) -> int | None:
+        """Index of the highest-priority rule matching ``value``, or None."""
+        best: int | None = None
+        for match in self._pattern.finditer(value.lower()):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def categorize(self, value: str | None) -> str:
+        if not value:
+            return self.default
+        index = self.rule_index(value)
+        return self.default if index is None else self._categories[index]
+
+
+_process_matcher = CategoryMatcher(PROCESS_CATEGORY_RULES)
+_varietal_matcher = CategoryMatcher(VARIETAL_CATEGORY_RULES)
+
+
+@lru_cache(maxsize=8192)
+def categorize_process(process: str) -> str:
+    """Categorize a process into major process groups."""
+    return _process_matcher.categorize(process)
+
+
+@lru_cache(maxsize=8192)
+def categorize_varietal(varietal: str) -> str:
+    """Categorize a varietal into major varietal groups."""
+    return _varietal_matcher.categorize(varietal)
@@ -11,6 +11,17 @@ from typing import Any
 import duckdb
 from rich.console import Console
 
+from kissaten.api.categories import categorize_process, categorize_varietal
+from kissaten.api.geography_rollups import build_geography_rollups
+from kissaten.api.origin_suggestions import build_origin_suggestions
+from kissaten.api.parquet_store import (
+    RAW_JSON_COLUMNS_CLAUSE,
+    plan_sources,
+    raw_source_sql,
+    register_wanted_files,
+)
+from kissaten.api.recommender import build_recommendation_index
+from kissaten.api.tasting_note_search import build_tasting_note_index
 from kissaten.scrapers import get_registry
 
 # Initialize Rich console for formatted output
@@ -201,6 +212,22 @@ def load_region_mappings():
             logger.error(f"Error loading region mappings for {country_code}: {e}")
 
 
+def load_bean_image_urls(images_dir: Path) -> dict[str, str]:
+    """Map bean paths to their content-addressed image URL from the image store manifests."""
+    urls = {}
+    for manifest_file in sorted((images_dir / "manifests").glob("*.json")):
+        try:
+            with open(manifest_file, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading image manifest {manifest_file}: {e}")
+            continue
+        for bean_path, entry in manifest.get("beans", {}).items():
+            if entry.get("original"):
+                urls[bean_path] = entry["original"]
+    return urls
+
+
 def load_farm_mappings():
     """Load farm name mappings from JSON file."""
     global _farm_mappings
@@ -419,6 +446,8 @@ def _register_udfs() -> None:
         ("normalize_region_name",  normalize_region_name,  [str],           str, {}),
         ("normalize_process_name", normalize_process_name, [str],           str, {}),
         ("normalize_varietal_name",normalize_varietal_name,[str],           str, {}),
+        ("categorize_process",     categorize_process,     [str],           str, {}),
+        ("categorize_varietal",    categorize_varietal,    [str],           str, {}),
     ]
     for name, func, params, ret, kwargs in _udfs:
         try:
@@ -460,6 +489,9 @@ def _api_mode_schema_warnings() -> None:
                 "country_codes", "roaster_location_codes",
                 "tasting_notes_categories", "processed_files",
                 "currency_rates", "varietal_mappings", "coffee_varietals",
+                "tasting_note_index", "tasting_note_postings",
+                "country_rollups", "region_rollups", "farm_rollups", "origin_suggestions",
+                "recommendation_beans", "recommendation_features", "recommendation_neighbours",
             },
             "roasters_columns": {"description"},
             "origins_columns": {
@@ -468,6 +500,7 @@ def _api_mode_schema_warnings() -> None:
                 "region_normalized", "farm_normalized",
                 "state_canonical", "state_canonical_slug",
                 "farm_canonical", "process_slug", "process_common_slug",
+                "process_category", "varietal_category",
             },
         }
         rows = conn.execute(
@@ -606,6 +639,30 @@ def ensure_roasters_description_column():
         logger.error(f"Error ensuring roasters description column: {e}")
 
 
+def refresh_origin_categories(only_missing: bool = False):
+    """Recompute ``origins.process_category`` and ``origins.varietal_category``.
+
+    Categories are derived from ``process_common_name`` and each entry of
+    ``variety_canonical``, so this must run after those columns are final.
+    Persisting them lets the API group by category in SQL rather than
+    categorising every row in Python on each request.
+
+    Args:
+        only_missing: If True, only fill rows whose categories are still NULL
+                      (newly inserted origins in incremental mode).
+    """
+    where_clause = "WHERE process_category IS NULL OR varietal_category IS NULL" if only_missing else ""
+    conn.execute(f"""
+        UPDATE origins
+        SET process_category = categorize_process(COALESCE(process_common_name, '')),
+            varietal_category = list_transform(
+                COALESCE(variety_canonical, CAST([] AS VARCHAR[])),
+                x -> categorize_varietal(x)
+            )
+        {where_clause}
+    """)
+
+
 def ensure_indexing_columns():
     """Ensure indexing columns (slugs) exist in the origins table."""
     if not _use_rw_db:
@@ -616,7 +673,8 @@ def ensure_indexing_columns():
                 "WHERE table_name = 'origins' AND table_schema = 'main'"
             ).fetchall()}
             missing = {"process_slug", "process_common_slug",
-                       "variety_canonical_slugs", "state_canonical_slug"} - cols
+                       "variety_canonical_slugs", "state_canonical_slug",
+                       "process_category", "varietal_category"} - cols
             if missing:
                 logger.warning(
                     "Production DB origins is missing indexing columns %s; "
@@ -662,6 +720,14 @@ def ensure_indexing_columns():
                 " WHERE state_canonical IS NOT NULL AND state_canonical_slug IS NULL"
             )
 
+        if "process_category" not in columns or "varietal_category" not in columns:
+            print("Adding process_category/varietal_category columns to origins table...")
+            if "process_category" not in columns:
+                conn.execute("ALTER TABLE origins ADD COLUMN process_category VARCHAR")
+            if "varietal_category" not in columns:
+                conn.execute("ALTER TABLE origins ADD COLUMN varietal_category VARCHAR[]")
+            refresh_origin_categories()
+
         # Ensure indexes exist
         conn.execute("CREATE INDEX IF NOT EXISTS idx_origins_state_canonical_slug ON origins(state_canonical_slug)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_origins_process_slug ON origins(process_slug)")
@@ -849,6 +915,15 @@ async def init_database(incremental: bool = False, check_for_changes: bool = Fal
         # Clear existing data - only in full refresh mode
         # Drop FTS as it depends on the table
         conn.execute("DROP TABLE IF EXISTS coffee_beans_fts_source")
+        conn.execute("DROP TABLE IF EXISTS tasting_note_postings")
+        conn.execute("DROP TABLE IF EXISTS tasting_note_index")
+        conn.execute("DROP TABLE IF EXISTS country_rollups")
+        conn.execute("DROP TABLE IF EXISTS region_rollups")
+        conn.execute("DROP TABLE IF EXISTS farm_rollups")
+        conn.execute("DROP TABLE IF EXISTS origin_suggestions")
+        conn.execute("DROP TABLE IF EXISTS recommendation_beans")
+        conn.execute("DROP TABLE IF EXISTS recommendation_features")
+        conn.execute("DROP TABLE IF EXISTS recommendation_neighbours")
         # Drop views first, as they depend on tables
         conn.execute("DROP VIEW IF EXISTS coffee_beans_with_categorized_notes")
         conn.execute("DROP VIEW IF EXISTS coffee_beans_with_origin")
@@ -956,6 +1031,8 @@ async def init_database(incremental: bool = False, check_for_changes: bool = Fal
             farm_unaccented VARCHAR,
             state_canonical_unaccented VARCHAR,
             state_canonical_slug VARCHAR,
+            process_category VARCHAR,  -- categorize_process(process_common_name)
+            varietal_category VARCHAR[],  -- categorize_varietal() per entry of variety_canonical
             FOREIGN KEY (bean_id) REFERENCES coffee_beans (id)
         )
     """)
@@ -1021,6 +1098,18 @@ async def init_database(incremental: bool = False, check_for_changes: bool = Fal
     except Exception:
         pass
 
+    try:
+        conn.execute("ALTER TABLE origins ADD COLUMN process_category VARCHAR")
+        print("Added process_category column to existing origins table")
+    except Exception:
+        pass
+
+    try:
+        conn.execute("ALTER TABLE origins ADD COLUMN varietal_category VARCHAR[]")
+        print("Added varietal_category column to existing origins table")
+    except Exception:
+        pass
+
     # Add indexes for speed
     try:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_origins_process_slug ON origins(process_slug)")
@@ -1200,6 +1289,29 @@ async def init_database(incremental: bool = False, check_for_changes: bool = Fal
     ensure_fts_index()
 
 
+def ensure_tasting_note_index():
+    """Rebuild the normalized tasting-note index used by boolean note search."""
+    build_tasting_note_index(conn)
+
+
+def ensure_geography_rollups():
+    """Rebuild the country/region/farm rollups served by the origin detail pages."""
+    build_geography_rollups(conn)
+
+
+def ensure_origin_suggestions():
+    """Rebuild the pre-aggregated country/region/farm suggestions behind origin typeahead."""
+    build_origin_suggestions(conn)
+
+
+def ensure_recommendation_index():
+    """Rebuild the feature vectors and neighbour lists behind bean recommendations.
+
+    Run after ``load_tasting_notes_categories`` so note categories are included.
+    """
+    build_recommendation_index(conn)
+
+
 def ensure_fts_index():
     """Ensure the FTS index exists and is up to date."""
     # Create the FTS source table joining beans with all their origins and roaster info
@@ -1857,33 +1969,16 @@ async def load_coffee_data(data_dir: Path, incremental: bool = False, check_for_
         print(f"Error inserting roasters from registry: {e}")
 
     try:
-        # Define a consistent schema for reading raw JSON files to ensure all fields are projected,
-        # even if certain fields are missing from some JSON files (e.g. roaster field, which is populated later).
-        columns_clause = """columns={
-            'name': 'VARCHAR',
-            'roaster': 'VARCHAR',
-            'url': 'VARCHAR',
-            'is_single_origin': 'BOOLEAN',
-            'price_paid_for_green_coffee': 'DOUBLE',
-            'currency_of_price_paid_for_green_coffee': 'VARCHAR',
-            'roast_level': 'VARCHAR',
-            'roast_profile': 'VARCHAR',
-            'weight': 'VARCHAR',
-            'price': 'VARCHAR',
-            'currency': 'VARCHAR',
-            'is_decaf': 'BOOLEAN',
-            'cupping_score': 'DOUBLE',
-            'is_tasting_kit': 'BOOLEAN',
-            'requires_review': 'BOOLEAN',
-            'tasting_notes': 'VARCHAR[]',
-            'description': 'VARCHAR',
-            'in_stock': 'BOOLEAN',
-            'scraped_at': 'VARCHAR',
-            'scraper_version': 'VARCHAR',
-            'image_url': 'VARCHAR',
-            'origins': 'STRUCT(country VARCHAR, region VARCHAR, producer VARCHAR, farm VARCHAR, elevation_min VARCHAR, elevation_max VARCHAR, latitude VARCHAR, longitude VARCHAR, process VARCHAR, variety VARCHAR, harvest_date VARCHAR)[]',
-            'price_options': 'STRUCT(weight INTEGER, price DOUBLE)[]'
-        }"""
+        # Read compacted Parquet partitions (see ``kissaten compact-data``) for
+        # finished sessions whose JSON hasn't changed, and JSON for the rest.
+        columns_clause = RAW_JSON_COLUMNS_CLAUSE
+        source_plan = plan_sources(data_dir)
+        if source_plan.parquet_files:
+            console.print(
+                f"[cyan]📦 Reading {len(source_plan.compacted_json_files)} beans from "
+                f"{len(source_plan.parquet_files)} compacted partitions, "
+                f"{len(source_plan.json_files)} from uncompacted JSON[/cyan]"
+            )
 
         if incremental:
             from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
@@ -2047,28 +2142,34 @@ async def load_coffee_data(data_dir: Path, incremental: bool = False, check_for_
                 f"(skipping {skipped_count} already processed)[/cyan]"
             )
 
-            # Register raw_coffee_data view pointing only to unprocessed files
-            escaped_paths_list = []
-            for f in unprocessed_json_files:
-                escaped_f = str(f).replace("'", "''")
-                escaped_paths_list.append(f"'{escaped_f}'")
-            escaped_paths = ", ".join(escaped_paths_list)
+            # Register raw_coffee_data view pointing only to unprocessed files.
+            # Compacted sessions are filtered through a temp table rather than
+            # a literal path list; only the uncompacted tail is read as JSON.
+            register_wanted_files(conn, data_dir, unprocessed_json_files)
+            source_sql = raw_source_sql(data_dir, source_plan, only_files=unprocessed_json_files)
             conn.execute(f"""
                 CREATE OR REPLACE TEMPORARY VIEW raw_coffee_data AS
                 SELECT
-                    json_data.*,
+                    src.*,
                     -- Extract roaster directory name from file path
-                    split_part(filename, '/', -3) as roaster_directory,
+                    split_part(src.filename, '/', -3) as roaster_directory,
                     -- Extract scrape date from file path (e.g., 20250911)
-                    split_part(filename, '/', -2) as scrape_date,
-                    filename
-                FROM read_json([{escaped_paths}],
-                    {columns_clause},
-                    filename=true,
-                    auto_detect=true,
-                    union_by_name=true,
-                    ignore_errors=true
-                ) as json_data
+                    split_part(src.filename, '/', -2) as scrape_date
+                FROM ({source_sql}) src
+            """)
+
+        elif source_plan.parquet_files:
+            # Full refresh over compacted partitions plus the uncompacted tail
+            source_sql = raw_source_sql(data_dir, source_plan)
+            conn.execute(f"""
+                CREATE OR REPLACE TEMPORARY VIEW raw_coffee_data AS
+                SELECT
+                    src.*,
+                    -- Extract roaster directory name from file path
+                    split_part(src.filename, '/', -3) as roaster_directory,
+                    -- Extract scrape date from file path (e.g., 20250911)
+                    split_part(src.filename, '/', -2) as scrape_date
+                FROM ({source_sql}) src
             """)
 
         else:
@@ -2276,6 +2377,20 @@ async def load_coffee_data(data_dir: Path, incremental: bool = False, check_for_
             WHERE name IS NOT NULL AND name != ''
         """)
 
+        # Point beans at their stored original (real format, shared across sessions) where the image store has one
+        bean_image_urls = load_bean_image_urls(data_dir.parent / "images")
+        if bean_image_urls:
+            conn.execute("DROP TABLE IF EXISTS temp_bean_images")
+            conn.execute("CREATE TEMPORARY TABLE temp_bean_images (bean_url_path VARCHAR, image_url VARCHAR)")
+            conn.executemany("INSERT INTO temp_bean_images VALUES (?, ?)", list(bean_image_urls.items()))
+            conn.execute("""
+                UPDATE coffee_beans
+                SET image_url = temp_bean_images.image_url
+                FROM temp_bean_images
+                WHERE coffee_beans.bean_url_path = temp_bean_images.bean_url_path
+                  AND coffee_beans.image_url != ''
+            """)
+
         # Get the maximum existing origin ID for incremental mode
         max_origin_id = 0
         if incremental:
@@ -2577,6 +2692,18 @@ async def load_coffee_data(data_dir: Path, incremental: bool = False, check_for_
             WHERE farm_canonical IS NULL
         """)
 
+        print("Categorizing processes and varietals on origins...")
+        refresh_origin_categories(only_missing=incremental)
+
+        print("Rebuilding tasting note index...")
+        ensure_tasting_note_index()
+
+        print("Rebuilding geography rollups...")
+        ensure_geography_rollups()
+
+        print("Rebuilding origin suggestions...")
+        ensure_origin_suggestions()
+
         # Get counts for logging
         result = conn.execute("SELECT COUNT(*) FROM coffee_beans").fetchone()
         bean_count = result[0] if result else 0
@@ -2606,6 +2733,7 @@ async def load_coffee_data(data_dir: Path, incremental: bool = False, check_for_
         conn.execute("DROP VIEW IF EXISTS all_coffee_beans_with_stock_status")
         conn.execute("DROP VIEW IF EXISTS filtered_coffee_data")
         conn.execute("DROP TABLE IF EXISTS raw_coffee_data_temp")
+        conn.execute("DROP TABLE IF EXISTS _snapshot_wanted_files")
 
     except Exception as e:
         print(f"Error loading coffee data with DuckDB glob: {e}")
@@ -2695,6 +2823,7 @@ async def refresh_canonical_data():
         - farm_normalized + farm_unaccented
         - producer_unaccented
         - process_slug
+        - process_category + varietal_category
         - name_unaccented (coffee_beans)
     """
     # Reload mapping files from disk so UDFs pick up any changes
@@ -2883,6 +3012,19 @@ async def refresh_canonical_data():
             farm_unaccented = strip_accents(farm),
             state_canonical_unaccented = strip_accents(state_canonical)
     """)
+
+    # --- 7. Refresh process/varietal categories ---
+    print("  Refreshing process and varietal categories...")
+    refresh_origin_categories()
+
+    # --- 8. Rebuild geography rollups from the refreshed canonical columns ---
+    print("  Rebuilding geography rollups...")
+    ensure_geography_rollups()
+
+    # --- 9. Rebuild origin typeahead suggestions (names and counts follow the canonical columns) ---
+    print("  Rebuilding origin suggestions...")
+    ensure_origin_suggestions()
+
     # Note: coffee_beans.name_unaccented is NOT refreshed here because:
     # 1. It's derived from coffee_beans.name which doesn't change during a mapping refresh.
     # 2. DuckDB has a limitation that prevents UPDATE on parent tables referenced by FK constraints.
@@ -2917,6 +3059,7 @@ async def main(incremental: bool = False, check_for_changes: bool = False, refre
         _ensure_connection()
         _register_udfs()
         await refresh_canonical_data()
+        ensure_recommendation_index()
         conn.close()
         return
 
@@ -2931,6 +3074,7 @@ async def main(incremental: bool = False, check_for_changes: bool = False, refre
     if refresh_mappings:
         await refresh_canonical_data()
     await load_tasting_notes_categories()
+    ensure_recommendation_index()
     # Only rebuild FTS index if data was actually loaded (not just mappings refresh).
     # The FTS-indexed columns (name, roaster, tasting_notes, countries, regions, etc.)
     # are not affected by canonical/mapping updates, so skip when only refreshing mappings.
@@ -0,0 +1,329 @@
+"""
+Precomputed geography rollups for the country, region and farm detail pages.
+
+``kissaten refresh`` materialises one row per country, region and farm
+(``build_geography_rollups``):
+
+- ``country_rollups`` keyed by ``country_code``
+- ``region_rollups`` keyed by ``(country_code, region_slug)``, where the
+  slug is ``COALESCE(state_canonical_slug, region_normalized)`` or
+  ``unknown-region`` for origins without a region
+- ``farm_rollups`` keyed by ``(country_code, region_slug, farm_slug)``. A farm
+  is reachable through both its canonical slug and its raw
+  ``farm_normalized`` slug (or ``unknown-farm``), matching the old request-time
+  filter.
+
+Each row holds the statistics and top lists the detail endpoints return:
+bean/roaster/farm counts, elevation stats, tasting notes, processes,
+varietals and roasters. The top lists are ``LIST(STRUCT)`` columns whose
+field names match the response models. A detail request is then a keyed
+lookup instead of ~20 sequential aggregate queries over ``origins``.
+"""
+
+from typing import Any
+
+# Elevation midpoint of an origin; NULL unless both ends are known
+_ELEVATION_MIDPOINT = "(NULLIF(elevation_min, 0) + NULLIF(elevation_max, 0)) / 2"
+
+_HAS_ELEVATION = "(elevation_min > 0 OR elevation_max > 0)"
+
+_VARIETY_ITEM = """unnest(CASE
+    WHEN variety_canonical IS NOT NULL AND len(variety_canonical) > 0 THEN variety_canonical
+    ELSE [variety]
+END)"""
+
+_PROCESS_ITEM = "COALESCE(NULLIF(process_common_name, ''), NULLIF(process, ''), 'Unknown')"
+
+
+def _top_list(
+    source: str,
+    keys: list[str],
+    item: str,
+    count: str,
+    struct: str,
+    limit: int | None = None,
+    where: str = "TRUE",
+) -> str:
+    """SQL selecting ``keys`` plus ``items``: the top ``limit`` items per key.
+
+    Items are ranked by ``count`` descending, then by item ascending, and
+    packed into a list of ``struct`` (which may reference ``item`` and ``cnt``).
+    """
+    key_cols = ", ".join(keys)
+    rank_filter = f"FILTER (WHERE rn <= {limit})" if limit else ""
+    return f"""
+        SELECT {key_cols}, list({struct} ORDER BY rn) {rank_filter} AS items
+        FROM (
+            SELECT *, row_number() OVER (PARTITION BY {key_cols} ORDER BY cnt DESC, item ASC) AS rn
+            FROM (
+                SELECT {key_cols}, item, {count} AS cnt
+                FROM (SELECT {key_cols}, bean_id, {item} AS item FROM {source} WHERE {where})
+                WHERE item IS NOT NULL AND item != ''
+                GROUP BY ALL
+            )
+        )
+        GROUP BY ALL
+    """
+
+
+def _standard_lists(
+    source: str, keys: list[str], note_source: str, note_count: str, limits: dict[str, int | None]
+) -> dict[str, str]:
+    """Roaster, tasting note, varietal and process top lists for one level."""
+    return {
+        "top_roasters": _top_list(
+            source, keys, "roaster", "COUNT(DISTINCT bean_id)",
+            "{'roaster_name': item, 'bean_count': cnt}", limits.get("top_roasters"),
+        ),
+        "common_tasting_notes": _top_list(
+            note_source, keys, "unnest(tasting_notes)", note_count,
+            "{'note': item, 'frequency': cnt}", limits.get("common_tasting_notes"),
+        ),
+        "varietals": _top_list(
+            source, keys, _VARIETY_ITEM, "COUNT(DISTINCT bean_id)",
+            "{'variety': item, 'count': cnt}", limits.get("varietals"),
+        ),
+        "processing_methods": _top_list(
+            source, keys, _PROCESS_ITEM, "COUNT(DISTINCT bean_id)",
+            "{'process': item, 'count': cnt}", limits.get("processing_methods"),
+        ),
+    }
+
+
+def _create_rollup(conn, table: str, keys: list[str], stats_sql: str, lists: dict[str, str]) -> None:
+    """CREATE ``table`` from a per-key stats query left-joined to each top list."""
+    select = ["s.*"]
+    joins = []
+    for i, (column, list_sql) in enumerate(lists.items()):
+        alias = f"l{i}"
+        select.append(f"COALESCE({alias}.items, []) AS {column}")
+        on = " AND ".join(f"{alias}.{key} = s.{key}" for key in keys)
+        joins.append(f"LEFT JOIN ({list_sql}) {alias} ON {on}")
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {table} AS
+        SELECT {", ".join(select)}
+        FROM ({stats_sql}) s
+        {" ".join(joins)}
+    """)
+
+
+def build_geography_rollups(conn) -> None:
+    """(Re)build ``country_rollups``, ``region_rollups`` and ``farm_rollups``.
+
+    Requires the canonical origin columns (``state_canonical_slug``,
+    ``farm_canonical``) and the ``normalize_farm_name`` UDF.
+    """
+    conn.execute("""
+        CREATE OR REPLACE TEMPORARY TABLE _geo_origin_rows AS
+        SELECT
+            o.bean_id,
+            o.country AS country_code,
+            CASE WHEN o.region IS NULL OR o.region = '' THEN 'unknown-region'
+                 ELSE COALESCE(o.state_canonical_slug, o.region_normalized)
+            END AS region_slug,
+            o.region, o.region_normalized, o.state_canonical,
+            o.farm, o.farm_canonical, o.farm_normalized, o.producer,
+            o.latitude, o.longitude, o.elevation_min, o.elevation_max,
+            o.process, o.process_common_name, o.variety, o.variety_canonical,
+            cb.roaster, cb.price_usd, cb.tasting_notes
+        FROM origins o
+        JOIN coffee_beans cb ON o.bean_id = cb.id
+        WHERE o.country IS NOT NULL
+    """)
+    # One row per (farm slug, distinct origin) - a named farm is reachable by
+    # both its canonical and its raw normalized slug
+    conn.execute("""
+        CREATE OR REPLACE TEMPORARY TABLE _geo_farm_rows AS
+        SELECT DISTINCT
+            unnest(CASE
+                WHEN farm IS NULL OR farm = '' THEN ['unknown-farm']
+                ELSE list_distinct(list_filter(
+                    [normalize_farm_name(farm_canonical), farm_normalized], s -> s IS NOT NULL
+                ))
+            END) AS farm_slug,
+            bean_id, country_code, region_slug, region, state_canonical,
+            farm, farm_canonical, farm_normalized, producer, latitude, longitude,
+            elevation_min, elevation_max, process, process_common_name, variety, variety_canonical,
+            tasting_notes
+        FROM _geo_origin_rows
+    """)
+
+    try:
+        _build_country_rollups(conn)
+        _build_region_rollups(conn)
+        _build_farm_rollups(conn)
+    finally:
+        conn.execute("DROP TABLE IF EXISTS _geo_farm_rows")
+        conn.execute("DROP TABLE IF EXISTS _geo_origin_rows")
+
+
+def _build_country_rollups(conn) -> None:
+    keys = ["country_code"]
+    stats_sql = f"""
+        SELECT
+            country_code,
+            COUNT(DISTINCT bean_id) AS total_beans,
+            COUNT(DISTINCT roaster) AS total_roasters,
+            COUNT(DISTINCT COALESCE(state_canonical, region)) FILTER (WHERE region IS NOT NULL AND region != '')
+                AS total_regions,
+            COUNT(DISTINCT COALESCE(farm_canonical, farm, 'unknown-farm-' || bean_id::VARCHAR)) AS total_farms,
+            AVG({_ELEVATION_MIDPOINT}) AS avg_elevation,
+            AVG(price_usd) AS avg_price_usd,
+            MIN(NULLIF(elevation_min, 0)) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_min,
+            MAX(NULLIF(elevation_max, 0)) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_max,
+            AVG({_ELEVATION_MIDPOINT}) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_avg
+        FROM _geo_origin_rows
+        GROUP BY country_code
+    """
+    notes_source = "(SELECT DISTINCT country_code, bean_id, tasting_notes FROM _geo_origin_rows)"
+    lists = _standard_lists(
+        "_geo_origin_rows", keys, notes_source, "COUNT(DISTINCT bean_id)",
+        {"top_roasters": 10, "common_tasting_notes": 15, "varietals": 10, "processing_methods": 10},
+    )
+    lists["top_regions"] = """
+        SELECT country_code, list(
+            {'region_name': region_name, 'bean_count': bean_count,
+             'farm_count': farm_count, 'is_geocoded': is_geocoded}
+            ORDER BY bean_count DESC, region_name ASC
+        ) FILTER (WHERE rn <= 10) AS items
+        FROM (
+            SELECT *, row_number() OVER (
+                PARTITION BY country_code ORDER BY bean_count DESC, region_name ASC
+            ) AS rn
+            FROM (
+                SELECT
+                    country_code,
+                    FIRST(region) AS region_name,
+                    COUNT(DISTINCT bean_id) AS bean_count,
+                    COUNT(DISTINCT COALESCE(farm_canonical, farm)) FILTER (WHERE farm IS NOT NULL AND farm != '')
+                        AS farm_count,
+                    BOOL_OR(state_canonical IS NOT NULL) AS is_geocoded
+                FROM _geo_origin_rows
+                WHERE region IS NOT NULL AND region != ''
+                GROUP BY country_code, region_normalized
+            )
+        )
+        GROUP BY country_code
+    """
+    _create_rollup(conn, "country_rollups", keys, stats_sql, lists)
+
+
+def _build_region_rollups(conn) -> None:
+    keys = ["country_code", "region_slug"]
+    # total_farms only counts *named* farms, so it matches the entries in
+    # top_farms excluding the synthetic "Unknown Farm" bucket
+    stats_sql = f"""
+        SELECT
+            country_code,
+            region_slug,
+            CASE WHEN region_slug = 'unknown-region' THEN 'Unknown Region'
+                 ELSE COALESCE(
+                     MODE(state_canonical) FILTER (WHERE state_canonical IS NOT NULL),
+                     MODE(region) FILTER (WHERE region IS NOT NULL AND region != ''),
+                     region_slug
+                 )
+            END AS region_name,
+            COALESCE(BOOL_OR(state_canonical IS NOT NULL), false) AS is_geocoded,
+            COUNT(DISTINCT bean_id) AS total_beans,
+            COUNT(DISTINCT roaster) AS total_roasters,
+            COUNT(DISTINCT CASE WHEN farm IS NOT NULL AND farm != ''
+                THEN COALESCE(farm_canonical, farm_normalized) END) AS total_farms,
+            AVG({_ELEVATION_MIDPOINT}) AS avg_elevation,
+            AVG(price_usd) AS avg_price_usd,
+            MIN(NULLIF(elevation_min, 0)) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_min,
+            MAX(NULLIF(elevation_max, 0)) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_max,
+            AVG({_ELEVATION_MIDPOINT}) FILTER (WHERE {_HAS_ELEVATION}) AS elevation_avg,
+            COUNT(DISTINCT bean_id) FILTER (WHERE farm IS NULL OR farm = '') AS unknown_farm_bean_count,
+            AVG({_ELEVATION_MIDPOINT}) FILTER (WHERE farm IS NULL OR farm = '') AS unknown_farm_avg_elevation
+        FROM _geo_origin_rows
+        GROUP BY country_code, region_slug
+    """
+    notes_source = "(SELECT DISTINCT country_code, region_slug, bean_id, tasting_notes FROM _geo_origin_rows)"
+    lists = _standard_lists(
+        "_geo_origin_rows", keys, notes_source, "COUNT(DISTINCT bean_id)",
+        {"top_roasters": 10, "common_tasting_notes": 15, "varietals": 10, "processing_methods": 10},
+    )
+    lists["top_farms"] = f"""
+        SELECT country_code, region_slug, list(
+            {{'farm_name': farm_name, 'producer_name': producer_name,
+              'bean_count': bean_count, 'avg_elevation': CAST(trunc(avg_elevation) AS INTEGER)}}
+            ORDER BY bean_count DESC, farm_name ASC
+        ) AS items
+        FROM (
+            SELECT
+                country_code,
+                region_slug,
+                COALESCE(ANY_VALUE(farm_canonical), arg_max(farm, length(farm))) AS farm_name,
+                MODE(producer) FILTER (WHERE producer IS NOT NULL AND producer != '') AS producer_name,
+                COUNT(DISTINCT bean_id) AS bean_count,
+                AVG({_ELEVATION_MIDPOINT}) AS avg_elevation
+            FROM _geo_origin_rows
+            WHERE farm IS NOT NULL AND farm != ''
+            GROUP BY country_code, region_slug, COALESCE(farm_canonical, farm_normalized)
+        )
+        GROUP BY country_code, region_slug
+    """
+    _create_rollup(conn, "region_rollups", keys, stats_sql, lists)
+
+
+def _build_farm_rollups(conn) -> None:
+    keys = ["country_code", "region_slug", "farm_slug"]
+    stats_sql = """
+        SELECT
+            country_code,
+            region_slug,
+            farm_slug,
+            COALESCE(
+                ANY_VALUE(farm_canonical), arg_max(farm, length(farm)), ANY_VALUE(farm_normalized), 'Unknown Farm'
+            ) AS farm_name,
+            CASE WHEN region_slug = 'unknown-region' THEN 'Unknown Region'
+                 ELSE COALESCE(ANY_VALUE(state_canonical), arg_max(region, length(region)), region_slug)
+            END AS region_name,
+            AVG(latitude) AS latitude,
+            AVG(longitude) AS longitude,
+            MIN(NULLIF(elevation_min, 0)) AS elevation_min,
+            MAX(NULLIF(elevation_max, 0)) AS elevation_max,
+            list(DISTINCT bean_id ORDER BY bean_id) AS bean_ids
+        FROM _geo_farm_rows
+        GROUP BY country_code, region_slug, farm_slug
+    """
+    # Farm notes count every mention across the farm's beans
+    notes_source = "(SELECT DISTINCT country_code, region_slug, farm_slug, bean_id, tasting_notes FROM _geo_farm_rows)"
+    lists = _standard_lists(
+        "_geo_farm_rows", keys, notes_source, "COUNT(*)",
+        {"common_tasting_notes": 10},
+    )
+    del lists["top_roasters"]
+    # Raw producer spellings; the endpoint merges spellings that normalize alike
+    lists["producers"] = """
+        SELECT country_code, region_slug, farm_slug, list(
+            {'name': producer, 'mention_count': mention_count}
+            ORDER BY mention_count DESC, length(producer) DESC, producer ASC
+        ) AS items
+        FROM (
+            SELECT country_code, region_slug, farm_slug, producer, COUNT(*) AS mention_count
+            FROM _geo_farm_rows
+            WHERE producer IS NOT NULL AND producer != ''
+            GROUP BY ALL
+        )
+        GROUP BY country_code, region_slug, farm_slug
+    """
+    _create_rollup(conn, "farm_rollups", keys, stats_sql, lists)
+
+
+def fetch_rollup(conn, table: str, **keys: str) -> dict[str, Any] | None:
+    """Fetch one rollup row as a dict, or None if there is no row for ``keys``."""
+    where = " AND ".join(f"r.{column} = ?" for column in keys)
+    cursor = conn.execute(
+        f"""
+        SELECT r.*, cc.name AS country_name
+        FROM {table} r
+        LEFT JOIN country_codes cc ON cc.alpha_2 = r.country_code
+        WHERE {where}
+        """,
+        list(keys.values()),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
@@ -21,13 +21,14 @@ from fastapi import Body, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field
 from starlette.responses import Response
 from starlette.types import Scope
 
 from kissaten.api.ai_search import create_ai_search_router
 from kissaten.api.beanconqueror_share import build_share_link
 from kissaten.api.brew_assistant import router as brew_assistant_router
+from kissaten.api.categories import categorize_process
 from kissaten.api.db import (
     conn,
     normalize_farm_name,
@@ -36,12 +37,20 @@ from kissaten.api.db import (
     normalize_varietal_name,
 )
 from kissaten.api.fx import convert_price, create_fx_router
+from kissaten.api.geography_rollups import fetch_rollup
+from kissaten.api.origin_suggestions import get_origin_suggestion_index
 from kissaten.api.podcasts import router as podcast_router
+from kissaten.api.recommender import (
+    RecommendationWeights,
+    get_recommender,
+    is_default_weights,
+    precomputed_neighbours,
+)
+from kissaten.api.tasting_note_search import build_tasting_note_filter, build_tasting_note_score
 from kissaten.schemas import APIResponse, PaginationInfo
 from kissaten.schemas.api_models import (
     APIBean,
     APICoffeeBean,
-    APIRecommendation,
     APISearchResult,
 )
 from kissaten.schemas.geography_models import (
@@ -177,6 +186,18 @@ def validate_currency_code(code: str | None) -> str | None:
     return code
 
 
+def json_response(payload: BaseModel) -> Response:
+    """Serialize a response straight to JSON bytes.
+
+    Returning a ``Response`` bypasses FastAPI's ``response_model`` handling,
+    which would otherwise dump the payload, validate it again against the
+    response model and serialize it a second time. The route's
+    ``response_model`` still documents the schema. Use this for payloads
+    whose data is built with the ``read_model`` constructors.
+    """
+    return Response(content=payload.model_dump_json(), media_type="application/json")
+
+
 def register_profiling_middleware(app: FastAPI):
     @app.middleware("http")
     async def profile_request(request: Request, call_next):
@@ -249,17 +270,13 @@ def build_coffee_bean_filters(filter_params: FilterParams, use_scoring: bool = F
         if filter_params.tasting_notes_only:
             # When scoring is enabled, we already use granular scoring for tasting notes
             if use_scoring:
-                score_expression, score_params = parse_boolean_search_query_for_field(
-                    filter_params.query, "cb.tasting_notes", use_granular_scoring=True
-                )
+                score_expression, score_params = build_tasting_note_score(filter_params.query)
                 if score_expression:
                     # Apply tasting notes weight to granular score
                     score_components.append(f"({score_expression} * {weights.tasting_notes})")
                     params.extend(score_params)
             else:
-                condition, search_params = parse_boolean_search_query_for_field(
-                    filter_params.query, "array_to_string(cb.tasting_notes, ' ')"
-                )
+                condition, search_params = build_tasting_note_filter(filter_params.query)
                 if condition:
                     add_condition(condition, search_params)
         else:
@@ -274,9 +291,7 @@ def build_coffee_bean_filters(filter_params: FilterParams, use_scoring: bool = F
                 score_components.append(f"(CASE WHEN cb.description ILIKE ? THEN {0.5 * weights.name} ELSE 0 END)")
                 params.append(f"%{filter_params.query}%")
                 # Tasting notes score component via granular scoring
-                score_expression, score_params = parse_boolean_search_query_for_field(
-                    filter_params.query, "cb.tasting_notes", use_granular_scoring=True
-                )
+                score_expression, score_params = build_tasting_note_score(filter_params.query)
                 if score_expression:
                     score_components.append(f"({score_expression} * {weights.tasting_notes})")
                     params.extend(score_params)
@@ -303,18 +318,14 @@ def build_coffee_bean_filters(filter_params: FilterParams, use_scoring: bool = F
     if filter_params.tasting_notes_query:
         if use_scoring:
             # Use granular scoring for relevance mode (calculated separately per note)
-            score_expression, score_params = parse_boolean_search_query_for_field(
-                filter_params.tasting_notes_query, "cb.tasting_notes", use_granular_scoring=True
-            )
+            score_expression, score_params = build_tasting_note_score(filter_params.tasting_notes_query)
             if score_expression:
                 # Apply tasting notes weight to granular score
                 score_components.append(f"({score_expression} * {weights.tasting_notes})")
                 params.extend(score_params)
         else:
             # Simple condition for strict mode
-            condition, search_params = parse_boolean_search_query_for_field(
-                filter_params.tasting_notes_query, "array_to_string(cb.tasting_notes, ' ')"
-            )
+            condition, search_params = build_tasting_note_filter(filter_params.tasting_notes_query)
             if condition:
                 add_condition(condition, search_params)
 
@@ -668,6 +679,7 @@ class CacheControlledStaticFiles(StaticFiles):
 # Serve static images (only if the directories exist, e.g. skip in CI / fresh dev envs)
 _roasters_dir = Path(__file__).parent.parent.parent.parent / "data" / "roasters"
 _flavours_dir = Path(__file__).parent.parent.parent.parent / "data" / "flavours"
+_images_dir = Path(__file__).parent.parent.parent.parent / "data" / "images"
 
 if _roasters_dir.exists():
     app.mount(
@@ -683,10 +695,16 @@ if _flavours_dir.exists():
         name="flavours-data",
     )
 
+# Content-addressed bean images, their thumbnails and the per-roaster manifests
+if _images_dir.exists():
+    app.mount(
+        "/data/images",
+        CacheControlledStaticFiles(directory=_images_dir),
+        name="images-data",
+    )
+
 
-def parse_boolean_search_query_for_field(
-    query: str, field_expression: str, use_granular_scoring: bool = False
-) -> tuple[str, list[str]]:
+def parse_boolean_search_query_for_field(query: str, field_expression: str) -> tuple[str, list[str]]:
     """
     Parse a boolean search query with wildcards and convert it to SQL for any field.
 
@@ -701,7 +719,6 @@ def parse_boolean_search_query_for_field(
     Args:
         query: The search query string
         field_expression: The SQL field expression to search in (e.g., "cb.roast_level", "o.region")
-        use_granular_scoring: If True, returns a SQL expression that calculates a score based on match type and position (only for tasting notes).
 
     Examples:
     - "choc*|floral" -> "(field_expression ILIKE ? OR field_expression ILIKE ?)"
@@ -721,142 +738,12 @@ def parse_boolean_search_query_for_field(
     # Use strip_accents on the search term for pre-computed _unaccented columns; plain ? otherwise
     param_sql = "strip_accents(?)" if "_unaccented" in field_expression else "?"
 
-    def tokenize(text: str) -> list[str]:
-        """Tokenize the search query into terms and operators, handling quoted strings"""
-        # Replace NOT with ! for easier parsing
-        text = re.sub(r"\bNOT\b", "!", text, flags=re.IGNORECASE)
-
-        tokens = []
-        i = 0
-        current_token = ""
-
-        while i < len(text):
-            char = text[i]
-
-            if char == '"':
-                # Handle quoted strings - find the closing quote
-                i += 1  # Skip opening quote
-                quoted_content = ""
-                while i < len(text) and text[i] != '"':
-                    quoted_content += text[i]
-                    i += 1
-
-                if i < len(text):  # Found closing quote
-                    i += 1  # Skip closing quote
-
-                # Add the quoted content as a single token with a special marker
-                if quoted_content.strip():
-                    tokens.append(f"EXACT:{quoted_content.strip()}")
-
-            elif char in "|&!()":
-                # Add any accumulated token
-                if current_token.strip():
-                    tokens.append(current_token.strip())
-                    current_token = ""
-                # Add the operator
-                tokens.append(char)
-                i += 1
-
-            elif char.isspace():
-                # Add any accumulated token
-                if current_token.strip():
-                    tokens.append(current_token.strip())
-                    current_token = ""
-                i += 1
-
-            else:
-                current_token += char
-                i += 1
-
-        # Add final token if any
-        if current_token.strip():
-            tokens.append(current_token.strip())
-
-        return [token for token in tokens if token]
-
-    def convert_wildcard_term(term: str) -> tuple[str, str]:
-        """Convert a single term with wildcards to SQL pattern and condition type"""
-        if term.startswith("EXACT:"):
-            # Exact match - remove the EXACT: prefix and use = instead of ILIKE
-            exact_term = term[6:]  # Remove 'EXACT:' prefix
-            return exact_term, "="
-        else:
-            # Wildcard/fuzzy match
-            pattern = term.replace("*", "%").replace("?", "_")
-            if "*" not in term and "?" not in term:
-                pattern = f"%{pattern}%"
-            return pattern, "ILIKE"
-
-    # If granular scoring is requested for tasting notes, we use a specialized unnest approach
-    if use_granular_scoring and "tasting_notes" in field_expression:
-        tokens = tokenize(query)
-        # Filter out operators and NOT terms for scoring weight calculation
-        scoring_terms = []
-        is_not = False
-        for i, token in enumerate(tokens):
-            if token == "!":
-                is_not = True
-            elif token not in "|&()":
-                if not is_not:
-                    scoring_terms.append(token)
-                is_not = False
-            else:
-                is_not = False
-
-        if not scoring_terms:
-            return "", []
-
-        # Build a scoring subquery:
-        # 1. Unnest tasting notes with index (pos) using generate_subscripts for DuckDB compatibility
-        # 2. For each term, calculate its match weight: exact (1.0), prefix (0.7), wildcard (0.4)
-        # 3. Apply position boost: 5.0 / (pos)
-        # 4. Sum up the scores
-        score_parts = []
-        score_params = []
-        for term in scoring_terms:
-            pattern, operator = convert_wildcard_term(term)
-            if operator == "=":
-                # Exact match
-                score_parts.append("(CASE WHEN lower(note) = lower(?) THEN 1.0 ELSE 0.0 END)")
-                score_params.append(pattern)
-            elif term.endswith("*") and term.count("*") == 1 and "?" not in term:
-                # Prefix match
-                prefix = term[:-1]
-                score_parts.append(
-                    "(CASE WHEN lower(note) = lower(?) THEN 1.0 WHEN lower(note) LIKE lower(?) THEN 0.7 ELSE 0.0 END)"
-                )
-                score_params.extend([prefix, f"{prefix}%"])
-            else:
-                # Wildcard/fuzzy match
-                score_parts.append(
-                    "(CASE WHEN lower(note) = lower(?) THEN 1.0 WHEN lower(note) LIKE lower(?) THEN 0.4 ELSE 0.0 END)"
-                )
-                score_params.extend([term, pattern])
-
-        score_sum_clause = " + ".join(score_parts)
-        # We use a scalar subquery to calculate the score for the array
-        # DuckDB unnest() doesn't support WITH ORDINALITY, so we use generate_subscripts
-        granular_sql = f"""
-            (SELECT COALESCE(SUM(({score_sum_clause}) * (5.0 / pos)), 0)
-             FROM (
-                 SELECT cb.tasting_notes[pos] AS note, pos
-                 FROM (SELECT generate_subscripts(cb.tasting_notes, 1) AS pos)
-             ) AS t)
-        """
-        return granular_sql, score_params
-
     # If no boolean operators, handle as simple wildcard search
     if not re.search(r"[|&!()]|NOT\b", query, re.IGNORECASE):
         # Check if it's a quoted exact match
         if query.strip().startswith('"') and query.strip().endswith('"'):
             exact_term = query.strip()[1:-1]  # Remove quotes
-            if "array_to_string" in field_expression:
-                return (
-                    f"EXISTS (SELECT 1 FROM unnest(cb.tasting_notes) AS t(note) WHERE lower(note) = lower({param_sql}))",
-                    [exact_term],
-                )
-            else:
-                return f"{field_expression} ILIKE {param_sql}", [exact_term]
+            return f"{field_expression} ILIKE {param_sql}", [exact_term]
         else:
             # Regular wildcard search
             search_pattern = query.replace("*", "%").replace("?", "_")
@@ -992,19 +879,11 @@ def parse_boolean_search_query_for_field(
                     return "", [], pos  # Should not happen if token list is not empty
 
                 full_term = " ".join(term_parts)
-                pattern, operator = convert_wildcard_term(full_term)
-
-                if operator == "=":
-                    # For exact matches, we still use ILIKE for case-insensitive comparison
-                    # but match the full field content when contained in arrays
-                    if "array_to_string" in field_expression:
-                        # For array fields, check if the exact term exists in the array (case-insensitive)
-                        condition = f"EXISTS (SELECT 1 FROM unnest(cb.tasting_notes) AS t(note) WHERE lower(note) = lower({param_sql}))"
-                    else:
-                        # For string fields, use exact case-insensitive match
-                        condition = f"{field_expression} ILIKE {param_sql}"
-                else:
-                    condition = f"{field_expression} ILIKE {param_sql}"
+                pattern, _ = convert_wildcard_term(full_term)
+
+                # Exact matches still use ILIKE (no wildcards) for a
+                # case-insensitive comparison of the full field content
+                condition = f"{field_expression} ILIKE {param_sql}"
                 return condition, [pattern], pos
 
         condition, params, _ = parse_or_expression(0)
@@ -1023,13 +902,7 @@ def parse_boolean_search_query_for_field(
         # Check if it's a quoted exact match
         if query.strip().startswith('"') and query.strip().endswith('"'):
             exact_term = query.strip()[1:-1]  # Remove quotes
-            if "array_to_string" in field_expression:
-                return (
-                    f"EXISTS (SELECT 1 FROM unnest(cb.tasting_notes) AS t(note) WHERE lower(note) = lower({param_sql}))",
-                    [exact_term],
-                )
-            else:
-                return f"{field_expression} ILIKE {param_sql}", [exact_term]
+            return f"{field_expression} ILIKE {param_sql}", [exact_term]
         else:
             search_pattern = query.replace("*", "%").replace("?", "_")
             if "*" not in query and "?" not in query:
@@ -1154,183 +1027,6 @@ def get_hierarchical_location_codes(target_location: str) -> list[str]:
         return [target_location]
 
 
-def categorize_process(process: str) -> str:
-    """Categorize a process into major process groups."""
-    if not process:
-        return "other"
-
-    process_lower = process.lower()
-
-    # 1. Additive / Infused / Co-Fermented (Check early for transparency)
-    if any(
-        keyword in process_lower
-        for keyword in [
-            "co-ferment",
-            "infused",
-            "infusion",
-            "cinnamon",
-            "ginger",
-            "passion fruit",
-            "passionfruit",
-            "strawberry",
-            "peach",
-            "mango",
-            "pineapple",
-            "coconut",
-            "grapefruit",
-            "raspberry",
-            "lychee",
-            "watermelon",
-            "lavender",
-            "jasmine",
-            "rose",
-            "kumquat",
-            "osmanthus",
-            "acai",
-        ]
-    ):
-        return "infused_cofermented"
-
-    # 2. Barrel Aged
-    if "barrel" in process_lower:
-        return "barrel_aged"
-
-    # 3. Decaf processes (Check before others as it's a primary attribute)
-    if any(keyword in process_lower for keyword in ["decaf", "ethyl acetate", "swiss water", "sugarcane"]):
-        return "decaf"
-
-    # 4. Anaerobic & Carbonic Maceration
-    if any(
-        keyword in process_lower
-        for keyword in ["anaerobic", "anaerobes", "anaerobico", "carbonic", "maceration", "anoxic"]
-    ):
-        return "anaerobic_carbonic"
-
-    # 5. Advanced Technical (Thermal Shock, Koji, Lactic, Yeast, Nitrogen)
-    if any(
-        keyword in process_lower
-        for keyword in ["thermal shock", "koji", "lactic", "yeast", "culturing", "bacteria", "nitrogen", "nitro"]
-    ):
-        return "advanced_technical"
-
-    # 6. Honey processes
-    if "honey" in process_lower:
-        return "honey"
-
-    # 7. Washed processes
-    if any(keyword in process_lower for keyword in ["washed", "lavado", "washing"]):
-        return "washed"
-
-    # 8. Natural processes
-    if any(keyword in process_lower for keyword in ["natural", "dry", "sun-dried", "sun dried", "winey"]):
-        return "natural"
-
-    # 9. Wet Hulled (Giling Basah)
-    if any(keyword in process_lower for keyword in ["giling basah", "wet hulled", "wet-hulled"]):
-        return "wet_hulled"
-
-    # 10. Fermentation (generic standalone fermentation, after base processes)
-    if any(keyword in process_lower for keyword in ["ferment", "inocul", "bioreactor", "mosto"]):
-        return "advanced_technical"
-
-    # 11. Experimental/Generic special processes
-    if "experimental" in process_lower:
-        return "experimental"
-
-    return "other"
-
-
-def categorize_varietal(varietal: str) -> str:
-    """Categorize a varietal into major varietal groups."""
-    if not varietal:
-        return "other"
-
-    varietal_lower = varietal.lower()
-
-    # Typica family
-    if any(keyword in varietal_lower for keyword in ["typica", "kona", "jamaica blue mountain", "mocha", "kent"]):
-        return "typica"
-
-    # Heirloom varieties
-    if any(
-        keyword in varietal_lower
-        for keyword in [
-            "heirloom",
-            "landrace",
-            "native",
-            "wild",
-            "forest",
-            "pink bourbon",
-            "bourbon ají",
-            "wush wush",
-            "chiroso",
-        ]
-    ):
-        return "heirloom"
-
-    # Bourbon family
-    if any(
-        keyword in varietal_lower
-        for keyword in [
-            "bourbon",
-            "santos",
-            "mundo novo",
-            "caturra",
-            "catuai",
-            "pacas",
-            "villa sarchi",
-            "tekisic",
-        ]
-    ):
-        return "bourbon"
-
-    # Geisha/Gesha varieties
-    if any(keyword in varietal_lower for keyword in ["geisha", "gesha"]):
-        return "geisha"
-
-    # SL varieties (SL28, SL34, etc.)
-    if any(keyword in varietal_lower for keyword in ["sl ", "sl28", "sl34", "scott labs"]):
-        return "sl_varieties"
-    # Use regex too
-    if re.search(r"sl\d+", varietal_lower):
-        return "sl_varieties"
-
-    # Hybrid varieties
-    if any(
-        keyword in varietal_lower
-        for keyword in [
-            "hybrid",
-            "f1",
-            "ruiru",
-            "batian",
-            "castillo",
-            "colombia",
-            "tabi",
-            "catimor",
-            "sarchimor",
-            "sidra",
-            "marsellesa",
-            "parainema",
-            "centroamericano",
-            "obata",
-            "icatu",
-            "starmaya",
-            "ihcafe",
-        ]
-    ):
-        return "hybrid"
-
-    # Pacamara and large bean varieties
-    if any(keyword in varietal_lower for keyword in ["pacamara", "maragogype", "maragogipe", "elephant bean"]):
-        return "large_bean"
-
-    # Other Arabica varieties
-    if any(keyword in varietal_lower for keyword in ["red catuai", "yellow catuai"]):
-        return "arabica_other"
-
-    return "other"
-
-
 # Display labels for processing-method and varietal category slugs used by the
 # uniqueness report. Mirrors the category names surfaced by /v1/processes and
 # /v1/varietals so chip labels stay consistent with those index pages.
@@ -2299,7 +1995,7 @@ async def search_coffee_beans(
                 "longitude": origin_row[11] or 0.0,
                 "country_full_name": origin_row[12] if origin_row[12] and origin_row[12].strip() else None,
             }
-            origins.append(APIBean(**origin_data))
+            origins.append(APIBean.read_model(**origin_data))
 
         bean_dict["origins"] = origins
 
@@ -2328,14 +2024,7 @@ async def search_coffee_beans(
             bean_dict["price"] = round(bean_dict["price"], 2)
 
         # Create APISearchResult object
-        try:
-            search_result = APISearchResult(**bean_dict)
-        except ValidationError as e:
-            logger.error(f"Validation error for bean ID {bean_dict.get('bean_url_path')}: {e}")
-            logger.error(f"Bean data: {bean_dict}")
-            raise e
-
-        coffee_beans.append(search_result)
+        coffee_beans.append(APISearchResult.read_model(**bean_dict))
 
     # Create pagination info
 
@@ -2348,7 +2037,7 @@ async def search_coffee_beans(
         has_previous=page > 1,
     )
 
-    return APIResponse.success_response(
+    return json_response(APIResponse.success_response(
         data=coffee_beans,
         pagination=pagination,
         metadata={
@@ -2359,12 +2048,12 @@ async def search_coffee_beans(
             "currency_conversion": {
                 "enabled": convert_to_currency is not None,
                 "target_currency": convert_to_currency.upper() if convert_to_currency else None,
-                "converted_results": sum(1 for bean in coffee_beans if getattr(bean, "price_converted", False)),
+                "converted_results": sum(1 for bean in coffee_beans if bean.get("price_converted", False)),
             }
             if convert_to_currency
             else None,
         },
-    )
+    ))
 
 
 @app.post("/v1/search/by-paths", response_model=APIResponse[list[APISearchResult]])
@@ -2691,7 +2380,7 @@ async def search_beans_by_paths(
                 "longitude": origin_row[11] or 0.0,
                 "country_full_name": origin_row[12] if origin_row[12] and origin_row[12].strip() else None,
             }
-            origins.append(APIBean(**origin_data))
+            origins.append(APIBean.read_model(**origin_data))
 
         bean_dict["origins"] = origins
 
@@ -2720,8 +2409,7 @@ async def search_beans_by_paths(
             bean_dict["price"] = round(bean_dict["price"], 2)
 
         # Create APISearchResult object
-        search_result = APISearchResult(**bean_dict)
-        coffee_beans.append(search_result)
+        coffee_beans.append(APISearchResult.read_model(**bean_dict))
 
     # Create pagination info
     pagination = PaginationInfo(
@@ -2733,7 +2421,7 @@ async def search_beans_by_paths(
         has_previous=page > 1,
     )
 
-    return APIResponse.success_response(
+    return json_response(APIResponse.success_response(
         data=coffee_beans,
         pagination=pagination,
         metadata={
@@ -2742,12 +2430,12 @@ async def search_beans_by_paths(
             "currency_conversion": {
                 "enabled": convert_to_currency is not None,
                 "target_currency": convert_to_currency.upper() if convert_to_currency else None,
-                "converted_results": sum(1 for bean in coffee_beans if getattr(bean, "price_converted", False)),
+                "converted_results": sum(1 for bean in coffee_beans if bean.get("price_converted", False)),
             }
             if convert_to_currency
             else None,
         },
-    )
+    ))
 
 
 @app.get("/v1/roasters", response_model=APIResponse[list[dict]])
@@ -3641,198 +3329,59 @@ async def get_origins():
     return APIResponse.success_response(data=countries)
 
 
-@app.get("/v1/origins/{country_code}", response_model=APIResponse[CountryDetailResponse])
-@cached(cache=SimpleMemoryCache)
-async def get_country_detail(country_code: str):
-    """Get detailed statistics and hierarchy for a specific country."""
-    # Setup profiling helper
-    query_count = 0
-    request_id = int(time.time())
-    temp_table = f"_country_beans_{request_id}"
-
-    def profiled_execute(query, params=None):
-        nonlocal query_count
-        query_count += 1
-
-        if not ENABLE_PROFILING:
-             return conn.execute(query, params) if params is not None else conn.execute(query)
+def _rollup_int(value) -> int | None:
+    """Truncate a rollup average to int, as the detail responses expect."""
+    return int(value) if value is not None else None
 
-        profile_file = f"duckdb_profile_{request_id}_country_q{query_count}.json"
-        conn.execute("PRAGMA enable_profiling = 'json'")
-        conn.execute(f"PRAGMA profiling_output = '{profile_file}'")
 
-        start = time.perf_counter()
-        result = conn.execute(query, params) if params is not None else conn.execute(query)
-        duration = time.perf_counter() - start
+def _rollup_elevation(rollup: dict) -> ElevationInfo:
+    return ElevationInfo(
+        min=rollup.get("elevation_min"),
+        max=rollup.get("elevation_max"),
+        avg=_rollup_int(rollup.get("elevation_avg")),
+    )
 
-        print(f"PROFILER [COUNTRY Q{query_count}]: Took {duration:.4f}s - Saved to {profile_file}")
-        preview = " ".join(query.split())[:80] + "..."
-        print(f"      SQL: {preview}")
 
-        return result
+@app.get("/v1/origins/{country_code}", response_model=APIResponse[CountryDetailResponse])
+@cached(cache=SimpleMemoryCache)
+async def get_country_detail(country_code: str):
+    """Get detailed statistics and hierarchy for a specific country.
 
-    try:
-        country_code = country_code.upper()
+    Served from ``country_rollups``, which ``kissaten refresh`` rebuilds.
+    """
+    country_code = country_code.upper()
 
-        # Get country name
-        country_name_query = "SELECT name FROM country_codes WHERE alpha_2 = ?"
-        country_name_result = conn.execute(country_name_query, [country_code]).fetchone()
+    rollup = fetch_rollup(conn, "country_rollups", country_code=country_code)
+    if rollup is None:
+        # A known country without beans still gets an (empty) page
+        country_name_result = conn.execute(
+            "SELECT name FROM country_codes WHERE alpha_2 = ?", [country_code]
+        ).fetchone()
         if not country_name_result:
-            # Check if any beans exist for this country code even if not in country_codes table
-            exists_query = "SELECT COUNT(*) FROM origins WHERE country = ?"
-            count = conn.execute(exists_query, [country_code]).fetchone()[0]
-            if count == 0:
-                raise HTTPException(status_code=404, detail=f"Country '{country_code}' not found")
-            country_name = country_code
-        else:
-            country_name = country_name_result[0]
-
-        # Step 1: Materialize (Single slow scan)
-        profiled_execute(
-            f"""
-            CREATE TEMPORARY TABLE {temp_table} AS
-            SELECT
-                o.bean_id, cb.roaster, cb.price_usd, cb.tasting_notes,
-                o.state_canonical, o.region, o.region_normalized, o.farm, o.farm_canonical,
-                o.elevation_min, o.elevation_max,
-                o.variety, o.variety_canonical,
-                o.process, o.process_common_name
-            FROM origins o
-            JOIN coffee_beans cb ON o.bean_id = cb.id
-            WHERE o.country = ?
-        """,
-            [country_code],
-        )
-
-        # Step 2: Get aggregate statistics (Instant from temp table)
-        # Note: All beans come from farms - even if farm is null/unknown, it counts as a farm
-        stats_query = f"""
-            SELECT
-                COUNT(DISTINCT bean_id) as total_beans,
-                COUNT(DISTINCT roaster) as total_roasters,
-                COUNT(DISTINCT COALESCE(state_canonical, region)) filter (where region is not null and region != '') as total_regions,
-                COUNT(DISTINCT COALESCE(farm_canonical, farm, 'unknown-farm-' || bean_id::VARCHAR)) as total_farms,
-                AVG((NULLIF(elevation_min, 0) + NULLIF(elevation_max, 0)) / 2) as avg_elevation,
-                AVG(price_usd) as avg_price_usd
-            FROM {temp_table}
-        """
-        stats_row = profiled_execute(stats_query).fetchone()
-        statistics = CountryStatistics(
-            total_beans=stats_row[0] or 0,
-            total_roasters=stats_row[1] or 0,
-            total_regions=stats_row[2] or 0,
-            total_farms=stats_row[3] or 0,
-            avg_elevation=int(stats_row[4]) if stats_row[4] is not None else None,
-            avg_price_usd=stats_row[5],
-        )
-
-        # Step 3: Top lists (Fast from temp table)
-        roasters_query = f"""
-            SELECT
-                roaster,
-                COUNT(DISTINCT bean_id) as bean_count
-            FROM {temp_table}
-            GROUP BY roaster
-            ORDER BY bean_count DESC, roaster ASC
-            LIMIT 10
-        """
-        roasters_rows = profiled_execute(roasters_query).fetchall()
-        top_roasters = [TopRoaster(roaster_name=row[0], bean_count=row[1]) for row in roasters_rows]
-
-        notes_query = f"""
-            SELECT
-                note,
-                COUNT(DISTINCT bean_id) as frequency
-            FROM (
-                SELECT unnest(tasting_notes) as note, bean_id
-                FROM {temp_table}
-            )
-            GROUP BY note
-            ORDER BY frequency DESC, note ASC
-            LIMIT 15
-        """
-        notes_rows = profiled_execute(notes_query).fetchall()
-        common_tasting_notes = [TopNote(note=row[0], frequency=row[1]) for row in notes_rows]
-
-        varietal_query = f"""
-            SELECT
-                canonical_variety,
-                COUNT(DISTINCT bean_id) as count
-            FROM (
-                SELECT
-                    unnest(CASE
-                        WHEN variety_canonical IS NOT NULL AND len(variety_canonical) > 0 THEN variety_canonical
-                        ELSE [variety]
-                    END) as canonical_variety,
-                    bean_id
-                FROM {temp_table}
-            )
-            WHERE canonical_variety IS NOT NULL AND canonical_variety != ''
-            GROUP BY canonical_variety
-            ORDER BY count DESC, canonical_variety ASC
-            LIMIT 10
-        """
-        varietal_rows = profiled_execute(varietal_query).fetchall()
-        varietals = [TopVariety(variety=row[0], count=row[1]) for row in varietal_rows]
-
-        process_query = f"""
-            SELECT
-                COALESCE(NULLIF(process_common_name, ''), NULLIF(process, ''), 'Unknown') as process_name,
-                COUNT(DISTINCT bean_id) as count
-            FROM {temp_table}
-            GROUP BY process_name
-            ORDER BY count DESC, process_name ASC
-            LIMIT 10
-        """
-        process_rows = profiled_execute(process_query).fetchall()
-        processing_methods = [TopProcess(process=row[0], count=row[1]) for row in process_rows]
-
-        elevation_query = f"""
-            SELECT
-                MIN(NULLIF(elevation_min, 0)) as min_elevation,
-                MAX(NULLIF(elevation_max, 0)) as max_elevation,
-                AVG((NULLIF(elevation_min, 0) + NULLIF(elevation_max, 0)) / 2) as avg_elevation
-            FROM {temp_table}
-            WHERE elevation_min > 0 OR elevation_max > 0
-        """
-        elev_row = profiled_execute(elevation_query).fetchone()
-        elevation_distribution = ElevationInfo(
-            min=elev_row[0], max=elev_row[1], avg=int(elev_row[2]) if elev_row[2] is not None else None
-        )
-
-        regions_query = f"""
-            SELECT
-                FIRST(region) as region_name,
-                COUNT(DISTINCT bean_id) as bean_count,
-                COUNT(DISTINCT COALESCE(farm_canonical, farm)) FILTER (WHERE farm IS NOT NULL AND farm != '') as farm_count,
-                BOOL_OR(state_canonical IS NOT NULL) as is_geocoded
-            FROM {temp_table}
-            WHERE region IS NOT NULL AND region != ''
-            GROUP BY region_normalized
-            ORDER BY bean_count DESC, region_name ASC
-            LIMIT 10
-        """
-        regions_rows = profiled_execute(regions_query).fetchall()
-        top_regions = [
-            RegionSummary(region_name=row[0], bean_count=row[1], farm_count=row[2], is_geocoded=row[3])
-            for row in regions_rows
-        ]
+            raise HTTPException(status_code=404, detail=f"Country '{country_code}' not found")
+        rollup = {"country_name": country_name_result[0]}
+
+    statistics = CountryStatistics(
+        total_beans=rollup.get("total_beans") or 0,
+        total_roasters=rollup.get("total_roasters") or 0,
+        total_regions=rollup.get("total_regions") or 0,
+        total_farms=rollup.get("total_farms") or 0,
+        avg_elevation=_rollup_int(rollup.get("avg_elevation")),
+        avg_price_usd=rollup.get("avg_price_usd"),
+    )
 
-        response_data = CountryDetailResponse(
-            country_code=country_code,
-            country_name=country_name,
-            statistics=statistics,
-            top_roasters=top_roasters,
-            top_regions=top_regions,
-            common_tasting_notes=common_tasting_notes,
-            varietals=varietals,
-            processing_methods=processing_methods,
-            elevation_distribution=elevation_distribution,
-        )
-        return APIResponse.success_response(data=response_data)
-    finally:
-        conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
-        conn.execute("PRAGMA disable_profiling")
+    response_data = CountryDetailResponse(
+        country_code=country_code,
+        country_name=rollup.get("country_name") or country_code,
+        statistics=statistics,
+        top_roasters=[TopRoaster(**row) for row in rollup.get("top_roasters", [])],
+        top_regions=[RegionSummary(**row) for row in rollup.get("top_regions", [])],
+        common_tasting_notes=[TopNote(**row) for row in rollup.get("common_tasting_notes", [])],
+        varietals=[TopVariety(**row) for row in rollup.get("varietals", [])],
+        processing_methods=[TopProcess(**row) for row in rollup.get("processing_methods", [])],
+        elevation_distribution=_rollup_elevation(rollup),
+    )
+    return APIResponse.success_response(data=response_data)
 
 
 @app.get("/v1/origins/{country_code}/regions", response_model=APIResponse[list[RegionSummary]])
@@ -3918,554 +3467,207 @@ async def get_country_regions(country_code: str):
 @app.get("/v1/origins/{country_code}/{region_slug}", response_model=APIResponse[RegionDetailResponse])
 @cached(cache=SimpleMemoryCache)
 async def get_region_detail(country_code: str, region_slug: str):
-    """Get detailed statistics and farms for a specific region (state level) within a country."""
-    # Setup profiling helper
-    query_count = 0
-    request_id = int(time.time())
-    temp_table = f"_region_beans_{request_id}"
-
-    def profiled_execute(query, params=None):
-        nonlocal query_count
-        query_count += 1
+    """Get detailed statistics and farms for a specific region (state level) within a country.
 
-        if not ENABLE_PROFILING:
-            return conn.execute(query, params) if params is not None else conn.execute(query)
+    Served from ``region_rollups``, keyed by the same
+    ``COALESCE(state_canonical_slug, region_normalized)`` slug as the regions list.
+    """
+    country_code = country_code.upper()
+    region_slug = region_slug.lower()
 
-        profile_file = f"duckdb_profile_{request_id}_q{query_count}.json"
-        conn.execute("PRAGMA enable_profiling = 'json'")
-        conn.execute(f"PRAGMA profiling_output = '{profile_file}'")
+    rollup = fetch_rollup(conn, "region_rollups", country_code=country_code, region_slug=region_slug)
+    if rollup is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Region '{region_slug}' not found in country '{country_code}'",
+        )
 
-        start = time.perf_counter()
-        result = conn.execute(query, params) if params is not None else conn.execute(query)
-        duration = time.perf_counter() - start
+    # total_farms only counts *named* farms, so it matches the entries in
+    # top_farms excluding the synthetic "Unknown Farm" bucket
+    statistics = RegionStatistics(
+        total_beans=rollup["total_beans"] or 0,
+        total_roasters=rollup["total_roasters"] or 0,
+        total_farms=rollup["total_farms"] or 0,
+        avg_elevation=_rollup_int(rollup["avg_elevation"]),
+        avg_price_usd=rollup["avg_price_usd"],
+    )
 
-        print(f"PROFILER [Q{query_count}]: Took {duration:.4f}s - Saved to {profile_file}")
-        preview = " ".join(query.split())[:80] + "..."
-        print(f"      SQL: {preview}")
+    farms = [FarmSummary(**row) for row in rollup["top_farms"]]
+    # Always add Unknown Farm entry since all beans come from farms
+    farms.append(
+        FarmSummary(
+            farm_name="Unknown Farm",
+            producer_name=None,
+            bean_count=rollup["unknown_farm_bean_count"] or 0,
+            avg_elevation=_rollup_int(rollup["unknown_farm_avg_elevation"]),
+        )
+    )
 
-        return result
+    response_data = RegionDetailResponse(
+        region_name=rollup["region_name"],
+        country_code=country_code,
+        country_name=rollup["country_name"] or country_code,
+        statistics=statistics,
+        top_farms=farms,
+        top_roasters=[TopRoaster(**row) for row in rollup["top_roasters"]],
+        common_tasting_notes=[TopNote(**row) for row in rollup["common_tasting_notes"]],
+        varietals=[TopVariety(**row) for row in rollup["varietals"]],
+        processing_methods=[TopProcess(**row) for row in rollup["processing_methods"]],
+        elevation_range=_rollup_elevation(rollup),
+        is_geocoded=rollup["is_geocoded"],
+    )
 
-    try:
-        country_code = country_code.upper()
-        region_slug = region_slug.lower()
+    return APIResponse.success_response(data=response_data)
 
-        # Step 1: Materialize the IDs for this region (The single slow scan)
-        if region_slug == "unknown-region":
-            region_filter_sql = "o.country = ? AND (o.region IS NULL OR o.region = '')"
-            filter_params = [country_code]
-        else:
-            # Must use the same COALESCE expression as the regions-list GROUP BY
-            # so that a geocoded row groups by its canonical slug, not the raw
-            # region_normalized.  Using OR would leak rows whose raw slug
-            # matches but whose canonical slug belongs to a different group
-            # (e.g. region='Sidama Bensa' → canonical='sidama', not 'sidama-bensa').
-            region_filter_sql = (
-                "o.country = ? AND COALESCE(o.state_canonical_slug, o.region_normalized) = ?"
-            )
-            filter_params = [country_code, region_slug]
 
-        profiled_execute(
-            f"""
-            CREATE TEMPORARY TABLE {temp_table} AS
-            SELECT DISTINCT bean_id, state_canonical, region, country
-            FROM origins o
-            WHERE {region_filter_sql}
-        """,
-            filter_params,
-        )
+@app.get("/v1/origins/{country_code}/{region_slug}/{farm_slug}", response_model=APIResponse[FarmDetailResponse])
+@cached(cache=SimpleMemoryCache)
+async def get_farm_detail(
+    country_code: str,
+    region_slug: str,
+    farm_slug: str,
+    convert_to_currency: str | None = Query(None, description="Currency to convert prices to (e.g. USD, EUR)"),
+):
+    """Get detailed information for a specific farm, including associated beans.
 
-        # Check if we found anything
-        count_row = conn.execute(f"SELECT COUNT(*) FROM {temp_table}").fetchone()
-        if not count_row or count_row[0] == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Region '{region_slug}' not found in country '{country_code}'",
-            )
+    Farm statistics come from ``farm_rollups``; the beans and their origins
+    are then fetched by the rollup's bean IDs.
+    """
+    convert_to_currency = validate_currency_code(convert_to_currency)
+    country_code = country_code.upper()
+    region_slug = region_slug.lower()
+    farm_slug = farm_slug.lower()
 
-        # Step 2: Get display info (Instant from temp table)
-        if region_slug == "unknown-region":
-            display_region_name = "Unknown Region"
-        else:
-            # Prefer the canonical state name (from geocoding) when available;
-            # fall back to the most frequent raw region name for non-geocoded rows.
-            # This is consistent with the regions-list endpoint.
-            name_row = profiled_execute(f"""
-                SELECT COALESCE(
-                    MODE(state_canonical) FILTER (WHERE state_canonical IS NOT NULL),
-                    MODE(region) FILTER (WHERE region IS NOT NULL AND region != '')
-                ) as display_name
-                FROM {temp_table}
-            """).fetchone()
-            display_region_name = name_row[0] if name_row and name_row[0] else region_slug
+    rollup = fetch_rollup(
+        conn, "farm_rollups", country_code=country_code, region_slug=region_slug, farm_slug=farm_slug
+    )
+    if rollup is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Farm '{farm_slug}' not found in region '{region_slug}' (Country: {country_code})",
+        )
 
-        country_name_query = "SELECT name FROM country_codes WHERE alpha_2 = ?"
-        country_name_result = profiled_execute(country_name_query, [country_code]).fetchone()
-        country_name = country_name_result[0] if country_name_result else country_code
-
-        # Step 3: Run all detail queries against the temp table (Extremely fast)
-        # Re-use region_filter_sql on every origins join so a bean that appears in
-        # multiple regions only contributes data for the region being viewed.
-        # total_farms only counts *named* farms (i.e. rows where ``o.farm`` is
-        # non-null/non-empty) so it matches the count of entries in
-        # ``top_farms`` excluding the synthetic "Unknown Farm" bucket.
-        stats_query = f"""
-            SELECT
-                COUNT(DISTINCT cb.id) as total_beans,
-                COUNT(DISTINCT cb.roaster) as total_roasters,
-                COUNT(DISTINCT CASE WHEN o.farm IS NOT NULL AND o.farm != ''
-                    THEN COALESCE(o.farm_canonical, o.farm_normalized)
-                    ELSE NULL END) as total_farms,
-                AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation,
-                AVG(cb.price_usd) as avg_price_usd
-            FROM {temp_table} t
-            JOIN coffee_beans cb ON t.bean_id = cb.id
-            JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-        """
-        stats_row = profiled_execute(stats_query, filter_params).fetchone()
-        statistics = RegionStatistics(
-            total_beans=stats_row[0] or 0,
-            total_roasters=stats_row[1] or 0,
-            total_farms=stats_row[2] or 0,
-            avg_elevation=int(stats_row[3]) if stats_row[3] is not None else None,
-            avg_price_usd=stats_row[4],
-        )
-
-        # All beans come from farms - get farms with known names
-        farms_query = f"""
-            SELECT
-                COALESCE(ANY_VALUE(o.farm_canonical), arg_max(o.farm, length(o.farm))) as farm_display_name,
-                MODE(o.producer) FILTER (WHERE o.producer IS NOT NULL AND o.producer != '') as producer_display_name,
-                COUNT(DISTINCT cb.id) as bean_count,
-                AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-            FROM {temp_table} t
-            JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-            JOIN coffee_beans cb ON t.bean_id = cb.id
-            WHERE o.farm IS NOT NULL AND o.farm != ''
-            GROUP BY COALESCE(o.farm_canonical, o.farm_normalized)
-            ORDER BY bean_count DESC
-        """
-        farms_rows = profiled_execute(farms_query, filter_params).fetchall()
-        farms = [
-            FarmSummary(
-                farm_name=row[0],
-                producer_name=row[1],
-                bean_count=row[2],
-                avg_elevation=int(row[3]) if row[3] is not None else None,
-            )
-            for row in farms_rows
-        ]
-
-        # Always include unknown farms (beans without farm names still come from farms)
-        unknown_farms_query = f"""
-            SELECT
-                COUNT(DISTINCT cb.id) as bean_count,
-                AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-            FROM {temp_table} t
-            JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-            JOIN coffee_beans cb ON t.bean_id = cb.id
-            WHERE (o.farm IS NULL OR o.farm = '')
-        """
-        unknown_farms_row = profiled_execute(unknown_farms_query, filter_params).fetchone()
-        # Always add Unknown Farm entry since all beans come from farms
-        farms.append(
-            FarmSummary(
-                farm_name="Unknown Farm",
-                producer_name=None,
-                bean_count=unknown_farms_row[0] if unknown_farms_row else 0,
-                avg_elevation=int(unknown_farms_row[1])
-                if unknown_farms_row and unknown_farms_row[1] is not None
-                else None,
-            )
-        )
-
-        roasters_query = f"""
-            SELECT
-                cb.roaster,
-                COUNT(DISTINCT cb.id) as bean_count
-            FROM {temp_table} t
-            JOIN coffee_beans cb ON t.bean_id = cb.id
-            GROUP BY cb.roaster
-            ORDER BY bean_count DESC, cb.roaster ASC
-            LIMIT 10
-        """
-        roasters_rows = profiled_execute(roasters_query).fetchall()
-        top_roasters = [TopRoaster(roaster_name=row[0], bean_count=row[1]) for row in roasters_rows]
-
-        notes_query = f"""
-            SELECT
-                note,
-                COUNT(DISTINCT bean_id) as frequency
-            FROM (
-                SELECT unnest(cb.tasting_notes) as note, cb.id as bean_id
-                FROM {temp_table} t
-                JOIN coffee_beans cb ON t.bean_id = cb.id
-            )
-            GROUP BY note
-            ORDER BY frequency DESC, note ASC
-            LIMIT 15
-        """
-        notes_rows = profiled_execute(notes_query).fetchall()
-        common_tasting_notes = [TopNote(note=row[0], frequency=row[1]) for row in notes_rows]
-
-        varietal_query = f"""
-            SELECT
-                canonical_variety,
-                COUNT(DISTINCT bean_id) as count
-            FROM (
-                SELECT
-                    unnest(CASE
-                        WHEN o.variety_canonical IS NOT NULL AND len(o.variety_canonical) > 0 THEN o.variety_canonical
-                        ELSE [o.variety]
-                    END) as canonical_variety,
-                    cb.id as bean_id
-                FROM {temp_table} t
-                JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-                JOIN coffee_beans cb ON t.bean_id = cb.id
-            )
-            WHERE canonical_variety IS NOT NULL AND canonical_variety != ''
-            GROUP BY canonical_variety
-            ORDER BY count DESC, canonical_variety ASC
-            LIMIT 10
-        """
-        varietal_rows = profiled_execute(varietal_query, filter_params).fetchall()
-        varietals = [TopVariety(variety=row[0], count=row[1]) for row in varietal_rows]
-
-        process_query = f"""
-            SELECT
-                COALESCE(NULLIF(o.process_common_name, ''), NULLIF(o.process, ''), 'Unknown') as process_name,
-                COUNT(DISTINCT cb.id) as count
-            FROM {temp_table} t
-            JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-            JOIN coffee_beans cb ON t.bean_id = cb.id
-            GROUP BY process_name
-            ORDER BY count DESC, process_name ASC
-            LIMIT 10
-        """
-        process_rows = profiled_execute(process_query, filter_params).fetchall()
-        processing_methods = [TopProcess(process=row[0], count=row[1]) for row in process_rows]
-
-        elevation_query = f"""
-            SELECT
-                MIN(NULLIF(o.elevation_min, 0)) as min_elevation,
-                MAX(NULLIF(o.elevation_max, 0)) as max_elevation,
-                AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-            FROM {temp_table} t
-            JOIN origins o ON t.bean_id = o.bean_id AND {region_filter_sql}
-            WHERE (o.elevation_min > 0 OR o.elevation_max > 0)
-        """
-        elev_row = profiled_execute(elevation_query, filter_params).fetchone()
-        elevation_range = ElevationInfo(
-            min=elev_row[0], max=elev_row[1], avg=int(elev_row[2]) if elev_row[2] is not None else None
-        )
-
-        is_geocoded_query = f"SELECT BOOL_OR(state_canonical IS NOT NULL) FROM {temp_table}"
-        is_geocoded_row = profiled_execute(is_geocoded_query).fetchone()
-        is_geocoded = is_geocoded_row[0] if is_geocoded_row and is_geocoded_row[0] is not None else False
-
-        response_data = RegionDetailResponse(
-            region_name=display_region_name,
-            country_code=country_code,
-            country_name=country_name,
-            statistics=statistics,
-            top_farms=farms,
-            top_roasters=top_roasters,
-            common_tasting_notes=common_tasting_notes,
-            varietals=varietals,
-            processing_methods=processing_methods,
-            elevation_range=elevation_range,
-            is_geocoded=is_geocoded,
-        )
-
-        return APIResponse.success_response(data=response_data)
-    finally:
-        # Final cleanup
-        conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
-        conn.execute("PRAGMA disable_profiling")
-
-
-@app.get("/v1/origins/{country_code}/{region_slug}/{farm_slug}", response_model=APIResponse[FarmDetailResponse])
-@cached(cache=SimpleMemoryCache)
-async def get_farm_detail(
-    country_code: str,
-    region_slug: str,
-    farm_slug: str,
-    convert_to_currency: str | None = Query(None, description="Currency to convert prices to (e.g. USD, EUR)"),
-):
-    """Get detailed information for a specific farm, including associated beans."""
-    convert_to_currency = validate_currency_code(convert_to_currency)
-    # Setup profiling helper
-    query_count = 0
-    request_id = int(time.time())
-    temp_table = f"_farm_beans_{request_id}"
-
-    def profiled_execute(query, params=None):
-        nonlocal query_count
-        query_count += 1
-
-        if not ENABLE_PROFILING:
-             return conn.execute(query, params) if params is not None else conn.execute(query)
-
-        profile_file = f"duckdb_profile_{request_id}_farm_q{query_count}.json"
-        conn.execute("PRAGMA enable_profiling = 'json'")
-        conn.execute(f"PRAGMA profiling_output = '{profile_file}'")
-
-        start = time.perf_counter()
-        result = conn.execute(query, params) if params is not None else conn.execute(query)
-        duration = time.perf_counter() - start
-
-        print(f"PROFILER [FARM Q{query_count}]: Took {duration:.4f}s - Saved to {profile_file}")
-        preview = " ".join(query.split())[:80] + "..."
-        print(f"      SQL: {preview}")
+    beans_query = """
+        SELECT DISTINCT
+            cb.id as bean_id, cb.name, cb.roaster, cb.url, cb.is_single_origin,
+            cb.roast_level, cb.roast_profile, cb.weight, cb.price, cb.currency,
+            cb.is_decaf, cb.cupping_score,
+            (
+                SELECT list(struct_pack(
+                    note := note_value,
+                    primary_category := (SELECT primary_category FROM tasting_notes_categories WHERE tasting_note = note_value LIMIT 1)
+                ))
+                FROM unnest(cb.tasting_notes) AS u(note_value)
+            ) AS tasting_notes_with_categories,
+            cb.description, cb.in_stock, cb.scraped_at, cb.scraper_version, cb.image_url,
+            cb.clean_url_slug, cb.bean_url_path, cb.price_paid_for_green_coffee,
+            cb.currency_of_price_paid_for_green_coffee, rwl.roaster_country_code, rwl.location as roaster_location
+        FROM (
+            SELECT DISTINCT ON (clean_url_slug) *
+            FROM coffee_beans cb_inner
+            WHERE list_contains(?, id)
+            ORDER BY clean_url_slug, scraped_at DESC
+        ) cb
+        LEFT JOIN roasters_with_location rwl ON cb.roaster = rwl.name
+        ORDER BY cb.name ASC
+    """
+    bean_rows = conn.execute(beans_query, [rollup["bean_ids"]]).fetchall()
 
-        return result
+    # Origins for every listed bean in one query
+    origins_query = """
+        SELECT o.bean_id, o.country, o.region, o.producer, o.farm, o.elevation_min, o.elevation_max,
+               COALESCE(NULLIF(o.process_common_name, ''), o.process) as process, o.variety, o.variety_canonical, o.harvest_date, o.latitude, o.longitude,
+               cc.name as country_full_name
+        FROM origins o
+        LEFT JOIN country_codes cc ON o.country = cc.alpha_2
+        WHERE list_contains(?, o.bean_id)
+        ORDER BY o.id
+    """
+    origins_by_bean: dict[int, list[APIBean]] = {}
+    for r in conn.execute(origins_query, [[row[0] for row in bean_rows]]).fetchall():
+        origins_by_bean.setdefault(r[0], []).append(APIBean(**{
+            "country": r[1], "region": r[2], "producer": r[3], "farm": r[4], "elevation_min": r[5],
+            "elevation_max": r[6], "process": r[7], "variety": r[8], "variety_canonical": r[9],
+            "harvest_date": r[10], "latitude": r[11], "longitude": r[12], "country_full_name": r[13]
+        }))
 
-    try:
-        country_code = country_code.upper()
-        region_slug = region_slug.lower()
-        farm_slug = farm_slug.lower()
-
-        # Step 1: Materialize the target rows for this specific farm (The single slow scan)
-        if region_slug == "unknown-region":
-            region_filter_sql = "(o.region IS NULL OR o.region = '')"
-            region_params = []
-        else:
-            region_filter_sql = "COALESCE(o.state_canonical_slug, o.region_normalized) = ?"
-            region_params = [region_slug]
+    columns = [
+        "id",
+        "name",
+        "roaster",
+        "url",
+        "is_single_origin",
+        "roast_level",
+        "roast_profile",
+        "weight",
+        "price",
+        "currency",
+        "is_decaf",
+        "cupping_score",
+        "tasting_notes_with_categories",
+        "description",
+        "in_stock",
+        "scraped_at",
+        "scraper_version",
+        "image_url",
+        "clean_url_slug",
+        "bean_url_path",
+        "price_paid_for_green_coffee",
+        "currency_of_price_paid_for_green_coffee",
+        "roaster_country_code",
+        "roaster_location",
+    ]
 
-        if farm_slug == "unknown-farm":
-            farm_filter_sql = "(o.farm IS NULL OR o.farm = '')"
-            farm_params = []
-        else:
-            farm_filter_sql = "(normalize_farm_name(o.farm_canonical) = ? OR o.farm_normalized = ?)"
-            farm_params = [farm_slug, farm_slug]
+    coffee_beans = []
+    for row in bean_rows:
+        bean_dict = dict(zip(columns, row))
+        bean_dict["tasting_notes"] = bean_dict.pop("tasting_notes_with_categories")
 
-        profiled_execute(f"""
-            CREATE TEMPORARY TABLE {temp_table} AS
-            SELECT DISTINCT
-                o.bean_id, o.country, o.region, o.state_canonical, o.farm, o.farm_canonical,
-                o.farm_normalized, o.producer, o.latitude, o.longitude, o.elevation_min,
-                o.elevation_max, o.process, o.process_common_name, o.variety, o.variety_canonical
-            FROM origins o
-            WHERE o.country = ?
-            AND {region_filter_sql}
-            AND {farm_filter_sql}
-        """, [country_code] + region_params + farm_params)
-
-        # Check if we found anything
-        count_row = conn.execute(f"SELECT COUNT(*) FROM {temp_table}").fetchone()
-        if not count_row or count_row[0] == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Farm '{farm_slug}' not found in region '{region_slug}' (Country: {country_code})",
-            )
+        if convert_to_currency:
+            target_currency = convert_to_currency.upper()
+            if bean_dict.get("price") is not None and bean_dict.get("currency"):
+                converted = convert_price(conn, bean_dict["price"], bean_dict["currency"], target_currency)
+                if converted is not None:
+                    bean_dict["price"] = round(converted, 2)
+                    bean_dict["currency"] = target_currency
 
-        # Step 2: Get display info (Instant from temp table)
-        farm_display_name_row = profiled_execute(f"""
-            SELECT
-                COALESCE(
-                    ANY_VALUE(farm_canonical),
-                    arg_max(farm, length(farm)),
-                    ANY_VALUE(farm_normalized),
-                    'Unknown Farm'
+            if bean_dict.get("price_paid_for_green_coffee") is not None and bean_dict.get("currency_of_price_paid_for_green_coffee"):
+                converted_green = convert_price(
+                    conn, bean_dict["price_paid_for_green_coffee"],
+                    bean_dict["currency_of_price_paid_for_green_coffee"], target_currency
                 )
-            FROM {temp_table}
-        """).fetchone()
-        actual_farm = farm_display_name_row[0]
-
-        if region_slug == "unknown-region":
-            actual_region = "Unknown Region"
-        else:
-            region_name_row = profiled_execute(f"""
-                SELECT COALESCE(ANY_VALUE(state_canonical), arg_max(region, length(region)))
-                FROM {temp_table}
-            """).fetchone()
-            actual_region = region_name_row[0] if region_name_row and region_name_row[0] else region_slug
-
-        country_name_query = "SELECT name FROM country_codes WHERE alpha_2 = ?"
-        country_name_result = profiled_execute(country_name_query, [country_code]).fetchone()
-        country_name = country_name_result[0] if country_name_result else country_code
-
-        # Step 3: Get farm environmental details (Instant from temp table)
-        farm_row = profiled_execute(f"""
-            SELECT
-                AVG(latitude) as latitude,
-                AVG(longitude) as longitude,
-                MIN(NULLIF(elevation_min, 0)) as elevation_min,
-                MAX(NULLIF(elevation_max, 0)) as max_elevation
-            FROM {temp_table}
-        """).fetchone()
-        lat, lng, elev_min, elev_max = farm_row
-
-        # Step 4: Get beans and their nested data (Using temp table)
-        beans_query = f"""
-            SELECT DISTINCT
-                cb.id as bean_id, cb.name, cb.roaster, cb.url, cb.is_single_origin,
-                cb.roast_level, cb.roast_profile, cb.weight, cb.price, cb.currency,
-                cb.is_decaf, cb.cupping_score,
-                (
-                    SELECT list(struct_pack(
-                        note := note_value,
-                        primary_category := (SELECT primary_category FROM tasting_notes_categories WHERE tasting_note = note_value LIMIT 1)
-                    ))
-                    FROM unnest(cb.tasting_notes) AS u(note_value)
-                ) AS tasting_notes_with_categories,
-                cb.description, cb.in_stock, cb.scraped_at, cb.scraper_version, cb.image_url,
-                cb.clean_url_slug, cb.bean_url_path, cb.price_paid_for_green_coffee,
-                cb.currency_of_price_paid_for_green_coffee, rwl.roaster_country_code, rwl.location as roaster_location
-            FROM (
-                SELECT DISTINCT ON (clean_url_slug) *
-                FROM coffee_beans cb_inner
-                WHERE id IN (SELECT bean_id FROM {temp_table})
-                ORDER BY clean_url_slug, scraped_at DESC
-            ) cb
-            LEFT JOIN roasters_with_location rwl ON cb.roaster = rwl.name
-            ORDER BY cb.name ASC
-        """
-        bean_rows = profiled_execute(beans_query).fetchall()
-
-        columns = [
-            "id",
-            "name",
-            "roaster",
-            "url",
-            "is_single_origin",
-            "roast_level",
-            "roast_profile",
-            "weight",
-            "price",
-            "currency",
-            "is_decaf",
-            "cupping_score",
-            "tasting_notes_with_categories",
-            "description",
-            "in_stock",
-            "scraped_at",
-            "scraper_version",
-            "image_url",
-            "clean_url_slug",
-            "bean_url_path",
-            "price_paid_for_green_coffee",
-            "currency_of_price_paid_for_green_coffee",
-            "roaster_country_code",
-            "roaster_location",
-        ]
-
-        coffee_beans = []
-        for row in bean_rows:
-            bean_dict = dict(zip(columns, row))
-            bean_dict["tasting_notes"] = bean_dict.pop("tasting_notes_with_categories")
-
-            if convert_to_currency:
-                target_currency = convert_to_currency.upper()
-                if bean_dict.get("price") is not None and bean_dict.get("currency"):
-                    converted = convert_price(conn, bean_dict["price"], bean_dict["currency"], target_currency)
-                    if converted is not None:
-                        bean_dict["price"] = round(converted, 2)
-                        bean_dict["currency"] = target_currency
-
-                if bean_dict.get("price_paid_for_green_coffee") is not None and bean_dict.get("currency_of_price_paid_for_green_coffee"):
-                    converted_green = convert_price(
-                        conn, bean_dict["price_paid_for_green_coffee"],
-                        bean_dict["currency_of_price_paid_for_green_coffee"], target_currency
-                    )
-                    if converted_green is not None:
-                        bean_dict["price_paid_for_green_coffee"] = round(converted_green, 2)
-                        bean_dict["currency_of_price_paid_for_green_coffee"] = target_currency
-
-            # Fetch origins for this bean using the full origins table, but limited to this bean
-            origins_query = """
-                SELECT o.country, o.region, o.producer, o.farm, o.elevation_min, o.elevation_max,
-                       COALESCE(NULLIF(o.process_common_name, ''), o.process) as process, o.variety, o.variety_canonical, o.harvest_date, o.latitude, o.longitude,
-                       cc.name as country_full_name
-                FROM origins o
-                LEFT JOIN country_codes cc ON o.country = cc.alpha_2
-                WHERE o.bean_id = ?
-                ORDER BY o.id
-            """
-            origins_results = conn.execute(origins_query, [bean_dict["id"]]).fetchall()
-            origins = [APIBean(**{
-                "country": r[0], "region": r[1], "producer": r[2], "farm": r[3], "elevation_min": r[4],
-                "elevation_max": r[5], "process": r[6], "variety": r[7], "variety_canonical": r[8],
-                "harvest_date": r[9], "latitude": r[10], "longitude": r[11], "country_full_name": r[12]
-            }) for r in origins_results]
-
-            bean_dict["origins"] = origins
-            coffee_beans.append(APISearchResult(**bean_dict))
-
-        # Additional statistics (Fast from temp table)
-        producer_rows = profiled_execute(f"""
-            SELECT producer, COUNT(*) as mention_count
-            FROM {temp_table}
-            WHERE producer IS NOT NULL AND producer != ''
-            GROUP BY producer
-            ORDER BY mention_count DESC, length(producer) DESC
-        """).fetchall()
-
-        cleaned_producers = {}
-        for p_name, p_count in producer_rows:
-            norm_name = normalize_farm_name(p_name)
-            if norm_name not in cleaned_producers:
-                cleaned_producers[norm_name] = {"name": p_name, "mention_count": p_count}
-            else:
-                cleaned_producers[norm_name]["mention_count"] += p_count
+                if converted_green is not None:
+                    bean_dict["price_paid_for_green_coffee"] = round(converted_green, 2)
+                    bean_dict["currency_of_price_paid_for_green_coffee"] = target_currency
 
-        producers = sorted(cleaned_producers.values(), key=lambda x: (x["mention_count"], len(x["name"])), reverse=True)
-        producer_name = producers[0]["name"] if producers else None
+        bean_dict["origins"] = origins_by_bean.get(bean_dict["id"], [])
+        coffee_beans.append(APISearchResult(**bean_dict))
 
-        notes_query = f"""
-            SELECT note, COUNT(*) as frequency
-            FROM (
-                SELECT unnest(cb.tasting_notes) as note
-                FROM coffee_beans cb
-                WHERE id IN (SELECT bean_id FROM {temp_table})
-            )
-            GROUP BY note
-            ORDER BY frequency DESC, note ASC
-            LIMIT 10
-        """
-        notes_rows = profiled_execute(notes_query).fetchall()
-        common_tasting_notes = [TopNote(note=row[0], frequency=row[1]) for row in notes_rows]
+    # Merge producer spellings that normalize to the same name
+    cleaned_producers = {}
+    for producer in rollup["producers"]:
+        p_name, p_count = producer["name"], producer["mention_count"]
+        norm_name = normalize_farm_name(p_name)
+        if norm_name not in cleaned_producers:
+            cleaned_producers[norm_name] = {"name": p_name, "mention_count": p_count}
+        else:
+            cleaned_producers[norm_name]["mention_count"] += p_count
 
-        varietal_query = f"""
-            SELECT canonical_variety, COUNT(DISTINCT bean_id) as count
-            FROM (
-                SELECT
-                    unnest(CASE
-                        WHEN variety_canonical IS NOT NULL AND len(variety_canonical) > 0 THEN variety_canonical
-                        ELSE [variety]
-                    END) as canonical_variety,
-                    bean_id
-                FROM {temp_table}
-            )
-            WHERE canonical_variety IS NOT NULL AND canonical_variety != ''
-            GROUP BY canonical_variety
-            ORDER BY count DESC, canonical_variety ASC
-        """
-        varietal_rows = profiled_execute(varietal_query).fetchall()
-        varietals = [TopVariety(variety=row[0], count=row[1]) for row in varietal_rows]
+    producers = sorted(cleaned_producers.values(), key=lambda x: (x["mention_count"], len(x["name"])), reverse=True)
+    producer_name = producers[0]["name"] if producers else None
 
-        process_query = f"""
-            SELECT
-                COALESCE(NULLIF(process_common_name, ''), NULLIF(process, ''), 'Unknown') as process_name,
-                COUNT(DISTINCT bean_id) as count
-            FROM {temp_table}
-            GROUP BY process_name
-            ORDER BY count DESC, process_name ASC
-        """
-        process_rows = profiled_execute(process_query).fetchall()
-        processing_methods = [TopProcess(process=row[0], count=row[1]) for row in process_rows]
-
-        response_data = FarmDetailResponse(
-            farm_name=actual_farm, producer_name=producer_name, producers=producers,
-            region_name=actual_region, country_code=country_code, country_name=country_name,
-            latitude=lat, longitude=lng, elevation_min=elev_min, elevation_max=elev_max,
-            beans=coffee_beans, varietals=varietals, processing_methods=processing_methods,
-            common_tasting_notes=common_tasting_notes,
-        )
-        return APIResponse.success_response(data=response_data)
-    finally:
-        conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
-        conn.execute("PRAGMA disable_profiling")
+    response_data = FarmDetailResponse(
+        farm_name=rollup["farm_name"], producer_name=producer_name, producers=producers,
+        region_name=rollup["region_name"], country_code=country_code,
+        country_name=rollup["country_name"] or country_code,
+        latitude=rollup["latitude"], longitude=rollup["longitude"],
+        elevation_min=rollup["elevation_min"], elevation_max=rollup["elevation_max"],
+        beans=coffee_beans,
+        varietals=[TopVariety(**row) for row in rollup["varietals"]],
+        processing_methods=[TopProcess(**row) for row in rollup["processing_methods"]],
+        common_tasting_notes=[TopNote(**row) for row in rollup["common_tasting_notes"]],
+    )
+    return APIResponse.success_response(data=response_data)
 
 
 @app.get("/v1/country-codes", response_model=APIResponse[list[dict]])
@@ -4503,177 +3705,20 @@ async def search_origins(
     country_code: str | None = Query(None, description="Optional country code to filter by"),
     region_slug: str | None = Query(None, description="Optional region slug to filter by"),
 ):
-    """Search for countries, regions, and farms matching the query."""
-    if not q.strip():
-        return APIResponse.success_response(data=[])
-
-    search_term = f"%{q}%"
-
-    # Search countries
-    countries_query = """
-        SELECT
-            'country' as type,
-            cc.name as name,
-            cc.alpha_2 as country_code,
-            cc.name as country_name,
-            NULL as region_name,
-            NULL as region_slug,
-            NULL as farm_slug,
-            NULL as producer_name,
-            COUNT(DISTINCT cb.id) as bean_count,
-            COUNT(DISTINCT o.farm_normalized) as farm_count,
-            AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-        FROM country_codes cc
-        LEFT JOIN origins o ON cc.alpha_2 = o.country
-        LEFT JOIN coffee_beans cb ON o.bean_id = cb.id
-        WHERE (strip_accents(cc.name) ILIKE strip_accents(?) OR cc.alpha_2 ILIKE ?)
-        AND (? IS NULL OR cc.alpha_2 = ?)
-        AND (? IS NULL) -- Countries don't have region slugs
-        GROUP BY cc.name, cc.alpha_2
-        ORDER BY bean_count DESC
-        LIMIT ?
-    """
+    """Search for countries, regions, and farms matching the query.
 
-    # Search regions
-    regions_query = """
-        SELECT
-            'region' as type,
-            COALESCE(
-                ANY_VALUE(o.state_canonical),
-                arg_max(o.region, length(o.region))
-            ) as name,
-            o.country as country_code,
-            arg_max(cc.name, length(cc.name)) as country_name,
-            COALESCE(
-                ANY_VALUE(o.state_canonical),
-                arg_max(o.region, length(o.region))
-            ) as region_name,
-            normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region')) as region_slug,
-            NULL as farm_slug,
-            NULL as producer_name,
-            COUNT(DISTINCT o.bean_id) as bean_count,
-            COUNT(DISTINCT o.farm_normalized) as farm_count,
-            AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-        FROM origins o
-        JOIN country_codes cc ON o.country = cc.alpha_2
-        WHERE (o.region_unaccented ILIKE strip_accents(?) OR o.state_canonical_unaccented ILIKE strip_accents(?))
-        AND (? IS NULL OR o.country = ?)
-        AND (? IS NULL OR normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region')) = ?)
-        GROUP BY
-            o.country,
-            normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region'))
-        ORDER BY bean_count DESC
-        LIMIT ?
+    Served from the refresh-time ``origin_suggestions`` index: names are
+    matched as accent- and case-insensitive substrings, best-stocked first.
     """
+    if not q.strip():
+        return APIResponse.success_response(data=[])
 
-    # Search farms
-    farms_query = """
-        SELECT
-            'farm' as type,
-            COALESCE(
-                ANY_VALUE(o.farm_canonical),
-                arg_max(o.farm, length(o.farm))
-            ) as name,
-            o.country as country_code,
-            arg_max(cc.name, length(cc.name)) as country_name,
-            COALESCE(
-                ANY_VALUE(o.state_canonical),
-                arg_max(o.region, length(o.region))
-            ) as region_name,
-            normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region')) as region_slug,
-            normalize_farm_name(COALESCE(
-                ANY_VALUE(o.farm_canonical),
-                ANY_VALUE(o.farm_normalized)
-            )) as farm_slug,
-            MODE(o.producer) FILTER (WHERE o.producer IS NOT NULL AND o.producer != '') as producer_name,
-            COUNT(DISTINCT o.bean_id) as bean_count,
-            NULL as farm_count,
-            AVG((NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2) as avg_elevation
-        FROM origins o
-        JOIN country_codes cc ON o.country = cc.alpha_2
-        WHERE (o.farm_unaccented ILIKE strip_accents(?)
-        OR o.producer_unaccented ILIKE strip_accents(?))
-        AND (? IS NULL OR o.country = ?)
-        AND (? IS NULL OR normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region')) = ?)
-        GROUP BY
-            o.country,
-            normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region')),
-            COALESCE(o.farm_canonical, o.farm_normalized)
-        ORDER BY bean_count DESC
-        LIMIT ?
-    """
-
-    results = []
-
-    # Run queries
-    # Country results
-    country_rows = conn.execute(
-        countries_query, [search_term, search_term, country_code, country_code, region_slug, limit]
-    ).fetchall()
-    for row in country_rows:
-        results.append(
-            OriginSearchResult(
-                type=row[0],
-                name=row[1],
-                country_code=row[2],
-                country_name=row[3],
-                region_name=row[4],
-                region_slug=row[5],
-                farm_slug=row[6],
-                producer_name=row[7],
-                bean_count=row[8],
-                farm_count=row[9],
-                avg_elevation=row[10],
-            )
-        )
-
-    # Region results
-    region_rows = conn.execute(
-        regions_query, [search_term, search_term, country_code, country_code, region_slug, region_slug, limit]
-    ).fetchall()
-    for row in region_rows:
-        results.append(
-            OriginSearchResult(
-                type=row[0],
-                name=row[1],
-                country_code=row[2],
-                country_name=row[3],
-                region_name=row[4],
-                region_slug=row[5],
-                farm_slug=row[6],
-                producer_name=row[7],
-                bean_count=row[8],
-                farm_count=row[9],
-                avg_elevation=row[10],
-            )
-        )
-
-    # Farm results
-    farm_rows = conn.execute(
-        farms_query, [search_term, search_term, country_code, country_code, region_slug, region_slug, limit]
-    ).fetchall()
-    for row in farm_rows:
-        results.append(
-            OriginSearchResult(
-                type=row[0],
-                name=row[1],
-                country_code=row[2],
-                country_name=row[3],
-                region_name=row[4],
-                region_slug=row[5],
-                farm_slug=row[6],
-                producer_name=row[7],
-                bean_count=row[8],
-                farm_count=row[9],
-                avg_elevation=row[10],
-            )
-        )
-
-    # Sort results by bean count descending
-    results.sort(key=lambda x: x.bean_count, reverse=True)
+    index = get_origin_suggestion_index(conn)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Origin search index is not available; run `kissaten refresh`")
 
-    # Final limit
-    return APIResponse.success_response(data=results[:limit])
+    results = index.search(q, limit, country_code=country_code, region_slug=region_slug)
+    return APIResponse.success_response(data=[OriginSearchResult(**row) for row in results])
 
 
 @app.get("/v1/beans/{roaster_slug}/{bean_slug}", response_model=APIResponse[APICoffeeBean])
@@ -4686,7 +3731,15 @@ async def get_bean_by_slug(
 ):
     """Get a specific coffee bean by roaster slug and bean slug from URL-friendly paths."""
     convert_to_currency = validate_currency_code(convert_to_currency)
+    coffee_bean = await load_bean_by_slug(roaster_slug, bean_slug, convert_to_currency)
+    return json_response(APIResponse.success_response(data=coffee_bean))
+
+
+async def load_bean_by_slug(roaster_slug: str, bean_slug: str, convert_to_currency: str | None) -> dict:
+    """A bean with its origins and price options as an ``APICoffeeBean`` read model.
 
+    Raises a 404 if the bean does not exist.
+    """
     expected_bean_url_path = f"/{roaster_slug}/{bean_slug}"
 
     query = """
@@ -4787,7 +3840,7 @@ async def get_bean_by_slug(
             "region_canonical": origin_row[13] if origin_row[13] and origin_row[13].strip() else None,
             "farm_canonical": origin_row[14] if origin_row[14] and origin_row[14].strip() else None,
         }
-        origins.append(APIBean(**origin_data))
+        origins.append(APIBean.read_model(**origin_data))
 
     bean_data["origins"] = origins
 
@@ -4849,9 +3902,7 @@ async def get_bean_by_slug(
     bean_data["price_options"] = price_options
 
     # Convert to APICoffeeBean object
-    coffee_bean = APICoffeeBean(**bean_data)
-
-    return APIResponse.success_response(data=coffee_bean)
+    return APICoffeeBean.read_model(**bean_data)
 
 
 @app.get("/v1/beans/{roaster_slug}/{bean_slug}/beanconquerer-link", response_model=APIResponse[dict])
@@ -4871,11 +3922,7 @@ async def get_bean_beanconquerer_link(
     """
     target_currency = validate_currency_code(convert_to_currency) or "USD"
 
-    bean_response = await get_bean_by_slug(roaster_slug, bean_slug, None)
-    if bean_response.data is None:
-        raise HTTPException(status_code=404, detail="Bean not found")
-
-    bean = bean_response.data
+    bean = APICoffeeBean(**await load_bean_by_slug(roaster_slug, bean_slug, None))
     kissaten_url = f"https://kissaten.app/roasters/{roaster_slug}/{bean_slug}"
     share_url = build_share_link(
         bean,
@@ -4960,6 +4007,117 @@ async def get_custom_bean_beanconquerer_link(
     return APIResponse.success_response(data={"share_url": share_url})
 
 
+def _search_engine_recommendations(
+    target_bean,
+    filter_params: FilterParams,
+    *,
+    include_roaster: bool,
+    include_origin: bool,
+    include_notes: bool,
+    include_roast: bool,
+    include_process: bool,
+    include_variety: bool,
+    different_roaster_boost: bool,
+    limit: int,
+) -> list[tuple[int, float]]:
+    """Rank recommendation candidates with the search engine's relevance scoring.
+
+    Fallback for when the recommendation index has not been built. Returns
+    (bean_id, similarity_score) pairs, best first.
+    """
+    weights = filter_params.weights
+
+    if include_notes and target_bean.tasting_notes:
+        # Join notes into a boolean query (OR match for any notes)
+        # Use quotes for multi-word notes to ensure exact matches
+        processed_notes = []
+        for n in target_bean.tasting_notes:
+            if not n.note:
+                continue
+            note_text = n.note.strip()
+            if " " in note_text:
+                processed_notes.append(f'"{note_text}"')
+            else:
+                processed_notes.append(note_text)
+
+        if processed_notes:
+            filter_params.tasting_notes_query = " | ".join(processed_notes)
+
+    if include_roaster and target_bean.roaster:
+        filter_params.roaster = [target_bean.roaster]
+
+    if include_origin and target_bean.origins:
+        countries = list(set(o.country for o in target_bean.origins if o.country))
+        if countries:
+            filter_params.origin = countries
+
+    if include_roast and target_bean.roast_level:
+        filter_params.roast_level = target_bean.roast_level
+
+    if include_process and target_bean.origins:
+        # Get unique processing methods from the target bean's origins
+        processes = list(set(o.process for o in target_bean.origins if o.process))
+        if processes:
+            # Use boolean OR for multiple processes
+            filter_params.process = " | ".join(processes)
+
+    if include_variety and target_bean.origins:
+        # Get unique varieties from the target bean's origins
+        varieties = []
+        for o in target_bean.origins:
+            if o.variety_canonical:
+                varieties.extend(o.variety_canonical)
+            elif o.variety:
+                varieties.append(o.variety)
+
+        unique_varieties = list(set(v for v in varieties if v))
+        if unique_varieties:
+            # Use boolean OR for multiple varieties
+            filter_params.variety = " | ".join(unique_varieties)
+
+    # Build conditions using existing scoring logic
+    filter_result = build_coffee_bean_filters(filter_params, use_scoring=True)
+    score_components = filter_result.score_components or ["0"]
+
+    # Hard conditions (like is_decaf) are always applied as WHERE filters
+    hard_where = ""
+    if filter_result.hard_conditions:
+        hard_where = " AND " + " AND ".join(filter_result.hard_conditions)
+
+    # Add a different roaster boost if requested to encourage discovery
+    if different_roaster_boost and target_bean.roaster:
+        score_components.append(f"(CASE WHEN cb.roaster != ? THEN {weights.different_roaster_boost} ELSE 0 END)")
+        filter_result.params.append(target_bean.roaster)
+
+    score_sum_clause = " + ".join(score_components)
+
+    recommendations_query = f"""
+        WITH deduplicated_beans AS (
+            SELECT cb.*,
+                   ROW_NUMBER() OVER (PARTITION BY cb.clean_url_slug ORDER BY cb.scraped_at DESC) as rn
+            FROM coffee_beans cb
+        ),
+        scored_beans AS (
+            SELECT
+                cb.id,
+                cb.scraped_at,
+                cb.name,
+                ({score_sum_clause}) as similarity_score
+            FROM deduplicated_beans cb
+            WHERE cb.rn = 1 AND cb.id != ? AND cb.in_stock = TRUE{hard_where}
+        )
+        SELECT id, similarity_score
+        FROM scored_beans
+        WHERE similarity_score > 0
+        ORDER BY similarity_score DESC, scraped_at DESC, name ASC
+        LIMIT ?
+    """
+
+    # Parameters: score params + target_id (to exclude) + hard filter params + limit
+    params = filter_result.params + [target_bean.id] + (filter_result.hard_params or []) + [limit]
+    return [(bean_id, score) for bean_id, score in conn.execute(recommendations_query, params).fetchall()]
+
+
 @app.get("/v1/beans/{roaster_slug}/{bean_slug}/recommendations", response_model=APIResponse[list[APISearchResult]])
 async def get_bean_recommendations_by_slug(
     roaster_slug: str,
@@ -4989,11 +4147,7 @@ async def get_bean_recommendations_by_slug(
 
     # First get the target bean data
     try:
-        bean_response = await get_bean_by_slug(roaster_slug, bean_slug, convert_to_currency)
-        if not bean_response.data:
-            raise HTTPException(status_code=404, detail="Bean not found")
-
-        target_bean = bean_response.data
+        target_bean = APICoffeeBean(**await load_bean_by_slug(roaster_slug, bean_slug, convert_to_currency))
 
         # Configure weights for recommendation
         weights = ScoringWeights(
@@ -5005,111 +4159,62 @@ async def get_bean_recommendations_by_slug(
             different_roaster_boost=weight_different_roaster,
             variety=weight_variety,
         )
+        recommendation_weights = RecommendationWeights(
+            tasting_notes=weight_tasting_notes if include_notes else 0.0,
+            origin=weight_origin if include_origin else 0.0,
+            roaster=weight_roaster if include_roaster else 0.0,
+            roast_level=weight_roast_level if include_roast else 0.0,
+            process=weight_process if include_process else 0.0,
+            variety=weight_variety if include_variety else 0.0,
+            different_roaster=weight_different_roaster if different_roaster_boost else 0.0,
+        )
 
-        # Build filter params based on target bean
-        # We use the search engine's scoring mode to calculate similarity
-        filter_params = FilterParams(weights=weights, is_decaf=is_decaf)
-
-        if include_notes and target_bean.tasting_notes:
-            # Join notes into a boolean query (OR match for any notes)
-            # Use quotes for multi-word notes to ensure exact matches
-            processed_notes = []
-            for n in target_bean.tasting_notes:
-                if not n.note:
-                    continue
-                note_text = n.note.strip()
-                if " " in note_text:
-                    processed_notes.append(f'"{note_text}"')
-                else:
-                    processed_notes.append(note_text)
-
-            if processed_notes:
-                filter_params.tasting_notes_query = " | ".join(processed_notes)
-
-        if include_roaster and target_bean.roaster:
-            filter_params.roaster = [target_bean.roaster]
-
-        if include_origin and target_bean.origins:
-            countries = list(set(o.country for o in target_bean.origins if o.country))
-            if countries:
-                filter_params.origin = countries
-
-        if include_roast and target_bean.roast_level:
-            filter_params.roast_level = target_bean.roast_level
-
-        if include_process and target_bean.origins:
-            # Get unique processing methods from the target bean's origins
-            processes = list(set(o.process for o in target_bean.origins if o.process))
-            if processes:
-                # Use boolean OR for multiple processes
-                filter_params.process = " | ".join(processes)
-
-        if include_variety and target_bean.origins:
-            # Get unique varieties from the target bean's origins
-            varieties = []
-            for o in target_bean.origins:
-                if o.variety_canonical:
-                    varieties.extend(o.variety_canonical)
-                elif o.variety:
-                    varieties.append(o.variety)
-
-            unique_varieties = list(set(v for v in varieties if v))
-            if unique_varieties:
-                # Use boolean OR for multiple varieties
-                filter_params.variety = " | ".join(unique_varieties)
-
-        # Build conditions using existing scoring logic
-        filter_result = build_coffee_bean_filters(filter_params, use_scoring=True)
-        score_components = filter_result.score_components or ["0"]
-
-        # Hard conditions (like is_decaf) are always applied as WHERE filters
-        hard_where = ""
-        if filter_result.hard_conditions:
-            hard_where = " AND " + " AND ".join(filter_result.hard_conditions)
-
-        # Add a different roaster boost if requested to encourage discovery
-        if different_roaster_boost and target_bean.roaster:
-            score_components.append(f"(CASE WHEN cb.roaster != ? THEN {weights.different_roaster_boost} ELSE 0 END)")
-            filter_result.params.append(target_bean.roaster)
-
-        score_sum_clause = " + ".join(score_components)
-
-        # Build the recommendation query using the same scoring engine
-        recommendations_query = f"""
-            WITH deduplicated_beans AS (
-                SELECT cb.*,
-                       ROW_NUMBER() OVER (PARTITION BY cb.clean_url_slug ORDER BY cb.scraped_at DESC) as rn
-                FROM coffee_beans cb
-            ),
-            scored_beans AS (
-                SELECT
-                    cb.id,
-                    cb.clean_url_slug,
-                    ({score_sum_clause}) as similarity_score
-                FROM deduplicated_beans cb
-                WHERE cb.rn = 1 AND cb.id != ? AND cb.in_stock = TRUE{hard_where}
+        # Request more than needed if we're not focusing on a single roaster, to allow diversification
+        diversify = not include_roaster or weights.roaster < 5
+        internal_limit = limit * 3 if diversify else limit
+
+        # Nearest neighbours from the refresh-time index: precomputed for the
+        # default weights, scored in memory for custom weights or decaf filters.
+        algorithm = "feature_vectors_v1"
+        ranked = None
+        if is_decaf is None and is_default_weights(recommendation_weights):
+            ranked = precomputed_neighbours(conn, target_bean.id, internal_limit)
+        if ranked is None:
+            recommender = get_recommender(conn)
+            if recommender is not None and target_bean.id in recommender:
+                ranked = recommender.recommend(target_bean.id, internal_limit, recommendation_weights, is_decaf)
+
+        if ranked is None:
+            # Index not built yet: score with the search engine instead
+            algorithm = "search_engine_relevance_v2"
+            ranked = _search_engine_recommendations(
+                target_bean,
+                FilterParams(weights=weights, is_decaf=is_decaf),
+                include_roaster=include_roaster,
+                include_origin=include_origin,
+                include_notes=include_notes,
+                include_roast=include_roast,
+                include_process=include_process,
+                include_variety=include_variety,
+                different_roaster_boost=different_roaster_boost,
+                limit=internal_limit,
             )
+
+        scores = dict(ranked)
+        results = conn.execute(
+            """
             SELECT
                 cb.id, cb.name, cb.roaster, rwl.roaster_country_code, rwl.location as roaster_location, cb.url, cb.is_single_origin,
                 cb.roast_level, cb.roast_profile, cb.weight, cb.price, cb.currency,
                 cb.is_decaf, cb.cupping_score, cb.tasting_notes, cb.description, cb.in_stock,
                 cb.scraped_at, cb.scraper_version, cb.image_url, cb.clean_url_slug,
-                cb.bean_url_path, cb.price_paid_for_green_coffee, cb.currency_of_price_paid_for_green_coffee,
-                sb.similarity_score
-            FROM deduplicated_beans cb
-            JOIN scored_beans sb ON cb.id = sb.id
+                cb.bean_url_path, cb.price_paid_for_green_coffee, cb.currency_of_price_paid_for_green_coffee
+            FROM coffee_beans cb
             LEFT JOIN roasters_with_location rwl ON cb.roaster = rwl.name
-            WHERE cb.rn = 1 AND sb.similarity_score > 0
-            ORDER BY sb.similarity_score DESC, cb.scraped_at DESC, cb.name ASC
-            LIMIT ?
-        """
-
-        # Parameters: score params + target_id (to exclude) + hard filter params + limit
-        # Request more than needed if we're not focusing on a single roaster, to allow diversification
-        internal_limit = limit * 3 if not include_roaster or weights.roaster < 5 else limit
-        params = filter_result.params + [target_bean.id] + (filter_result.hard_params or []) + [internal_limit]
-
-        results = conn.execute(recommendations_query, params).fetchall()
+            WHERE list_contains(?, cb.id)
+            """,
+            [list(scores)],
+        ).fetchall()
 
         columns = [
             "id",
@@ -5136,16 +4241,17 @@ async def get_bean_recommendations_by_slug(
             "bean_url_path",
             "price_paid_for_green_coffee",
             "currency_of_price_paid_for_green_coffee",
-            "similarity_score",
         ]
 
-        # Use a list for candidate data before pruning/diversification
+        # Use a list for candidate data before pruning/diversification, in ranked order
+        beans_by_id = {row[0]: dict(zip(columns, row)) for row in results}
         candidates = []
-        for row in results:
-            candidates.append(dict(zip(columns, row)))
+        for bean_id, score in ranked:
+            if bean_id in beans_by_id:
+                candidates.append({**beans_by_id[bean_id], "similarity_score": score})
 
         # Diversification logic: limit beans from the same roaster if discovery is requested
-        if (not include_roaster or weights.roaster < 5) and len(candidates) > limit:
+        if diversify and len(candidates) > limit:
             pruned_candidates = []
             roaster_counts = {}
             # Max 2 beans per roaster unless we run out of diverse options
@@ -5174,51 +4280,42 @@ async def get_bean_recommendations_by_slug(
         else:
             final_selection = candidates[:limit]
 
+        # Origins for every recommended bean in one query
+        origins_query = """
+            SELECT o.bean_id, o.country, o.region, o.producer, o.farm, o.elevation_min, o.elevation_max,
+                   o.process, o.variety, o.variety_canonical, o.harvest_date, o.latitude, o.longitude,
+                   cc.name as country_full_name
+            FROM origins o
+            LEFT JOIN country_codes cc ON o.country = cc.alpha_2
+            WHERE list_contains(?, o.bean_id)
+            ORDER BY o.id
+        """
+        origins_by_bean: dict[int, list[APIBean]] = {}
+        for origin_row in conn.execute(origins_query, [[bean["id"] for bean in final_selection]]).fetchall():
+            origin_data = {
+                "country": origin_row[1] if origin_row[1] and origin_row[1].strip() else None,
+                "region": origin_row[2] if origin_row[2] and origin_row[2].strip() else None,
+                "producer": origin_row[3] if origin_row[3] and origin_row[3].strip() else None,
+                "farm": origin_row[4] if origin_row[4] and origin_row[4].strip() else None,
+                "elevation_min": origin_row[5] or 0,
+                "elevation_max": origin_row[6] or 0,
+                "process": origin_row[7] if origin_row[7] and origin_row[7].strip() else None,
+                "variety": origin_row[8] if origin_row[8] and origin_row[8].strip() else None,
+                "variety_canonical": origin_row[9] if origin_row[9] else None,
+                "harvest_date": origin_row[10],
+                "latitude": origin_row[11] or 0.0,
+                "longitude": origin_row[12] or 0.0,
+                "country_full_name": origin_row[13],
+            }
+            origins_by_bean.setdefault(origin_row[0], []).append(APIBean.read_model(**origin_data))
+
         recommendations = []
         for bean_data in final_selection:
             # Set default for bean_url_path if needed
             if not bean_data.get("bean_url_path"):
                 bean_data["bean_url_path"] = ""
 
-            # Ensure similarity_score is present for the response model
-            if "similarity_score" in bean_data:
-                # rename it to 'score' for APISearchResult consistency if needed,
-                # but APISearchResult expects 'score'
-                bean_data["score"] = bean_data["similarity_score"]
-
-            # Fetch origins for this recommended bean
-            origins_query = """
-                SELECT o.country, o.region, o.producer, o.farm, o.elevation_min, o.elevation_max,
-                       o.process, o.variety, o.variety_canonical, o.harvest_date, o.latitude, o.longitude,
-                       cc.name as country_full_name
-                FROM origins o
-                LEFT JOIN country_codes cc ON o.country = cc.alpha_2
-                WHERE o.bean_id = ?
-                ORDER BY o.id
-            """
-            origins_results = conn.execute(origins_query, [bean_data["id"]]).fetchall()
-
-            # Convert origins to list of APIBean objects
-            origins = []
-            for origin_row in origins_results:
-                origin_data = {
-                    "country": origin_row[0] if origin_row[0] and origin_row[0].strip() else None,
-                    "region": origin_row[1] if origin_row[1] and origin_row[1].strip() else None,
-                    "producer": origin_row[2] if origin_row[2] and origin_row[2].strip() else None,
-                    "farm": origin_row[3] if origin_row[3] and origin_row[3].strip() else None,
-                    "elevation_min": origin_row[4] or 0,
-                    "elevation_max": origin_row[5] or 0,
-                    "process": origin_row[6] if origin_row[6] and origin_row[6].strip() else None,
-                    "variety": origin_row[7] if origin_row[7] and origin_row[7].strip() else None,
-                    "variety_canonical": origin_row[8] if origin_row[8] else None,
-                    "harvest_date": origin_row[9],
-                    "latitude": origin_row[10] or 0.0,
-                    "longitude": origin_row[11] or 0.0,
-                    "country_full_name": origin_row[12],
-                }
-                origins.append(APIBean(**origin_data))
-
-            bean_data["origins"] = origins
+            bean_data["origins"] = origins_by_bean.get(bean_data["id"], [])
 
             # Handle currency conversion if requested
             if convert_to_currency and convert_to_currency.upper() != bean_data.get("currency", "").upper():
@@ -5245,23 +4342,18 @@ async def get_bean_recommendations_by_slug(
             else:
                 bean_data["price_converted"] = False
 
-            # Create APIRecommendation object
-            # Also set the score field for generic search result compatibility
-            sim_score = row[columns.index("similarity_score")]
-            bean_data["score"] = sim_score
-            # Clear old similarity_score to be sure
-            bean_data.pop("similarity_score", None)
+            # Recommendations are served as search results scored by similarity
+            bean_data["score"] = bean_data.pop("similarity_score")
 
-            recommendation = APIRecommendation(**bean_data, similarity_score=sim_score)
-            recommendations.append(recommendation)
+            recommendations.append(APISearchResult.read_model(**bean_data))
 
-        return APIResponse.success_response(
+        return json_response(APIResponse.success_response(
             data=recommendations,
             metadata={
                 "target_bean_roaster": roaster_slug,
                 "target_bean_slug": bean_slug,
                 "total_recommendations": len(recommendations),
-                "recommendation_algorithm": "search_engine_relevance_v2",
+                "recommendation_algorithm": algorithm,
                 "features_used": {
                     "roaster": include_roaster,
                     "origin": include_origin,
@@ -5272,12 +4364,12 @@ async def get_bean_recommendations_by_slug(
                 "currency_conversion": {
                     "enabled": convert_to_currency is not None,
                     "target_currency": convert_to_currency.upper() if convert_to_currency else None,
-                    "converted_results": sum(1 for rec in recommendations if getattr(rec, "price_converted", False)),
+                    "converted_results": sum(1 for rec in recommendations if rec.get("price_converted", False)),
                 }
                 if convert_to_currency
                 else None,
             },
-        )
+        ))
 
     except HTTPException:
         raise
@@ -5321,6 +4413,7 @@ async def get_processes():
             WITH process_stats AS (
                 SELECT
                     o.process_common_name as process_name,
+                    COALESCE(ANY_VALUE(o.process_category), 'other') as category,
                     STRING_AGG(DISTINCT o.process, ' ') as process_original_names,
                     COUNT(DISTINCT cb.id) as bean_count,
                     COUNT(DISTINCT cb.roaster) as roaster_count,
@@ -5345,6 +4438,7 @@ async def get_processes():
             )
             SELECT
                 p.process_name,
+                p.category,
                 p.process_original_names,
                 p.bean_count,
                 p.roaster_count,
@@ -5380,8 +4474,9 @@ async def get_processes():
         }
 
         for row in results:
-            process_name, process_original_names, bean_count, roaster_count, country_count, countries_list = row
-            category = categorize_process(process_name)
+            process_name, category, process_original_names, bean_count, roaster_count, country_count, countries_list = (
+                row
+            )
             process_slug = normalize_process_name(process_name)
 
             process_data = {
@@ -5419,7 +4514,7 @@ async def get_process_details(process_slug: str, convert_to_currency: str = "EUR
 
     # First, find the actual process_common_name from the slug efficiently
     query = """
-        SELECT process_common_name, COUNT(*) as bean_count
+        SELECT process_common_name, ANY_VALUE(process_category) as category, COUNT(*) as bean_count
         FROM origins
         WHERE process_common_slug = ? OR process_slug = ?
         GROUP BY process_common_name
@@ -5429,6 +4524,7 @@ async def get_process_details(process_slug: str, convert_to_currency: str = "EUR
 
     row = conn.execute(query, [process_slug, process_slug]).fetchone()
     actual_process_common_name = row[0] if row else None
+    process_category = (row[1] if row else None) or categorize_process(actual_process_common_name)
 
     if not actual_process_common_name:
         raise HTTPException(status_code=404, detail=f"Process '{process_slug}' not found")
@@ -5517,7 +4613,7 @@ async def get_process_details(process_slug: str, convert_to_currency: str = "EUR
     process_details = {
         "name": actual_process_common_name,
         "slug": process_slug,
-        "category": categorize_process(actual_process_common_name),
+        "category": process_category,
         "original_names": [{"name": row[0], "bean_count": row[1]} for row in original_processes],
         "statistics": {
             "total_beans": stats[0] if stats[0] else 0,
@@ -5729,10 +4825,10 @@ async def get_process_beans(
                         bean_dict["price_converted"] = True
 
             # Convert origins to correct objects
-            bean_dict["origins"] = [APIBean(**dict(o)) for o in bean_dict["origins"]]
+            bean_dict["origins"] = [APIBean.read_model(**dict(o)) for o in bean_dict["origins"]]
 
             # Create the final result
-            coffee_beans.append(APISearchResult(**bean_dict))
+            coffee_beans.append(APISearchResult.read_model(**bean_dict))
 
     finally:
         conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
@@ -5747,7 +4843,7 @@ async def get_process_beans(
         has_previous=page > 1,
     )
 
-    return APIResponse.success_response(
+    return json_response(APIResponse.success_response(
         data=coffee_beans,
         pagination=pagination,
         metadata={
@@ -5757,12 +4853,12 @@ async def get_process_beans(
             "currency_conversion": {
                 "enabled": convert_to_currency is not None,
                 "target_currency": convert_to_currency.upper() if convert_to_currency else None,
-                "converted_results": sum(1 for bean in coffee_beans if getattr(bean, "price_converted", False)),
+                "converted_results": sum(1 for bean in coffee_beans if bean.get("price_converted", False)),
             }
             if convert_to_currency
             else None,
         },
-    )
+    ))
 
 
 @app.get("/v1/varietals", response_model=APIResponse[dict])
@@ -5800,15 +4896,16 @@ async def get_varietals():
         main_query = """
             WITH varietal_stats AS (
                 SELECT
-                    t.canon_var as canonical_variety,
+                    t.canon_var[1] as canonical_variety,
+                    COALESCE(ANY_VALUE(t.canon_var[2]), 'other') as category,
                     COUNT(DISTINCT cb.id) as bean_count,
                     COUNT(DISTINCT cb.roaster) as roaster_count,
                     COUNT(DISTINCT o.country) as country_count
                 FROM origins o
                 JOIN coffee_beans cb ON o.bean_id = cb.id,
-                unnest(o.variety_canonical) AS t(canon_var)
-                WHERE t.canon_var IS NOT NULL AND t.canon_var != ''
-                GROUP BY t.canon_var
+                unnest(list_zip(o.variety_canonical, o.varietal_category)) AS t(canon_var)
+                WHERE t.canon_var[1] IS NOT NULL AND t.canon_var[1] != ''
+                GROUP BY t.canon_var[1]
             ),
             country_stats AS (
                 SELECT
@@ -5843,6 +4940,7 @@ async def get_varietals():
             )
             SELECT
                 v.canonical_variety,
+                v.category,
                 v.bean_count,
                 v.roaster_count,
                 v.country_count,
@@ -5880,8 +4978,7 @@ async def get_varietals():
         }
 
         for row in results:
-            varietal_name, bean_count, roaster_count, country_count, countries_list, original_names_str = row
-            category = categorize_varietal(varietal_name)
+            varietal_name, category, bean_count, roaster_count, country_count, countries_list, original_names_str = row
             varietal_slug = normalize_varietal_name(varietal_name)
 
             varietal_data = {
@@ -5915,10 +5012,11 @@ async def get_varietal_details(varietal_slug: str, convert_to_currency: str = "E
 
     # First, try to find the actual canonical varietal name from the slug efficiently
     query = """
-        SELECT canon_var, COUNT(*) as bean_count
+        SELECT canon_var, ANY_VALUE(canon_category) as category, COUNT(*) as bean_count
         FROM (
             SELECT unnest(variety_canonical) as canon_var,
-                   unnest(variety_canonical_slugs) as canon_slug
+                   unnest(variety_canonical_slugs) as canon_slug,
+                   unnest(varietal_category) as canon_category
             FROM origins
         ) t
         WHERE t.canon_slug = ?
@@ -5929,8 +5027,10 @@ async def get_varietal_details(varietal_slug: str, convert_to_currency: str = "E
 
     row = conn.execute(query, [varietal_slug]).fetchone()
     actual_varietal = None
+    varietal_category = None
     if row:
         actual_varietal = row[0]
+        varietal_category = row[1]
 
     if not actual_varietal:
         raise HTTPException(status_code=404, detail=f"Varietal '{varietal_slug}' not found")
@@ -6046,7 +5146,7 @@ async def get_varietal_details(varietal_slug: str, convert_to_currency: str = "E
     varietal_details = {
         "name": actual_varietal,
         "slug": varietal_slug,
-        "category": categorize_varietal(actual_varietal),
+        "category": varietal_category or "other",
         "statistics": {
             "total_beans": stats[0] if stats[0] else 0,
             "total_roasters": stats[1] if stats[1] else 0,
@@ -6264,10 +5364,10 @@ async def get_varietal_beans(
                         bean_dict["price_converted"] = True
 
             # Convert origins to correct objects
-            bean_dict["origins"] = [APIBean(**dict(o)) for o in bean_dict["origins"]]
+            bean_dict["origins"] = [APIBean.read_model(**dict(o)) for o in bean_dict["origins"]]
 
             # Create the final result
-            coffee_beans.append(APISearchResult(**bean_dict))
+            coffee_beans.append(APISearchResult.read_model(**bean_dict))
 
         pagination = PaginationInfo(
             page=page,
@@ -6278,7 +5378,7 @@ async def get_varietal_beans(
             has_previous=page > 1,
         )
 
-        return APIResponse.success_response(
+        return json_response(APIResponse.success_response(
             data=coffee_beans,
             pagination=pagination,
             metadata={
@@ -6288,12 +5388,12 @@ async def get_varietal_beans(
                 "currency_conversion": {
                     "enabled": convert_to_currency is not None,
                     "target_currency": convert_to_currency.upper() if convert_to_currency else None,
-                    "converted_results": sum(1 for bean in coffee_beans if getattr(bean, "price_converted", False)),
+                    "converted_results": sum(1 for bean in coffee_beans if bean.get("price_converted", False)),
                 }
                 if convert_to_currency
                 else None,
             },
-        )
+        ))
 
     finally:
         conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
@@ -6618,10 +5718,10 @@ async def search_by_tasting_category(
                     "longitude": origin_row[11] or 0.0,
                     "country_full_name": origin_row[12],
                 }
-                origins.append(APIBean(**origin_data))
+                origins.append(APIBean.read_model(**origin_data))
 
             bean_dict["origins"] = origins
-            search_result = APISearchResult(**bean_dict)
+            search_result = APISearchResult.read_model(**bean_dict)
             coffee_beans.append(search_result)
 
         # Create pagination info
@@ -6635,7 +5735,7 @@ async def search_by_tasting_category(
             has_previous=page > 1,
         )
 
-        return APIResponse.success_response(
+        return json_response(APIResponse.success_response(
             data=coffee_beans,
             pagination=pagination,
             metadata={
@@ -6644,7 +5744,7 @@ async def search_by_tasting_category(
                 "min_confidence": min_confidence,
                 "total_results": total_count,
             },
-        )
+        ))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
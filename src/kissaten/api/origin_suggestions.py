@@ -0,0 +1,251 @@
+"""
+Refresh-time typeahead index for ``/v1/search/origins``.
+
+``kissaten refresh`` materialises one suggestion per country, region and farm
+in ``origin_suggestions`` (``build_origin_suggestions``), with the bean/farm
+counts and average elevation the endpoint returns and the names a query is
+matched against (``search_names``):
+
+- countries: the country name and its alpha-2 code
+- regions: every raw ``region`` and ``state_canonical`` spelling in the group,
+  grouped by ``(country_code, region_slug)``
+- farms: every raw ``farm`` and ``producer`` spelling in the group, grouped by
+  ``(country_code, region_slug, COALESCE(farm_canonical, farm_normalized))``
+
+Rows are ranked by bean count (countries before regions before farms on
+ties). ``OriginSuggestionIndex`` loads the table once per process and indexes
+every 1-, 2- and 3-character substring of the accent-folded names. A query of
+up to three characters is a single posting-list lookup; a longer query
+intersects the posting lists of its trigrams and checks the survivors with a
+substring test. Posting lists are in rank order, so the first ``limit``
+matches are the answer.
+"""
+
+import logging
+import unicodedata
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_GRAM_SIZE = 3
+
+_TYPE_ORDER = "CASE type WHEN 'country' THEN 0 WHEN 'region' THEN 1 ELSE 2 END"
+
+_ELEVATION_MIDPOINT = "(NULLIF(o.elevation_min, 0) + NULLIF(o.elevation_max, 0)) / 2"
+
+_REGION_SLUG = "normalize_region_name(COALESCE(o.state_canonical, o.region, 'unknown-region'))"
+
+_REGION_NAME = "COALESCE(ANY_VALUE(o.state_canonical), arg_max(o.region, length(o.region)))"
+
+_RESULT_COLUMNS = [
+    "type",
+    "name",
+    "country_code",
+    "country_name",
+    "region_name",
+    "region_slug",
+    "farm_slug",
+    "producer_name",
+    "bean_count",
+    "farm_count",
+    "avg_elevation",
+]
+
+
+def _names(*columns: str) -> str:
+    """SQL aggregate: the distinct non-empty values of ``columns`` as one list."""
+    lists = [f"COALESCE(list({c}) FILTER (WHERE NULLIF({c}, '') IS NOT NULL), [])" for c in columns]
+    return f"list_distinct(list_concat({', '.join(lists)}))"
+
+
+def build_origin_suggestions(conn) -> None:
+    """(Re)build ``origin_suggestions`` from ``origins`` and ``country_codes``.
+
+    Requires the canonical origin columns and the ``normalize_region_name`` /
+    ``normalize_farm_name`` UDFs.
+    """
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE origin_suggestions AS
+        WITH countries AS (
+            SELECT
+                'country' AS type,
+                cc.name AS name,
+                cc.alpha_2 AS country_code,
+                cc.name AS country_name,
+                NULL::VARCHAR AS region_name,
+                NULL::VARCHAR AS region_slug,
+                NULL::VARCHAR AS farm_slug,
+                NULL::VARCHAR AS producer_name,
+                COUNT(DISTINCT cb.id) AS bean_count,
+                COUNT(DISTINCT o.farm_normalized) AS farm_count,
+                AVG({_ELEVATION_MIDPOINT}) AS avg_elevation,
+                [cc.name, cc.alpha_2] AS search_names
+            FROM country_codes cc
+            LEFT JOIN origins o ON cc.alpha_2 = o.country
+            LEFT JOIN coffee_beans cb ON o.bean_id = cb.id
+            GROUP BY cc.name, cc.alpha_2
+        ),
+        regions AS (
+            SELECT
+                'region' AS type,
+                {_REGION_NAME} AS name,
+                o.country AS country_code,
+                arg_max(cc.name, length(cc.name)) AS country_name,
+                {_REGION_NAME} AS region_name,
+                {_REGION_SLUG} AS region_slug,
+                NULL::VARCHAR AS farm_slug,
+                NULL::VARCHAR AS producer_name,
+                COUNT(DISTINCT o.bean_id) AS bean_count,
+                COUNT(DISTINCT o.farm_normalized) AS farm_count,
+                AVG({_ELEVATION_MIDPOINT}) AS avg_elevation,
+                {_names("o.region", "o.state_canonical")} AS search_names
+            FROM origins o
+            JOIN country_codes cc ON o.country = cc.alpha_2
+            WHERE NULLIF(o.region, '') IS NOT NULL OR NULLIF(o.state_canonical, '') IS NOT NULL
+            GROUP BY o.country, {_REGION_SLUG}
+        ),
+        farms AS (
+            SELECT
+                'farm' AS type,
+                COALESCE(ANY_VALUE(o.farm_canonical), arg_max(o.farm, length(o.farm))) AS name,
+                o.country AS country_code,
+                arg_max(cc.name, length(cc.name)) AS country_name,
+                {_REGION_NAME} AS region_name,
+                {_REGION_SLUG} AS region_slug,
+                normalize_farm_name(COALESCE(ANY_VALUE(o.farm_canonical), ANY_VALUE(o.farm_normalized))) AS farm_slug,
+                MODE(o.producer) FILTER (WHERE o.producer IS NOT NULL AND o.producer != '') AS producer_name,
+                COUNT(DISTINCT o.bean_id) AS bean_count,
+                NULL::BIGINT AS farm_count,
+                AVG({_ELEVATION_MIDPOINT}) AS avg_elevation,
+                {_names("o.farm", "o.producer")} AS search_names
+            FROM origins o
+            JOIN country_codes cc ON o.country = cc.alpha_2
+            WHERE NULLIF(COALESCE(o.farm_canonical, o.farm_normalized), '') IS NOT NULL
+            GROUP BY o.country, {_REGION_SLUG}, COALESCE(o.farm_canonical, o.farm_normalized)
+        )
+        SELECT
+            row_number() OVER (
+                ORDER BY bean_count DESC, {_TYPE_ORDER}, name, country_code, region_slug, farm_slug
+            ) AS rank,
+            *
+        FROM (
+            SELECT * FROM countries
+            UNION ALL BY NAME SELECT * FROM regions
+            UNION ALL BY NAME SELECT * FROM farms
+        )
+        WHERE name IS NOT NULL AND len(search_names) > 0
+    """)
+    clear_origin_suggestion_cache()
+
+
+def fold(text: str) -> str:
+    """Accent- and case-folded text, as matched by the typeahead index."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _grams(text: str) -> set[str]:
+    """Every substring of ``text`` of length 1 to ``_GRAM_SIZE``."""
+    return {text[i : i + n] for n in range(1, _GRAM_SIZE + 1) for i in range(len(text) - n + 1)}
+
+
+class OriginSuggestionIndex:
+    """In-memory substring index over the origin suggestions.
+
+    ``rows`` must be in rank order and each carry the result columns plus
+    ``search_names``.
+    """
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.rows = [{column: row[column] for column in _RESULT_COLUMNS} for row in rows]
+        self.search_names = [tuple(fold(name) for name in row["search_names"]) for row in rows]
+        self.country_codes = np.array([row["country_code"] or "" for row in rows], dtype=object)
+        self.region_slugs = np.array([row["region_slug"] or "" for row in rows], dtype=object)
+
+        postings: dict[str, list[int]] = {}
+        for position, names in enumerate(self.search_names):
+            for gram in set().union(*(_grams(name) for name in names)):
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    @classmethod
+    def from_connection(cls, conn) -> "OriginSuggestionIndex":
+        select = ", ".join(_RESULT_COLUMNS)
+        cursor = conn.execute(f"SELECT {select}, search_names FROM origin_suggestions ORDER BY rank")
+        columns = [column[0] for column in cursor.description]
+        return cls([dict(zip(columns, row)) for row in cursor.fetchall()])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _candidates(self, query: str) -> np.ndarray:
+        """Rank-ordered positions whose names may contain ``query``."""
+        if len(query) <= _GRAM_SIZE:
+            return self.postings.get(query, np.empty(0, dtype=np.int32))
+        lists = []
+        for gram in {query[i : i + _GRAM_SIZE] for i in range(len(query) - _GRAM_SIZE + 1)}:
+            if gram not in self.postings:
+                return np.empty(0, dtype=np.int32)
+            lists.append(self.postings[gram])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for other in lists[1:]:
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+            if not len(candidates):
+                break
+        return candidates
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        country_code: str | None = None,
+        region_slug: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Up to ``limit`` suggestions whose names contain ``query``, best ranked first.
+
+        ``country_code`` keeps suggestions in that country; ``region_slug``
+        keeps regions and farms in that region (and so drops countries).
+        """
+        folded = fold(query)
+        if not folded:
+            return []
+        candidates = self._candidates(folded)
+        if country_code is not None:
+            candidates = candidates[self.country_codes[candidates] == country_code]
+        if region_slug is not None:
+            candidates = candidates[self.region_slugs[candidates] == region_slug]
+
+        verify = len(folded) > _GRAM_SIZE
+        results = []
+        for position in candidates.tolist():
+            if verify and not any(folded in name for name in self.search_names[position]):
+                continue
+            results.append(self.rows[position])
+            if len(results) == limit:
+                break
+        return results
+
+
+_index_cache: dict[str, OriginSuggestionIndex] = {}
+
+
+def clear_origin_suggestion_cache() -> None:
+    """Drop the cached in-memory index (call after rebuilding the table)."""
+    _index_cache.clear()
+
+
+def get_origin_suggestion_index(conn) -> OriginSuggestionIndex | None:
+    """The in-memory typeahead index, loaded on first use.
+
+    Returns None if ``origin_suggestions`` has not been built yet.
+    """
+    if "index" not in _index_cache:
+        try:
+            _index_cache["index"] = OriginSuggestionIndex.from_connection(conn)
+        except Exception as e:
+            logger.warning(f"Origin suggestion index unavailable: {e}")
+            return None
+    return _index_cache["index"]
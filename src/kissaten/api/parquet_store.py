@@ -0,0 +1,330 @@
+"""
+Columnar Parquet snapshot store for scraped bean JSON.
+
+Scrapers write one JSON file per bean into ``data/roasters/<roaster>/<YYYYMMDD>/``.
+Those files stay the source of truth, but reading every one of them on each
+``kissaten refresh`` scales with scrape *history* rather than with new data.
+
+``compact_sessions`` rolls each finished session directory into a single
+Parquet file partitioned by roaster and date::
+
+    data/snapshots/roaster=<roaster>/date=<YYYYMMDD>/beans.parquet
+    data/snapshots/roaster=<roaster>/date=<YYYYMMDD>/manifest.json
+
+The manifest records which JSON files went into the partition and their
+mtimes/sizes. ``plan_sources`` compares it against the session directory on
+disk: a partition is only used while the files it was built from are
+unchanged, otherwise the whole session falls back to the uncompacted tail and
+is re-read from JSON. The loader therefore reads compacted partitions plus
+only the uncompacted tail, and results are identical either way.
+
+Each Parquet row stores the source JSON path relative to the roasters
+directory (``source_path``); ``raw_source_sql`` rebuilds the absolute
+``filename`` column so downstream views (roaster_directory, scrape_date,
+bean_url_path, processed_files tracking) behave exactly as with ``read_json``.
+"""
+
+import json
+import logging
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the compacted column set or layout changes so stale
+# partitions are ignored and rebuilt instead of silently mis-read.
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILENAME = "manifest.json"
+PARQUET_FILENAME = "beans.parquet"
+
+# Consistent schema for reading raw bean JSON so every field is projected even
+# when missing from some files (e.g. ``roaster``, which is populated later).
+RAW_JSON_COLUMNS_CLAUSE = """columns={
+            'name': 'VARCHAR',
+            'roaster': 'VARCHAR',
+            'url': 'VARCHAR',
+            'is_single_origin': 'BOOLEAN',
+            'price_paid_for_green_coffee': 'DOUBLE',
+            'currency_of_price_paid_for_green_coffee': 'VARCHAR',
+            'roast_level': 'VARCHAR',
+            'roast_profile': 'VARCHAR',
+            'weight': 'VARCHAR',
+            'price': 'VARCHAR',
+            'currency': 'VARCHAR',
+            'is_decaf': 'BOOLEAN',
+            'cupping_score': 'DOUBLE',
+            'is_tasting_kit': 'BOOLEAN',
+            'requires_review': 'BOOLEAN',
+            'tasting_notes': 'VARCHAR[]',
+            'description': 'VARCHAR',
+            'in_stock': 'BOOLEAN',
+            'scraped_at': 'VARCHAR',
+            'scraper_version': 'VARCHAR',
+            'image_url': 'VARCHAR',
+            'origins': 'STRUCT(country VARCHAR, region VARCHAR, producer VARCHAR, farm VARCHAR, elevation_min VARCHAR, elevation_max VARCHAR, latitude VARCHAR, longitude VARCHAR, process VARCHAR, variety VARCHAR, harvest_date VARCHAR)[]',
+            'price_options': 'STRUCT(weight INTEGER, price DOUBLE)[]'
+        }"""
+
+
+def default_snapshot_dir(roasters_dir: Path) -> Path:
+    """Snapshot directory next to ``data/roasters`` (outside the JSON glob)."""
+    return roasters_dir.parent / "snapshots"
+
+
+def _sql_str(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_list(paths: list[Path]) -> str:
+    return "[" + ", ".join(_sql_str(str(p)) for p in paths) + "]"
+
+
+def _file_fingerprints(session_dir: Path) -> dict[str, list[int]]:
+    """``{filename: [mtime_ns, size]}`` for every bean JSON in a session dir."""
+    fingerprints = {}
+    for path in sorted(session_dir.glob("*.json")):
+        stat = path.stat()
+        fingerprints[path.name] = [stat.st_mtime_ns, stat.st_size]
+    return fingerprints
+
+
+def partition_dir(snapshot_dir: Path, roaster_directory: str, scrape_date: str) -> Path:
+    return snapshot_dir / f"roaster={roaster_directory}" / f"date={scrape_date}"
+
+
+def _read_manifest(part_dir: Path) -> dict | None:
+    manifest_path = part_dir / MANIFEST_FILENAME
+    if not manifest_path.exists() or not (part_dir / PARQUET_FILENAME).exists():
+        return None
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _iter_session_dirs(roasters_dir: Path, roaster: str | None = None):
+    roaster_dirs = [roasters_dir / roaster] if roaster else sorted(p for p in roasters_dir.iterdir() if p.is_dir())
+    for roaster_dir in roaster_dirs:
+        if not roaster_dir.is_dir():
+            continue
+        for session_dir in sorted(p for p in roaster_dir.iterdir() if p.is_dir()):
+            yield roaster_dir.name, session_dir
+
+
+@dataclass
+class CompactionResult:
+    """Summary of a ``compact_sessions`` run."""
+
+    compacted: list[str] = field(default_factory=list)
+    up_to_date: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    files: int = 0
+    removed: list[str] = field(default_factory=list)
+
+
+def compact_sessions(
+    roasters_dir: Path,
+    snapshot_dir: Path | None = None,
+    roaster: str | None = None,
+    include_today: bool = False,
+    force: bool = False,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> CompactionResult:
+    """Roll session directories into per-(roaster, date) Parquet partitions.
+
+    Args:
+        roasters_dir: ``data/roasters`` directory holding the JSON source of truth.
+        snapshot_dir: Where partitions are written (default: ``data/snapshots``).
+        roaster: Only compact this roaster directory.
+        include_today: Also compact today's session (normally still being written).
+        force: Rebuild partitions even when their manifest is up to date.
+        conn: DuckDB connection to use (an in-memory one is created by default).
+
+    Returns:
+        CompactionResult listing compacted / unchanged / skipped sessions.
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(roasters_dir)
+    own_conn = conn is None
+    conn = conn or duckdb.connect()
+    today = datetime.now().strftime("%Y%m%d")
+    result = CompactionResult()
+
+    try:
+        for roaster_directory, session_dir in _iter_session_dirs(roasters_dir, roaster):
+            scrape_date = session_dir.name
+            key = f"{roaster_directory}/{scrape_date}"
+            if not include_today and scrape_date >= today:
+                result.skipped.append(key)
+                continue
+
+            fingerprints = _file_fingerprints(session_dir)
+            part_dir = partition_dir(snapshot_dir, roaster_directory, scrape_date)
+            if not fingerprints:
+                # Session only holds diffjson/images: nothing to compact.
+                if part_dir.exists():
+                    shutil.rmtree(part_dir)
+                    result.removed.append(key)
+                continue
+
+            manifest = _read_manifest(part_dir)
+            if not force and manifest and manifest.get("files") == fingerprints:
+                result.up_to_date.append(key)
+                continue
+
+            part_dir.mkdir(parents=True, exist_ok=True)
+            json_paths = [session_dir / name for name in fingerprints]
+            tmp_path = part_dir / f"{PARQUET_FILENAME}.tmp"
+            roasters_prefix = str(roasters_dir) + "/"
+            conn.execute(f"""
+                COPY (
+                    SELECT
+                        json_data.* EXCLUDE (filename),
+                        replace(filename, {_sql_str(roasters_prefix)}, '') as source_path
+                    FROM read_json({_sql_list(json_paths)},
+                        {RAW_JSON_COLUMNS_CLAUSE},
+                        filename=true,
+                        auto_detect=true,
+                        union_by_name=true,
+                        ignore_errors=true
+                    ) as json_data
+                ) TO {_sql_str(str(tmp_path))} (FORMAT PARQUET, COMPRESSION ZSTD)
+            """)
+            tmp_path.replace(part_dir / PARQUET_FILENAME)
+            with open(part_dir / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "format_version": SNAPSHOT_FORMAT_VERSION,
+                        "roaster_directory": roaster_directory,
+                        "scrape_date": scrape_date,
+                        "compacted_at": datetime.now().isoformat(),
+                        "files": fingerprints,
+                    },
+                    f,
+                    indent=2,
+                )
+            result.compacted.append(key)
+            result.files += len(fingerprints)
+    finally:
+        if own_conn:
+            conn.close()
+
+    return result
+
+
+@dataclass
+class SourcePlan:
+    """Which inputs a refresh should read.
+
+    ``parquet_files`` are valid compacted partitions; ``json_files`` is the
+    uncompacted tail (new sessions, today's session, and any session whose
+    JSON changed since it was compacted).
+    """
+
+    parquet_files: list[Path] = field(default_factory=list)
+    json_files: list[Path] = field(default_factory=list)
+    compacted_json_files: set[Path] = field(default_factory=set)
+
+
+def plan_sources(roasters_dir: Path, snapshot_dir: Path | None = None) -> SourcePlan:
+    """Split the bean JSON under ``roasters_dir`` into compacted vs tail inputs.
+
+    Returns an empty plan when the snapshot directory doesn't exist, so a
+    tree that has never been compacted pays no extra directory walk.
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(roasters_dir)
+    plan = SourcePlan()
+    if not snapshot_dir.exists():
+        # Nothing compacted yet: callers keep using the plain JSON glob.
+        return plan
+
+    for roaster_directory, session_dir in _iter_session_dirs(roasters_dir):
+        part_dir = partition_dir(snapshot_dir, roaster_directory, session_dir.name)
+        manifest = _read_manifest(part_dir)
+        if manifest:
+            fingerprints = _file_fingerprints(session_dir)
+            if fingerprints and manifest.get("files") == fingerprints:
+                plan.parquet_files.append(part_dir / PARQUET_FILENAME)
+                plan.compacted_json_files.update(session_dir / name for name in fingerprints)
+                continue
+        plan.json_files.extend(sorted(session_dir.glob("*.json")))
+
+    return plan
+
+
+def raw_source_sql(
+    roasters_dir: Path,
+    plan: SourcePlan,
+    only_files: list[Path] | None = None,
+) -> str | None:
+    """SQL selecting raw bean rows (with ``filename``) from a ``SourcePlan``.
+
+    Args:
+        roasters_dir: Directory the ``source_path`` column is relative to.
+        plan: Output of ``plan_sources``.
+        only_files: Restrict to these JSON paths (incremental mode). Compacted
+                    rows are filtered by joining against ``_snapshot_wanted_files``,
+                    a temp table the caller fills, instead of a literal path list.
+
+    Returns:
+        A SELECT statement, or None when there is nothing to read.
+    """
+    selects = []
+    roasters_prefix = str(roasters_dir) + "/"
+
+    if only_files is None:
+        parquet_files = plan.parquet_files
+        json_files = plan.json_files
+    else:
+        wanted = set(only_files)
+        parquet_files = plan.parquet_files if wanted & plan.compacted_json_files else []
+        json_files = [f for f in only_files if f not in plan.compacted_json_files]
+
+    if parquet_files:
+        where_clause = ""
+        if only_files is not None:
+            where_clause = "WHERE source_path IN (SELECT source_path FROM _snapshot_wanted_files)"
+        selects.append(f"""
+            SELECT
+                p.* EXCLUDE (source_path),
+                {_sql_str(roasters_prefix)} || p.source_path as filename
+            FROM read_parquet({_sql_list(parquet_files)}, union_by_name=true) p
+            {where_clause}
+        """)
+
+    if json_files:
+        selects.append(f"""
+            SELECT json_data.*
+            FROM read_json({_sql_list(json_files)},
+                {RAW_JSON_COLUMNS_CLAUSE},
+                filename=true,
+                auto_detect=true,
+                union_by_name=true,
+                ignore_errors=true
+            ) as json_data
+        """)
+
+    if not selects:
+        return None
+    return "\nUNION ALL BY NAME\n".join(selects)
+
+
+def register_wanted_files(conn: duckdb.DuckDBPyConnection, roasters_dir: Path, files: list[Path]) -> None:
+    """Fill the ``_snapshot_wanted_files`` temp table used by ``raw_source_sql``."""
+    conn.execute("CREATE OR REPLACE TEMPORARY TABLE _snapshot_wanted_files (source_path VARCHAR)")
+    rows = []
+    for f in files:
+        try:
+            rows.append((str(f.relative_to(roasters_dir)),))
+        except ValueError:
+            continue
+    if rows:
+        conn.executemany("INSERT INTO _snapshot_wanted_files VALUES (?)", rows)
@@ -0,0 +1,414 @@
+"""
+Nearest-neighbour bean recommendations over refresh-time feature vectors.
+
+``kissaten refresh`` builds (``build_recommendation_index``):
+
+- ``recommendation_beans``: one row per bean with the dense features and
+  filters: roaster, roast level rank, decaf flag, whether the bean can be
+  recommended (latest scrape of its URL, in stock, reviewed), and a
+  tie-break rank (newest first, then name).
+- ``recommendation_features(bean_id, block, feature, weight)``: sparse,
+  L2-normalised feature blocks per bean:
+
+  - ``notes``: TF-IDF over normalised tasting notes
+  - ``note_categories``: TF-IDF over the notes' primary/secondary categories
+  - ``process``, ``variety``, ``origin``: multi-hot (one-hot per origin) vectors
+
+- ``recommendation_neighbours(bean_id, rank, neighbour_id, score)``: the
+  top ``NEIGHBOURS_PER_BEAN`` neighbours of every bean under the default
+  weights.
+
+The similarity between two beans is a weighted sum of per-block cosine
+similarities plus the roaster and roast-closeness terms, using the same
+weight parameters as the search-engine recommendations:
+
+    tasting_notes * (0.6 * cos(notes) + 0.4 * cos(note_categories))
+    + origin * cos(origin) + process * cos(process) + variety * cos(variety)
+    + roaster * [same roaster] + different_roaster * [different roaster]
+    + roast_level * closeness(roast levels)
+
+Default-weight requests read the precomputed neighbour list, an O(k) keyed
+lookup. Requests with custom weights score the whole catalogue against the
+target with ``BeanRecommender``, which holds the blocks as NumPy CSR/CSC
+arrays: a sparse dot product over the target's postings plus a few vector
+ops, instead of the per-bean correlated SQL scoring.
+"""
+
+import logging
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NEIGHBOURS_PER_BEAN = 60
+
+ROAST_LEVEL_RANKS = {"Extra-Light": 0, "Light": 1, "Medium-Light": 2, "Medium": 3, "Medium-Dark": 4, "Dark": 5}
+
+# Roast closeness by level distance: same level, one apart, two apart, further
+_ROAST_CLOSENESS = np.array([1.0, 0.5, 0.2, 0.0])
+
+# Share of the tasting-notes weight given to category (vs exact note) overlap
+NOTE_CATEGORY_SHARE = 0.4
+
+# Sentinels in recommendation_beans.roast_rank
+_NO_ROAST = -1
+_UNKNOWN_ROAST = -2
+
+
+@dataclass(frozen=True)
+class RecommendationWeights:
+    """Weights of the similarity terms; defaults match the endpoint's defaults."""
+
+    tasting_notes: float = 3.0
+    origin: float = 0.5
+    roaster: float = 0.5
+    roast_level: float = 0.5
+    process: float = 0.0
+    variety: float = 10.0
+    different_roaster: float = 1.0
+
+
+DEFAULT_WEIGHTS = RecommendationWeights()
+
+
+def build_recommendation_index(conn, neighbours_per_bean: int = NEIGHBOURS_PER_BEAN) -> None:
+    """(Re)build the recommendation tables from ``coffee_beans`` and ``origins``.
+
+    Requires ``tasting_note_index``; ``tasting_notes_categories`` may be empty.
+    """
+    roast_cases = " ".join(f"WHEN '{level}' THEN {rank}" for level, rank in ROAST_LEVEL_RANKS.items())
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE recommendation_beans AS
+        SELECT
+            cb.id AS bean_id,
+            cb.roaster,
+            CASE WHEN cb.roast_level IS NULL OR cb.roast_level = '' THEN {_NO_ROAST}
+                 ELSE CASE cb.roast_level {roast_cases} ELSE {_UNKNOWN_ROAST} END
+            END AS roast_rank,
+            CAST(COALESCE(CAST(cb.is_decaf AS INTEGER), -1) AS TINYINT) AS is_decaf,
+            COALESCE(cb.rn = 1 AND cb.in_stock = TRUE AND cb.requires_review = false, false) AS is_candidate,
+            row_number() OVER (ORDER BY cb.scraped_at DESC, cb.name ASC) AS tie_rank
+        FROM (
+            SELECT *, row_number() OVER (PARTITION BY clean_url_slug ORDER BY scraped_at DESC) AS rn
+            FROM coffee_beans
+        ) cb
+        ORDER BY cb.id
+    """)
+    conn.execute("""
+        CREATE OR REPLACE TABLE recommendation_features AS
+        WITH raw AS (
+            SELECT bean_id, 'notes' AS block, note AS feature, 1.0 AS tf
+            FROM tasting_note_index
+            WHERE note IS NOT NULL AND note != ''
+            GROUP BY ALL
+
+            UNION ALL
+            SELECT cb.id, 'note_categories', tnc.primary_category || '/' || COALESCE(tnc.secondary_category, ''),
+                   COUNT(*)
+            FROM coffee_beans cb, unnest(cb.tasting_notes) AS u(note)
+            JOIN tasting_notes_categories tnc ON tnc.tasting_note = u.note
+            WHERE tnc.primary_category IS NOT NULL
+            GROUP BY ALL
+
+            UNION ALL
+            SELECT bean_id, 'process', lower(COALESCE(NULLIF(process_common_name, ''), process)), 1.0
+            FROM origins
+            WHERE COALESCE(NULLIF(process_common_name, ''), process, '') != ''
+            GROUP BY ALL
+
+            UNION ALL
+            SELECT bean_id, 'variety', lower(v), 1.0
+            FROM origins, unnest(CASE
+                WHEN variety_canonical IS NOT NULL AND len(variety_canonical) > 0 THEN variety_canonical
+                ELSE [variety]
+            END) AS t(v)
+            WHERE v IS NOT NULL AND v != ''
+            GROUP BY ALL
+
+            UNION ALL
+            SELECT bean_id, 'origin', country, 1.0
+            FROM origins
+            WHERE country IS NOT NULL AND country != ''
+            GROUP BY ALL
+        ),
+        idf AS (
+            -- Inverse document frequency for the note blocks; one-hot blocks are unweighted
+            SELECT block, feature,
+                   CASE WHEN block IN ('notes', 'note_categories')
+                        THEN 1 + ln((SELECT COUNT(*) FROM coffee_beans) / COUNT(DISTINCT bean_id))
+                        ELSE 1.0
+                   END AS idf
+            FROM raw
+            GROUP BY block, feature
+        ),
+        weighted AS (
+            SELECT r.bean_id, r.block, r.feature, r.tf * i.idf AS w
+            FROM raw r JOIN idf i USING (block, feature)
+        )
+        SELECT bean_id, block, feature, w / sqrt(SUM(w * w) OVER (PARTITION BY bean_id, block)) AS weight
+        FROM weighted
+        ORDER BY bean_id, block, feature
+    """)
+
+    recommender = BeanRecommender.from_connection(conn)
+    bean_ids, ranks, neighbour_ids, scores = recommender.all_neighbours(neighbours_per_bean)
+    _neighbour_arrays = {  # noqa: F841 - read by DuckDB's replacement scan below
+        "bean_id": bean_ids,
+        "rank": ranks,
+        "neighbour_id": neighbour_ids,
+        "score": scores,
+    }
+    conn.execute("""
+        CREATE OR REPLACE TABLE recommendation_neighbours AS
+        SELECT * FROM _neighbour_arrays ORDER BY bean_id, rank
+    """)
+    clear_recommender_cache()
+
+
+def _ragged_arange(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of ``arange(s, s + c)`` for each (start, count) pair."""
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    return offsets + np.arange(total)
+
+
+@dataclass
+class _FeatureBlock:
+    """A sparse feature block stored both by bean (CSR) and by feature (CSC)."""
+
+    row_ptr: np.ndarray
+    row_features: np.ndarray
+    row_weights: np.ndarray
+    col_ptr: np.ndarray
+    col_rows: np.ndarray
+    col_weights: np.ndarray
+
+    @classmethod
+    def from_triples(
+        cls, rows: np.ndarray, features: np.ndarray, weights: np.ndarray, n_rows: int, n_features: int
+    ) -> "_FeatureBlock":
+        by_row = np.lexsort((features, rows))
+        by_col = np.lexsort((rows, features))
+        return cls(
+            row_ptr=np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_rows)))),
+            row_features=features[by_row],
+            row_weights=weights[by_row],
+            col_ptr=np.concatenate(([0], np.cumsum(np.bincount(features, minlength=n_features)))),
+            col_rows=rows[by_col],
+            col_weights=weights[by_col],
+        )
+
+    def similarities(self, targets: np.ndarray, n_rows: int) -> np.ndarray:
+        """Cosine similarity of each target row with every row, shape (len(targets), n_rows)."""
+        starts = self.row_ptr[targets]
+        counts = self.row_ptr[targets + 1] - starts
+        entries = _ragged_arange(starts, counts)
+        owners = np.repeat(np.arange(len(targets)), counts)
+        features = self.row_features[entries]
+
+        posting_starts = self.col_ptr[features]
+        posting_counts = self.col_ptr[features + 1] - posting_starts
+        postings = _ragged_arange(posting_starts, posting_counts)
+        values = self.col_weights[postings] * np.repeat(self.row_weights[entries], posting_counts)
+        cells = np.repeat(owners, posting_counts) * n_rows + self.col_rows[postings]
+        return np.bincount(cells, weights=values, minlength=len(targets) * n_rows).reshape(len(targets), n_rows)
+
+
+class BeanRecommender:
+    """In-memory recommendation index loaded from the refresh-time tables."""
+
+    BLOCKS = ("notes", "note_categories", "process", "variety", "origin")
+
+    def __init__(
+        self,
+        bean_ids: np.ndarray,
+        roasters: np.ndarray,
+        roast_ranks: np.ndarray,
+        is_decaf: np.ndarray,
+        is_candidate: np.ndarray,
+        tie_ranks: np.ndarray,
+        blocks: dict[str, _FeatureBlock],
+    ):
+        self.bean_ids = bean_ids
+        self.roasters = roasters
+        self.roast_ranks = roast_ranks
+        self.is_decaf = is_decaf
+        self.is_candidate = is_candidate
+        self.tie_ranks = tie_ranks
+        self.blocks = blocks
+        self._rows = {int(bean_id): row for row, bean_id in enumerate(bean_ids)}
+
+    @classmethod
+    def from_connection(cls, conn) -> "BeanRecommender":
+        beans = conn.execute("""
+            SELECT bean_id, roaster, roast_rank, is_decaf, is_candidate, tie_rank
+            FROM recommendation_beans ORDER BY bean_id
+        """).fetchnumpy()
+        bean_ids = beans["bean_id"].astype(np.int64)
+        n_rows = len(bean_ids)
+        roaster_names = np.asarray(beans["roaster"], dtype=object)
+        roaster_names[[name is None for name in roaster_names]] = ""
+        _, roasters = np.unique(roaster_names.astype(str), return_inverse=True)
+
+        features = conn.execute("""
+            SELECT b.row - 1 AS row, f.block, f.feature, f.weight
+            FROM recommendation_features f
+            JOIN (SELECT bean_id, row_number() OVER (ORDER BY bean_id) AS row FROM recommendation_beans) b
+              USING (bean_id)
+        """).fetchnumpy()
+        blocks = {}
+        for block in cls.BLOCKS:
+            mask = np.asarray(features["block"] == block)
+            _, feature_ids = np.unique(np.asarray(features["feature"][mask], dtype=str), return_inverse=True)
+            blocks[block] = _FeatureBlock.from_triples(
+                rows=np.asarray(features["row"][mask], dtype=np.int64),
+                features=feature_ids.astype(np.int64),
+                weights=np.asarray(features["weight"][mask], dtype=np.float64),
+                n_rows=n_rows,
+                n_features=int(feature_ids.max()) + 1 if len(feature_ids) else 0,
+            )
+
+        return cls(
+            bean_ids=bean_ids,
+            roasters=roasters,
+            roast_ranks=np.asarray(beans["roast_rank"], dtype=np.int64),
+            is_decaf=np.asarray(beans["is_decaf"], dtype=np.int8),
+            is_candidate=np.asarray(beans["is_candidate"], dtype=bool),
+            tie_ranks=np.asarray(beans["tie_rank"], dtype=np.int64),
+            blocks=blocks,
+        )
+
+    def __contains__(self, bean_id: int) -> bool:
+        return bean_id in self._rows
+
+    def scores(self, targets: np.ndarray, weights: RecommendationWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+        """Similarity of each target row with every bean, shape (len(targets), n_beans)."""
+        n_rows = len(self.bean_ids)
+        total = np.zeros((len(targets), n_rows))
+
+        block_weights = {
+            "notes": weights.tasting_notes * (1 - NOTE_CATEGORY_SHARE),
+            "note_categories": weights.tasting_notes * NOTE_CATEGORY_SHARE,
+            "origin": weights.origin,
+            "process": weights.process,
+            "variety": weights.variety,
+        }
+        for block, weight in block_weights.items():
+            if weight:
+                total += weight * self.blocks[block].similarities(targets, n_rows)
+
+        if weights.roaster or weights.different_roaster:
+            same_roaster = self.roasters[None, :] == self.roasters[targets][:, None]
+            total += np.where(same_roaster, weights.roaster, weights.different_roaster)
+
+        if weights.roast_level:
+            target_ranks = self.roast_ranks[targets]
+            # An unrecognised target roast level is treated as Medium, as in search scoring
+            target_ranks = np.where(target_ranks == _UNKNOWN_ROAST, ROAST_LEVEL_RANKS["Medium"], target_ranks)
+            distance = np.minimum(np.abs(self.roast_ranks[None, :] - target_ranks[:, None]), 3)
+            closeness = _ROAST_CLOSENESS[distance]
+            closeness[:, self.roast_ranks < 0] = 0.0
+            closeness[target_ranks < 0, :] = 0.0
+            total += weights.roast_level * closeness
+
+        return total
+
+    def _top_k(self, scores: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+        """Rows of the ``k`` best masked scores, ordered by score then tie-break rank."""
+        candidates = np.flatnonzero(mask & (scores > 0))
+        if len(candidates) > k:
+            kth_score = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= kth_score]
+        order = np.lexsort((self.tie_ranks[candidates], -scores[candidates]))
+        return candidates[order[:k]]
+
+    def recommend(
+        self,
+        bean_id: int,
+        k: int,
+        weights: RecommendationWeights = DEFAULT_WEIGHTS,
+        is_decaf: bool | None = None,
+    ) -> list[tuple[int, float]]:
+        """Top ``k`` (bean_id, score) recommendations for ``bean_id``."""
+        row = self._rows[bean_id]
+        scores = self.scores(np.array([row]), weights)[0]
+        mask = self.is_candidate.copy()
+        mask[row] = False
+        if is_decaf is not None:
+            mask &= self.is_decaf == int(is_decaf)
+        return [(int(self.bean_ids[i]), float(scores[i])) for i in self._top_k(scores, mask, k)]
+
+    def all_neighbours(
+        self, k: int, weights: RecommendationWeights = DEFAULT_WEIGHTS, batch_size: int = 128
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Top ``k`` neighbours of every bean, scored in batches.
+
+        Returns:
+            Flat (bean_id, rank, neighbour_id, score) arrays.
+        """
+        bean_ids, ranks, neighbour_ids, scores = [], [], [], []
+        n_rows = len(self.bean_ids)
+        for start in range(0, n_rows, batch_size):
+            targets = np.arange(start, min(start + batch_size, n_rows))
+            batch_scores = self.scores(targets, weights)
+            for i, row in enumerate(targets):
+                mask = self.is_candidate.copy()
+                mask[row] = False
+                top = self._top_k(batch_scores[i], mask, k)
+                bean_ids.append(np.full(len(top), self.bean_ids[row]))
+                ranks.append(np.arange(1, len(top) + 1))
+                neighbour_ids.append(self.bean_ids[top])
+                scores.append(batch_scores[i][top])
+
+        def flat(parts, dtype):
+            return np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype=dtype)
+
+        return flat(bean_ids, np.int64), flat(ranks, np.int32), flat(neighbour_ids, np.int64), flat(scores, np.float64)
+
+
+_recommender_cache: dict[str, BeanRecommender | None] = {}
+
+
+def clear_recommender_cache() -> None:
+    """Drop the cached in-memory index (call after rebuilding the tables)."""
+    _recommender_cache.clear()
+
+
+def get_recommender(conn) -> BeanRecommender | None:
+    """The in-memory index for custom-weight requests, loaded on first use.
+
+    Returns None if the recommendation tables have not been built yet.
+    """
+    if "recommender" not in _recommender_cache:
+        try:
+            _recommender_cache["recommender"] = BeanRecommender.from_connection(conn)
+        except Exception as e:
+            logger.warning(f"Recommendation index unavailable: {e}")
+            return None
+    return _recommender_cache["recommender"]
+
+
+def precomputed_neighbours(conn, bean_id: int, limit: int) -> list[tuple[int, float]] | None:
+    """Default-weight neighbours of ``bean_id`` from ``recommendation_neighbours``.
+
+    Returns None if the bean (or the table) is not in the index.
+    """
+    try:
+        indexed = conn.execute("SELECT 1 FROM recommendation_beans WHERE bean_id = ?", [bean_id]).fetchone()
+    except Exception:
+        return None
+    if indexed is None:
+        return None
+    rows = conn.execute(
+        "SELECT neighbour_id, score FROM recommendation_neighbours WHERE bean_id = ? ORDER BY rank LIMIT ?",
+        [bean_id, limit],
+    ).fetchall()
+    return [(neighbour_id, score) for neighbour_id, score in rows]
+
+
+def is_default_weights(weights: RecommendationWeights) -> bool:
+    """Whether ``weights`` are the defaults the neighbour lists were precomputed with."""
+    return all(getattr(weights, f.name) == getattr(DEFAULT_WEIGHTS, f.name) for f in fields(weights))
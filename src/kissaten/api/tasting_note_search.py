@@ -0,0 +1,265 @@
+"""
+Boolean tasting-note search over the refresh-time note index.
+
+``kissaten refresh`` materialises two tables (``build_tasting_note_index``):
+
+- ``tasting_note_index(bean_id, pos, note)``: one row per bean note, with the
+  note lower-cased and accent-stripped.
+- ``tasting_note_postings(note, bean_ids)``: the inverted map from each
+  distinct note to the beans that carry it.
+
+Strict-mode queries such as ``chocolate&(berry|cherry)&!ferment*`` compile
+into set operations on bean IDs. Each term becomes a postings lookup, ``&``
+becomes INTERSECT, ``|`` becomes UNION and ``!`` becomes EXCEPT. The result
+is a single uncorrelated ``cb.id IN (...)`` semi-join that is evaluated once
+per query, instead of ``array_to_string(cb.tasting_notes, ' ') ILIKE ?`` on
+every candidate row for every term. Term lookups scan the note vocabulary,
+not the catalogue.
+
+Terms are matched against individual notes, the same way relevance scoring
+already treated them: ``fruit*`` matches any note starting with "fruit", and
+``"Peach"`` matches a note equal to "peach". Matching is case- and
+accent-insensitive.
+"""
+
+import re
+
+# Search terms are normalised the same way as the indexed notes
+_NORMALIZED_PARAM = "lower(strip_accents(?))"
+
+# Beans eligible for a negated term: every bean with a tasting notes list
+_ALL_NOTED_BEANS = "SELECT id AS bean_id FROM coffee_beans WHERE tasting_notes IS NOT NULL"
+
+
+def build_tasting_note_index(conn) -> None:
+    """(Re)build ``tasting_note_index`` and ``tasting_note_postings`` from ``coffee_beans``.
+
+    Notes are trimmed, lower-cased and accent-stripped; ``pos`` is the
+    1-based position of the note on the bean, used for relevance scoring.
+    """
+    conn.execute("""
+        CREATE OR REPLACE TABLE tasting_note_index AS
+        SELECT
+            cb.id AS bean_id,
+            t.pos,
+            lower(strip_accents(trim(cb.tasting_notes[t.pos]))) AS note
+        FROM coffee_beans cb,
+             LATERAL (SELECT generate_subscripts(cb.tasting_notes, 1) AS pos) t
+        WHERE cb.tasting_notes IS NOT NULL
+    """)
+    conn.execute("""
+        CREATE OR REPLACE TABLE tasting_note_postings AS
+        SELECT note, list(DISTINCT bean_id ORDER BY bean_id) AS bean_ids
+        FROM tasting_note_index
+        WHERE note IS NOT NULL AND note != ''
+        GROUP BY note
+    """)
+
+
+def tokenize_query(text: str) -> list[str]:
+    """Tokenize a boolean search query into terms and operators.
+
+    Quoted strings become a single ``EXACT:<text>`` token and ``NOT`` is
+    rewritten to ``!``, matching ``parse_boolean_search_query_for_field``.
+    """
+    text = re.sub(r"\bNOT\b", "!", text, flags=re.IGNORECASE)
+
+    tokens = []
+    i = 0
+    current_token = ""
+
+    while i < len(text):
+        char = text[i]
+
+        if char == '"':
+            # Handle quoted strings - find the closing quote
+            i += 1
+            quoted_content = ""
+            while i < len(text) and text[i] != '"':
+                quoted_content += text[i]
+                i += 1
+            if i < len(text):
+                i += 1
+            if quoted_content.strip():
+                tokens.append(f"EXACT:{quoted_content.strip()}")
+
+        elif char in "|&!()":
+            if current_token.strip():
+                tokens.append(current_token.strip())
+                current_token = ""
+            tokens.append(char)
+            i += 1
+
+        elif char.isspace():
+            if current_token.strip():
+                tokens.append(current_token.strip())
+                current_token = ""
+            i += 1
+
+        else:
+            current_token += char
+            i += 1
+
+    if current_token.strip():
+        tokens.append(current_token.strip())
+
+    return [token for token in tokens if token]
+
+
+def _term_pattern(term: str) -> tuple[str, bool]:
+    """Return (pattern, is_exact) for a single search term."""
+    if term.startswith("EXACT:"):
+        return term[6:], True
+    pattern = term.replace("*", "%").replace("?", "_")
+    if "*" not in term and "?" not in term:
+        pattern = f"%{pattern}%"
+    return pattern, False
+
+
+def _term_bean_ids(term: str) -> tuple[str, list[str]]:
+    """SQL selecting the bean IDs with a note matching ``term``."""
+    pattern, is_exact = _term_pattern(term)
+    operator = "=" if is_exact else "LIKE"
+    return (
+        f"SELECT unnest(bean_ids) AS bean_id FROM tasting_note_postings WHERE note {operator} {_NORMALIZED_PARAM}",
+        [pattern],
+    )
+
+
+def _combine(left: tuple[str, list[str]], operator: str, right: tuple[str, list[str]]) -> tuple[str, list[str]]:
+    sql = f"SELECT bean_id FROM ({left[0]}) {operator} SELECT bean_id FROM ({right[0]})"
+    return sql, left[1] + right[1]
+
+
+def compile_bean_id_set(query: str) -> tuple[str, list[str]] | None:
+    """Compile a boolean tasting-note query into a bean-ID set query.
+
+    Operator precedence matches ``parse_boolean_search_query_for_field``:
+    ``!`` binds tighter than ``&``, which binds tighter than ``|``.
+
+    Returns:
+        (sql, params) selecting a ``bean_id`` column, or None for an empty query.
+    """
+    tokens = tokenize_query(query)
+    if not tokens:
+        return None
+
+    def parse_or(pos: int):
+        left, pos = parse_and(pos)
+        while pos < len(tokens) and tokens[pos] == "|":
+            right, pos = parse_and(pos + 1)
+            left = _merge(left, "UNION", right)
+        return left, pos
+
+    def parse_and(pos: int):
+        left, pos = parse_not(pos)
+        while pos < len(tokens) and tokens[pos] == "&":
+            right, pos = parse_not(pos + 1)
+            left = _merge(left, "INTERSECT", right)
+        return left, pos
+
+    def parse_not(pos: int):
+        if pos < len(tokens) and tokens[pos] == "!":
+            operand, pos = parse_primary(pos + 1)
+            if operand is None:
+                return None, pos
+            return _combine((_ALL_NOTED_BEANS, []), "EXCEPT", operand), pos
+        return parse_primary(pos)
+
+    def parse_primary(pos: int):
+        if pos >= len(tokens):
+            return None, pos
+        if tokens[pos] == "(":
+            operand, pos = parse_or(pos + 1)
+            if pos < len(tokens) and tokens[pos] == ")":
+                pos += 1
+            return operand, pos
+        # Consecutive terms form a single phrase, as in the SQL ILIKE parser
+        term_parts = []
+        while pos < len(tokens) and tokens[pos] not in "|&()":
+            term_parts.append(tokens[pos])
+            pos += 1
+        if not term_parts:
+            return None, pos
+        return _term_bean_ids(" ".join(term_parts)), pos
+
+    def _merge(left, operator, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return _combine(left, operator, right)
+
+    result, _ = parse_or(0)
+    return result
+
+
+def build_tasting_note_filter(query: str, bean_id_expression: str = "cb.id") -> tuple[str, list[str]]:
+    """Strict-mode condition restricting beans to those matching ``query``.
+
+    Returns:
+        tuple: (sql_condition, parameters); ("", []) for an empty query.
+    """
+    compiled = compile_bean_id_set(query)
+    if compiled is None:
+        return "", []
+    sql, params = compiled
+    return f"{bean_id_expression} IN ({sql})", params
+
+
+def build_tasting_note_score(query: str, bean_id_expression: str = "cb.id") -> tuple[str, list[str]]:
+    """Relevance score for how well a bean's notes match ``query``.
+
+    Each non-negated term scores every note: exact match 1.0, prefix match
+    0.7, wildcard/substring match 0.4. Scores are weighted by ``5.0 / pos``
+    so earlier (more prominent) notes count more.
+
+    Returns:
+        tuple: (sql_expression, parameters); ("", []) if there are no positive terms.
+    """
+    tokens = tokenize_query(query)
+    scoring_terms = []
+    is_not = False
+    for token in tokens:
+        if token == "!":
+            is_not = True
+        elif token not in "|&()":
+            if not is_not:
+                scoring_terms.append(token)
+            is_not = False
+        else:
+            is_not = False
+
+    if not scoring_terms:
+        return "", []
+
+    score_parts = []
+    score_params = []
+    for term in scoring_terms:
+        pattern, is_exact = _term_pattern(term)
+        if is_exact:
+            score_parts.append(f"(CASE WHEN t.note = {_NORMALIZED_PARAM} THEN 1.0 ELSE 0.0 END)")
+            score_params.append(pattern)
+        elif term.endswith("*") and term.count("*") == 1 and "?" not in term:
+            prefix = term[:-1]
+            score_parts.append(
+                f"(CASE WHEN t.note = {_NORMALIZED_PARAM} THEN 1.0 "
+                f"WHEN t.note LIKE {_NORMALIZED_PARAM} THEN 0.7 ELSE 0.0 END)"
+            )
+            score_params.extend([prefix, f"{prefix}%"])
+        else:
+            score_parts.append(
+                f"(CASE WHEN t.note = {_NORMALIZED_PARAM} THEN 1.0 "
+                f"WHEN t.note LIKE {_NORMALIZED_PARAM} THEN 0.4 ELSE 0.0 END)"
+            )
+            score_params.extend([term, pattern])
+
+    score_sum_clause = " + ".join(score_parts)
+    return (
+        f"""
+            (SELECT COALESCE(SUM(({score_sum_clause}) * (5.0 / t.pos)), 0)
+             FROM tasting_note_index t
+             WHERE t.bean_id = {bean_id_expression})
+        """,
+        score_params,
+    )
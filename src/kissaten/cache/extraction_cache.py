@@ -0,0 +1,146 @@
+"""Content-addressed cache of AI extraction results.
+
+A product page whose condensed content has not changed extracts to the same
+``CoffeeBean``, so ``BaseScraper._extract_bean_with_ai`` looks the result up
+here before calling the LLM. Entries are keyed by a hash of:
+
+- the text sent to the extractor (the condensed page)
+- the store currency the extractor is told to assume
+- the extractor fingerprint (prompt version, prompt text, output schema and
+  models; see ``CoffeeDataExtractor.cache_fingerprint``)
+
+The product URL is not part of the key, so a product that moved to a new URL
+with identical content is still a hit; the cached bean gets the new URL.
+
+Each entry is one JSON file under ``data/cache/extractions/<key[:2]>/``,
+written atomically, so concurrent scrapers (and separate batch processes) can
+share the cache without locking. A hit refreshes the file's mtime, which
+``evict()`` uses to drop entries by age and, past a size budget, least recently
+used first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import HttpUrl, ValidationError
+
+from ..schemas import CoffeeBean
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache/extractions")
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_SIZE_MB = 512
+
+
+class ExtractionCache:
+    """Extracted beans stored by the hash of the extractor input."""
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(content: str, fingerprint: str, currency: str | None) -> str:
+        """Cache key of one extractor input."""
+        digest = hashlib.sha256()
+        for part in (fingerprint, currency or "", content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str, variant: str) -> Path:
+        suffix = "" if variant == "original" else f".{variant}"
+        return self.cache_dir / key[:2] / f"{key}{suffix}.json"
+
+    def get(self, key: str, product_url: str, variant: str = "original") -> CoffeeBean | None:
+        """The cached bean for ``key`` re-addressed to ``product_url``, or None on a miss.
+
+        ``variant`` distinguishes the extracted bean (``"original"``) from its
+        English translation (``"en"``).
+        """
+        path = self._path(key, variant)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            bean = CoffeeBean.model_validate(entry["bean"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, ValidationError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        bean.url = HttpUrl(product_url)
+        bean.scraped_at = datetime.now(timezone.utc)
+        return bean
+
+    def put(self, key: str, bean: CoffeeBean, variant: str = "original") -> None:
+        """Store the bean extracted for ``key``."""
+        path = self._path(key, variant)
+        entry = {
+            "key": key,
+            "variant": variant,
+            "product_url": str(bean.url),
+            "cached_at": datetime.now(timezone.utc).isoformat(),
+            "bean": bean.model_dump(mode="json"),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write extraction cache entry {path}: {e}")
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def stats(self) -> dict[str, int]:
+        """Number of entries and their total size in bytes."""
+        entries = self._entries()
+        return {"entries": len(entries), "size_bytes": sum(size for _, size, _ in entries)}
+
+    def evict(
+        self, max_age_days: float | None = DEFAULT_MAX_AGE_DAYS, max_size_mb: float | None = DEFAULT_MAX_SIZE_MB
+    ) -> int:
+        """Delete entries unused for ``max_age_days``, then the least recently used ones
+        until the cache fits in ``max_size_mb``. Returns the number deleted."""
+        entries = sorted(self._entries())
+        keep = entries
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            keep = [entry for entry in entries if entry[0] >= cutoff]
+        if max_size_mb is not None:
+            budget = max_size_mb * 1024 * 1024
+            total = sum(size for _, size, _ in keep)
+            while keep and total > budget:
+                total -= keep.pop(0)[1]
+
+        kept = {path for _, _, path in keep}
+        deleted = 0
+        for _, _, path in entries:
+            if path not in kept:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        if deleted:
+            logger.info(f"Evicted {deleted} extraction cache entries from {self.cache_dir}")
+        return deleted
+
+    def clear(self) -> int:
+        """Delete every entry. Returns the number deleted."""
+        return self.evict(max_age_days=0, max_size_mb=0)
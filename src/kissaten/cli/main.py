@@ -425,6 +425,12 @@ def test_scraper(
                 console.print(f"JSON: {json_path}", soft_wrap=True)
                 if image_path is not None:
                     console.print(f"Image: {image_path}", soft_wrap=True)
+                if scraper.last_condensed_page:
+                    console.print(
+                        f"Extractor input: {Path(temp_dir) / 'extractor_input.md'} "
+                        f"({scraper.last_condensed_page.summary()})",
+                        soft_wrap=True,
+                    )
 
             return True
         except Exception as e:
@@ -842,6 +848,10 @@ def run_all_scrapers(
                                         beans_found=beans_found,
                                         beans_processed=session.beans_processed,
                                         beans_in_stock=session.beans_found_in_stock,
+                                        extraction_cache_hits=session.extraction_cache_hits,
+                                        extraction_cache_misses=session.extraction_cache_misses,
+                                        images_downloaded=session.images_downloaded,
+                                        images_reused=session.images_reused,
                                         session_success=session_success,
                                         duration_seconds=round(time.monotonic() - start_ts, 3),
                                         **batch_ctx,
@@ -855,6 +865,10 @@ def run_all_scrapers(
                                             "beans_found": beans_found,
                                             "beans_processed": session.beans_processed,
                                             "beans_in_stock": session.beans_found_in_stock,
+                                            "extraction_cache_hits": session.extraction_cache_hits,
+                                            "extraction_cache_misses": session.extraction_cache_misses,
+                                            "images_downloaded": session.images_downloaded,
+                                            "images_reused": session.images_reused,
                                         }
                                     )
                             else:
@@ -1014,6 +1028,14 @@ def run_all_scrapers(
                 )
             console.print(success_table)
 
+        cache_hits = sum(s.get("extraction_cache_hits", 0) for s in results["successful"])
+        cache_misses = sum(s.get("extraction_cache_misses", 0) for s in results["successful"])
+        if cache_hits or cache_misses:
+            console.print(
+                f"\n[dim]AI extractions served from cache: {cache_hits}/{cache_hits + cache_misses} "
+                f"({cache_hits / (cache_hits + cache_misses) * 100:.1f}%)[/dim]"
+            )
+
         # Log final summary to logfire
         logfire.info(
             "Scraper run completed",
@@ -1022,6 +1044,8 @@ def run_all_scrapers(
             failed_count=failed_count,
             skipped_count=skipped_count,
             success_rate=f"{successful_count / total * 100:.1f}%",
+            extraction_cache_hits=cache_hits,
+            extraction_cache_misses=cache_misses,
             **batch_ctx,
             _tags=["scraper_run_complete", "summary"],
         )
@@ -1075,6 +1099,11 @@ def run_all_scrapers(
         except Exception as e:
             logger.warning("Failed to write batch results summary to %s: %s", batch_results_path, e)
 
+        # Keep the extraction cache within its age and size budget
+        from kissaten.cache.extraction_cache import ExtractionCache
+
+        ExtractionCache(Path("data") / "cache" / "extractions").evict()
+
         # Exit with error code if any scrapers failed and continue_on_error is False
         if failed_count > 0 and not continue_on_error:
             console.print(f"\n[red]❌ {failed_count} scrapers failed. Exiting with error code 1.[/red]")
@@ -1572,6 +1601,69 @@ def refresh(
         raise typer.Exit(1)
 
 
+@app.command()
+def compact_data(
+    data_dir: Path = typer.Option(Path("data"), "--data-dir", help="Directory containing scraped data"),
+    roaster: str | None = typer.Option(None, "--roaster", "-r", help="Only compact this roaster directory"),
+    include_today: bool = typer.Option(
+        False, "--include-today", help="Also compact today's sessions (normally still being written)"
+    ),
+    force: bool = typer.Option(False, "--force", help="Rebuild partitions even if their manifest is up to date"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
+):
+    """Compact scraped bean JSON into per-roaster/date Parquet partitions.
+
+    Each finished session directory (data/roasters/<roaster>/<YYYYMMDD>/) is
+    rolled into data/snapshots/roaster=<roaster>/date=<YYYYMMDD>/beans.parquet
+    with a manifest of the JSON files it was built from. The JSON files are left
+    untouched and remain the source of truth.
+
+    `kissaten refresh` reads compacted partitions plus only the uncompacted
+    tail (new sessions and sessions whose JSON changed after compaction), so
+    refresh time scales with new data rather than scrape history.
+
+    Examples:
+        kissaten compact-data                    # Compact all finished sessions
+        kissaten compact-data -r square_mile     # Only one roaster
+        kissaten compact-data --force            # Rebuild every partition
+    """
+    setup_logging(verbose)
+
+    roasters_dir = data_dir / "roasters"
+    if not roasters_dir.exists():
+        console.print(f"[red]Error: Roasters data directory '{roasters_dir}' does not exist.[/red]")
+        raise typer.Exit(1)
+
+    from ..api.parquet_store import compact_sessions, default_snapshot_dir
+
+    snapshot_dir = default_snapshot_dir(roasters_dir)
+    console.print("[bold blue]📦 Compacting scraped bean JSON into Parquet partitions...[/bold blue]")
+    console.print(f"[blue]Roasters Directory:[/blue] {roasters_dir.absolute()}")
+    console.print(f"[blue]Snapshot Directory:[/blue] {snapshot_dir.absolute()}")
+
+    start = time.perf_counter()
+    try:
+        result = compact_sessions(
+            roasters_dir, snapshot_dir, roaster=roaster, include_today=include_today, force=force
+        )
+    except Exception as e:
+        console.print(f"[red]Error compacting data: {e}[/red]")
+        raise typer.Exit(1)
+    elapsed = time.perf_counter() - start
+
+    console.print(
+        f"\n[bold green]✅ Compacted {len(result.compacted)} sessions ({result.files:,} JSON files) "
+        f"in {elapsed:.1f}s[/bold green]"
+    )
+    console.print(f"  • Already up to date: {len(result.up_to_date)}")
+    console.print(f"  • Skipped (today's sessions): {len(result.skipped)}")
+    if result.removed:
+        console.print(f"  • Removed empty partitions: {len(result.removed)}")
+    if verbose:
+        for key in result.compacted:
+            console.print(f"[dim]  compacted {key}[/dim]")
+
+
 @app.command()
 def refresh_media(
     podcast_dir: Path = typer.Option(
@@ -2548,6 +2640,36 @@ def cache_clear(
         raise typer.Exit(1)
 
 
+@app.command()
+def extraction_cache(
+    cache_dir: Path = typer.Option(
+        Path("data/cache/extractions"), "--cache-dir", help="Path to the AI extraction cache directory"
+    ),
+    max_age_days: float = typer.Option(
+        90, "--max-age-days", help="Delete entries not used for this many days"
+    ),
+    max_size_mb: float = typer.Option(
+        512, "--max-size-mb", help="Then delete least recently used entries until the cache fits in this size"
+    ),
+    clear: bool = typer.Option(False, "--clear", help="Delete every entry"),
+):
+    """Show and trim the cache of AI extraction results.
+
+    `run-all-scrapers` trims the cache with the default limits after every batch.
+    """
+    setup_logging(verbose=False)
+
+    from kissaten.cache.extraction_cache import ExtractionCache
+
+    cache = ExtractionCache(cache_dir)
+    deleted = cache.clear() if clear else cache.evict(max_age_days=max_age_days, max_size_mb=max_size_mb)
+    stats = cache.stats()
+    console.print(f"[green]✓ Deleted {deleted} extraction cache entries[/green]")
+    console.print(
+        f"{stats['entries']} entries, {stats['size_bytes'] / 1024 / 1024:.1f} MB in [dim]{cache_dir}[/dim]"
+    )
+
+
 @app.command()
 def deduplicate_regions(
     country_code: str | None = typer.Argument(
@@ -2696,6 +2818,21 @@ def deduplicate_regions(
 
 # --- Categorization Commands ---
 
+
+def _print_batch_estimate(estimate, concurrency: int) -> None:
+    """Print a dry-run BatchEstimate for a categorization task."""
+    table = Table(title=f"Dry run: {estimate.task}")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+    table.add_row("Items to process", f"{estimate.items:,}")
+    table.add_row("Batches", f"{estimate.batches:,}")
+    table.add_row("Already checkpointed", f"{estimate.checkpointed_batches:,}")
+    table.add_row("Input tokens (approx.)", f"{estimate.input_tokens:,}")
+    table.add_row("Output tokens (approx.)", f"{estimate.output_tokens:,}")
+    table.add_row("Cost (approx.)", f"${estimate.cost_usd:,.2f}")
+    table.add_row(f"Wall time at concurrency {concurrency}", f"{estimate.wall_time_seconds / 60:,.1f} min")
+    console.print(table)
+
 categorize_app = typer.Typer(help="Categorize coffee data (processing, varietals, tasting notes)")
 app.add_typer(categorize_app, name="categorize")
 
@@ -2715,15 +2852,27 @@ def categorize_processing(
         "--database-path",
         help="Path to the DuckDB database file",
     ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum LLM batches in flight at once"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Estimate batches, tokens, cost and wall time without calling the model"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
-    """Categorize coffee processing methods."""
+    """Categorize coffee processing methods.
+
+    Batches run concurrently and are checkpointed, so an interrupted run
+    resumes where it stopped.
+    """
     setup_logging(verbose)
     from ..ai.processing_method_categorizer import ProcessCategorizer
     from ..ai.validation_gate import validate_processing_mappings_file
 
+    categorizer = ProcessCategorizer(database_path, concurrency=concurrency)
+    if dry_run:
+        _print_batch_estimate(categorizer.estimate_categorization(), concurrency)
+        return
+
     async def run():
-        categorizer = ProcessCategorizer(database_path)
         console.print("[bold cyan]Starting coffee processing method categorization...[/bold cyan]")
         output_file = await categorizer.categorize_all_methods()
         console.print(f"[green]✅ Categorization complete! Results saved to {output_file}[/green]")
@@ -2758,19 +2907,30 @@ def categorize_varietals(
         "--database-path",
         help="Path to the DuckDB database file",
     ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum LLM batches in flight at once"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Estimate batches, tokens, cost and wall time without calling the model"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
-    """Categorize coffee varietals using AI."""
+    """Categorize coffee varietals using AI.
+
+    Batches run concurrently and are checkpointed, so an interrupted run
+    resumes where it stopped.
+    """
     setup_logging(verbose)
     from ..ai.varietal_categorizer import VarietalCategorizer
     from ..ai.validation_gate import validate_varietal_mappings_file
 
     # Create the categorizer here so we can reach its mappings_file for the
     # post-run validation gate without refactoring the async run() helper.
-    categorizer = VarietalCategorizer(database_path)
+    categorizer = VarietalCategorizer(database_path, concurrency=concurrency)
+    threshold = 0.6 if retry_low_confidence else 0.0
+    if dry_run:
+        _print_batch_estimate(categorizer.estimate_categorization(min_confidence_threshold=threshold), concurrency)
+        return
 
     async def run():
-        threshold = 0.6 if retry_low_confidence else 0.0
         console.print("[bold cyan]Starting coffee varietal categorization...[/bold cyan]")
         await categorizer.categorize_all_varietals(min_confidence_threshold=threshold)
         if review_and_merge:
@@ -2809,9 +2969,17 @@ def categorize_tasting_notes(
         "--database-path",
         help="Path to the DuckDB database file",
     ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum LLM batches in flight at once"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Estimate batches, tokens, cost and wall time without calling the model"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
-    """Categorize coffee tasting notes and update taste lexicon."""
+    """Categorize coffee tasting notes and update taste lexicon.
+
+    Batches run concurrently and are checkpointed, so an interrupted run
+    resumes where it stopped.
+    """
     setup_logging(verbose)
     from ..ai.tasting_note_categorizer import TastingNoteCategorizer
 
@@ -2819,8 +2987,19 @@ def categorize_tasting_notes(
     categorized_csv_path = Path(__file__).parent.parent / "database/tasting_notes_categorized.csv"
     taste_lexicon_path = Path(__file__).parent.parent / "database/taste_lexicon.json"
 
+    if dry_run:
+        categorizer = TastingNoteCategorizer(
+            database_path, taste_lexicon_path, categorized_csv_path, concurrency=concurrency
+        )
+        _print_batch_estimate(
+            categorizer.estimate_categorization(batch_size=50, update_tertiary=update_missing), concurrency
+        )
+        return
+
     async def run():
-        categorizer = TastingNoteCategorizer(database_path, taste_lexicon_path, categorized_csv_path)
+        categorizer = TastingNoteCategorizer(
+            database_path, taste_lexicon_path, categorized_csv_path, concurrency=concurrency
+        )
 
         if cleanup:
             stale_notes = categorizer.get_stale_notes()
@@ -2873,9 +3052,19 @@ def categorize_all(
         "--database-path",
         help="Path to the DuckDB database file",
     ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Maximum LLM batches in flight at once"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Estimate batches, tokens, cost and wall time without calling the model"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
-    """Run all categorization processes sequentially."""
+    """Run all categorization processes sequentially.
+
+    Within each task, LLM batches run concurrently (--concurrency) and are
+    checkpointed under data/checkpoints/categorize/, so re-running after an
+    interruption skips the batches that already finished. Use --dry-run to
+    see the batches, tokens, cost and wall time each task would need.
+    """
     setup_logging(verbose)
     console.print("\n[bold magenta]🚀 Running ALL categorization tasks sequentially...[/bold magenta]\n")
 
@@ -2885,6 +3074,8 @@ def categorize_all(
         review_and_merge=review_and_merge,
         skip_validation=skip_validation,
         database_path=database_path,
+        concurrency=concurrency,
+        dry_run=dry_run,
         verbose=verbose,
     )
 
@@ -2895,16 +3086,27 @@ def categorize_all(
         retry_low_confidence=True,
         skip_validation=skip_validation,
         database_path=database_path,
+        concurrency=concurrency,
+        dry_run=dry_run,
         verbose=verbose,
     )
 
     # Tasting Notes
     console.print("\n[bold blue]Task 3/3: Tasting Notes[/bold blue]")
     categorize_tasting_notes(
-        update_missing=False, cleanup=False, recategorize_other=False, database_path=database_path, verbose=verbose
+        update_missing=False,
+        cleanup=False,
+        recategorize_other=False,
+        database_path=database_path,
+        concurrency=concurrency,
+        dry_run=dry_run,
+        verbose=verbose,
     )
 
-    console.print("\n[bold green]✨ All categorization tasks completed successfully![/bold green]")
+    if dry_run:
+        console.print("\n[yellow]Dry run complete - no model calls were made.[/yellow]")
+    else:
+        console.print("\n[bold green]✨ All categorization tasks completed successfully![/bold green]")
 
 
 @app.command()
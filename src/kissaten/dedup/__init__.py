@@ -1,5 +1,6 @@
 """Farm name deduplication utilities for Kissaten."""
 
+from kissaten.dedup.blocking import candidate_pairs
 from kissaten.dedup.clusterer import UnionFind, cluster_farms, select_canonical_name
 from kissaten.dedup.matcher import name_similarity, producer_overlap, should_merge
 from kissaten.dedup.normalizer import extract_surnames, normalize_farm_name
@@ -10,6 +11,7 @@ __all__ = [
     "name_similarity",
     "producer_overlap",
     "should_merge",
+    "candidate_pairs",
     "UnionFind",
     "cluster_farms",
     "select_canonical_name",
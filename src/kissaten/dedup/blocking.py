@@ -0,0 +1,164 @@
+"""Candidate generation (blocking) for farm clustering.
+
+``should_merge`` only merges two farms when either
+
+1. their normalized names are similar (token set ratio >= ``name_threshold``)
+   and their producers share a surname, or
+2. their names are near-identical (>= ``exact_threshold``) and at least one
+   producer has no surnames.
+
+Instead of scoring every pair of farms in a region, ``candidate_pairs`` only
+scores pairs that can satisfy one of these rules:
+
+- Surname index: rule 1 needs a shared surname, so pairs come from farms
+  grouped by surname.
+- Name-token index: under rule 2, names that share a token.
+- Q-gram filter: names with no token in common only reach ``exact_threshold``
+  when they are long and differ by a few characters. These pairs are found
+  with a length window and a q-gram count filter on the sorted token strings
+  that ``token_set_ratio`` compares.
+
+Similarities within each block are computed in bulk with
+``rapidfuzz.process.cdist``. Every filter is exact (no pair that
+``should_merge`` would accept is dropped), and ``cluster_farms`` confirms the
+candidates with ``should_merge`` itself, so clusters are identical to the
+exhaustive pairwise comparison.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+
+from rapidfuzz import fuzz, process
+
+from kissaten.dedup.normalizer import extract_surnames, normalize_farm_name
+
+QGRAM_SIZE = 3
+
+# Rows per cdist call, to bound the score matrix for very large blocks
+CDIST_CHUNK_SIZE = 1024
+
+# Slack for float rounding in cdist scores and length bounds. Keeping a few
+# extra candidates is harmless since should_merge makes the final call.
+_EPSILON = 1e-6
+
+
+def _similar_pairs(names: list[str], rows: list[int], cols: list[int], threshold: float) -> Iterator[tuple[int, int]]:
+    """Yield (i, j) pairs, i < j, from ``rows`` x ``cols`` with name similarity >= ``threshold``."""
+    cutoff = threshold * 100 - _EPSILON
+    col_names = [names[j] for j in cols]
+    for start in range(0, len(rows), CDIST_CHUNK_SIZE):
+        chunk = rows[start : start + CDIST_CHUNK_SIZE]
+        if cutoff <= 0:
+            # Every pair passes; cdist would report a 0.0 score as "below cutoff"
+            hits = ((r, c) for r in range(len(chunk)) for c in range(len(cols)))
+        else:
+            scores = process.cdist(
+                [names[i] for i in chunk], col_names, scorer=fuzz.token_set_ratio, score_cutoff=cutoff, workers=-1
+            )
+            hits = zip(*scores.nonzero())
+        for r, c in hits:
+            i, j = chunk[r], cols[c]
+            if i != j:
+                yield (i, j) if i < j else (j, i)
+
+
+def _long_name_pairs(
+    names: list[str], tokens: list[set[str]], rows: list[int], threshold: float
+) -> Iterator[tuple[int, int]]:
+    """Yield pairs with no shared name token that can still reach ``threshold``.
+
+    Without a shared token, ``token_set_ratio`` is the Indel ratio of the two
+    sorted token strings ``a`` and ``b``, so reaching ``threshold`` allows at
+    most ``(1 - threshold) * (len(a) + len(b))`` edits. Below one edit the
+    strings would have to be identical, and identical strings share tokens,
+    which leaves only long names. Candidates must also fall in the matching
+    length window and share at least ``max(len) - q + 1 - q * edits`` q-grams
+    (the q-gram lemma).
+    """
+    slack = 1.0 - threshold
+    if slack <= 0:
+        return
+
+    keys = [" ".join(sorted(t)) for t in tokens]
+    lengths = [len(key) for key in keys]
+    order = sorted(range(len(keys)), key=lengths.__getitem__)
+    sorted_lengths = [lengths[i] for i in order]
+    qgram_cache: dict[int, Counter] = {}
+
+    def qgrams(i: int) -> Counter:
+        if i not in qgram_cache:
+            key = keys[i]
+            qgram_cache[i] = Counter(key[k : k + QGRAM_SIZE] for k in range(len(key) - QGRAM_SIZE + 1))
+        return qgram_cache[i]
+
+    for i in rows:
+        la = lengths[i]
+        if la == 0:
+            continue
+        # |la - lb| <= slack * (la + lb), and at least one edit allowed
+        lo = max(1, math.ceil(la * (1 - slack) / (1 + slack) - _EPSILON), math.ceil(1 / slack - la - _EPSILON))
+        hi = math.floor(la * (1 + slack) / (1 - slack) + _EPSILON)
+        if lo > hi:
+            continue
+
+        candidates = []
+        for j in order[bisect_left(sorted_lengths, lo) : bisect_right(sorted_lengths, hi)]:
+            if j == i or tokens[i] & tokens[j]:
+                continue
+            lb = lengths[j]
+            max_edits = math.floor(slack * (la + lb) + _EPSILON)
+            required = max(la, lb) - QGRAM_SIZE + 1 - QGRAM_SIZE * max_edits
+            if required > 0 and sum((qgrams(i) & qgrams(j)).values()) < required:
+                continue
+            candidates.append(j)
+
+        if candidates:
+            yield from _similar_pairs(names, [i], candidates, threshold)
+
+
+def candidate_pairs(
+    farms: list[dict], name_threshold: float = 0.90, exact_threshold: float = 0.99
+) -> set[tuple[int, int]]:
+    """
+    Find the index pairs of farms that could pass ``should_merge``.
+
+    Args:
+        farms: List of farm dicts with 'farm_name' and 'producer_name' keys
+        name_threshold: Minimum name similarity for a producer-backed match
+        exact_threshold: Name similarity for a match without producer overlap
+
+    Returns:
+        Set of (i, j) index pairs with i < j. Includes every pair that
+        ``should_merge`` accepts (and possibly a few it rejects).
+    """
+    names = [normalize_farm_name(farm["farm_name"]) for farm in farms]
+    surnames = [extract_surnames(farm.get("producer_name", "")) for farm in farms]
+    pairs: set[tuple[int, int]] = set()
+
+    # Rule 1: similar names with a shared producer surname
+    by_surname = defaultdict(list)
+    for i, farm_surnames in enumerate(surnames):
+        for surname in farm_surnames:
+            by_surname[surname].append(i)
+    for block in by_surname.values():
+        if len(block) > 1:
+            pairs.update(_similar_pairs(names, block, block, name_threshold))
+
+    # Rule 2: near-identical names where one producer is unknown
+    unknown = [i for i, farm_surnames in enumerate(surnames) if not farm_surnames]
+    if unknown:
+        unknown_set = set(unknown)
+        tokens = [set(name.split()) for name in names]
+        by_token = defaultdict(list)
+        for i, name_tokens in enumerate(tokens):
+            for token in name_tokens:
+                by_token[token].append(i)
+        for block in by_token.values():
+            rows = [i for i in block if i in unknown_set]
+            if rows and len(block) > 1:
+                pairs.update(_similar_pairs(names, rows, block, exact_threshold))
+        pairs.update(_long_name_pairs(names, tokens, unknown, exact_threshold))
+
+    return pairs
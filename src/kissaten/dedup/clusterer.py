@@ -2,6 +2,7 @@
 
 from collections import defaultdict
 
+from kissaten.dedup.blocking import candidate_pairs
 from kissaten.dedup.matcher import should_merge
 
 
@@ -60,16 +61,22 @@ class UnionFind:
             self.rank[px] += 1
 
 
-def cluster_farms(farms: list[dict], name_threshold: float = 0.90) -> list[dict]:
+def cluster_farms(farms: list[dict], name_threshold: float = 0.90, use_blocking: bool = True) -> list[dict]:
     """
     Group farms into clusters based on merge rules.
     
     Uses Union-Find to efficiently group farms that should be merged together.
     Each cluster represents a set of farm entries that refer to the same farm.
     
+    With blocking (the default), only the candidate pairs from
+    ``blocking.candidate_pairs`` are checked with ``should_merge``, in the same
+    order as the exhaustive O(n²) loop, so the clusters are identical.
+    
     Args:
         farms: List of farm dicts with 'farm_name', 'producer_name', 'bean_count', etc.
         name_threshold: Minimum name similarity threshold (default: 0.90)
+        use_blocking: Compare candidate pairs only (default: True). False
+                      compares every pair.
         
     Returns:
         List of cluster dicts, each containing:
@@ -98,28 +105,33 @@ def cluster_farms(farms: list[dict], name_threshold: float = 0.90) -> list[dict]
     uf = UnionFind(n)
     merge_confidences = defaultdict(list)  # Track confidence per cluster
     
-    # O(n²) pairwise comparison
-    for i in range(n):
-        for j in range(i + 1, n):
-            should, confidence = should_merge(farms[i], farms[j], name_threshold=name_threshold)
-            if should:
-                # Merge the sets
-                root_before_i = uf.find(i)
-                root_before_j = uf.find(j)
-                uf.union(i, j)
-                
-                # Track confidence for the resulting cluster
-                new_root = uf.find(i)
-                merge_confidences[new_root].append(confidence)
-                
-                # If we merged two existing clusters, combine their confidences
-                if root_before_i != root_before_j:
-                    if root_before_i != new_root and root_before_i in merge_confidences:
-                        merge_confidences[new_root].extend(merge_confidences[root_before_i])
-                        del merge_confidences[root_before_i]
-                    if root_before_j != new_root and root_before_j in merge_confidences:
-                        merge_confidences[new_root].extend(merge_confidences[root_before_j])
-                        del merge_confidences[root_before_j]
+    if use_blocking:
+        # Sorted so merges happen in the same order as the exhaustive loop
+        pairs = sorted(candidate_pairs(farms, name_threshold=name_threshold))
+    else:
+        # O(n²) pairwise comparison
+        pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+    
+    for i, j in pairs:
+        should, confidence = should_merge(farms[i], farms[j], name_threshold=name_threshold)
+        if should:
+            # Merge the sets
+            root_before_i = uf.find(i)
+            root_before_j = uf.find(j)
+            uf.union(i, j)
+            
+            # Track confidence for the resulting cluster
+            new_root = uf.find(i)
+            merge_confidences[new_root].append(confidence)
+            
+            # If we merged two existing clusters, combine their confidences
+            if root_before_i != root_before_j:
+                if root_before_i != new_root and root_before_i in merge_confidences:
+                    merge_confidences[new_root].extend(merge_confidences[root_before_i])
+                    del merge_confidences[root_before_i]
+                if root_before_j != new_root and root_before_j in merge_confidences:
+                    merge_confidences[new_root].extend(merge_confidences[root_before_j])
+                    del merge_confidences[root_before_j]
     
     # Group by root to form clusters
     cluster_map = defaultdict(list)
@@ -1,12 +1,38 @@
 """API response models that extend the base CoffeeBean schema."""
 
 import datetime
-from typing import Optional
+from collections.abc import Callable
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
 from .coffee_bean import Bean, CoffeeBean, PriceOption
 
+_READ_MODEL_DEFAULTS: dict[type[BaseModel], tuple[dict[str, Any], dict[str, Callable[[], Any]]]] = {}
+
+
+def read_model_row(model: type[BaseModel], data: dict[str, Any]) -> dict[str, Any]:
+    """``data`` completed with the defaults of ``model``'s fields, without validation.
+
+    The result serializes to the same JSON as ``model(**data)`` would for
+    already-valid data, including extra keys.
+    """
+    if model not in _READ_MODEL_DEFAULTS:
+        defaults, factories = {}, {}
+        for name, field in model.model_fields.items():
+            if field.default_factory is not None:
+                factories[name] = field.default_factory
+            elif not field.is_required():
+                defaults[name] = field.default
+        _READ_MODEL_DEFAULTS[model] = defaults, factories
+
+    defaults, factories = _READ_MODEL_DEFAULTS[model]
+    row = {**defaults, **data}
+    for name, factory in factories.items():
+        if name not in row:
+            row[name] = factory()
+    return row
+
 
 class APIBean(Bean):
     """Bean model for API responses with relaxed validation."""
@@ -25,6 +51,11 @@ class APIBean(Bean):
     region_canonical: str | None = Field(None, description="Canonical region/state name")
     farm_canonical: str | None = Field(None, description="Canonical farm name")
 
+    @classmethod
+    def read_model(cls, **data) -> dict[str, Any]:
+        """Origin as a validator-free read model (see ``APICoffeeBean.read_model``)."""
+        return read_model_row(cls, data)
+
 class TastingNote(BaseModel):
     """Represents a tasting note with its assigned primary category."""
 
@@ -74,6 +105,28 @@ class APICoffeeBean(CoffeeBean):
         """Ignore price validation for API models."""
         return model
 
+    @classmethod
+    def read_model(cls, **data) -> dict[str, Any]:
+        """Bean as a validator-free read model for trusted database rows.
+
+        Rows in the database were validated as ``CoffeeBean`` when they were
+        scraped. Building the API model for every result re-runs those
+        validators (note cleaning, which may even call the AI splitter, price
+        checks, nested origin validators) and FastAPI's ``response_model``
+        validates the dumped result once more. Endpoints instead build plain
+        dicts with the model's fields and serialize them once with
+        ``json_response``. ``origins`` must be ``APIBean.read_model`` rows.
+        """
+        # Same shapes the field validators produce: plain notes are title-cased
+        # and de-duplicated (without the AI splitter), missing lists are empty
+        notes = data.get("tasting_notes") or []
+        if notes and isinstance(notes[0], str):
+            notes = list(dict.fromkeys(note.strip().title() for note in notes if note and note.strip()))
+        data["tasting_notes"] = notes
+        if "price_options" in data:
+            data["price_options"] = data["price_options"] or []
+        return read_model_row(cls, data)
+
     class Config:
         # Allow extra fields that might come from the database
         extra = "allow"
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
 class ScrapingSession(BaseModel):
@@ -29,6 +29,20 @@ class ScrapingSession(BaseModel):
     duration_seconds: float | None = Field(None, ge=0, description="Total duration in seconds")
     pages_scraped: int = Field(0, ge=0, description="Number of pages scraped")
     requests_made: int = Field(0, ge=0, description="Total HTTP requests made")
+    extraction_cache_hits: int = Field(0, ge=0, description="AI extractions served from the extraction cache")
+    extraction_cache_misses: int = Field(0, ge=0, description="AI extractions that had to call the LLM")
+    images_downloaded: int = Field(0, ge=0, description="Product images downloaded into the image store")
+    images_reused: int = Field(0, ge=0, description="Product images already in the image store and unchanged")
+    pipeline_metrics: dict[str, dict[str, float]] = Field(
+        default_factory=dict, description="Throughput counters of each product pipeline stage"
+    )
+
+    @computed_field
+    @property
+    def extraction_cache_hit_ratio(self) -> float | None:
+        """Share of AI extractions served from the cache (None if nothing was extracted)."""
+        lookups = self.extraction_cache_hits + self.extraction_cache_misses
+        return self.extraction_cache_hits / lookups if lookups else None
 
     def mark_completed(self, success: bool = True):
         """Mark the session as completed."""
@@ -2,7 +2,7 @@
 
 import logging
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 
 from ..ai import CoffeeDataExtractor
 from ..schemas import CoffeeBean
@@ -27,6 +27,9 @@ logger = logging.getLogger(__name__)
 class AustraattKaffebrenneriScraper(BaseScraper):
     """Scraper for Austrått Kaffebrenneri with AI-powered extraction."""
 
+    # Title, description, options and price; drops related products and reviews
+    content_root_selector = "main > section"
+
     def __init__(self, api_key: str | None = None):
         """Initialize Austrått Kaffebrenneri scraper.
 
@@ -51,43 +54,6 @@ class AustraattKaffebrenneriScraper(BaseScraper):
         """
         return ["https://www.austraattkaffebrenneri.no/categories/kaffe"]
 
-    async def fetch_page(self, *args, **kwargs) -> BeautifulSoup | Tag | None:
-        """Fetch a page and return a reduced soup for AI extraction.
-
-        For product pages, trim the soup down to the main product section
-        (``main > section``) which contains the title, description, options
-        and price - everything the AI extractor needs. Drops the rest of the
-        page (header, footer, related products, reviews widgets, etc.) to
-        reduce token count.
-
-        Args:
-            *args: Positional args forwarded to ``super().fetch_page``.
-            **kwargs: Keyword args forwarded to ``super().fetch_page``.
-
-        Returns:
-            Reduced BeautifulSoup/Tag, or None if the fetch failed.
-        """
-        try:
-            soup = await super().fetch_page(*args, **kwargs)
-            url = kwargs.get("url")
-            if not url and len(args) > 0:
-                url = args[0]
-
-            if not isinstance(soup, (BeautifulSoup, Tag)) or "/products/" not in (url or ""):
-                return soup
-
-            section = soup.select_one("main > section")
-            if not section:
-                return soup
-
-            trimmed = BeautifulSoup("", "lxml")
-            trimmed.append(section)
-            logger.debug(f"Trimmed product page to main section: {url}")
-            return trimmed
-        except Exception as e:
-            logger.error(f"Error fetching page {kwargs.get('url') or (args[0] if args else '?')}: {e}")
-            return None
-
     async def _scrape_new_products(self, product_urls: list[str]) -> list[CoffeeBean]:
         """Scrape new products using full AI extraction.
 
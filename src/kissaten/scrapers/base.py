@@ -20,8 +20,12 @@ from playwright.async_api import Browser, Page, async_playwright
 
 from kissaten.ai.extractor import CoffeeDataExtractor
 
+from ..cache.extraction_cache import ExtractionCache
 from ..schemas import CoffeeBean, CoffeeBeanDiffUpdate, ScrapingSession
 from . import _curl_http as httpx
+from .html_condenser import CondensedPage, condense_html
+from .image_store import ImageStore
+from .pipeline import Pipeline, Stage
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +48,14 @@ class WebBotAuth(httpx.Auth):
 class BaseScraper(ABC):
     """Abstract base class for all coffee roaster scrapers."""
 
+    # CSS selector of the element holding the product on a product page. AI
+    # extraction only sees this element's content (plus the page's product
+    # metadata); None uses the whole body.
+    content_root_selector: str | None = None
+    # False for scrapers that already hand the extractor a hand-built soup whose
+    # <script> payloads must reach the model verbatim
+    condense_html_for_ai: bool = True
+
     def _validate_roaster_name(self, roaster_name: str) -> None:
         """Validate that roaster_name matches the registry.
 
@@ -174,6 +186,12 @@ class BaseScraper(ABC):
         # Used to suppress out-of-stock updates after network/fetch failures.
         self._failed_listing_urls: list[str] = []
 
+        # Condensed input of the most recent AI extraction (for test-scraper --extract)
+        self.last_condensed_page: CondensedPage | None = None
+        # Extracted beans by page content; None disables the cache
+        self.extraction_cache: ExtractionCache | None = ExtractionCache(BEAN_DATA_DIR / "cache" / "extractions")
+        self._image_stores: dict[Path, ImageStore] = {}  # output dir -> image store
+
         # Initialize AI extractor (may be None if GOOGLE_API_KEY is not set)
         try:
             self.ai_extractor = CoffeeDataExtractor()
@@ -964,6 +982,7 @@ class BaseScraper(ABC):
             product_urls: List of product URLs that are currently in stock
             output_dir: Base output directory
         """
+        product_urls = self._drop_unchanged_stock_updates(product_urls, True, output_dir)
         if not product_urls:
             return
 
@@ -993,6 +1012,7 @@ class BaseScraper(ABC):
                 # Save diffjson file - use dict directly to avoid Pydantic serialization issues
                 with open(output_path, "w") as f:
                     json.dump(update_data, f, indent=2)
+                self._stock_update_written(str(url), True, output_dir)
 
                 logger.debug(f"Created stock update: {output_path}")
 
@@ -1040,6 +1060,10 @@ class BaseScraper(ABC):
                 self.session.add_error(msg)
             return
 
+        out_of_stock_urls = self._drop_unchanged_stock_updates(out_of_stock_urls, False, output_dir)
+        if not out_of_stock_urls:
+            return
+
         logger.info(f"Creating out-of-stock updates for {len(out_of_stock_urls)} products")
 
         session_datetime = self.session_datetime or datetime.now().strftime("%Y%m%d")
@@ -1066,12 +1090,33 @@ class BaseScraper(ABC):
                 # Save diffjson file - use dict directly to avoid Pydantic serialization issues
                 with open(output_path, "w") as f:
                     json.dump(update_data, f, indent=2)
+                self._stock_update_written(str(url), False, output_dir)
 
                 logger.debug(f"Created out-of-stock update: {output_path}")
 
             except Exception as e:
                 logger.error(f"Failed to create out-of-stock update for {url}: {e}")
 
+    def _drop_unchanged_stock_updates(self, urls: list[str], in_stock: bool, output_dir: Path) -> list[str]:
+        """Filter out URLs whose last written stock diffjson already has ``in_stock``."""
+        changed = [url for url in urls if not self._stock_update_unchanged(str(url), in_stock, output_dir)]
+        if len(changed) < len(urls):
+            status = "in-stock" if in_stock else "out-of-stock"
+            logger.info(f"Skipping {len(urls) - len(changed)} {status} updates with unchanged stock status")
+        return changed
+
+    def _stock_update_unchanged(self, url: str, in_stock: bool, output_dir: Path) -> bool:
+        """Whether a stock diffjson for ``url`` would repeat the last one written.
+
+        The base scraper keeps no record of written updates, so it always
+        writes. Scrapers that track their listings override this (see
+        ``ShopifyJsonScraper``).
+        """
+        return False
+
+    def _stock_update_written(self, url: str, in_stock: bool, output_dir: Path) -> None:
+        """Called after a stock diffjson for ``url`` has been written."""
+
     def _generate_diffjson_filename(self, url: str) -> str:
         """Generate a filename for diffjson files based on product URL.
 
@@ -1246,9 +1291,19 @@ class BaseScraper(ABC):
         logger.debug(f"Saved bean to: {filename}")
         return filename
 
+    def _image_store(self, output_dir: Path = BEAN_DATA_DIR) -> ImageStore:
+        """The content-addressed image store under ``output_dir``, with this roaster's manifest."""
+        if output_dir not in self._image_stores:
+            self._image_stores[output_dir] = ImageStore(output_dir / "images", self._get_roaster_dir_name())
+        return self._image_stores[output_dir]
+
     async def download_and_save_image(self, image_url: str, bean_uid: str, output_dir: Path) -> Path | None:
         """Download and save product image.
 
+        The image is kept once in the content-addressed store under
+        ``output_dir/images`` (see ``ImageStore``), re-fetched only if the
+        server reports a change, and linked into the session directory.
+
         Args:
             image_url: URL of the image to download
             bean_uid: Unique identifier for the bean (same as JSON filename without extension)
@@ -1262,21 +1317,22 @@ class BaseScraper(ABC):
             session_datetime = self.session_datetime or datetime.now().strftime("%Y%m%d")
 
             bean_dir = output_dir / "roasters" / self._get_roaster_dir_name() / session_datetime
-            bean_dir.mkdir(parents=True, exist_ok=True)
-
-            # Create image filename with same base name as JSON
-            image_filename = bean_dir / f"{bean_uid}.png"
 
-            # Download the image
-            logger.debug(f"Downloading image: {image_url}")
-            response = await self.client.get(image_url)
-            response.raise_for_status()
+            logger.debug(f"Fetching image: {image_url}")
+            store = self._image_store(output_dir)
+            downloads = store.downloads
+            image = await store.fetch(self.client, image_url)
+            if self.session:
+                if store.downloads > downloads:
+                    self.session.images_downloaded += 1
+                else:
+                    self.session.images_reused += 1
+            store.record_bean(bean_uid, image, bean_dir.relative_to(output_dir) / f"{bean_uid}.json")
 
-            # Save the image as PNG
-            with open(image_filename, "wb") as f:
-                f.write(response.content)
+            # Same base name as the JSON, so image URLs derived from bean file paths keep working
+            image_filename = store.link(image, bean_dir / f"{bean_uid}.png")
 
-            logger.debug(f"Saved image to: {image_filename}")
+            logger.debug(f"Saved image to: {image_filename} ({image.path})")
             return image_filename
 
         except Exception as e:
@@ -1392,8 +1448,11 @@ class BaseScraper(ABC):
             logger.warning(f"AI extraction produced no bean for {product_url}")
             return None
 
-        # Save the bean (and image) into the temp output dir for inspection
+        # Save the bean (and image) into the temp output dir for inspection,
+        # next to the condensed text the extractor was given
         json_path, image_path = await self.save_bean_with_image(bean, output_dir)
+        if self.last_condensed_page:
+            (output_dir / "extractor_input.md").write_text(self.last_condensed_page.text, encoding="utf-8")
         logger.info(f"Test extraction saved bean to: {json_path}")
         return bean, json_path, image_path
 
@@ -1631,6 +1690,28 @@ class BaseScraper(ABC):
         # If no clear indicators, be conservative and include it
         return True
 
+    def _product_save_stages(self, output_dir: Path, workers: int) -> list[Stage]:
+        """Pipeline stages that save an extracted ``(product_url, bean)``: write the
+        bean's JSON and mark the URL as scraped, then download the image."""
+
+        async def save(extracted: tuple[str, CoffeeBean]) -> CoffeeBean:
+            product_url, bean = extracted
+            self.save_bean_to_file(bean, output_dir)
+            self._mark_bean_as_scraped(product_url)
+            return bean
+
+        async def download_image(bean: CoffeeBean) -> CoffeeBean:
+            if bean.image_url:
+                await self.download_and_save_image(str(bean.image_url), self.create_bean_uid(bean), output_dir)
+            return bean
+
+        return [Stage("save", save), Stage("image", download_image, workers=workers)]
+
+    def _record_pipeline_metrics(self, pipeline: Pipeline) -> None:
+        pipeline.log_metrics()
+        if self.session:
+            self.session.pipeline_metrics = {metrics.name: metrics.as_dict() for metrics in pipeline.metrics}
+
     async def process_product_batch(
         self,
         product_urls: list[str],
@@ -1639,50 +1720,41 @@ class BaseScraper(ABC):
         save_to_file: bool = True,
         output_dir: Path | None = None,
     ) -> list[CoffeeBean]:
-        """Process a batch of product URLs concurrently.
+        """Process product URLs concurrently.
+
+        Extraction runs in a pool of ``batch_size`` workers; when
+        ``save_to_file`` is set, extracted beans flow on to separate save and
+        image download stages, so a slow download never holds up extraction.
 
         Args:
             product_urls: List of product URLs to process
             extract_function: Function to extract bean from a product URL
-            batch_size: Number of URLs to process concurrently
+            batch_size: Number of URLs to extract concurrently
             save_to_file: Whether to save beans to individual files
             output_dir: Output directory for saving files
 
         Returns:
             List of successfully extracted CoffeeBean objects
         """
-        coffee_beans = []
-
         if output_dir is None:
             output_dir = Path("data")
 
-        # Process products in batches
-        for i in range(0, len(product_urls), batch_size):
-            batch_urls = product_urls[i : i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (len(product_urls) + batch_size - 1) // batch_size
-            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch_urls)} products)")
-
-            # Process this batch concurrently
-            tasks = [extract_function(url) for url in batch_urls]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Filter out None results and exceptions
-            for result in results:
-                if isinstance(result, CoffeeBean):
-                    coffee_beans.append(result)
-                    if save_to_file:
-                        # Save bean to file with image download and mark as scraped
-                        await self.save_bean_with_image(result, output_dir)
-                        self._mark_bean_as_scraped(str(result.url))
-                elif isinstance(result, Exception):
-                    logger.error(f"Exception in batch processing: {result}")
-
-            # Small delay between batches to be respectful
-            if i + batch_size < len(product_urls):
-                await asyncio.sleep(0.5)
+        async def extract(url: str) -> tuple[str, CoffeeBean] | CoffeeBean | None:
+            result = await extract_function(url)
+            if not isinstance(result, CoffeeBean):
+                return None
+            return (str(result.url), result) if save_to_file else result
+
+        stages = [Stage("extract", extract, workers=batch_size)]
+        if save_to_file:
+            stages += self._product_save_stages(output_dir, workers=batch_size)
 
-        return coffee_beans
+        logger.info(f"Processing {len(product_urls)} products with {batch_size} concurrent extractions")
+        async with Pipeline(stages) as pipeline:
+            for url in product_urls:
+                await pipeline.put(url)
+        self._record_pipeline_metrics(pipeline)
+        return pipeline.results
 
     async def scrape_with_ai_extraction(
         self,
@@ -1693,21 +1765,27 @@ class BaseScraper(ABC):
         translate_to_english: bool = False,
         max_concurrent: int = 2,
         output_dir: Path | None = None,
+        max_concurrent_fetches: int | None = None,
     ) -> list[CoffeeBean]:
         """Common scraping flow with AI extraction.
 
+        New products stream through a ``Pipeline`` as soon as their store page
+        has been read: fetch, AI extraction, JSON save and image download each
+        have their own workers and bounded queue, so slow LLM calls do not
+        stall page fetches (and slow fetches do not leave the extractor idle).
+
         Args:
             extract_product_urls_function: Function to extract product URLs from store page
             ai_extractor: AI extractor instance
             use_playwright: Whether to use Playwright for fetching pages
-            max_concurrent: Maximum number of concurrent requests (default: 2)
+            max_concurrent: Maximum number of concurrent AI extractions (and image downloads)
             output_dir: Output directory for saving files
+            max_concurrent_fetches: Maximum number of concurrent product page fetches
+                (defaults to ``max_concurrent``)
 
         Returns:
             List of CoffeeBean objects
         """
-        coffee_beans = []
-
         # Start a new scraping session if none exists
         if not self.session:
             self.start_session()
@@ -1715,6 +1793,38 @@ class BaseScraper(ABC):
         if output_dir is None:
             output_dir = BEAN_DATA_DIR
 
+        async def fetch(product_url: str) -> tuple[str, BeautifulSoup] | None:
+            logger.debug(f"Fetching product page: {product_url}")
+            product_soup = await self.fetch_page(product_url, use_playwright=use_playwright)
+            if not product_soup:
+                logger.warning(f"Failed to fetch product page: {product_url}")
+                return None
+            self.session.pages_scraped += 1
+            return product_url, product_soup
+
+        async def extract(page: tuple[str, BeautifulSoup]) -> tuple[str, CoffeeBean] | None:
+            product_url, product_soup = page
+            logger.debug(f"AI extracting from: {product_url}")
+            bean = await self._extract_bean_with_ai(
+                ai_extractor,
+                product_soup,
+                product_url,
+                use_optimized_mode=use_optimized_mode,
+                translate_to_english=translate_to_english,
+            )
+            self._apply_product_flags(bean, product_url, is_new=True)
+            if bean and self.is_coffee_product_name(bean.name):
+                origins_str = ", ".join(str(origin) for origin in bean.origins)
+                logger.debug(f"AI extracted: {bean.name} from {origins_str}")
+                return product_url, bean
+            return None
+
+        stages = [
+            Stage("fetch", fetch, workers=max_concurrent_fetches or max_concurrent),
+            Stage("extract", extract, workers=max_concurrent),
+            *self._product_save_stages(output_dir, workers=max_concurrent),
+        ]
+
         try:
             # Load existing beans from all sessions to enable stock updates
             self._load_existing_beans_from_all_sessions(output_dir)
@@ -1722,87 +1832,44 @@ class BaseScraper(ABC):
             store_urls = await self.get_store_urls()
 
             all_product_urls = set()
+            queued_urls: set[str] = set()
 
-            for store_url in store_urls:
-                logger.info(f"Scraping store page: {store_url}")
-
-                # Extract product URLs
-                product_urls = await extract_product_urls_function(store_url)
-                logger.info(f"Found {len(product_urls)} total product URLs on {store_url}")
-
-                all_product_urls.update(product_urls)
-
-                self.session.pages_scraped += 1
-
-                # Create stock updates for products we already have
-                existing_urls = [url for url in product_urls if self._is_bean_already_scraped_anywhere(url)]
-                if existing_urls:
-                    await self._create_stock_updates(existing_urls, output_dir)
-
-                # Filter out URLs that have already been scraped anywhere
-                new_product_urls = [url for url in product_urls if not self._is_bean_already_scraped_anywhere(url)]
-                skipped_count = len(product_urls) - len(new_product_urls)
-
-                if skipped_count > 0:
-                    logger.info(f"Skipping {skipped_count} already scraped products (stock status updated)")
-                logger.info(f"Processing {len(new_product_urls)} new products for AI extraction")
-
-                # Create semaphore to limit concurrent processing
-                semaphore = asyncio.Semaphore(max_concurrent)
-
-                # Define extraction function with semaphore control
-                async def extract_bean_from_url_with_semaphore(product_url: str) -> CoffeeBean | None:
-                    async with semaphore:
-                        try:
-                            logger.debug(f"AI extracting from: {product_url}")
-                            product_soup = await self.fetch_page(product_url, use_playwright=use_playwright)
-
-                            if not product_soup:
-                                logger.warning(f"Failed to fetch product page: {product_url}")
-                                return None
-
-                            self.session.pages_scraped += 1
-
-                            # Use AI to extract detailed bean information
-                            bean = await self._extract_bean_with_ai(
-                                ai_extractor,
-                                product_soup,
-                                product_url,
-                                use_optimized_mode=use_optimized_mode,
-                                translate_to_english=translate_to_english,
-                            )
-                            self._apply_product_flags(bean, product_url, is_new=True)
-                            if bean and self.is_coffee_product_name(bean.name):
-                                origins_str = ", ".join(str(origin) for origin in bean.origins)
-                                logger.debug(f"AI extracted: {bean.name} from {origins_str}")
-                                # Save bean to file and mark as scraped
-                                if output_dir is None:
-                                    output_dir_to_use = Path("data")
-                                else:
-                                    output_dir_to_use = output_dir
-                                await self.save_bean_with_image(bean, output_dir_to_use)
-                                self._mark_bean_as_scraped(product_url)
-                                return bean
-
-                            return None
-
-                        except Exception as e:
-                            logger.error(f"Error processing product {product_url}: {e}")
-                            return None
-
-                # Process all products concurrently with semaphore control
-                logger.info(
-                    f"Processing {len(new_product_urls)} products with max {max_concurrent} concurrent requests"
-                )
-                tasks = [extract_bean_from_url_with_semaphore(url) for url in new_product_urls]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+            async with Pipeline(stages) as pipeline:
+                for store_url in store_urls:
+                    logger.info(f"Scraping store page: {store_url}")
+
+                    # Extract product URLs
+                    product_urls = await extract_product_urls_function(store_url)
+                    logger.info(f"Found {len(product_urls)} total product URLs on {store_url}")
+
+                    all_product_urls.update(product_urls)
+
+                    self.session.pages_scraped += 1
+
+                    # Create stock updates for products we already have
+                    existing_urls = [url for url in product_urls if self._is_bean_already_scraped_anywhere(url)]
+                    if existing_urls:
+                        await self._create_stock_updates(existing_urls, output_dir)
 
-                # Filter out None results and exceptions
-                for result in results:
-                    if isinstance(result, CoffeeBean):
-                        coffee_beans.append(result)
-                    elif isinstance(result, Exception):
-                        logger.error(f"Exception in concurrent processing: {result}")
+                    # Filter out URLs that have already been scraped anywhere, or
+                    # are already in the pipeline from an earlier store page
+                    new_product_urls = [
+                        url
+                        for url in product_urls
+                        if not self._is_bean_already_scraped_anywhere(url) and url not in queued_urls
+                    ]
+                    skipped_count = len(product_urls) - len(new_product_urls)
+
+                    if skipped_count > 0:
+                        logger.info(f"Skipping {skipped_count} already scraped or queued products")
+                    logger.info(f"Queueing {len(new_product_urls)} new products for AI extraction")
+
+                    for url in new_product_urls:
+                        queued_urls.add(url)
+                        await pipeline.put(url)
+
+            self._record_pipeline_metrics(pipeline)
+            coffee_beans = pipeline.results
 
             if self.session:
                 self.session.beans_found = len(all_product_urls)
@@ -1895,9 +1962,6 @@ class BaseScraper(ABC):
             CoffeeBean object or None if extraction fails
         """
         try:
-            # Get the HTML content for AI processing
-            html_content = str(soup)
-
             # Currency is detected at most once, from the first product page fetched.
             # After that we reuse the cached value without parsing further pages.
             if not self._currency_detected:
@@ -1908,18 +1972,45 @@ class BaseScraper(ABC):
                     logger.info(f"Detected store currency from product page: {page_currency}")
             page_currency = self.store_currency
 
-            # Use AI extractor to get structured data
-            if use_optimized_mode:
-                # For complex sites that benefit from visual analysis
-                screenshot_bytes = await self.take_screenshot(product_url)
-                bean: CoffeeBean = await ai_extractor.extract_coffee_data(
-                    html_content, product_url, screenshot_bytes, use_optimized_mode=True, default_currency=page_currency
-                )
+            # Send the extractor compact text rather than the raw page
+            if self.condense_html_for_ai:
+                condensed = condense_html(soup, self.content_root_selector, base_url=product_url)
+                self.last_condensed_page = condensed
+                logger.info(f"Condensed {product_url} for AI extraction: {condensed.summary()}")
+                html_content = condensed.text
             else:
-                # Standard mode for most sites
-                bean: CoffeeBean = await ai_extractor.extract_coffee_data(
-                    html_content, product_url, default_currency=page_currency
+                html_content = str(soup)
+
+            # Unchanged page content extracts to the same bean: reuse it
+            cache_key = None
+            if self.extraction_cache is not None and isinstance(ai_extractor, CoffeeDataExtractor):
+                cache_key = self.extraction_cache.key(
+                    html_content, ai_extractor.cache_fingerprint(use_optimized_mode), page_currency
                 )
+            bean = self.extraction_cache.get(cache_key, product_url) if cache_key else None
+            if bean:
+                logger.info(f"Extraction cache hit for {product_url}")
+                self._count_extraction_cache_lookup(hit=True)
+            else:
+                if cache_key:
+                    self._count_extraction_cache_lookup(hit=False)
+                if use_optimized_mode:
+                    # For complex sites that benefit from visual analysis
+                    screenshot_bytes = await self.take_screenshot(product_url)
+                    bean: CoffeeBean = await ai_extractor.extract_coffee_data(
+                        html_content,
+                        product_url,
+                        screenshot_bytes,
+                        use_optimized_mode=True,
+                        default_currency=page_currency,
+                    )
+                else:
+                    # Standard mode for most sites
+                    bean: CoffeeBean = await ai_extractor.extract_coffee_data(
+                        html_content, product_url, default_currency=page_currency
+                    )
+                if bean and cache_key:
+                    self.extraction_cache.put(cache_key, bean)
 
             # if we don't have country and process and variety, then we probably don't have a valid bean
 
@@ -1942,7 +2033,12 @@ class BaseScraper(ABC):
                 if translate_to_english:
                     # save a copy before translating
                     self.save_bean_to_file(bean, output_dir=BEAN_DATA_DIR, original_language=True)
-                    bean = await ai_extractor.translate_to_english(bean)
+                    translated = self.extraction_cache.get(cache_key, product_url, "en") if cache_key else None
+                    if translated is None:
+                        translated = await ai_extractor.translate_to_english(bean)
+                        if translated and cache_key:
+                            self.extraction_cache.put(cache_key, translated, "en")
+                    bean = translated
                 return bean
             else:
                 logger.warning(f"Failed to extract data from {product_url}")
@@ -1954,6 +2050,14 @@ class BaseScraper(ABC):
             logger.error(f"Error extracting bean from product page {product_url}: {traceback.format_exc()}")
             return None
 
+    def _count_extraction_cache_lookup(self, hit: bool) -> None:
+        if not self.session:
+            return
+        if hit:
+            self.session.extraction_cache_hits += 1
+        else:
+            self.session.extraction_cache_misses += 1
+
     def extract_product_urls_from_soup(
         self, soup: Tag, url_path_patterns: list[str], selectors: list[str] | None = None
     ) -> list[str]:
@@ -0,0 +1,278 @@
+"""Deterministic HTML-to-text condensation for AI extraction.
+
+Product pages are mostly markup the extractor never needs: scripts, styles,
+inline SVG, site navigation, footers and theme JSON. ``condense_html`` turns a
+page into compact Markdown-like text made of:
+
+- the page title and the product ``<meta>`` tags (``description``,
+  ``og:*``, ``product:price:*``)
+- every JSON-LD block whose ``@type`` describes a product or offer, as
+  one-line JSON
+- the Shopify product JSON injected by ``ShopifyJsonScraper``
+  (``#shopify-product-json``), as one-line JSON
+- the visible content of the page, or of the scraper's
+  ``content_root_selector``, with headings, list items, table rows, product
+  images (``![alt](url)``) and variant options kept
+
+The same page always gives the same text, so extraction results stay
+reproducible and condensed inputs can be compared across runs.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+# Never carry product content
+_DROP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+    "video", "audio", "source", "link", "meta", "button", "input", "textarea", "nav", "dialog",
+}
+
+# Site chrome, dropped unless it sits inside the main content
+_CHROME_TAGS = {"header", "footer", "aside"}
+_CONTENT_TAGS = {"main", "article"}
+
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt", "fieldset", "figcaption",
+    "figure", "form", "header", "footer", "hr", "label", "legend", "main", "p", "pre", "section", "summary",
+    "ul", "ol",
+}
+
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+_META_KEYS = (
+    "description",
+    "og:title",
+    "og:description",
+    "og:image",
+    "og:price:amount",
+    "og:price:currency",
+    "product:price:amount",
+    "product:price:currency",
+)
+
+_JSON_LD_TYPES = {"product", "productgroup", "offer", "aggregateoffer", "individualproduct"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class CondensedPage:
+    """Condensed extractor input and how much smaller it is than the page."""
+
+    text: str
+    original_chars: int
+
+    @property
+    def condensed_chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the original size removed (0.0 when nothing was removed)."""
+        if not self.original_chars:
+            return 0.0
+        return max(0.0, 1 - self.condensed_chars / self.original_chars)
+
+    def summary(self) -> str:
+        return f"{self.original_chars:,} -> {self.condensed_chars:,} chars ({self.reduction:.0%} smaller)"
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _compact_json(raw: str) -> str | None:
+    try:
+        return json.dumps(json.loads(raw), ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return _collapse(raw) or None
+
+
+def _json_ld_types(data) -> set[str]:
+    """Lower-cased ``@type`` values anywhere in a JSON-LD document."""
+    types: set[str] = set()
+    if isinstance(data, list):
+        for item in data:
+            types |= _json_ld_types(item)
+    elif isinstance(data, dict):
+        value = data.get("@type")
+        for type_ in value if isinstance(value, list) else [value]:
+            if isinstance(type_, str):
+                types.add(type_.lower())
+        for key in ("@graph", "mainEntity", "offers", "hasVariant"):
+            if key in data:
+                types |= _json_ld_types(data[key])
+    return types
+
+
+def _product_json_ld(soup: BeautifulSoup) -> list[str]:
+    blocks = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        raw = script.string or script.get_text()
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        if _json_ld_types(data) & _JSON_LD_TYPES:
+            blocks.append(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return blocks
+
+
+def _meta_lines(soup: BeautifulSoup) -> list[str]:
+    lines = []
+    title = soup.find("title")
+    if title and _collapse(title.get_text()):
+        lines.append(f"Title: {_collapse(title.get_text())}")
+    for key in _META_KEYS:
+        tag = soup.find("meta", attrs={"property": key}) or soup.find("meta", attrs={"name": key})
+        content = _collapse(tag.get("content", "")) if tag else ""
+        if content:
+            lines.append(f"{key}: {content}")
+    return lines
+
+
+def _image_url(img: Tag, base_url: str | None) -> str | None:
+    src = img.get("src") or img.get("data-src") or ""
+    if not src or src.startswith("data:"):
+        srcset = img.get("srcset") or img.get("data-srcset") or ""
+        src = srcset.split(",")[0].strip().split(" ")[0] if srcset else ""
+    if not src or src.startswith("data:"):
+        return None
+    return urljoin(base_url, src) if base_url else src
+
+
+def _is_hidden_chrome(tag: Tag) -> bool:
+    if tag.name not in _CHROME_TAGS:
+        return False
+    return not any(parent.name in _CONTENT_TAGS for parent in tag.parents)
+
+
+class _Writer:
+    """Walks a content tree and emits one line per block."""
+
+    def __init__(self, base_url: str | None):
+        self.base_url = base_url
+        self.lines: list[str] = []
+        self.inline: list[str] = []
+        self.images: set[str] = set()
+
+    def flush(self, prefix: str = "") -> None:
+        text = _collapse("".join(self.inline))
+        self.inline = []
+        if text:
+            self.lines.append(f"{prefix}{text}")
+
+    def walk(self, node: Tag) -> None:
+        for child in node.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                self.inline.append(str(child))
+            elif isinstance(child, Tag):
+                self.element(child)
+
+    def element(self, tag: Tag) -> None:
+        name = tag.name
+        if name in _DROP_TAGS or _is_hidden_chrome(tag):
+            return
+        if name == "br":
+            self.flush()
+        elif name == "img":
+            url = _image_url(tag, self.base_url)
+            if url and url not in self.images:
+                self.images.add(url)
+                self.flush()
+                self.lines.append(f"![{_collapse(tag.get('alt', ''))}]({url})")
+        elif name in _HEADING_TAGS:
+            self.flush()
+            self.walk(tag)
+            self.flush("#" * int(name[1]) + " ")
+        elif name == "li":
+            self.flush()
+            self.walk(tag)
+            self.flush("- ")
+        elif name == "tr":
+            self.flush()
+            cells = [_collapse(cell.get_text(" ")) for cell in tag.find_all(["td", "th"], recursive=False)]
+            if any(cells):
+                self.lines.append("| " + " | ".join(cells) + " |")
+        elif name == "select":
+            self.flush()
+            options = [_collapse(option.get_text(" ")) for option in tag.find_all("option")]
+            options = [option for option in options if option]
+            if options:
+                self.lines.append("Options: " + " | ".join(options))
+        elif name in _BLOCK_TAGS or name in {"table", "tbody", "thead", "tfoot", "body", "html"}:
+            self.flush()
+            self.walk(tag)
+            self.flush()
+        else:
+            self.walk(tag)
+
+
+def _dedupe(lines: list[str]) -> list[str]:
+    """Drop repeated lines (themes often render mobile and desktop copies)."""
+    seen: set[str] = set()
+    kept = []
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            kept.append(line)
+    return kept
+
+
+def condense_html(
+    page: BeautifulSoup | str,
+    content_root_selector: str | None = None,
+    base_url: str | None = None,
+) -> CondensedPage:
+    """Condense a product page into compact text for the AI extractor.
+
+    Args:
+        page: Parsed page or raw HTML
+        content_root_selector: CSS selector of the element holding the product;
+            the whole body is used when it is None or matches nothing
+        base_url: URL the page was fetched from, used to absolutise image URLs
+
+    Returns:
+        The condensed text and the size of the HTML it was made from
+    """
+    html = page if isinstance(page, str) else str(page)
+    soup = BeautifulSoup(html, "lxml")
+
+    sections = []
+    meta = _meta_lines(soup)
+    if meta:
+        sections.append("\n".join(meta))
+    json_ld = _product_json_ld(soup)
+    if json_ld:
+        sections.append("Product JSON-LD:\n" + "\n".join(json_ld))
+
+    # Injected by ShopifyJsonScraper; kept whatever the content root is
+    shopify_context = soup.find(id="shopify-structured-data")
+    if shopify_context:
+        shopify_json = shopify_context.find(id="shopify-product-json")
+        compact = _compact_json(shopify_json.get_text()) if shopify_json else None
+        if compact:
+            sections.append("Shopify product JSON:\n" + compact)
+        shopify_context.decompose()
+
+    root = soup.select_one(content_root_selector) if content_root_selector else None
+    if root is None:
+        root = soup.body or soup
+    writer = _Writer(base_url)
+    if root.name in _CHROME_TAGS:
+        # An explicitly chosen root is content, whatever its tag
+        writer.walk(root)
+    else:
+        writer.element(root)
+    writer.flush()
+    content = _dedupe(writer.lines)
+    if content:
+        sections.append("Page content:\n" + "\n".join(content))
+
+    return CondensedPage(text="\n\n".join(sections), original_chars=len(html))
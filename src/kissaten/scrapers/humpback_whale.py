@@ -35,6 +35,9 @@ class HumpbackWhaleCoffeeScraper(BaseScraper):
     """Scraper for humpbackwhalecoffee.com — feeds the product's Next.js
     Flight ``<script>`` block to the AI extractor."""
 
+    # The product data lives in the Flight <script> block itself
+    condense_html_for_ai = False
+
     def __init__(self, api_key: str | None = None):
         super().__init__(
             roaster_name="Humpback Whale Coffee",
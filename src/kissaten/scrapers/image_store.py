@@ -0,0 +1,274 @@
+"""Content-addressed store of bean images with pre-generated thumbnails.
+
+Product images are kept once per distinct content under ``data/images/``:
+
+- ``blobs/<sha[:2]>/<sha>.<ext>`` holds the original bytes, named by their
+  SHA-256 and the format Pillow detects (not whatever the URL claims), so the
+  same bag photo used by several beans, sessions or roasters is stored once.
+- ``thumbs/<sha[:2]>/<sha>_<width>.<format>`` holds WebP and AVIF resizes at
+  ``THUMBNAIL_WIDTHS``, generated once per blob.
+- ``manifests/<roaster>.json`` maps every bean path (``/<roaster>/<bean>``,
+  the ``bean_url_path`` of the API) to the URLs of its original and
+  thumbnails, and every image URL to the ``ETag``/``Last-Modified`` it was
+  fetched with. The API serves the manifests next to the images.
+
+A source URL seen before is re-fetched conditionally; a ``304 Not Modified``
+(or identical bytes) reuses the stored blob without writing anything. Within
+one run a URL is fetched at most once.
+
+The per-session ``<bean_uid>.png`` next to the bean JSON is kept as a hard link
+to the blob, so image URLs built from bean file paths keep working without
+using extra disk.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Widths the frontend shows bean images at: search result tiles (~400px, 2x on
+# high-DPI screens) and the bean page
+THUMBNAIL_WIDTHS = (200, 400, 800)
+THUMBNAIL_QUALITY = {"webp": 80, "avif": 60}
+
+# Static URL the API mounts ``data/images`` at
+STATIC_URL_PREFIX = "/static/data/images"
+
+_TIMESTAMP_SUFFIX = re.compile(r"_\d{6}$")
+
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif", "AVIF": "avif"}
+_CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/avif": "avif",
+    "image/svg+xml": "svg",
+}
+
+
+@dataclass
+class StoredImage:
+    """One blob in the store and its thumbnails (paths relative to the store root)."""
+
+    sha256: str
+    path: str
+    width: int | None = None
+    height: int | None = None
+    thumbnails: dict[str, dict[int, str]] = field(default_factory=dict)
+
+    def manifest_entry(self) -> dict[str, Any]:
+        return {
+            "sha256": self.sha256,
+            "original": f"{STATIC_URL_PREFIX}/{self.path}",
+            "width": self.width,
+            "height": self.height,
+            "thumbnails": {
+                image_format: {str(width): f"{STATIC_URL_PREFIX}/{path}" for width, path in sorted(paths.items())}
+                for image_format, paths in self.thumbnails.items()
+            },
+        }
+
+
+class ImageStore:
+    """Deduplicated image blobs under ``root`` and the manifest of one roaster."""
+
+    def __init__(self, root: Path, roaster_dir: str):
+        self.root = root
+        self.roaster_dir = roaster_dir
+        self._beans: dict[str, dict[str, Any]] = {}
+        self._sources: dict[str, dict[str, Any]] = {}
+        self._fetched: dict[str, StoredImage] = {}  # URL -> image, for this run
+        self.downloads = 0
+        self.reused = 0
+        self._load()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifests" / f"{self.roaster_dir}.json"
+
+    def _load(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable image manifest {self.manifest_path}: {e}")
+            return
+        if manifest.get("version") != MANIFEST_VERSION:
+            return
+        self._beans = manifest.get("beans", {})
+        self._sources = manifest.get("sources", {})
+
+    def _save(self) -> None:
+        manifest = {"version": MANIFEST_VERSION, "beans": self._beans, "sources": self._sources}
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(f".json.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Failed to save image manifest {self.manifest_path}: {e}")
+
+    # --- fetching ------------------------------------------------------------
+
+    async def fetch(self, client: Any, image_url: str) -> StoredImage:
+        """The stored image for ``image_url``, downloading it only if it may have changed."""
+        if image_url in self._fetched:
+            self.reused += 1
+            return self._fetched[image_url]
+
+        known = self._stored_source(image_url)
+        headers = {}
+        if known is not None:
+            source = self._sources[image_url]
+            if source.get("etag"):
+                headers["If-None-Match"] = source["etag"]
+            if source.get("last_modified"):
+                headers["If-Modified-Since"] = source["last_modified"]
+
+        response = await client.get(image_url, headers=headers) if headers else await client.get(image_url)
+        if response.status_code == 304 and known is not None:
+            logger.debug(f"Image unchanged since last scrape: {image_url}")
+            image = known
+            self.reused += 1
+        else:
+            response.raise_for_status()
+            image = await asyncio.to_thread(self.add, response.content, response.headers.get("Content-Type"))
+            self.downloads += 1
+            self._sources[image_url] = {
+                "sha256": image.sha256,
+                "path": image.path,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            }
+        self._fetched[image_url] = image
+        return image
+
+    def _stored_source(self, image_url: str) -> StoredImage | None:
+        """The blob last fetched from ``image_url``, if it is still on disk."""
+        source = self._sources.get(image_url)
+        if not source or not (self.root / source["path"]).exists():
+            return None
+        return self._describe(source["sha256"], source["path"])
+
+    # --- blobs and thumbnails ------------------------------------------------
+
+    def add(self, content: bytes, content_type: str | None = None) -> StoredImage:
+        """Store ``content`` (if new) and its thumbnails; return the stored image."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        try:
+            with Image.open(io.BytesIO(content)) as img:
+                extension = _EXTENSIONS.get(img.format or "", (img.format or "bin").lower())
+            identified = True
+        except (UnidentifiedImageError, OSError):
+            identified = False
+            content_type = (content_type or "").split(";")[0].strip().lower()
+            extension = _CONTENT_TYPE_EXTENSIONS.get(content_type, "bin")
+
+        path = f"blobs/{sha256[:2]}/{sha256}.{extension}"
+        blob = self.root / path
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(blob)
+        if identified:
+            self._make_thumbnails(sha256, content)
+        return self._describe(sha256, path)
+
+    def _make_thumbnails(self, sha256: str, content: bytes) -> None:
+        formats = [image_format for image_format in THUMBNAIL_QUALITY if features.check(image_format)]
+        missing = [
+            (width, image_format)
+            for width in THUMBNAIL_WIDTHS
+            for image_format in formats
+            if not (self.root / self._thumbnail_path(sha256, width, image_format)).exists()
+        ]
+        if not missing:
+            return
+        try:
+            with Image.open(io.BytesIO(content)) as img:
+                img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+                for width, image_format in missing:
+                    if width >= img.width:
+                        continue
+                    height = max(1, round(img.height * width / img.width))
+                    thumbnail = self.root / self._thumbnail_path(sha256, width, image_format)
+                    thumbnail.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = thumbnail.with_name(f"{thumbnail.name}.{os.getpid()}.tmp")
+                    img.resize((width, height), Image.Resampling.LANCZOS).save(
+                        tmp_path, format=image_format.upper(), quality=THUMBNAIL_QUALITY[image_format]
+                    )
+                    tmp_path.replace(thumbnail)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to create thumbnails for image {sha256}: {e}")
+
+    @staticmethod
+    def _thumbnail_path(sha256: str, width: int, image_format: str) -> str:
+        return f"thumbs/{sha256[:2]}/{sha256}_{width}.{image_format}"
+
+    def _describe(self, sha256: str, path: str) -> StoredImage:
+        image = StoredImage(sha256=sha256, path=path)
+        try:
+            with Image.open(self.root / path) as img:
+                image.width, image.height = img.size
+        except (UnidentifiedImageError, OSError):
+            return image
+        for image_format in THUMBNAIL_QUALITY:
+            for width in THUMBNAIL_WIDTHS:
+                thumbnail = self._thumbnail_path(sha256, width, image_format)
+                if (self.root / thumbnail).exists():
+                    image.thumbnails.setdefault(image_format, {})[width] = thumbnail
+        return image
+
+    # --- beans ---------------------------------------------------------------
+
+    def record_bean(self, bean_uid: str, image: StoredImage, bean_file: Path | None = None) -> None:
+        """Point the bean's path in the manifest at ``image``."""
+        entry = image.manifest_entry()
+        if bean_file is not None:
+            entry["bean_file"] = bean_file.as_posix()
+        entry["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._beans[bean_path(self.roaster_dir, bean_uid)] = entry
+        self._save()
+
+    def bean_image(self, bean_uid: str) -> dict[str, Any] | None:
+        """The manifest entry of a bean, or None if it has no stored image."""
+        return self._beans.get(bean_path(self.roaster_dir, bean_uid))
+
+    def link(self, image: StoredImage, destination: Path) -> Path:
+        """Make ``destination`` a hard link to the blob (a copy where linking is not possible)."""
+        blob = self.root / image.path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.unlink(missing_ok=True)
+        try:
+            os.link(blob, destination)
+        except OSError:
+            shutil.copyfile(blob, destination)
+        return destination
+
+
+def bean_path(roaster_dir: str, bean_uid: str) -> str:
+    """The API's ``bean_url_path`` of a bean: its uid without the time-of-scrape suffix."""
+    return f"/{roaster_dir}/{_TIMESTAMP_SUFFIX.sub('', bean_uid)}"
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
@@ -26,6 +26,9 @@ logger = logging.getLogger(__name__)
 class IndigoScraper(BaseScraper):
     """Scraper for Indigo Coffee Roasters (indigoroasters.com) with AI-powered extraction."""
 
+    # The minimised soup carries the LS.variants <script> the extractor reads prices from
+    condense_html_for_ai = False
+
     def __init__(self, api_key: str | None = None):
         """Initialize Indigo scraper.
 
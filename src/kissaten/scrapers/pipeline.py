@@ -0,0 +1,186 @@
+"""Bounded multi-stage async pipeline for scraping products.
+
+Scraping a product runs steps with very different costs: fetching the page
+(network, rate limited), AI extraction (seconds per call), writing the bean
+JSON (fast, local) and downloading the image (network). ``Pipeline`` runs
+each step as a ``Stage`` with its own pool of workers, connected by bounded
+``asyncio.Queue``s:
+
+- a slow stage only holds up the stages feeding it once the queue in front of
+  it is full (back-pressure), instead of every product waiting on one shared
+  semaphore;
+- each stage records ``StageMetrics`` (items in and out, failures, time busy
+  and time blocked on a full downstream queue), so the bottleneck of a run is
+  visible in the logs and in ``ScrapingSession.pipeline_metrics``.
+
+A stage handler returns the item to pass downstream, or None to drop it. An
+exception drops the item and is counted as a failure; it does not stop the
+pipeline. Items leaving the last stage are collected in ``Pipeline.results``.
+
+Usage::
+
+    async with Pipeline([Stage("fetch", fetch, workers=4), Stage("extract", extract, workers=2)]) as pipeline:
+        for url in urls:
+            await pipeline.put(url)
+    beans = pipeline.results
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline step and the size of its worker pool.
+
+    ``queue_size`` bounds the queue in front of the stage (default: twice the
+    number of workers).
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any | None]]
+    workers: int = 1
+    queue_size: int | None = None
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters of one stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    emitted: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    started_at: float | None = field(default=None, repr=False)
+    finished_at: float | None = field(default=None, repr=False)
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def items_per_second(self) -> float:
+        """Items handled per second of the stage's lifetime."""
+        return self.processed / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        """Share of the workers' time spent in the handler (1.0 = the stage is the bottleneck)."""
+        capacity = self.wall_seconds * self.workers
+        return min(1.0, self.busy_seconds / capacity) if capacity else 0.0
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "items_per_second": round(self.items_per_second, 3),
+            "utilisation": round(self.utilisation, 3),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.processed} handled, {self.emitted} passed on, {self.failed} failed, "
+            f"{self.items_per_second:.2f}/s, {self.utilisation:.0%} busy x{self.workers}, "
+            f"{self.blocked_seconds:.1f}s blocked downstream"
+        )
+
+
+class Pipeline:
+    """Stages connected by bounded queues, each with its own worker pool."""
+
+    def __init__(self, stages: list[Stage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.metrics = [StageMetrics(stage.name, stage.workers) for stage in stages]
+        self.results: list[Any] = []
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size or 2 * stage.workers) for stage in stages]
+        self._workers: list[list[asyncio.Task]] = []
+
+    async def __aenter__(self) -> "Pipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.join()
+        else:
+            await self.cancel()
+
+    def start(self) -> None:
+        now = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            self.metrics[index].started_at = now
+            self._workers.append(
+                [asyncio.create_task(self._work(index), name=f"{stage.name}-{n}") for n in range(stage.workers)]
+            )
+
+    async def put(self, item: Any) -> None:
+        """Feed an item to the first stage, waiting while its queue is full."""
+        await self._queues[0].put(item)
+
+    async def join(self) -> list[Any]:
+        """Let every queued item through, stop the workers and return the results."""
+        for index, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                await self._queues[index].put(_DONE)
+            await asyncio.gather(*self._workers[index])
+            self.metrics[index].finished_at = time.perf_counter()
+        return self.results
+
+    async def cancel(self) -> None:
+        """Stop every worker without draining the queues."""
+        tasks = [task for workers in self._workers for task in workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        metrics = self.metrics[index]
+        queue = self._queues[index]
+        downstream = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            started = time.perf_counter()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                metrics.failed += 1
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                continue
+            finally:
+                metrics.busy_seconds += time.perf_counter() - started
+            metrics.processed += 1
+            if result is None:
+                continue
+            metrics.emitted += 1
+            if downstream is None:
+                self.results.append(result)
+            else:
+                blocked = time.perf_counter()
+                await downstream.put(result)
+                metrics.blocked_seconds += time.perf_counter() - blocked
+
+    def log_metrics(self) -> None:
+        for metrics in self.metrics:
+            logger.info(f"Pipeline stage {metrics.summary()}")
@@ -10,7 +10,8 @@ from bs4 import BeautifulSoup
 
 from ..schemas import CoffeeBean
 from . import _curl_http as httpx
-from .base import BaseScraper
+from .base import BEAN_DATA_DIR, BaseScraper
+from .shopify_listing_cache import ShopifyListingCache
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,11 @@ class ShopifyJsonScraper(BaseScraper):
 
     This scraper uses products.json for discovery and stock status, then
     uses AI extraction on the product page HTML enriched with JSON metadata.
+
+    Listing scrapes are incremental (see ``ShopifyListingCache``): pages are
+    fetched with conditional requests and served from disk when unchanged,
+    and stock diffjson is only written for products whose stock status
+    differs from the last update written.
     """
 
     def __init__(
@@ -61,6 +67,14 @@ class ShopifyJsonScraper(BaseScraper):
         self.exclude_slugs: list[str] = []  # Can be overridden by subclasses
         self._shopify_product_data: dict[str, dict[str, Any]] = {}  # URL -> product JSON
         self._shopify_stock_status: dict[str, bool] = {}  # URL -> any variant available
+        self._listing_caches: dict[Path, ShopifyListingCache] = {}  # output dir -> listing cache
+
+    def _listing_cache(self, output_dir: Path = BEAN_DATA_DIR) -> ShopifyListingCache:
+        """The persistent listing cache for this roaster under ``output_dir``."""
+        if output_dir not in self._listing_caches:
+            cache_dir = output_dir / "cache" / "roasters" / self._get_roaster_dir_name() / "shopify_listing"
+            self._listing_caches[output_dir] = ShopifyListingCache(cache_dir)
+        return self._listing_caches[output_dir]
 
     async def _fetch_all_shopify_products(self, products_json_url: str) -> list[dict[str, Any]]:
         """Fetch all products from a Shopify products.json endpoint with pagination.
@@ -127,20 +141,35 @@ class ShopifyJsonScraper(BaseScraper):
             was the last attempt (for logging only).
 
             Ladder:
-              * httpx once. On 429, mark this page as escalated.
+              * httpx once, with ``If-None-Match``/``If-Modified-Since`` when
+                the page is cached. A 304 returns the cached page. On 429,
+                mark this page as escalated.
               * Playwright up to ``max_retries`` times with 5s/10s backoff.
             ``response`` and ``data`` are bound only inside the success path of
             their respective branches so a successful Playwright parse is
             never discarded by a leftover 429 ``response.raise_for_status()``.
         """
         escalated = False
+        cache = self._listing_cache()
 
-        # 1) Single httpx attempt.
+        # 1) Single httpx attempt, conditional on the validators of the cached page.
         try:
-            response = await self.client.get(url)
+            conditional_headers = cache.conditional_headers(url)
+            if conditional_headers:
+                response = await self.client.get(url, headers=conditional_headers)
+                if response.status_code == 304:
+                    data = cache.cached_page(url)
+                    if data is not None:
+                        logger.info(f"Shopify products page unchanged since last scrape: {url}")
+                        return data, False
+                    response = await self.client.get(url)
+            else:
+                response = await self.client.get(url)
             if response.status_code != 429:
                 response.raise_for_status()
-                return response.json(), False
+                data = response.json()
+                cache.store_page(url, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return data, False
             logger.warning(f"Received 429 Too Many Requests from {url} via httpx. Upgrading to Playwright in 5.00s...")
             await asyncio.sleep(5.0)
             escalated = True
@@ -160,6 +189,8 @@ class ShopifyJsonScraper(BaseScraper):
                 logger.info(f"Fetching Shopify products via Playwright: {url}")
                 html_content = await self._fetch_with_playwright(url)
                 data = json.loads(BeautifulSoup(html_content, "lxml").get_text(strip=True) or "{}")
+                # No validators from a browser fetch: the next run downloads the page again
+                cache.store_page(url, data, None, None)
                 return data, True
             except Exception as e:
                 last_error = e
@@ -301,6 +332,7 @@ class ShopifyJsonScraper(BaseScraper):
             logger.warning(msg)
             if self.session:
                 self.session.add_error(msg)
+            self._listing_cache(output_dir).save()
             return len(in_stock_known), 0
 
         # An empty in_stock_known is only trustworthy when the current catalog
@@ -318,10 +350,24 @@ class ShopifyJsonScraper(BaseScraper):
         await self._create_out_of_stock_updates(
             in_stock_known, output_dir, allow_empty_current=catalog_overlaps_history
         )
+        self._listing_cache(output_dir).save()
 
         out_of_stock_count = len(self._all_sessions_bean_files) - len(in_stock_known)
         return len(in_stock_known), max(0, out_of_stock_count)
 
+    def _stock_update_unchanged(self, url: str, in_stock: bool, output_dir: Path) -> bool:
+        return self._listing_cache(output_dir).stock_unchanged(self._normalize_url(url), in_stock)
+
+    def _stock_update_written(self, url: str, in_stock: bool, output_dir: Path) -> None:
+        self._listing_cache(output_dir).record_stock(self._normalize_url(url), in_stock)
+
+    def _mark_bean_as_scraped(self, product_url: str) -> None:
+        """Also forget the recorded stock status: the new bean file now defines it."""
+        super()._mark_bean_as_scraped(product_url)
+        for cache in self._listing_caches.values():
+            cache.forget_stock(self._normalize_url(product_url))
+            cache.save()
+
     def _format_shopify_context(self, product: dict[str, Any]) -> str:
         """Format Shopify product metadata into an HTML snippet for AI enrichment.
 
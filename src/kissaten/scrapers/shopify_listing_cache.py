@@ -0,0 +1,127 @@
+"""Persistent per-roaster state for incremental Shopify listing scrapes.
+
+``ShopifyJsonScraper`` keeps one ``ShopifyListingCache`` per roaster under
+``data/cache/roasters/<roaster>/shopify_listing/``:
+
+- ``state.json`` holds the ``ETag``/``Last-Modified`` validators of every
+  ``products.json`` page, plus the stock status last written to a diffjson
+  for every known product URL.
+- ``pages/<hash>.json`` holds the body of every page, so a ``304 Not
+  Modified`` answer can be served from disk.
+
+The validators let a run send conditional requests and skip re-downloading
+unchanged pages. The stock map lets it skip writing a diffjson when a
+product's stock status is the one the database already has.
+
+Nothing is written until ``save()``, so a scrape that fails half-way leaves
+the previous state intact.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+
+class ShopifyListingCache:
+    """Page validators, page bodies and last-written stock status for one roaster."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self._pages: dict[str, dict[str, Any]] = {}
+        self._stock: dict[str, bool] = {}
+        self._pending_bodies: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    @property
+    def state_path(self) -> Path:
+        return self.cache_dir / "state.json"
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / "pages" / f"{hashlib.sha1(url.encode()).hexdigest()[:16]}.json"
+
+    def _load(self) -> None:
+        if not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Shopify listing state {self.state_path}: {e}")
+            return
+        if state.get("version") != STATE_VERSION:
+            logger.info(f"Ignoring Shopify listing state {self.state_path} with old version {state.get('version')}")
+            return
+        self._pages = state.get("pages", {})
+        self._stock = state.get("stock", {})
+
+    # --- products.json pages -------------------------------------------------
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` headers for a page we hold a body for."""
+        page = self._pages.get(url)
+        if not page or not self._body_path(url).exists():
+            return {}
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def cached_page(self, url: str) -> dict[str, Any] | None:
+        """The stored body of a page (after a ``304``), or None if it is missing."""
+        if url in self._pending_bodies:
+            return self._pending_bodies[url]
+        try:
+            return json.loads(self._body_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cached Shopify page for {url} is unreadable: {e}")
+            return None
+
+    def store_page(self, url: str, data: dict[str, Any], etag: str | None, last_modified: str | None) -> None:
+        """Remember a freshly downloaded page and its validators."""
+        self._pages[url] = {"etag": etag, "last_modified": last_modified}
+        self._pending_bodies[url] = data
+        self._dirty = True
+
+    # --- stock diffjson ------------------------------------------------------
+
+    def stock_unchanged(self, url: str, in_stock: bool) -> bool:
+        """True if the last diffjson written for ``url`` had this stock status."""
+        return self._stock.get(url) is in_stock
+
+    def record_stock(self, url: str, in_stock: bool) -> None:
+        if self._stock.get(url) is not in_stock:
+            self._stock[url] = in_stock
+            self._dirty = True
+
+    def forget_stock(self, url: str) -> None:
+        """Drop the stock status of ``url`` (a new bean file now defines it)."""
+        if self._stock.pop(url, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write pending page bodies and the state file, if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for url, data in self._pending_bodies.items():
+                body_path = self._body_path(url)
+                body_path.parent.mkdir(parents=True, exist_ok=True)
+                body_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            state = {"version": STATE_VERSION, "pages": self._pages, "stock": self._stock}
+            tmp_path = self.state_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save Shopify listing state to {self.cache_dir}: {e}")
+            return
+        self._pending_bodies.clear()
+        self._dirty = False
@@ -50,7 +50,7 @@ import pytest_asyncio  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
 
 import kissaten.api.db as _db_module  # noqa: E402
-from kissaten.api.db import conn, init_database, load_coffee_data  # noqa: E402
+from kissaten.api.db import conn, ensure_recommendation_index, init_database, load_coffee_data  # noqa: E402
 
 # The AI search agent opens ``data/ai_search_cache.duckdb`` (a relative
 # path) at app-startup time. If a long-lived dev server is already holding
@@ -106,6 +106,7 @@ async def db_session():
         pytest.skip(f"Test data directory not found: {_TEST_DATA_DIR}")
     await init_database()
     await load_coffee_data(_TEST_DATA_DIR)
+    ensure_recommendation_index()
     yield
 
 
@@ -198,3 +199,4 @@ async def setup_database(db_session):
         conn.execute(f"TRUNCATE TABLE {tbl}")
     conn.commit()
     await load_coffee_data(_TEST_DATA_DIR)
+    ensure_recommendation_index()
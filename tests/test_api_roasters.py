@@ -103,3 +103,60 @@ async def test_get_bean_recommendations_invalid_returns_404(client):
     """GET /v1/beans/{roaster_slug}/{bean_slug}/recommendations returns 404 for unknown beans."""
     response = client.get("/v1/beans/nonexistent-roaster/nonexistent-bean/recommendations")
     assert response.status_code == 404
+
+
+def _recommendable_bean_path():
+    from kissaten.api.db import conn
+
+    row = conn.execute(
+        """
+        SELECT cb.bean_url_path FROM coffee_beans cb
+        JOIN recommendation_neighbours rn ON rn.bean_id = cb.id
+        WHERE cb.bean_url_path IS NOT NULL
+        GROUP BY cb.bean_url_path HAVING COUNT(*) >= 6
+        LIMIT 1
+        """
+    ).fetchone()
+    if not row:
+        pytest.skip("No bean with precomputed neighbours in test database")
+    return row[0]
+
+
+@pytest.mark.asyncio
+async def test_get_bean_recommendations_uses_index(client):
+    """Default-weight recommendations come from the precomputed neighbours, best first."""
+    response = client.get(f"/v1/beans{_recommendable_bean_path()}/recommendations")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["metadata"]["recommendation_algorithm"] == "feature_vectors_v1"
+    scores = [rec["score"] for rec in body["data"]]
+    assert len(scores) == 6
+    assert all(score > 0 for score in scores)
+    assert all(rec["origins"] for rec in body["data"])
+
+
+@pytest.mark.asyncio
+async def test_get_bean_recommendations_custom_weights_and_decaf(client):
+    """Custom weights and the decaf filter are scored live against the index."""
+    path = _recommendable_bean_path()
+    response = client.get(f"/v1/beans{path}/recommendations", params={"weight_variety": 0, "is_decaf": "false"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["metadata"]["recommendation_algorithm"] == "feature_vectors_v1"
+    assert body["data"]
+    assert all(rec["is_decaf"] is False for rec in body["data"])
+
+
+@pytest.mark.asyncio
+async def test_get_bean_recommendations_without_index(client, monkeypatch):
+    """Without the index, recommendations fall back to search-engine scoring."""
+    import kissaten.api.main as api_main
+
+    monkeypatch.setattr(api_main, "precomputed_neighbours", lambda *args: None)
+    monkeypatch.setattr(api_main, "get_recommender", lambda conn: None)
+    response = client.get(f"/v1/beans{_recommendable_bean_path()}/recommendations")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["metadata"]["recommendation_algorithm"] == "search_engine_relevance_v2"
+    scores = [rec["score"] for rec in body["data"]]
+    assert scores and all(score > 0 for score in scores)
@@ -0,0 +1,108 @@
+"""
+Tests for the refresh-time geography rollups behind the origin detail pages.
+
+``country_rollups``, ``region_rollups`` and ``farm_rollups`` are built by
+``load_coffee_data``; the detail endpoints read a single keyed row from them.
+These tests check the rollups against direct aggregates over ``origins``.
+"""
+
+import pytest
+
+from kissaten.api.db import conn
+
+_REGION_SLUG = """CASE WHEN o.region IS NULL OR o.region = '' THEN 'unknown-region'
+    ELSE COALESCE(o.state_canonical_slug, o.region_normalized) END"""
+
+
+def test_rollup_tables_built(db_session):
+    countries = conn.execute("SELECT COUNT(DISTINCT country) FROM origins WHERE country IS NOT NULL").fetchone()[0]
+    assert conn.execute("SELECT COUNT(*) FROM country_rollups").fetchone()[0] == countries > 0
+
+    regions = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT DISTINCT o.country, {_REGION_SLUG} FROM origins o WHERE o.country IS NOT NULL)"
+    ).fetchone()[0]
+    assert conn.execute("SELECT COUNT(*) FROM region_rollups").fetchone()[0] == regions
+
+
+def test_region_rollups_match_origins(db_session):
+    expected = dict(
+        (region_slug, (beans, roasters))
+        for region_slug, beans, roasters in conn.execute(
+            f"""
+            SELECT {_REGION_SLUG}, COUNT(DISTINCT o.bean_id), COUNT(DISTINCT cb.roaster)
+            FROM origins o JOIN coffee_beans cb ON o.bean_id = cb.id
+            WHERE o.country = 'ET'
+            GROUP BY 1
+            """
+        ).fetchall()
+    )
+    actual = {
+        region_slug: (beans, roasters)
+        for region_slug, beans, roasters in conn.execute(
+            "SELECT region_slug, total_beans, total_roasters FROM region_rollups WHERE country_code = 'ET'"
+        ).fetchall()
+    }
+    assert actual == expected
+
+
+def test_region_detail_matches_rollup(client):
+    region_slug, total_beans, top_farms = conn.execute(
+        """
+        SELECT region_slug, total_beans, top_farms FROM region_rollups
+        WHERE country_code = 'ET' AND region_slug != 'unknown-region'
+        ORDER BY total_beans DESC LIMIT 1
+        """
+    ).fetchone()
+    response = client.get(f"/v1/origins/ET/{region_slug}")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["statistics"]["total_beans"] == total_beans
+    assert data["statistics"]["total_farms"] == len(top_farms)
+    assert data["top_farms"][-1]["farm_name"] == "Unknown Farm"
+
+
+def test_farm_detail_beans_and_origins(client):
+    region_slug, farm_slug, bean_ids = conn.execute(
+        """
+        SELECT region_slug, farm_slug, bean_ids FROM farm_rollups
+        WHERE farm_slug != 'unknown-farm'
+        ORDER BY len(bean_ids) DESC LIMIT 1
+        """
+    ).fetchone()
+    country_code = conn.execute(
+        "SELECT country_code FROM farm_rollups WHERE region_slug = ? AND farm_slug = ? LIMIT 1",
+        [region_slug, farm_slug],
+    ).fetchone()[0]
+
+    response = client.get(f"/v1/origins/{country_code}/{region_slug}/{farm_slug}")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert 0 < len(data["beans"]) <= len(bean_ids)
+    for bean in data["beans"]:
+        assert bean["origins"], f"bean {bean['name']} is missing its origins"
+
+
+def test_farm_reachable_by_canonical_and_raw_slug(client):
+    row = conn.execute(
+        """
+        SELECT country, """
+        + _REGION_SLUG
+        + """, normalize_farm_name(farm_canonical), farm_normalized
+        FROM origins o
+        WHERE farm IS NOT NULL AND farm != ''
+          AND farm_canonical IS NOT NULL
+          AND normalize_farm_name(farm_canonical) != farm_normalized
+        LIMIT 1
+        """
+    ).fetchone()
+    if row is None:
+        pytest.skip("No farm with a canonical name that differs from its raw name")
+    country_code, region_slug, canonical_slug, raw_slug = row
+    for farm_slug in (canonical_slug, raw_slug):
+        response = client.get(f"/v1/origins/{country_code}/{region_slug}/{farm_slug}")
+        assert response.status_code == 200
+
+
+def test_unknown_farm_and_region_404(client):
+    assert client.get("/v1/origins/ET/not-a-region").status_code == 404
+    assert client.get("/v1/origins/ET/unknown-region/not-a-farm").status_code == 404
@@ -0,0 +1,102 @@
+"""
+Tests for the compiled process/varietal category matchers.
+
+Background
+----------
+``categorize_process`` and ``categorize_varietal`` used to be chains of
+``any(keyword in s for keyword in [...])`` checks where the first matching
+rule wins. They are now compiled into a single regex of zero-width lookaheads
+(one named group per rule, in priority order) and the matcher keeps the
+*minimum* rule index seen across all start positions.
+
+These tests pin that:
+1. Rule priority is preserved when keywords from several rules overlap.
+2. ``refresh_origin_categories()`` persists ``origins.process_category`` and
+   an ``origins.varietal_category`` list aligned with ``variety_canonical``.
+"""
+
+import pytest
+
+from kissaten.api.categories import categorize_process, categorize_varietal
+from kissaten.api.db import conn, refresh_origin_categories
+
+
+# ---------------------------------------------------------------------------
+# Matcher priority
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "varietal, expected",
+    [
+        # "bourbon" (bourbon rule) is a substring, but heirloom ranks higher.
+        ("pink bourbon", "heirloom"),
+        # Regex rule ``sl\d+`` in the SL group, not a literal keyword.
+        ("sl9", "sl_varieties"),
+        # The arabica_other rule is shadowed by the bourbon rule ("catuai").
+        ("red catuai", "bourbon"),
+        ("Gesha", "geisha"),
+        ("", "other"),
+        ("Unknown", "other"),
+    ],
+)
+def test_categorize_varietal_priority(varietal, expected):
+    assert categorize_varietal(varietal) == expected
+
+
+@pytest.mark.parametrize(
+    "process, expected",
+    [
+        # "natural" appears first in the string, but co-ferment ranks higher.
+        ("natural co-ferment", "infused_cofermented"),
+        # "ferment" alone only counts after the base processes have missed.
+        ("washed fermentation", "washed"),
+        ("fermented", "advanced_technical"),
+        ("Anaerobic Natural", "anaerobic_carbonic"),
+        ("Swiss Water Decaf", "decaf"),
+        ("", "other"),
+    ],
+)
+def test_categorize_process_priority(process, expected):
+    assert categorize_process(process) == expected
+
+
+# ---------------------------------------------------------------------------
+# Persisted columns
+# ---------------------------------------------------------------------------
+
+def test_refresh_origin_categories_populates_columns(db_session):
+    """Every origin gets a process_category and a varietal_category list the
+    same length as variety_canonical, matching the Python matchers."""
+    refresh_origin_categories()
+
+    rows = conn.execute(
+        """
+        SELECT process_common_name, process_category, variety_canonical, varietal_category
+        FROM origins
+        """
+    ).fetchall()
+    assert rows, "Expected origins in the test database"
+
+    for process_common_name, process_category, variety_canonical, varietal_category in rows:
+        assert process_category == categorize_process(process_common_name or "")
+        assert varietal_category is not None
+        assert len(varietal_category) == len(variety_canonical or [])
+        assert varietal_category == [categorize_varietal(v) for v in (variety_canonical or [])]
+
+
+def test_refresh_origin_categories_only_missing(db_session):
+    """Incremental mode only fills rows whose categories are still NULL."""
+    row_id = conn.execute("SELECT MIN(id) FROM origins").fetchone()[0]
+    other_id = conn.execute("SELECT MAX(id) FROM origins").fetchone()[0]
+    try:
+        conn.execute("UPDATE origins SET process_category = NULL WHERE id = ?", [row_id])
+        conn.execute("UPDATE origins SET process_category = 'sentinel' WHERE id = ?", [other_id])
+
+        refresh_origin_categories(only_missing=True)
+
+        filled = conn.execute("SELECT process_category FROM origins WHERE id = ?", [row_id]).fetchone()[0]
+        untouched = conn.execute("SELECT process_category FROM origins WHERE id = ?", [other_id]).fetchone()[0]
+        assert filled is not None
+        assert untouched == "sentinel"
+    finally:
+        refresh_origin_categories()
@@ -81,3 +81,29 @@ def test_robust_region_slug_matching(client):
     # If merged, bean_count should be summation of both
     # We just check it's successful for now as a proxy for robust matching
     assert data["data"]["country_code"] == "PA"
+
+
+def test_origin_suggestions_match_origins(db_session):
+    """Country suggestions carry the same bean counts as a direct aggregate over origins."""
+    expected = dict(
+        conn.execute(
+            "SELECT country, COUNT(DISTINCT bean_id) FROM origins WHERE country IS NOT NULL GROUP BY country"
+        ).fetchall()
+    )
+    actual = dict(
+        conn.execute(
+            "SELECT country_code, bean_count FROM origin_suggestions WHERE type = 'country' AND bean_count > 0"
+        ).fetchall()
+    )
+    assert actual == expected
+
+
+def test_search_origins_is_case_and_accent_insensitive(client):
+    """Typeahead matches folded names and ranks by bean count."""
+    upper = client.get("/v1/search/origins?q=COLOMBIA").json()["data"]
+    assert upper == client.get("/v1/search/origins?q=colombiá").json()["data"]
+    assert any(r["type"] == "country" and r["country_code"] == "CO" for r in upper)
+
+    results = client.get("/v1/search/origins?q=a&limit=50").json()["data"]
+    counts = [r["bean_count"] for r in results]
+    assert counts == sorted(counts, reverse=True)
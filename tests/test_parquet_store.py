@@ -0,0 +1,141 @@
+"""
+Tests for the Parquet snapshot store (``kissaten compact-data``).
+
+Tests cover:
+- Compaction writes one partition + manifest per session
+- Re-running compaction is a no-op for unchanged sessions
+- A session whose JSON changed after compaction falls back to the JSON tail
+- A full refresh over compacted partitions loads the same beans as plain JSON
+- Incremental refresh reads new files from compacted partitions
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from kissaten.api import db
+from kissaten.api.parquet_store import (
+    MANIFEST_FILENAME,
+    compact_sessions,
+    default_snapshot_dir,
+    plan_sources,
+)
+
+TEST_DATA_ROOT = Path(__file__).parent.parent / "test_data" / "roasters"
+
+
+@pytest.fixture
+def temp_test_data():
+    """Temporary copy of test data so snapshots are written outside the repo."""
+    temp_dir = Path(tempfile.mkdtemp())
+    test_data_dir = temp_dir / "roasters"
+    shutil.copytree(TEST_DATA_ROOT, test_data_dir)
+    yield test_data_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def isolated_db_connection():
+    """Swap db.conn for a throwaway database and restore it afterwards."""
+    temp_db_path = Path(tempfile.mktemp(suffix=".duckdb"))
+    original_conn = db.conn
+    db.conn = duckdb.connect(str(temp_db_path))
+    db._register_udfs()
+    yield db.conn
+    db.conn.close()
+    db.conn = original_conn
+    if temp_db_path.exists():
+        temp_db_path.unlink()
+
+
+def _session_dirs_with_json(roasters_dir: Path) -> list[Path]:
+    return [d for d in roasters_dir.glob("*/*") if d.is_dir() and any(d.glob("*.json"))]
+
+
+def _bean_snapshot(roasters_dir: Path) -> list[tuple]:
+    rows = db.conn.execute(
+        """
+        SELECT name, url, in_stock, bean_url_path, date_added, scraped_at,
+               replace(filename, ?, '') as rel_filename, array_length(tasting_notes)
+        FROM coffee_beans
+        ORDER BY url, bean_url_path
+        """,
+        [str(roasters_dir) + "/"],
+    ).fetchall()
+    return rows
+
+
+def test_compaction_writes_partitions_and_is_idempotent(temp_test_data):
+    snapshot_dir = default_snapshot_dir(temp_test_data)
+    assert plan_sources(temp_test_data).parquet_files == []
+
+    result = compact_sessions(temp_test_data, include_today=True)
+    sessions = _session_dirs_with_json(temp_test_data)
+    assert len(result.compacted) == len(sessions)
+    assert result.files == sum(len(list(d.glob("*.json"))) for d in sessions)
+
+    for session_dir in sessions:
+        part = snapshot_dir / f"roaster={session_dir.parent.name}" / f"date={session_dir.name}"
+        manifest = json.loads((part / MANIFEST_FILENAME).read_text())
+        assert set(manifest["files"]) == {p.name for p in session_dir.glob("*.json")}
+
+    again = compact_sessions(temp_test_data, include_today=True)
+    assert again.compacted == []
+    assert len(again.up_to_date) == len(sessions)
+
+
+def test_changed_session_falls_back_to_json(temp_test_data):
+    compact_sessions(temp_test_data, include_today=True)
+    plan = plan_sources(temp_test_data)
+    assert plan.json_files == []
+
+    changed = sorted((temp_test_data / "test_roaster" / "20250912").glob("*.json"))[0]
+    data = json.loads(changed.read_text())
+    data["name"] = data["name"] + " (edited)"
+    changed.write_text(json.dumps(data))
+    os.utime(changed, ns=(changed.stat().st_atime_ns, changed.stat().st_mtime_ns + 1_000_000_000))
+
+    plan = plan_sources(temp_test_data)
+    assert changed in plan.json_files
+    assert changed not in plan.compacted_json_files
+    # Only the edited session drops out of the compacted set
+    assert all(p.parent == changed.parent for p in plan.json_files)
+
+
+@pytest.mark.asyncio
+async def test_full_refresh_from_snapshots_matches_json(temp_test_data, isolated_db_connection):
+    await db.init_database(incremental=False)
+    await db.load_coffee_data(temp_test_data, incremental=False)
+    from_json = _bean_snapshot(temp_test_data)
+    origins_from_json = db.conn.execute("SELECT COUNT(*) FROM origins").fetchone()[0]
+    assert from_json
+
+    compact_sessions(temp_test_data, include_today=True)
+
+    await db.init_database(incremental=False)
+    await db.load_coffee_data(temp_test_data, incremental=False)
+    from_snapshots = _bean_snapshot(temp_test_data)
+    origins_from_snapshots = db.conn.execute("SELECT COUNT(*) FROM origins").fetchone()[0]
+
+    assert from_snapshots == from_json
+    assert origins_from_snapshots == origins_from_json
+
+
+@pytest.mark.asyncio
+async def test_incremental_refresh_reads_compacted_partitions(temp_test_data, isolated_db_connection):
+    compact_sessions(temp_test_data, include_today=True)
+
+    await db.init_database(incremental=True)
+    await db.load_coffee_data(temp_test_data, incremental=True)
+    first = _bean_snapshot(temp_test_data)
+    assert first
+
+    # Second incremental pass has nothing new to read
+    await db.init_database(incremental=True)
+    await db.load_coffee_data(temp_test_data, incremental=True)
+    assert _bean_snapshot(temp_test_data) == first
@@ -0,0 +1,121 @@
+"""
+Tests for boolean tasting-note search over the refresh-time note index.
+
+Strict-mode tasting note queries compile into INTERSECT/UNION/EXCEPT over
+bean IDs from ``tasting_note_postings``. These tests check the compiled sets
+against a per-note evaluation in Python and confirm the index tables are
+built by ``load_coffee_data``.
+"""
+
+import unicodedata
+
+import pytest
+
+from kissaten.api.db import conn
+from kissaten.api.tasting_note_search import (
+    build_tasting_note_filter,
+    build_tasting_note_score,
+    compile_bean_id_set,
+    tokenize_query,
+)
+
+
+def _normalize(note: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", note)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip().lower()
+
+
+@pytest.fixture(scope="module")
+def bean_notes(db_session):
+    rows = conn.execute("SELECT id, tasting_notes FROM coffee_beans WHERE tasting_notes IS NOT NULL").fetchall()
+    return {bean_id: [_normalize(n) for n in notes if n is not None] for bean_id, notes in rows}
+
+
+def _matching(bean_notes, predicate) -> set[int]:
+    return {bean_id for bean_id, notes in bean_notes.items() if any(predicate(n) for n in notes)}
+
+
+def _compiled_ids(query: str) -> set[int]:
+    sql, params = compile_bean_id_set(query)
+    return {row[0] for row in conn.execute(sql, params).fetchall()}
+
+
+def test_index_tables_built(db_session):
+    index_rows = conn.execute("SELECT COUNT(*) FROM tasting_note_index").fetchone()[0]
+    expected = conn.execute(
+        "SELECT COALESCE(SUM(len(tasting_notes)), 0) FROM coffee_beans WHERE tasting_notes IS NOT NULL"
+    ).fetchone()[0]
+    assert index_rows == expected > 0
+
+    # Every note in the postings is already normalized
+    unnormalized = conn.execute(
+        "SELECT COUNT(*) FROM tasting_note_postings WHERE note != lower(strip_accents(note))"
+    ).fetchone()[0]
+    assert unnormalized == 0
+
+
+def test_tokenize_query():
+    assert tokenize_query('"Passion Fruit" & !(bitter | sour)') == [
+        "EXACT:Passion Fruit", "&", "!", "(", "bitter", "|", "sour", ")",
+    ]
+    assert tokenize_query("chocolate NOT cocoa") == ["chocolate", "!", "cocoa"]
+
+
+def test_single_term(bean_notes):
+    assert _compiled_ids("chocolate") == _matching(bean_notes, lambda n: "chocolate" in n)
+
+
+def test_prefix_wildcard_matches_any_note(bean_notes):
+    assert _compiled_ids("fruit*") == _matching(bean_notes, lambda n: n.startswith("fruit"))
+
+
+def test_and_or_not(bean_notes):
+    chocolate = _matching(bean_notes, lambda n: "chocolate" in n)
+    berry = _matching(bean_notes, lambda n: "berry" in n)
+    cherry = _matching(bean_notes, lambda n: "cherry" in n)
+    caramel = _matching(bean_notes, lambda n: "caramel" in n)
+
+    assert _compiled_ids("chocolate&berry") == chocolate & berry
+    assert _compiled_ids("berry|cherry") == berry | cherry
+    assert _compiled_ids("chocolate&!caramel") == chocolate - caramel
+    assert _compiled_ids("(berry|cherry)&!chocolate") == (berry | cherry) - chocolate
+    # ! binds tighter than &, & tighter than |
+    assert _compiled_ids("berry|cherry&chocolate") == berry | (cherry & chocolate)
+
+
+def test_exact_match(bean_notes):
+    some_note = next(notes[0] for notes in bean_notes.values() if notes)
+    expected = _matching(bean_notes, lambda n: n == some_note)
+    assert _compiled_ids(f'"{some_note.upper()}"') == expected
+
+
+def test_empty_query():
+    assert compile_bean_id_set("   ") is None
+    assert build_tasting_note_filter("") == ("", [])
+    assert build_tasting_note_score("!sour") == ("", [])
+
+
+def test_score_ranks_earlier_notes_higher(db_session):
+    bean_id, first_note = conn.execute(
+        """
+        SELECT bean_id, note FROM tasting_note_index
+        WHERE pos = 1 AND note NOT IN (SELECT note FROM tasting_note_index WHERE pos > 1)
+        LIMIT 1
+        """
+    ).fetchone()
+    sql, params = build_tasting_note_score(f'"{first_note}"', bean_id_expression="?")
+    score = conn.execute(f"SELECT {sql}", params + [bean_id]).fetchone()[0]
+    assert score == pytest.approx(5.0)
+
+
+def test_search_endpoint_uses_index(client, bean_notes):
+    response = client.get("/v1/search?tasting_notes_query=chocolate%26berry&per_page=100")
+    assert response.status_code == 200
+    data = response.json()
+    expected = _matching(bean_notes, lambda n: "chocolate" in n) & _matching(bean_notes, lambda n: "berry" in n)
+    assert data["pagination"]["total_items"] <= len(expected)
+    for bean in data["data"]:
+        notes = " ".join(
+            str(note.get("note", "")) if isinstance(note, dict) else str(note) for note in bean["tasting_notes"]
+        ).lower()
+        assert "chocolate" in notes and "berry" in notes
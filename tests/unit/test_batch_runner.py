@@ -0,0 +1,136 @@
+"""Unit tests for ``kissaten.ai.batch_runner``.
+
+The runner drives the LLM categorizers: bounded concurrency, rate-limit-aware
+retries, and per-batch checkpoints so an interrupted run resumes.
+"""
+
+import asyncio
+
+from pydantic import BaseModel
+
+from kissaten.ai.batch_runner import BatchRunner, is_rate_limited
+
+
+class Echo(BaseModel):
+    value: str
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def _runner(tmp_path, **kwargs) -> BatchRunner:
+    kwargs.setdefault("base_delay", 0.01)
+    kwargs.setdefault("max_delay", 0.05)
+    return BatchRunner("test_task", checkpoint_dir=tmp_path, result_model=Echo, **kwargs)
+
+
+async def test_results_keep_input_order_and_respect_concurrency(tmp_path):
+    in_flight = 0
+    peak = 0
+
+    async def worker(batch):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later batches finish first
+        await asyncio.sleep(0.02 / (int(batch[0]) + 1))
+        in_flight -= 1
+        return [Echo(value=item) for item in batch]
+
+    items = [str(i) for i in range(20)]
+    results = await _runner(tmp_path, concurrency=3).run(items, 2, worker)
+
+    assert [r.value for r in results] == items
+    assert 1 < peak <= 3
+
+
+async def test_rate_limited_batch_is_retried(tmp_path):
+    calls = {}
+
+    async def worker(batch):
+        calls[batch[0]] = calls.get(batch[0], 0) + 1
+        if batch[0] == "a" and calls["a"] < 3:
+            raise RateLimited("429 RESOURCE_EXHAUSTED")
+        return [Echo(value=item) for item in batch]
+
+    runner = _runner(tmp_path)
+    results = await runner.run(["a", "b"], 1, worker)
+
+    assert [r.value for r in results] == ["a", "b"]
+    assert calls["a"] == 3
+    assert runner.stats.retries == 2
+    assert runner.stats.failed == 0
+
+
+async def test_failed_batch_uses_fallback_and_is_not_checkpointed(tmp_path):
+    async def worker(batch):
+        if "bad" in batch:
+            raise ValueError("validation error")
+        return [Echo(value=item) for item in batch]
+
+    runner = _runner(tmp_path, max_retries=1)
+    items = ["ok1", "ok2", "bad", "ok3"]
+    results = await runner.run(items, 2, worker, on_error=lambda batch, _e: [Echo(value="fallback")] * len(batch))
+
+    assert [r.value for r in results] == ["ok1", "ok2", "fallback", "fallback"]
+    assert runner.stats.failed == 1
+    checkpoints = sorted(p.name for p in (tmp_path / "test_task" / runner.run_key(items, 2)).iterdir())
+    assert checkpoints == ["batch-00000.json"]
+
+
+async def test_interrupted_run_resumes_from_checkpoints(tmp_path):
+    items = [f"note {i}" for i in range(10)]
+    seen = []
+
+    async def flaky_worker(batch):
+        if batch[0] == "note 6":
+            raise RuntimeError("connection reset")
+        return [Echo(value=item.upper()) for item in batch]
+
+    await _runner(tmp_path, max_retries=0).run(items, 2, flaky_worker)
+
+    async def worker(batch):
+        seen.append(batch)
+        return [Echo(value=item.upper()) for item in batch]
+
+    runner = _runner(tmp_path)
+    results = await runner.run(items, 2, worker)
+
+    assert seen == [["note 6", "note 7"]]
+    assert runner.stats.resumed == 4
+    assert [r.value for r in results] == [item.upper() for item in items]
+
+    runner.clear(items, 2)
+    assert not (tmp_path / "test_task" / runner.run_key(items, 2)).exists()
+
+
+async def test_context_separates_runs(tmp_path):
+    async def worker(batch):
+        return [Echo(value=item) for item in batch]
+
+    runner = _runner(tmp_path)
+    await runner.run(["x"], 1, worker, context="Berry")
+    assert runner.run_key(["x"], 1, "Berry") != runner.run_key(["x"], 1, "Citrus")
+    assert runner.estimate(["x"], 1, context="Berry").checkpointed_batches == 1
+    assert runner.estimate(["x"], 1, context="Citrus").checkpointed_batches == 0
+
+
+def test_estimate(tmp_path):
+    runner = _runner(tmp_path, concurrency=4)
+    estimate = runner.estimate(["abcd"] * 100, 10, prompt_overhead_chars=400, seconds_per_batch=10)
+
+    assert estimate.batches == 10
+    assert estimate.remaining_batches == 10
+    # 100 items * 8 chars + 10 calls * 400 chars of prompt, at 4 chars/token
+    assert estimate.input_tokens == (100 * 8 + 10 * 400) // 4
+    # 10 batches at concurrency 4 -> 3 waves
+    assert estimate.wall_time_seconds == 30
+    assert estimate.cost_usd > 0
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(RateLimited())
+    assert is_rate_limited(Exception("429 Too Many Requests"))
+    assert is_rate_limited(Exception("RESOURCE_EXHAUSTED: quota exceeded"))
+    assert not is_rate_limited(ValueError("output validation failed"))
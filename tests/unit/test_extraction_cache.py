@@ -0,0 +1,121 @@
+"""Unit tests for the content-addressed AI extraction cache."""
+
+import os
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from bs4 import BeautifulSoup
+
+from kissaten.ai.extractor import CoffeeDataExtractor
+from kissaten.cache.extraction_cache import ExtractionCache
+from kissaten.schemas import CoffeeBean
+from kissaten.scrapers.shopify_base import ShopifyJsonScraper
+
+PAGE = "<html><body><h1>Huila Geisha</h1><p>Washed, 1,800 masl</p></body></html>"
+
+
+def _bean(url="https://proper-roaster.com/products/huila-geisha", name="Huila Geisha"):
+    return CoffeeBean(
+        name=name,
+        roaster="Proper Roaster",
+        url=url,
+        origins=[{"country": "CO", "region": "Huila", "process": "Washed"}],
+        price_options=[],
+    )
+
+
+def test_key_depends_on_content_fingerprint_and_currency():
+    key = ExtractionCache.key("page", "fingerprint", "GBP")
+    assert key == ExtractionCache.key("page", "fingerprint", "GBP")
+    assert key != ExtractionCache.key("page 2", "fingerprint", "GBP")
+    assert key != ExtractionCache.key("page", "fingerprint 2", "GBP")
+    assert key != ExtractionCache.key("page", "fingerprint", "EUR")
+
+
+def test_hit_is_readdressed_to_the_requested_url(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    key = ExtractionCache.key("page", "fingerprint", "GBP")
+    assert cache.get(key, "https://proper-roaster.com/products/a") is None
+
+    cache.put(key, _bean())
+    bean = cache.get(key, "https://proper-roaster.com/products/moved")
+    assert bean.name == "Huila Geisha"
+    assert str(bean.url) == "https://proper-roaster.com/products/moved"
+    # Variants are stored separately
+    assert cache.get(key, "https://proper-roaster.com/products/a", "en") is None
+
+
+def test_unreadable_entry_is_discarded(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    key = ExtractionCache.key("page", "fingerprint", "GBP")
+    cache.put(key, _bean())
+    (entry,) = tmp_path.glob("*/*.json")
+    entry.write_text("{not json")
+    assert cache.get(key, "https://proper-roaster.com/products/a") is None
+    assert not entry.exists()
+
+
+def test_evict_by_age_then_size(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    now = time.time()
+    keys = [ExtractionCache.key(f"page {i}", "fingerprint", "GBP") for i in range(4)]
+    for age_days, key in zip([100, 3, 2, 1], keys):
+        cache.put(key, _bean())
+        (path,) = tmp_path.glob(f"*/{key}.json")
+        os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+    entry_size = cache.stats()["size_bytes"] / 4
+
+    # The 100-day-old entry goes on age, the least recently used remaining one on size
+    assert cache.evict(max_age_days=90, max_size_mb=2.5 * entry_size / 1024 / 1024) == 2
+    url = "https://proper-roaster.com/products/a"
+    assert [cache.get(key, url) is not None for key in keys] == [False, False, True, True]
+
+    assert cache.clear() == 2
+    assert cache.stats() == {"entries": 0, "size_bytes": 0}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_not_extracted_twice(tmp_path):
+    scraper = ShopifyJsonScraper(
+        roaster_name="Proper Roaster", base_url="https://proper-roaster.com", products_json_urls=[]
+    )
+    scraper.extraction_cache = ExtractionCache(tmp_path)
+    scraper.start_session()
+    # A real extractor (for the prompt fingerprint) whose LLM call is stubbed
+    extractor = object.__new__(CoffeeDataExtractor)
+    extractor.extract_coffee_data = AsyncMock(return_value=_bean())
+    extractor.translate_to_english = AsyncMock(return_value=_bean(name="Huila Geisha (EN)"))
+
+    first = await scraper._extract_bean_with_ai(extractor, BeautifulSoup(PAGE, "lxml"), str(_bean().url))
+    moved_url = "https://proper-roaster.com/products/huila-geisha-2026"
+    second = await scraper._extract_bean_with_ai(extractor, BeautifulSoup(PAGE, "lxml"), moved_url)
+
+    assert extractor.extract_coffee_data.await_count == 1
+    assert first.name == second.name == "Huila Geisha"
+    assert str(second.url) == moved_url
+    assert (scraper.session.extraction_cache_hits, scraper.session.extraction_cache_misses) == (1, 1)
+    assert scraper.session.model_dump()["extraction_cache_hit_ratio"] == 0.5
+
+    # A changed page misses
+    await scraper._extract_bean_with_ai(extractor, BeautifulSoup(PAGE.replace("1,800", "1,900"), "lxml"), moved_url)
+    assert extractor.extract_coffee_data.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_translation_is_cached(tmp_path, monkeypatch):
+    scraper = ShopifyJsonScraper(
+        roaster_name="Proper Roaster", base_url="https://proper-roaster.com", products_json_urls=[]
+    )
+    scraper.extraction_cache = ExtractionCache(tmp_path)
+    monkeypatch.setattr(scraper, "save_bean_to_file", lambda *args, **kwargs: None)
+    extractor = object.__new__(CoffeeDataExtractor)
+    extractor.extract_coffee_data = AsyncMock(return_value=_bean())
+    extractor.translate_to_english = AsyncMock(return_value=_bean(name="Huila Geisha (EN)"))
+
+    for _ in range(2):
+        bean = await scraper._extract_bean_with_ai(
+            extractor, BeautifulSoup(PAGE, "lxml"), str(_bean().url), translate_to_english=True
+        )
+        assert bean.name == "Huila Geisha (EN)"
+    assert extractor.translate_to_english.await_count == 1
@@ -0,0 +1,82 @@
+"""Unit tests for blocking-key candidate generation in farm deduplication.
+
+Blocked clustering must return exactly the clusters of the exhaustive
+pairwise comparison, including merge confidences.
+"""
+
+import random
+
+from kissaten.dedup import candidate_pairs, cluster_farms, should_merge
+
+_NAMES = ["las flores", "el paraiso", "la esperanza", "quebraditas", "san jose", "buenavista", "el mirador", "la palma"]
+_PREFIXES = ["", "Finca ", "Hacienda "]
+_SUFFIXES = ["", " Farm", " Coffee Farm"]
+_SYLLABLES = ["ka", "lo", "mi", "ra", "to", "ne", "su", "va", "chi", "gua"]
+_PEOPLE = ["Edinson Argote", "Luz Angela Rojas", "Jairo Arcila", "Elkin Guzman", "Rodrigo Sanchez", "Pedro Rojas"]
+
+
+def _synthetic_farms(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    base_names = _NAMES + ["".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4))) for _ in range(30)]
+    farms = []
+    for _ in range(count):
+        name = rng.choice(base_names)
+        roll = rng.random()
+        if roll < 0.3:
+            name = f"{name} {rng.choice(base_names).split()[-1]}"
+        elif roll < 0.4:
+            # One-character typo
+            pos = rng.randrange(len(name))
+            name = name[:pos] + rng.choice("aeiou") + name[pos + 1 :]
+        producer = rng.choice(_PEOPLE) if rng.random() < 0.7 else ""
+        if producer and rng.random() < 0.3:
+            producer = f"{producer} & {rng.choice(_PEOPLE)}"
+        farms.append(
+            {
+                "farm_name": f"{rng.choice(_PREFIXES)}{name.title()}{rng.choice(_SUFFIXES)}",
+                "producer_name": producer,
+                "bean_count": rng.randint(1, 20),
+            }
+        )
+    return farms
+
+
+def test_blocked_clusters_match_exhaustive():
+    for seed in range(5):
+        farms = _synthetic_farms(150, seed)
+        assert cluster_farms(farms, use_blocking=True) == cluster_farms(farms, use_blocking=False)
+        assert cluster_farms(farms, name_threshold=0.8) == cluster_farms(farms, name_threshold=0.8, use_blocking=False)
+
+
+def test_candidates_cover_every_merge():
+    farms = _synthetic_farms(120, seed=42)
+    candidates = candidate_pairs(farms)
+    for i in range(len(farms)):
+        for j in range(i + 1, len(farms)):
+            if should_merge(farms[i], farms[j])[0]:
+                assert (i, j) in candidates
+
+
+def test_long_names_without_shared_tokens():
+    # No common token, but a single edit apart: token_set_ratio >= 0.99
+    base = "abcdefghijklmnopqrstuvwxyz" * 2 + "abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwx"
+    farms = [
+        {"farm_name": base, "producer_name": "", "bean_count": 3},
+        {"farm_name": base + "y", "producer_name": "Edinson Argote", "bean_count": 1},
+        {"farm_name": "Quebraditas", "producer_name": "", "bean_count": 1},
+    ]
+    assert should_merge(farms[0], farms[1])[0]
+    assert (0, 1) in candidate_pairs(farms)
+    clusters = cluster_farms(farms)
+    assert [len(c["entries"]) for c in clusters] == [2, 1]
+    assert clusters == cluster_farms(farms, use_blocking=False)
+
+
+def test_producer_overlap_required_below_exact_threshold():
+    farms = [
+        {"farm_name": "Las Flores", "producer_name": "Jairo Arcila", "bean_count": 2},
+        {"farm_name": "Finca Las Flores Altas", "producer_name": "Jairo Arcila", "bean_count": 1},
+        {"farm_name": "Las Flores Altas", "producer_name": "Elkin Guzman", "bean_count": 1},
+    ]
+    assert candidate_pairs(farms) >= {(0, 1)}
+    assert cluster_farms(farms) == cluster_farms(farms, use_blocking=False)
@@ -0,0 +1,124 @@
+"""Unit tests for condensing product pages before AI extraction."""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from bs4 import BeautifulSoup
+
+from kissaten.scrapers.html_condenser import condense_html
+from kissaten.scrapers.shopify_base import ShopifyJsonScraper
+
+PRODUCT_URL = "https://roaster.example/products/huila-geisha"
+
+PAGE = f"""
+<html>
+<head>
+  <title>Huila Geisha – Example Roasters</title>
+  <meta property="og:image" content="https://cdn.example/huila.jpg">
+  <meta property="og:price:currency" content="GBP">
+  <meta name="viewport" content="width=device-width">
+  <style>body {{ color: red; }}</style>
+  <script>window.theme = {{"strings": "{'x' * 2000}"}};</script>
+  <script type="application/ld+json">{{"@type": "Organization", "name": "Example Roasters"}}</script>
+  <script type="application/ld+json">
+    {{"@context": "https://schema.org", "@type": "Product", "name": "Huila Geisha",
+      "offers": {{"@type": "Offer", "price": "18.00"}}}}
+  </script>
+</head>
+<body>
+  <header><nav><a href="/">Home</a><a href="/shop">Shop</a></nav></header>
+  <main>
+    <div class="product">
+      <h1>Huila   Geisha</h1>
+      <img src="//cdn.example/huila.jpg" alt="Bag of Huila Geisha">
+      <img src="//cdn.example/huila.jpg" alt="Bag of Huila Geisha">
+      <p>Notes of <strong>jasmine</strong>, bergamot<br>and peach.</p>
+      <table>
+        <tr><th>Process</th><td>Washed</td></tr>
+        <tr><th>Altitude</th><td>1,800 masl</td></tr>
+      </table>
+      <select name="size"><option>250g - £18.00</option><option>1kg - £60.00</option></select>
+      <button>Add to cart</button>
+    </div>
+    <section class="related"><h2>You may also like</h2><ul><li>Ethiopia Guji</li></ul></section>
+  </main>
+  <svg><path d="M0 0L10 10"/></svg>
+  <footer><p>© Example Roasters</p></footer>
+</body>
+</html>
+"""
+
+
+def test_keeps_product_content_and_drops_chrome():
+    condensed = condense_html(PAGE, base_url=PRODUCT_URL)
+    text = condensed.text
+
+    assert "Title: Huila Geisha – Example Roasters" in text
+    assert "og:image: https://cdn.example/huila.jpg" in text
+    assert "# Huila Geisha" in text
+    assert "Notes of jasmine, bergamot\nand peach." in text
+    assert "| Process | Washed |" in text
+    assert "Options: 250g - £18.00 | 1kg - £60.00" in text
+    assert "- Ethiopia Guji" in text
+    # Images are absolutised and listed once
+    assert text.count("![Bag of Huila Geisha](https://cdn.example/huila.jpg)") == 1
+
+    for dropped in ("window.theme", "color: red", "Home", "Add to cart", "©", "viewport", "M0 0"):
+        assert dropped not in text
+
+
+def test_keeps_only_product_json_ld():
+    text = condense_html(PAGE).text
+    assert '{"@context":"https://schema.org","@type":"Product","name":"Huila Geisha"' in text
+    assert "Organization" not in text
+
+
+def test_content_root_selector():
+    text = condense_html(PAGE, content_root_selector="div.product").text
+    assert "# Huila Geisha" in text
+    assert "You may also like" not in text
+    # Page metadata is kept whatever the root
+    assert "og:image" in text
+    # A selector matching nothing falls back to the whole body
+    assert "You may also like" in condense_html(PAGE, content_root_selector="#missing").text
+
+
+def test_reports_reduction():
+    condensed = condense_html(PAGE)
+    assert condensed.original_chars == len(PAGE)
+    assert condensed.condensed_chars == len(condensed.text)
+    assert 0.5 < condensed.reduction < 1
+    assert condensed.summary().endswith("smaller)")
+
+
+def test_is_deterministic():
+    assert condense_html(PAGE).text == condense_html(BeautifulSoup(PAGE, "lxml")).text
+
+
+def test_keeps_injected_shopify_context():
+    scraper = ShopifyJsonScraper(
+        roaster_name="Proper Roaster", base_url="https://proper-roaster.com", products_json_urls=[]
+    )
+    product = {"title": "Huila Geisha", "body_html": "<p>Washed</p>", "variants": [{"price": "18.00"}]}
+    soup = scraper._inject_shopify_context(BeautifulSoup(PAGE, "lxml"), product)
+
+    text = condense_html(soup, content_root_selector="div.product").text
+    assert "Shopify product JSON:\n" + json.dumps(product, separators=(",", ":")) in text
+    # The context is not repeated in the page content
+    assert text.count("Huila Geisha\",\"body_html") == 1
+
+
+@pytest.mark.asyncio
+async def test_extractor_receives_condensed_page():
+    scraper = ShopifyJsonScraper(
+        roaster_name="Proper Roaster", base_url="https://proper-roaster.com", products_json_urls=[]
+    )
+    extractor = AsyncMock()
+    extractor.extract_coffee_data.return_value = None
+
+    await scraper._extract_bean_with_ai(extractor, BeautifulSoup(PAGE, "lxml"), PRODUCT_URL)
+
+    html_content = extractor.extract_coffee_data.call_args.args[0]
+    assert html_content == scraper.last_condensed_page.text
+    assert "window.theme" not in html_content
@@ -0,0 +1,120 @@
+"""Unit tests for the content-addressed bean image store."""
+
+import io
+import json
+
+import pytest
+from PIL import Image, features
+
+from kissaten.api.db import load_bean_image_urls
+from kissaten.scrapers.base import BaseScraper
+from kissaten.scrapers.image_store import ImageStore, bean_path
+
+IMAGE_URL = "https://cdn.proper-roaster.com/bag.jpg"
+
+
+def _jpeg(width=1000, height=800, color=(120, 80, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeImageServer:
+    """Serves one image with an ETag and answers matching conditional requests with 304."""
+
+    def __init__(self, content: bytes, etag='"v1"'):
+        self.content = content
+        self.etag = etag
+        self.requests: list[dict[str, str]] = []
+
+    async def get(self, url, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.content, {"ETag": self.etag, "Content-Type": "image/png"})
+
+
+class MockPlainScraper(BaseScraper):
+    def __init__(self):
+        super().__init__(roaster_name="Proper Roaster", base_url="https://proper-roaster.com", rate_limit_delay=0)
+
+    async def get_store_urls(self) -> list[str]:
+        return []
+
+    async def _extract_product_urls_from_store(self, store_url: str) -> list[str]:
+        return []
+
+
+def test_add_names_blob_by_hash_and_real_format(tmp_path):
+    store = ImageStore(tmp_path, "proper_roaster")
+    image = store.add(_jpeg(), content_type="image/png")
+
+    assert image.path == f"blobs/{image.sha256[:2]}/{image.sha256}.jpg"
+    assert (image.width, image.height) == (1000, 800)
+    # Adding the same bytes again stores nothing new
+    assert store.add(_jpeg()).path == image.path
+    assert len(list(tmp_path.glob("blobs/*/*"))) == 1
+
+
+def test_thumbnails_are_only_made_below_the_original_width(tmp_path):
+    store = ImageStore(tmp_path, "proper_roaster")
+    image = store.add(_jpeg(width=500, height=250))
+
+    assert sorted(image.thumbnails["webp"]) == [200, 400]
+    with Image.open(tmp_path / image.thumbnails["webp"][400]) as thumbnail:
+        assert (thumbnail.format, thumbnail.size) == ("WEBP", (400, 200))
+    if features.check("avif"):
+        assert sorted(image.thumbnails["avif"]) == [200, 400]
+
+
+@pytest.mark.asyncio
+async def test_fetch_is_conditional_across_runs(tmp_path):
+    server = FakeImageServer(_jpeg())
+    store = ImageStore(tmp_path, "proper_roaster")
+    first = await store.fetch(server, IMAGE_URL)
+    # Fetched once per run
+    assert await store.fetch(server, IMAGE_URL) is first
+    assert server.requests == [{}]
+    store.record_bean("huila_washed_120000", first)
+
+    next_run = ImageStore(tmp_path, "proper_roaster")
+    again = await next_run.fetch(server, IMAGE_URL)
+    assert server.requests[-1] == {"If-None-Match": '"v1"'}
+    assert again.path == first.path
+    assert (next_run.downloads, next_run.reused) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_download_and_save_image_links_sessions_to_one_blob(tmp_path):
+    scraper = MockPlainScraper()
+    scraper.client = FakeImageServer(_jpeg())
+
+    scraper.session_datetime = "20260101"
+    first = await scraper.download_and_save_image(IMAGE_URL, "huila_washed_120000", tmp_path)
+    scraper._image_stores.clear()  # a later run
+    scraper.session_datetime = "20260201"
+    second = await scraper.download_and_save_image(IMAGE_URL, "huila_washed_130000", tmp_path)
+
+    assert first == tmp_path / "roasters/proper_roaster/20260101/huila_washed_120000.png"
+    assert first.stat().st_ino == second.stat().st_ino
+    assert len(list(tmp_path.glob("images/blobs/*/*"))) == 1
+
+    manifest = json.loads((tmp_path / "images/manifests/proper_roaster.json").read_text())
+    entry = manifest["beans"][bean_path("proper_roaster", "huila_washed_130000")]
+    assert entry["bean_file"] == "roasters/proper_roaster/20260201/huila_washed_130000.json"
+    assert entry["original"].startswith("/static/data/images/blobs/") and entry["original"].endswith(".jpg")
+    assert set(entry["thumbnails"]["webp"]) == {"200", "400", "800"}
+
+    assert load_bean_image_urls(tmp_path / "images") == {"/proper_roaster/huila_washed": entry["original"]}
@@ -0,0 +1,88 @@
+"""Unit tests for the in-memory origin typeahead index."""
+
+import pytest
+
+from kissaten.api.origin_suggestions import OriginSuggestionIndex, fold
+
+
+def _row(type_, name, country_code, bean_count, search_names, region_slug=None, farm_slug=None):
+    return {
+        "type": type_,
+        "name": name,
+        "country_code": country_code,
+        "country_name": {"CO": "Colombia", "ET": "Ethiopia", "SV": "El Salvador"}[country_code],
+        "region_name": None,
+        "region_slug": region_slug,
+        "farm_slug": farm_slug,
+        "producer_name": None,
+        "bean_count": bean_count,
+        "farm_count": None,
+        "avg_elevation": None,
+        "search_names": search_names,
+    }
+
+
+# In rank order: bean count descending
+_ROWS = [
+    _row("country", "Ethiopia", "ET", 40, ["Ethiopia", "ET"]),
+    _row("country", "Colombia", "CO", 30, ["Colombia", "CO"]),
+    _row("region", "Huila", "CO", 12, ["Huila", "Pitalito, Huila"], region_slug="huila"),
+    _row("region", "Oromia", "ET", 10, ["Oromia", "Oromiya"], region_slug="oromia"),
+    _row("farm", "El Paraíso", "CO", 6, ["El Paraíso", "Diego Bermúdez"], "huila", "el-paraiso"),
+    _row("country", "El Salvador", "SV", 5, ["El Salvador", "SV"]),
+    _row("farm", "Finca La Esperanza", "CO", 2, ["Finca La Esperanza"], "huila", "finca-la-esperanza"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return OriginSuggestionIndex(_ROWS)
+
+
+def _names(results):
+    return [row["name"] for row in results]
+
+
+def test_fold():
+    assert fold("Paraíso") == "paraiso"
+    assert fold("BERMÚDEZ") == "bermudez"
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("o", ["Ethiopia", "Colombia", "Huila", "Oromia", "El Paraíso", "El Salvador"]),
+        ("hu", ["Huila"]),
+        ("PARAIS", ["El Paraíso"]),
+        ("paraíso", ["El Paraíso"]),
+        ("bermudez", ["El Paraíso"]),
+        ("pitalito", ["Huila"]),
+        ("el ", ["El Paraíso", "El Salvador"]),
+        ("oromiya", ["Oromia"]),
+        ("esperanza", ["Finca La Esperanza"]),
+        # Both trigrams occur in "pitalito", but not as one substring
+        ("lita", []),
+        ("zzz", []),
+    ],
+)
+def test_search_matches_substrings_in_rank_order(index, query, expected):
+    assert _names(index.search(query, limit=20)) == expected
+
+
+def test_search_limit(index):
+    assert _names(index.search("o", limit=2)) == ["Ethiopia", "Colombia"]
+
+
+def test_search_filters(index):
+    assert _names(index.search("a", limit=20, country_code="CO")) == [
+        "Colombia", "Huila", "El Paraíso", "Finca La Esperanza"
+    ]
+    # A region filter drops countries
+    assert _names(index.search("a", limit=20, region_slug="huila")) == ["Huila", "El Paraíso", "Finca La Esperanza"]
+    assert index.search("a", limit=20, country_code="ET", region_slug="huila") == []
+
+
+def test_results_carry_only_result_columns(index):
+    (result,) = index.search("paraiso", limit=1)
+    assert "search_names" not in result
+    assert result["farm_slug"] == "el-paraiso"
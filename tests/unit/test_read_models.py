@@ -0,0 +1,95 @@
+"""Unit tests for the validator-free API read models.
+
+A read model must serialize to the same JSON as the validated API model
+built from the same (already valid) database row.
+"""
+
+import json
+from datetime import datetime
+
+from pydantic_core import to_json
+
+from kissaten.schemas.api_models import APIBean, APICoffeeBean, APISearchResult
+
+_ORIGIN = {
+    "country": "ET",
+    "region": "Guji",
+    "producer": None,
+    "farm": "Shakiso",
+    "elevation_min": 1900,
+    "elevation_max": 2200,
+    "process": "Natural",
+    "variety": "Heirloom",
+    "variety_canonical": ["Ethiopian Landrace"],
+    "harvest_date": datetime(2025, 12, 1),
+    "latitude": 0.0,
+    "longitude": 0.0,
+    "country_full_name": "Ethiopia",
+}
+
+_BEAN = {
+    "id": 7,
+    "name": "Guji Natural",
+    "roaster": "Test Roaster",
+    "url": "https://roaster.example.com/products/guji",
+    "is_single_origin": True,
+    "roast_level": "Light",
+    "roast_profile": "Filter",
+    "weight": 250,
+    "price": 18.5,
+    "currency": "GBP",
+    "is_decaf": False,
+    "cupping_score": None,
+    "description": "Floral and sweet.",
+    "in_stock": True,
+    "scraped_at": datetime(2026, 9, 1, 12, 30),
+    "scraper_version": "2.0",
+    "image_url": "/images/guji.jpg",
+    "clean_url_slug": "guji",
+    "bean_url_path": "/test_roaster/guji",
+    "price_converted": False,
+}
+
+
+def _validated_json(model, bean: dict) -> dict:
+    origins = [APIBean(**origin) for origin in bean["origins"]]
+    return json.loads(model(**{**bean, "origins": origins}).model_dump_json())
+
+
+def _read_model_json(model, bean: dict) -> dict:
+    origins = [APIBean.read_model(**origin) for origin in bean["origins"]]
+    return json.loads(to_json(model.read_model(**{**bean, "origins": origins})))
+
+
+def test_search_result_matches_validated_model():
+    bean = {
+        **_BEAN,
+        "origins": [_ORIGIN],
+        "tasting_notes": [{"note": "Jasmine", "primary_category": "Floral"}],
+        "score": 2.5,
+        "date_added": datetime(2026, 8, 1),
+    }
+    assert _read_model_json(APISearchResult, bean) == _validated_json(APISearchResult, bean)
+
+
+def test_plain_notes_are_cleaned_like_the_validator():
+    bean = {**_BEAN, "origins": [_ORIGIN], "tasting_notes": ["dark chocolate", " Dark Chocolate", "", "plum"]}
+    data = _read_model_json(APISearchResult, bean)
+    assert data["tasting_notes"] == ["Dark Chocolate", "Plum"]
+    assert data == _validated_json(APISearchResult, bean)
+
+
+def test_missing_lists_and_defaults():
+    bean = {**_BEAN, "origins": [], "tasting_notes": None, "price_options": None}
+    data = _read_model_json(APICoffeeBean, bean)
+    assert data["tasting_notes"] == []
+    assert data["price_options"] == []
+    assert data["requires_review"] is False
+    assert data == _validated_json(APICoffeeBean, bean)
+
+
+def test_read_model_rows_are_independent():
+    first = APISearchResult.read_model(**_BEAN, origins=[])
+    second = APISearchResult.read_model(**_BEAN, origins=[])
+    first["tasting_notes"].append("Peach")
+    assert second["tasting_notes"] == []
@@ -0,0 +1,174 @@
+"""Unit tests for the refresh-time recommendation index.
+
+Builds the index over a small in-memory catalogue and checks the sparse
+scoring against a dense reference, plus the candidate filters and ordering.
+"""
+
+from datetime import datetime, timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from kissaten.api.recommender import (
+    BeanRecommender,
+    RecommendationWeights,
+    _ragged_arange,
+    build_recommendation_index,
+    is_default_weights,
+    precomputed_neighbours,
+)
+from kissaten.api.tasting_note_search import build_tasting_note_index
+
+# id, roaster, slug, roast_level, is_decaf, in_stock, requires_review, notes, [(country, process, varieties)]
+_BEANS = [
+    (1, "A", "a-1", "Light", False, True, False, ["Jasmine", "Peach"], [("ET", "Washed", ["Heirloom"])]),
+    (2, "B", "b-1", "Light", False, True, False, ["Jasmine", "Bergamot"], [("ET", "Washed", ["Heirloom"])]),
+    (3, "C", "c-1", "Dark", False, True, False, ["Chocolate"], [("BR", "Natural", ["Bourbon"])]),
+    (4, "A", "a-2", "Medium", True, True, False, ["Peach", "Chocolate"], [("CO", "Washed", ["Caturra"])]),
+    (5, "B", "b-2", "Light", False, False, False, ["Jasmine", "Peach"], [("ET", "Washed", ["Heirloom"])]),
+    (6, "C", "c-2", "Light", False, True, True, ["Jasmine", "Peach"], [("ET", "Washed", ["Heirloom"])]),
+    (7, "D", "d-1", None, None, True, False, ["Peach"], [("KE", "Washed", ["SL28", "SL34"])]),
+    # Older scrape of d-1: never a candidate
+    (8, "D", "d-1", "Light", False, True, False, ["Jasmine"], [("ET", "Washed", ["Heirloom"])]),
+]
+
+_CATEGORIES = [("jasmine", "Floral", "Floral"), ("bergamot", "Fruity", "Citrus"), ("peach", "Fruity", "Stone")]
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect(":memory:")
+    con.execute("""
+        CREATE TABLE coffee_beans (
+            id INTEGER, name VARCHAR, roaster VARCHAR, clean_url_slug VARCHAR, roast_level VARCHAR,
+            is_decaf BOOLEAN, in_stock BOOLEAN, requires_review BOOLEAN, tasting_notes VARCHAR[],
+            scraped_at TIMESTAMP
+        )
+    """)
+    con.execute("""
+        CREATE TABLE origins (
+            bean_id INTEGER, country VARCHAR, process VARCHAR, process_common_name VARCHAR,
+            variety VARCHAR, variety_canonical VARCHAR[]
+        )
+    """)
+    con.execute("""
+        CREATE TABLE tasting_notes_categories (
+            tasting_note VARCHAR, primary_category VARCHAR, secondary_category VARCHAR
+        )
+    """)
+    now = datetime(2026, 1, 1)
+    for bean_id, roaster, slug, roast, decaf, in_stock, review, notes, origins in _BEANS:
+        con.execute(
+            "INSERT INTO coffee_beans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [bean_id, f"Bean {bean_id}", roaster, slug, roast, decaf, in_stock, review, notes,
+             now - timedelta(days=bean_id)],
+        )
+        for country, process, varieties in origins:
+            con.execute("INSERT INTO origins VALUES (?, ?, ?, NULL, NULL, ?)", [bean_id, country, process, varieties])
+    con.executemany("INSERT INTO tasting_notes_categories VALUES (?, ?, ?)", _CATEGORIES)
+    # The categories table is keyed by the raw note text
+    con.execute("UPDATE tasting_notes_categories SET tasting_note = upper(tasting_note[1]) || tasting_note[2:]")
+    build_tasting_note_index(con)
+    build_recommendation_index(con, neighbours_per_bean=5)
+    return con
+
+
+def _dense_scores(con, target: int, weights: RecommendationWeights) -> dict[int, float]:
+    """Reference scores computed from dense per-block vectors."""
+    features = con.execute("SELECT bean_id, block, feature, weight FROM recommendation_features").fetchall()
+    vectors: dict[tuple[int, str], dict[str, float]] = {}
+    for bean_id, block, feature, weight in features:
+        vectors.setdefault((bean_id, block), {})[feature] = weight
+
+    def cos(a: int, b: int, block: str) -> float:
+        va, vb = vectors.get((a, block), {}), vectors.get((b, block), {})
+        return sum(w * vb.get(f, 0.0) for f, w in va.items())
+
+    beans = {
+        row[0]: row for row in con.execute("SELECT bean_id, roaster, roast_rank FROM recommendation_beans").fetchall()
+    }
+    closeness = [1.0, 0.5, 0.2, 0.0]
+    scores = {}
+    for bean_id, roaster, roast_rank in beans.values():
+        notes = 0.6 * cos(target, bean_id, "notes") + 0.4 * cos(target, bean_id, "note_categories")
+        score = (
+            weights.tasting_notes * notes
+            + weights.origin * cos(target, bean_id, "origin")
+            + weights.process * cos(target, bean_id, "process")
+            + weights.variety * cos(target, bean_id, "variety")
+            + (weights.roaster if roaster == beans[target][1] else weights.different_roaster)
+        )
+        target_rank = beans[target][2]
+        if target_rank >= 0 and roast_rank >= 0:
+            score += weights.roast_level * closeness[min(abs(target_rank - roast_rank), 3)]
+        scores[bean_id] = score
+    return scores
+
+
+def test_ragged_arange():
+    assert _ragged_arange(np.array([5, 0, 9]), np.array([2, 0, 3])).tolist() == [5, 6, 9, 10, 11]
+    assert _ragged_arange(np.array([], dtype=np.int64), np.array([], dtype=np.int64)).tolist() == []
+
+
+def test_feature_vectors_are_unit_length(con):
+    norms = con.execute("""
+        SELECT bean_id, block, SUM(weight * weight) FROM recommendation_features GROUP BY ALL
+    """).fetchall()
+    assert norms
+    assert all(abs(norm - 1.0) < 1e-9 for _, _, norm in norms)
+    blocks = {block for _, block, _ in norms}
+    assert blocks == {"notes", "note_categories", "process", "variety", "origin"}
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        RecommendationWeights(),
+        RecommendationWeights(tasting_notes=1.0, origin=2.0, process=1.5, variety=0.0, roast_level=3.0),
+        RecommendationWeights(roaster=10.0, different_roaster=0.0),
+    ],
+)
+def test_scores_match_dense_reference(con, weights):
+    recommender = BeanRecommender.from_connection(con)
+    for target in range(1, 9):
+        row = int(np.flatnonzero(recommender.bean_ids == target)[0])
+        sparse = recommender.scores(np.array([row]), weights)[0]
+        expected = _dense_scores(con, target, weights)
+        for i, bean_id in enumerate(recommender.bean_ids):
+            assert sparse[i] == pytest.approx(expected[int(bean_id)]), (target, int(bean_id))
+
+
+def test_recommend_filters_candidates(con):
+    recommender = BeanRecommender.from_connection(con)
+    recommended = [bean_id for bean_id, _ in recommender.recommend(1, k=10)]
+    # Out of stock (5), needing review (6) and superseded scrapes (8) are excluded, as is the target
+    assert set(recommended) == {2, 3, 4, 7}
+    assert recommended[0] == 2
+
+    assert [bean_id for bean_id, _ in recommender.recommend(1, k=10, is_decaf=True)] == [4]
+    assert 7 not in [bean_id for bean_id, _ in recommender.recommend(1, k=10, is_decaf=False)]
+
+
+def test_recommend_orders_by_score_then_recency(con):
+    recommender = BeanRecommender.from_connection(con)
+    # Only the roaster terms score: every other roaster ties on the boost
+    weights = RecommendationWeights(tasting_notes=0, origin=0, roaster=0, roast_level=0, variety=0)
+    ranked = recommender.recommend(1, k=3, weights=weights)
+    assert [bean_id for bean_id, _ in ranked] == [2, 3, 7]
+    assert all(score == 1.0 for _, score in ranked)
+
+
+def test_precomputed_neighbours_match_live_scoring(con):
+    recommender = BeanRecommender.from_connection(con)
+    for target in range(1, 9):
+        precomputed = precomputed_neighbours(con, target, limit=5)
+        live = recommender.recommend(target, k=5)
+        assert [b for b, _ in precomputed] == [b for b, _ in live]
+        assert [s for _, s in precomputed] == pytest.approx([s for _, s in live])
+    assert precomputed_neighbours(con, 999, limit=5) is None
+
+
+def test_is_default_weights():
+    assert is_default_weights(RecommendationWeights())
+    assert not is_default_weights(RecommendationWeights(variety=0.0))
@@ -0,0 +1,119 @@
+"""Unit tests for the staged scrape pipeline.
+
+Covers ``Pipeline`` itself (dropping, failures, back-pressure, metrics) and
+``BaseScraper.scrape_with_ai_extraction`` running fetch, extraction, save and
+image download as separate stages.
+"""
+
+import asyncio
+
+import pytest
+from bs4 import BeautifulSoup
+
+from kissaten.schemas import CoffeeBean
+from kissaten.scrapers.base import BaseScraper
+from kissaten.scrapers.pipeline import Pipeline, Stage
+
+STORE_URLS = ["https://proper-roaster.com/collections/filter", "https://proper-roaster.com/collections/espresso"]
+
+
+class MockPlainScraper(BaseScraper):
+    def __init__(self):
+        super().__init__(roaster_name="Proper Roaster", base_url="https://proper-roaster.com", rate_limit_delay=0)
+
+    async def get_store_urls(self) -> list[str]:
+        return STORE_URLS
+
+    async def _extract_product_urls_from_store(self, store_url: str) -> list[str]:
+        return []
+
+
+@pytest.mark.asyncio
+async def test_pipeline_drops_none_and_counts_failures():
+    async def double(n):
+        if n == 3:
+            raise ValueError("boom")
+        return None if n % 2 else n * 2
+
+    async def add_one(n):
+        return n + 1
+
+    async with Pipeline([Stage("double", double, workers=2), Stage("add", add_one)]) as pipeline:
+        for n in range(6):
+            await pipeline.put(n)
+
+    assert sorted(pipeline.results) == [1, 5, 9]
+    double_metrics, add_metrics = pipeline.metrics
+    assert (double_metrics.processed, double_metrics.emitted, double_metrics.failed) == (5, 3, 1)
+    assert (add_metrics.processed, add_metrics.emitted) == (3, 3)
+    assert set(double_metrics.as_dict()) >= {"items_per_second", "utilisation", "blocked_seconds"}
+
+
+@pytest.mark.asyncio
+async def test_slow_stage_applies_back_pressure_but_not_lockstep():
+    fetched = []
+    extracted = []
+
+    async def fetch(n):
+        fetched.append(n)
+        return n
+
+    async def extract(n):
+        await asyncio.sleep(0.01)
+        extracted.append(n)
+        return n
+
+    # The fetcher runs ahead of the extractor, but only by the size of the queue between them
+    max_lead = 0
+    async with Pipeline([Stage("fetch", fetch, workers=4), Stage("extract", extract, queue_size=2)]) as pipeline:
+        for n in range(12):
+            await pipeline.put(n)
+            max_lead = max(max_lead, len(fetched) - len(extracted))
+
+    assert sorted(pipeline.results) == list(range(12))
+    assert 2 <= max_lead <= 2 + 1 + 4
+    assert pipeline.metrics[0].blocked_seconds > 0
+
+
+def _bean(url):
+    return CoffeeBean(
+        name=url.rsplit("/", 1)[-1].title(),
+        roaster="Proper Roaster",
+        url=url,
+        image_url="https://cdn.proper-roaster.com/bag.png",
+        origins=[{"country": "CO"}],
+        price_options=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_scrape_with_ai_extraction_streams_products_through_stages(tmp_path, mocker):
+    scraper = MockPlainScraper()
+    listings = {
+        STORE_URLS[0]: ["https://proper-roaster.com/products/huila", "https://proper-roaster.com/products/guji"],
+        # Listed again on the second page: queued only once
+        STORE_URLS[1]: ["https://proper-roaster.com/products/guji", "https://proper-roaster.com/products/nyeri"],
+    }
+
+    async def extract_bean(ai_extractor, soup, product_url, **kwargs):
+        return _bean(product_url)
+
+    mocker.patch.object(scraper, "fetch_page", new_callable=mocker.AsyncMock, return_value=BeautifulSoup("", "lxml"))
+    mocker.patch.object(scraper, "_extract_bean_with_ai", side_effect=extract_bean)
+    download = mocker.patch.object(scraper, "download_and_save_image", new_callable=mocker.AsyncMock)
+
+    async def product_urls(store_url):
+        return listings[store_url]
+
+    beans = await scraper.scrape_with_ai_extraction(product_urls, ai_extractor=None, output_dir=tmp_path)
+
+    assert sorted(bean.name for bean in beans) == ["Guji", "Huila", "Nyeri"]
+    assert scraper.fetch_page.await_count == 3
+    assert download.await_count == 3
+    assert len(list(tmp_path.glob("roasters/proper_roaster/*/*.json"))) == 3
+    assert all(scraper._is_bean_already_scraped_anywhere(url) for url in listings[STORE_URLS[1]])
+
+    session = scraper.session
+    assert session.beans_processed == 3
+    assert list(session.pipeline_metrics) == ["fetch", "extract", "save", "image"]
+    assert session.pipeline_metrics["extract"]["emitted"] == 3
@@ -0,0 +1,133 @@
+"""Unit tests for incremental Shopify listing scrapes.
+
+Covers conditional ``products.json`` requests (ETag/Last-Modified, 304 served
+from the cached page) and skipping stock diffjson whose status has not
+changed since the last update written.
+"""
+
+import pytest
+
+from kissaten.scrapers.base import BEAN_DATA_DIR
+from kissaten.scrapers.shopify_base import ShopifyJsonScraper
+from kissaten.scrapers.shopify_listing_cache import ShopifyListingCache
+
+PRODUCTS_JSON_URL = "https://proper-roaster.com/products.json"
+
+KNOWN_URLS = [
+    "https://proper-roaster.com/products/ethiopia-yirgacheffe",
+    "https://proper-roaster.com/products/colombia-huila",
+]
+
+
+class _Response:
+    def __init__(self, status_code, json=None, headers=None):
+        self.status_code = status_code
+        self._json = json
+        self.headers = headers or {}
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        assert self.status_code < 400
+
+
+class MockShopifyScraper(ShopifyJsonScraper):
+    def __init__(self):
+        super().__init__(
+            roaster_name="Proper Roaster",
+            base_url="https://proper-roaster.com",
+            products_json_urls=[PRODUCTS_JSON_URL],
+            rate_limit_delay=0,
+        )
+
+
+def _scraper(tmp_path, session_datetime="20260101"):
+    scraper = MockShopifyScraper()
+    scraper.start_session()
+    scraper.session_datetime = session_datetime
+    # Fetches use the default data directory; point it at tmp_path
+    scraper._listing_caches[BEAN_DATA_DIR] = scraper._listing_cache(tmp_path)
+    return scraper
+
+
+def _product(handle, available):
+    return {"id": hash(handle), "title": handle, "handle": handle, "variants": [{"available": available}]}
+
+
+def _serve(products, etag):
+    """A ``client.get`` stub honouring ``If-None-Match``; records the headers it was sent."""
+    requests = []
+
+    async def get(url, headers=None):
+        requests.append(headers or {})
+        if "page=1" not in url:
+            return _Response(200, json={"products": []})
+        if headers and headers.get("If-None-Match") == etag:
+            return _Response(304)
+        return _Response(200, json={"products": products}, headers={"ETag": etag})
+
+    return get, requests
+
+
+def _diffjson_files(tmp_path, session_datetime):
+    return sorted(p.name for p in (tmp_path / "roasters" / "proper_roaster" / session_datetime).glob("*.diffjson"))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_served_from_cache(tmp_path):
+    products = [_product("ethiopia-yirgacheffe", True)]
+
+    first = _scraper(tmp_path)
+    first.client.get, requests = _serve(products, etag='W/"v1"')
+    assert await first._fetch_all_shopify_products(PRODUCTS_JSON_URL) == products
+    assert requests[0] == {}
+    first._listing_cache(tmp_path).save()
+
+    second = _scraper(tmp_path)
+    second.client.get, requests = _serve(products, etag='W/"v1"')
+    assert await second._fetch_all_shopify_products(PRODUCTS_JSON_URL) == products
+    assert requests[0] == {"If-None-Match": 'W/"v1"'}
+
+    # A changed page is downloaded again and replaces the cached copy
+    changed = [_product("ethiopia-yirgacheffe", False)]
+    third = _scraper(tmp_path)
+    third.client.get, _ = _serve(changed, etag='W/"v2"')
+    assert await third._fetch_all_shopify_products(PRODUCTS_JSON_URL) == changed
+
+
+def test_validators_need_a_cached_page(tmp_path):
+    cache = ShopifyListingCache(tmp_path / "listing")
+    cache.store_page("https://example.com/products.json?page=1", {"products": []}, 'W/"v1"', None)
+    cache.save()
+    for body in (tmp_path / "listing" / "pages").iterdir():
+        body.unlink()
+    assert cache.conditional_headers("https://example.com/products.json?page=1") == {}
+
+
+@pytest.mark.asyncio
+async def test_stock_diffjson_only_written_on_change(tmp_path):
+    async def run(session_datetime, stock):
+        scraper = _scraper(tmp_path, session_datetime)
+        scraper._all_sessions_bean_files = set(KNOWN_URLS)
+        scraper._shopify_stock_status = stock
+        await scraper.create_diffjson_stock_updates(list(stock), tmp_path)
+        return _diffjson_files(tmp_path, session_datetime)
+
+    stock = {KNOWN_URLS[0]: True, KNOWN_URLS[1]: False}
+    assert len(await run("20260101", stock)) == 2
+    # Same stock status: nothing to write
+    assert await run("20260102", stock) == []
+    # Only the product that changed gets an update
+    written = await run("20260103", {KNOWN_URLS[0]: False, KNOWN_URLS[1]: False})
+    assert len(written) == 1
+    assert written[0].startswith("ethiopia") and written[0].endswith("_out_of_stock.diffjson")
+
+
+@pytest.mark.asyncio
+async def test_new_bean_file_resets_recorded_stock(tmp_path):
+    scraper = _scraper(tmp_path)
+    cache = scraper._listing_cache(tmp_path)
+    cache.record_stock(KNOWN_URLS[0], True)
+    scraper._mark_bean_as_scraped(KNOWN_URLS[0])
+    assert not ShopifyListingCache(cache.cache_dir).stock_unchanged(KNOWN_URLS[0], True)